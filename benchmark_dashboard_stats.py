@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark recruiter_dashboard for a busy recruiter: the old queries vs dashboard_stats.py.
+
+Builds a throwaway test database with one recruiter owning N interviews (default
+50,000) over 200 jobs, plus applications and candidates, and another recruiter
+whose rows the queries must skip, then reports query count and latency for:
+  - the old dashboard: nine queries, every list loaded to len() it
+  - compute_recruiter_stats(): every counter in one query
+  - recruiter_stats() on a warm cache
+  - the recruiter_dashboard view end to end (counters + one page per list), cold and warm
+
+Usage:
+    USE_SQLITE=True python benchmark_dashboard_stats.py [--interviews 50000] [--samples 20]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.db.models import Avg
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from jobapp.dashboard_stats import compute_recruiter_stats, invalidate_recruiter_stats, recruiter_stats
+from jobapp.models import Application, Candidate, CustomUser, Interview, Job
+
+STATUSES = ['scheduled', 'completed', 'completed', 'completed', 'cancelled', 'no_show']
+RECOMMENDATIONS = ['highly_recommended', 'recommended', 'maybe', 'not_recommended', 'never_hire']
+
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(int(len(samples_ms) * 0.95) - 1, 0)]
+    print(f"{label:<46} mean {statistics.mean(samples_ms):8.2f} ms   "
+          f"p50 {statistics.median(samples_ms):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def build_dataset(interview_count, application_count, candidate_count):
+    """Create both recruiters' rows in bulk (no signals); returns the busy recruiter"""
+    rng = random.Random(42)
+    busy = CustomUser.objects.create_user('bench_recruiter', password='bench', is_recruiter=True)
+    other = CustomUser.objects.create_user('bench_other', password='bench', is_recruiter=True)
+    seekers = CustomUser.objects.bulk_create([
+        CustomUser(username=f'bench_seeker{i}', email=f'seeker{i}@example.com') for i in range(1000)])
+
+    jobs = {}
+    for recruiter in (busy, other):
+        jobs[recruiter.pk] = Job.objects.bulk_create([
+            Job(title=f'Job {i}', company='Bench Co', location='Remote', description='Benchmark job',
+                status='active' if i % 4 else 'closed', posted_by=recruiter)
+            for i in range(200)])
+
+    now = timezone.now()
+    interviews = []
+    for i in range(interview_count * 2):
+        recruiter = busy if i < interview_count else other
+        status = rng.choice(STATUSES)
+        interviews.append(Interview(
+            job=rng.choice(jobs[recruiter.pk]),
+            candidate_name=f"Candidate {i}",
+            candidate_email=f"candidate{i}@example.com",
+            interview_id=f"d{i:010d}",
+            link=f"/interview/ready/bench-{i}/",
+            status=status,
+            scheduled_at=now + timedelta(days=rng.randint(-30, 30)),
+            completed_at=now - timedelta(minutes=rng.randint(1, 50000)) if status == 'completed' else None,
+            recommendation=rng.choice(RECOMMENDATIONS) if status == 'completed' else None,
+            interview_duration_minutes=rng.choice([10, 15, 20, 30]),
+        ))
+    Interview.objects.bulk_create(interviews, batch_size=2000)
+
+    Application.objects.bulk_create([
+        Application(applicant=seekers[i % len(seekers)], job=rng.choice(jobs[busy.pk] if i % 2 else jobs[other.pk]))
+        for i in range(application_count * 2)], batch_size=2000)
+    Candidate.objects.bulk_create([
+        Candidate(name=f'Candidate {i}', email=f'pool{i}@example.com', phone='555-0100',
+                  added_by=busy if i % 2 else other)
+        for i in range(candidate_count * 2)], batch_size=2000)
+    return busy
+
+
+def legacy_dashboard(user):
+    """The queries recruiter_dashboard ran before, with the len() calls that loaded every row"""
+    counts = [
+        len(Job.objects.filter(posted_by=user).order_by('-date_posted')),
+        len(Application.objects.filter(job__posted_by=user).select_related('job', 'applicant').order_by('-applied_at')),
+        len(Interview.objects.filter(job__posted_by=user).select_related('job', 'candidate').order_by('-scheduled_at')),
+        len(Interview.objects.filter(job__posted_by=user, status='completed').select_related('job', 'candidate')
+            .prefetch_related('turns').order_by('-completed_at')),
+        len(Interview.objects.filter(job__posted_by=user).select_related('job', 'candidate').order_by('-created_at')[:10]),
+        Interview.objects.filter(job__posted_by=user, status='completed',
+                                 recommendation__in=['highly_recommended', 'recommended']).count(),
+        Interview.objects.filter(job__posted_by=user, status='completed',
+                                 recommendation__in=['not_recommended', 'never_hire']).count(),
+        Interview.objects.filter(job__posted_by=user, status='completed', interview_duration_minutes__isnull=False)
+        .aggregate(avg_duration=Avg('interview_duration_minutes'))['avg_duration'],
+        len(Candidate.objects.filter(added_by=user).order_by('-added_at')),
+        len(list(Job.objects.filter(posted_by=user).values('id', 'title', 'company', 'status'))),
+    ]
+    return counts
+
+
+def measure(label, run, samples, before=None):
+    timings = []
+    for _ in range(samples):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - t0)
+    if before:
+        before()
+    with CaptureQueriesContext(connection) as queries:
+        run()
+    summarize(f"{label} ({len(queries)} queries)", timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=50000)
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--candidates', type=int, default=10000)
+    parser.add_argument('--samples', type=int, default=20)
+    args = parser.parse_args()
+
+    print("🧪 Recruiter dashboard benchmark")
+    print("=" * 78)
+
+    logging.disable(logging.WARNING)
+    setup_test_environment()
+    old_db_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        recruiter = build_dataset(args.interviews, args.applications, args.candidates)
+        print(f"Dataset: recruiter with {args.interviews} interviews, {args.applications} applications, "
+              f"{args.candidates} candidates on {connection.vendor} (built in {time.perf_counter() - start:.1f}s)")
+        stats = compute_recruiter_stats(recruiter)
+        print(f"Counters: {stats}")
+        print("-" * 78)
+
+        drop = lambda: invalidate_recruiter_stats(recruiter.pk)
+        measure("old dashboard queries + len()", lambda: legacy_dashboard(recruiter), args.samples)
+        measure("compute_recruiter_stats()", lambda: compute_recruiter_stats(recruiter), args.samples)
+        recruiter_stats(recruiter)
+        measure("recruiter_stats(), cached", lambda: recruiter_stats(recruiter), args.samples)
+
+        client = Client()
+        client.force_login(recruiter)
+        url = reverse('recruiter_dashboard')
+
+        def render():
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+
+        measure("recruiter_dashboard view, cold counters", render, args.samples, before=drop)
+        measure("recruiter_dashboard view, cached counters", render, args.samples)
+
+        print("-" * 78)
+        print("✅ Done")
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
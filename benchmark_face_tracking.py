@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark FaceTracker throughput: full-resolution detection on every frame vs the downscaled,
+tracked pipeline.
+
+Frames are JPEG bytes, as the proctoring endpoints receive them:
+  - face_tracking_demo.jpg (800x600, no real faces)
+  - synthetic webcam sequences at 640x480, 1280x720 and 1920x1080 with one or two drawn faces
+    that drift a few pixels per frame (the Haar cascade detects them)
+
+Each sequence is run through:
+  - full frame: FaceTracker(working_width=0) with no tracking state - the previous behaviour
+  - downscaled: FaceTracker() with no tracking state
+  - tracked:    FaceTracker() with one tracking state per sequence (full search every N frames)
+
+OpenCV is limited to one thread, so frames/sec is per core. Face counts that differ from the
+full-frame run are reported per sequence.
+
+Usage:
+    python benchmark_face_tracking.py [--frames 60] [--working-width 640] [--full-every 5]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+import cv2
+import numpy as np
+
+from jobapp.utils.face_tracker import FaceTracker, FaceTrackState
+
+
+def draw_face(img, cx, cy, size):
+    """Cartoon face with shaded eyes, brows, nose and mouth - enough for the frontal face cascade"""
+    cv2.ellipse(img, (cx, cy), (int(size * 0.42), int(size * 0.55)), 0, 0, 360, (150, 170, 200), -1)
+    for side in (-0.18, 0.18):
+        ex, ey = int(cx + side * size), int(cy - 0.1 * size)
+        cv2.ellipse(img, (ex, ey), (int(size * 0.09), int(size * 0.045)), 0, 0, 360, (40, 40, 40), -1)
+        brow = int(size * 0.11)
+        cv2.line(img, (ex - brow, ey - int(size * 0.09)), (ex + brow, ey - int(size * 0.09)),
+                 (50, 50, 60), max(2, int(size * 0.03)))
+    cv2.line(img, (cx, cy - int(0.02 * size)), (cx, cy + int(0.14 * size)), (110, 120, 150), max(2, int(size * 0.03)))
+    cv2.ellipse(img, (cx, cy + int(0.25 * size)), (int(size * 0.14), int(size * 0.04)), 0, 0, 360, (80, 80, 140), -1)
+
+
+def synthetic_sequence(width, height, faces, count, seed=0):
+    """JPEG frames of `faces` drawn faces drifting slowly, with sensor noise"""
+    rng = np.random.default_rng(seed)
+    size = int(height * 0.4)
+    frames = []
+    for i in range(count):
+        img = np.full((height, width, 3), 90, np.uint8)
+        for n in range(faces):
+            cx = int(width * (n + 1) / (faces + 1) + 12 * np.sin(i / 5 + n))
+            cy = int(height / 2 + 8 * np.cos(i / 7 + n))
+            draw_face(img, cx, cy, size)
+        img = cv2.GaussianBlur(img, (0, 0), size / 60)
+        noise = rng.integers(-6, 7, img.shape, dtype=np.int16)
+        img = np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        frames.append(cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 70])[1].tobytes())
+    return frames
+
+
+def run(tracker, frames, tracked):
+    state = FaceTrackState() if tracked else None
+    counts = []
+    start = time.perf_counter()
+    for frame in frames:
+        counts.append(tracker.process_image(frame, state)['count'])
+    return time.perf_counter() - start, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=60, help='Frames per synthetic sequence')
+    parser.add_argument('--working-width', type=int, default=640, help='Detection width for the downscaled runs')
+    parser.add_argument('--full-every', type=int, default=5, help='Full-frame search interval when tracking')
+    args = parser.parse_args()
+
+    print("🧪 Face tracking benchmark")
+    print("=" * 78)
+
+    logging.disable(logging.WARNING)
+    logging.getLogger('jobapp.utils.face_tracker').disabled = True
+    cv2.setNumThreads(1)
+
+    demo_path = project_root / 'face_tracking_demo.jpg'
+    sequences = [('face_tracking_demo.jpg', [demo_path.read_bytes()] * args.frames)]
+    for width, height in ((640, 480), (1280, 720), (1920, 1080)):
+        for faces in (1, 2):
+            sequences.append((f"{width}x{height}, {faces} face{'s' if faces > 1 else ''}",
+                              synthetic_sequence(width, height, faces, args.frames)))
+
+    modes = [
+        ('full frame', FaceTracker(working_width=0), False),
+        ('downscaled', FaceTracker(working_width=args.working_width), False),
+        ('tracked', FaceTracker(working_width=args.working_width, full_detect_every=args.full_every), True),
+    ]
+    print(f"{len(sequences)} sequences x {args.frames} frames, OpenCV threads: 1, "
+          f"working width {args.working_width}, full search every {args.full_every} frames")
+    print("-" * 78)
+    print(f"{'sequence':<26}" + ''.join(f"{name + ' fps':>16}" for name, _, _ in modes) + f"{'speedup':>10}   count diffs")
+
+    totals = {name: 0.0 for name, _, _ in modes}
+    frame_total = 0
+    for label, frames in sequences:
+        row = f"{label:<26}"
+        baseline_counts = None
+        fps = []
+        diffs = []
+        for name, tracker, tracked in modes:
+            elapsed, counts = run(tracker, frames, tracked)
+            totals[name] += elapsed
+            fps.append(len(frames) / elapsed)
+            row += f"{fps[-1]:16.1f}"
+            if baseline_counts is None:
+                baseline_counts = counts
+            else:
+                mismatched = sum(a != b for a, b in zip(counts, baseline_counts))
+                diffs.append(f"{name}: {mismatched}")
+        frame_total += len(frames)
+        expected = f"(full frame finds {max(baseline_counts)})"
+        print(row + f"{fps[-1] / fps[0]:9.1f}x   {', '.join(diffs)} {expected}")
+
+    print("-" * 78)
+    print("Overall frames/sec per core: " + ', '.join(
+        f"{name} {frame_total / elapsed:.1f}" for name, elapsed in totals.items()))
+    print("✅ Done")
+
+
+if __name__ == '__main__':
+    main()
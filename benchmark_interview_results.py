@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark interview results rendering at scale: JSON TextField parsing vs InterviewTurn rows.
+
+Builds a throwaway test database with N interviews (default 10,000), each with a full
+conversation stored both as the legacy questions_asked/answers_given JSON and as
+InterviewTurn rows, then times:
+  - loading the Q&A for one interview (legacy json.loads vs one indexed turns query)
+  - rendering the recruiter interview_results page end to end
+  - rendering the recruiter dashboard with every completed interview's Q&A
+
+Usage:
+    USE_SQLITE=True python benchmark_interview_results.py [--interviews 10000] [--turns 12] [--samples 200]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from jobapp.models import CustomUser, Interview, InterviewTurn, Job
+
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(int(len(samples_ms) * 0.95) - 1, 0)]
+    print(f"{label:<38} mean {statistics.mean(samples_ms):8.2f} ms   "
+          f"p50 {statistics.median(samples_ms):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def build_dataset(interview_count, turns_per_interview, dashboard_interviews):
+    """Create recruiters, jobs, interviews and their turns in bulk"""
+    busy_recruiter = CustomUser.objects.create_user('bench_recruiter', password='bench', is_recruiter=True)
+    other_recruiter = CustomUser.objects.create_user('bench_other', password='bench', is_recruiter=True)
+    busy_job = Job.objects.create(title='Backend Developer', company='Bench Co', location='Remote',
+                                  description='Benchmark job', posted_by=busy_recruiter)
+    other_job = Job.objects.create(title='Frontend Developer', company='Bench Co', location='Remote',
+                                   description='Benchmark job', posted_by=other_recruiter)
+
+    now = timezone.now()
+    interviews = []
+    for i in range(interview_count):
+        interviews.append(Interview(
+            job=busy_job if i < dashboard_interviews else other_job,
+            candidate_name=f"Candidate {i}",
+            candidate_email=f"candidate{i}@example.com",
+            interview_id=f"b{i:010d}",
+            link=f"/interview/ready/bench-{i}/",
+            status='completed',
+            started_at=now - timedelta(minutes=15),
+            completed_at=now,
+            results_generated_at=now,
+            overall_score=7.5,
+            technical_score=7.0,
+            communication_score=8.0,
+            problem_solving_score=7.5,
+            ai_feedback='Solid candidate with good communication.',
+            recommendation='recommended',
+        ))
+    Interview.objects.bulk_create(interviews, batch_size=1000)
+    interview_ids = list(Interview.objects.order_by('id').values_list('id', flat=True))
+
+    answer = "I built and maintained Django services with Postgres, Redis and Celery for five years. " * 3
+    question = "That sounds great! What was the hardest scaling problem you solved on that project?"
+
+    turns = []
+    legacy_updates = []
+    for interview_id in interview_ids:
+        questions_asked, answers_given = [], []
+        for index in range(turns_per_interview):
+            speaker = 'interviewer' if index % 2 == 0 else 'candidate'
+            text = question if speaker == 'interviewer' else answer
+            stamp = now - timedelta(seconds=(turns_per_interview - index) * 20)
+            question_number = (index + 1) // 2
+            turns.append(InterviewTurn(interview_id=interview_id, turn_index=index, speaker=speaker,
+                                       text=text, question_number=question_number, created_at=stamp))
+            entry = {'question_number': question_number, 'timestamp': stamp.isoformat()}
+            if speaker == 'interviewer':
+                questions_asked.append({**entry, 'question': text})
+            else:
+                answers_given.append({**entry, 'answer': text})
+        legacy_updates.append(Interview(id=interview_id, questions_asked=json.dumps(questions_asked),
+                                        answers_given=json.dumps(answers_given)))
+        if len(turns) >= 5000:
+            InterviewTurn.objects.bulk_create(turns)
+            turns = []
+    if turns:
+        InterviewTurn.objects.bulk_create(turns)
+    Interview.objects.bulk_update(legacy_updates, ['questions_asked', 'answers_given'], batch_size=1000)
+    return busy_recruiter
+
+
+def legacy_load_qa(interview_uuid):
+    """Q&A loading as the results page did it before: parse both JSON columns"""
+    interview = Interview.objects.get(uuid=interview_uuid)
+    questions_asked = json.loads(interview.questions_asked) if interview.questions_asked else []
+    answers_given = json.loads(interview.answers_given) if interview.answers_given else []
+    return [
+        (questions_asked[i]['question'] if i < len(questions_asked) else None,
+         answers_given[i]['answer'] if i < len(answers_given) else None)
+        for i in range(max(len(questions_asked), len(answers_given)))
+    ]
+
+
+def turns_load_qa(interview_uuid):
+    """Q&A loading from InterviewTurn rows"""
+    interview = Interview.objects.get(uuid=interview_uuid)
+    questions, answers = [], []
+    for turn in interview.turns.all():
+        (questions if turn.speaker == 'interviewer' else answers).append(turn.text)
+    return [
+        (questions[i] if i < len(questions) else None, answers[i] if i < len(answers) else None)
+        for i in range(max(len(questions), len(answers)))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interviews', type=int, default=10000)
+    parser.add_argument('--turns', type=int, default=12, help='Messages per interview')
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--dashboard-interviews', type=int, default=50,
+                        help='Completed interviews owned by the dashboard recruiter')
+    args = parser.parse_args()
+
+    print("🧪 Interview results benchmark")
+    print("=" * 70)
+
+    # View logging is chatty; keep the benchmark output readable
+    logging.disable(logging.WARNING)
+    setup_test_environment()
+    old_db_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        recruiter = build_dataset(args.interviews, args.turns, args.dashboard_interviews)
+        print(f"Dataset: {args.interviews} interviews, {InterviewTurn.objects.count()} turns "
+              f"(built in {time.perf_counter() - start:.1f}s)")
+        print("-" * 70)
+
+        uuids = list(Interview.objects.values_list('uuid', flat=True))
+        sample = [random.choice(uuids) for _ in range(args.samples)]
+
+        for label, loader in [("Load Q&A - JSON columns", legacy_load_qa),
+                              ("Load Q&A - InterviewTurn rows", turns_load_qa)]:
+            timings = []
+            for interview_uuid in sample:
+                t0 = time.perf_counter()
+                loader(interview_uuid)
+                timings.append(time.perf_counter() - t0)
+            summarize(label, timings)
+
+        client = Client()
+        client.force_login(recruiter)
+        own_uuids = list(Interview.objects.filter(job__posted_by=recruiter).values_list('uuid', flat=True))
+
+        timings = []
+        for _ in range(min(args.samples, 100)):
+            url = reverse('interview_results', args=[random.choice(own_uuids)])
+            t0 = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - t0)
+            assert response.status_code == 200, response.status_code
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        summarize(f"Results page render ({len(queries)} queries)", timings)
+
+        timings = []
+        for _ in range(10):
+            t0 = time.perf_counter()
+            response = client.get(reverse('recruiter_dashboard'))
+            timings.append(time.perf_counter() - t0)
+            assert response.status_code == 200, response.status_code
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse('recruiter_dashboard'))
+        summarize(f"Dashboard render ({len(queries)} queries)", timings)
+
+        print("-" * 70)
+        print("✅ Done")
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
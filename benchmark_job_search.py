@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark the job list search at scale: title__icontains vs the full-text index.
+
+Builds a throwaway test database with N jobs (default 100,000) whose titles,
+skills, companies, locations and descriptions are drawn from small vocabularies,
+indexes them with job_search.index_jobs(), then times one page of search results
+(the page rows, the paginator count and the "no results" check) for:
+  - the old job_list: title__icontains, Paginator (COUNT + SELECT) and jobs.exists()
+  - search_jobs() with WindowCountPaginator (one query per page)
+plus the job_list view end to end and unsearched pages at increasing depth:
+  - Paginator / OFFSET (the old job_list)
+  - KeysetPaginator on (date_posted, id) (the job list and jobs API now)
+
+On SQLite this exercises the FTS5 fallback; point DATABASE_URL at PostgreSQL to
+measure the tsvector / trigram indexes.
+
+Usage:
+    USE_SQLITE=True python benchmark_job_search.py [--jobs 100000] [--samples 50]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from jobapp.job_search import index_jobs, search_jobs
+from jobapp.models import CustomUser, Job
+from jobapp.pagination import KeysetPaginator, WindowCountPaginator, encode_cursor
+
+TITLES = ['Backend Developer', 'Frontend Engineer', 'Data Scientist', 'DevOps Engineer', 'Product Manager',
+          'QA Analyst', 'Mobile Developer', 'Machine Learning Engineer', 'Site Reliability Engineer', 'Designer']
+SENIORITY = ['Junior', 'Senior', 'Lead', 'Principal', 'Staff', '']
+SKILLS = ['Python', 'Django', 'PostgreSQL', 'React', 'TypeScript', 'Kubernetes', 'Terraform', 'Go', 'Rust',
+          'Kotlin', 'Swift', 'PyTorch', 'Spark', 'Figma', 'Selenium', 'AWS', 'GCP', 'Redis', 'Kafka', 'GraphQL']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Vandelay', 'Stark Industries', 'Wayne Enterprises']
+LOCATIONS = ['Remote', 'Bangalore', 'Kochi', 'Berlin', 'London', 'New York', 'Singapore', 'Toronto']
+FILLER = ("We are growing our team and looking for someone who enjoys ownership, clear writing and "
+          "shipping reliable software with a small, focused group of engineers. ")
+
+# (query, what it exercises)
+QUERIES = [
+    ('python', 'skill only in required_skills'),
+    ('django postgresql', 'two skills'),
+    ('senior backend developer', 'title words'),
+    ('kochi', 'location'),
+    ('hooli', 'company'),
+    ('pyhton', 'misspelt (trigram on PostgreSQL)'),
+    ('cobol', 'no results'),
+]
+
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(int(len(samples_ms) * 0.95) - 1, 0)]
+    print(f"{label:<46} mean {statistics.mean(samples_ms):8.2f} ms   "
+          f"p50 {statistics.median(samples_ms):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def build_dataset(job_count):
+    """Create the jobs in bulk (no signals) and index them in one pass"""
+    recruiter = CustomUser.objects.create_user('bench_recruiter', password='bench', is_recruiter=True)
+    rng = random.Random(42)
+    batch = []
+    for i in range(job_count):
+        skills = rng.sample(SKILLS, 4)
+        batch.append(Job(
+            title=f"{rng.choice(SENIORITY)} {rng.choice(TITLES)}".strip(),
+            company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            description=FILLER * rng.randint(2, 6) + f"You will work mostly with {skills[0]} and {skills[1]}.",
+            required_skills=', '.join(skills),
+            status='active' if i % 5 else 'closed',
+            posted_by=recruiter,
+        ))
+        if len(batch) >= 5000:
+            Job.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Job.objects.bulk_create(batch)
+    start = time.perf_counter()
+    index_jobs()
+    return time.perf_counter() - start
+
+
+def legacy_page(query, page):
+    """One page of results as job_list computed it before"""
+    jobs = Job.objects.all().order_by('-date_posted').filter(title__icontains=query)
+    page_obj = Paginator(jobs, 5).get_page(page)
+    list(page_obj)
+    return page_obj.paginator.count, not jobs.exists()
+
+
+def indexed_page(query, page):
+    """One page of results through the search index"""
+    jobs = search_jobs(Job.objects.all().order_by('-date_posted'), query)
+    paginator = WindowCountPaginator(jobs, 5)
+    page_obj = paginator.get_page(page)
+    list(page_obj)
+    return paginator.count, paginator.count == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    print("🧪 Job search benchmark")
+    print("=" * 78)
+
+    logging.disable(logging.WARNING)
+    setup_test_environment()
+    old_db_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        index_seconds = build_dataset(args.jobs)
+        print(f"Dataset: {args.jobs} jobs on {connection.vendor} "
+              f"(built in {time.perf_counter() - start:.1f}s, indexed in {index_seconds:.1f}s)")
+        print("-" * 78)
+
+        for query, description in QUERIES:
+            print(f"'{query}' - {description}")
+            for label, run in [("title__icontains + COUNT + exists()", legacy_page),
+                               ("search index + window count", indexed_page)]:
+                timings = []
+                for _ in range(args.samples):
+                    t0 = time.perf_counter()
+                    total, _ = run(query, random.randint(1, 3))
+                    timings.append(time.perf_counter() - t0)
+                with CaptureQueriesContext(connection) as queries:
+                    run(query, 1)
+                summarize(f"  {label} ({total} hits, {len(queries)} queries)", timings)
+
+        print("Unsearched list, page depth")
+        jobs = Job.objects.all().order_by('-date_posted', '-id')
+        for depth in (1, 100, 1000, 10000):
+            if (depth - 1) * 5 >= args.jobs:
+                break
+            cursor = None
+            if depth > 1:
+                row = jobs[(depth - 1) * 5 - 1]
+                cursor = encode_cursor([row.date_posted.isoformat(), str(row.id)])
+            for label, run in [("OFFSET", lambda: list(Paginator(jobs, 5).page(depth))),
+                               ("keyset", lambda: list(KeysetPaginator(jobs, 5).page(cursor)))]:
+                timings = []
+                for _ in range(args.samples):
+                    t0 = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - t0)
+                summarize(f"  page {depth:>5} - {label}", timings)
+
+        client = Client()
+        timings = []
+        for _ in range(args.samples):
+            query, _ = random.choice(QUERIES)
+            t0 = time.perf_counter()
+            response = client.get(reverse('job_list'), {'search': query})
+            timings.append(time.perf_counter() - t0)
+            assert response.status_code == 200, response.status_code
+        summarize("job_list view render", timings)
+
+        print("-" * 78)
+        print("✅ Done")
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
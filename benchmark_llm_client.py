@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-turn latency of ask_ai_question: new OpenAI client per call vs shared pooled client.
+
+Runs against a local stub OpenAI-compatible server, so no NVIDIA key or network is needed.
+
+Usage:
+    python benchmark_llm_client.py [--turns 200] [--delay-ms 0]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    """Minimal /v1/chat/completions endpoint with HTTP/1.1 keep-alive"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        if self.delay:
+            time.sleep(self.delay)
+
+        body = json.dumps({
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': 'nvidia/llama-3.3-nemotron-super-49b-v1',
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': 'That sounds great! What got you into that?'},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 10, 'total_tokens': 20},
+        }).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(delay_ms):
+    StubCompletionHandler.delay = delay_ms / 1000.0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubCompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(samples_ms):7.2f} ms   "
+          f"p50 {statistics.median(samples_ms):7.2f} ms   p95 {p95:7.2f} ms")
+    return statistics.mean(samples_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--turns', type=int, default=200)
+    parser.add_argument('--delay-ms', type=float, default=0.0, help='Simulated model latency per request')
+    args = parser.parse_args()
+
+    server = start_stub_server(args.delay_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    # Configure the module before import so it points at the stub
+    os.environ['NVIDIA_API_KEY'] = 'stub-key'
+    os.environ['NVIDIA_BASE_URL'] = base_url
+
+    from openai import OpenAI
+    from jobapp.utils import interview_ai_nvidia
+    from jobapp.utils.interview_ai_nvidia import ask_ai_question, close_llm_clients
+
+    prompt = "I have five years of Python experience building APIs."
+
+    print("🧪 NVIDIA LLM client benchmark")
+    print("=" * 60)
+    print(f"Stub server: {base_url}  turns: {args.turns}  delay: {args.delay_ms} ms")
+
+    # Before: a brand new client (and connection pool) for every turn
+    original_get_client = interview_ai_nvidia.get_llm_client
+
+    def fresh_client(api_key, base_url=None):
+        return OpenAI(base_url=base_url or interview_ai_nvidia.NVIDIA_BASE_URL, api_key=api_key, timeout=10.0)
+
+    interview_ai_nvidia.get_llm_client = fresh_client
+    before = []
+    for _ in range(args.turns):
+        start = time.perf_counter()
+        ask_ai_question(prompt, candidate_name="Bench", job_title="Developer", company_name="Bench Co")
+        before.append(time.perf_counter() - start)
+    interview_ai_nvidia.get_llm_client = original_get_client
+
+    # After: shared pooled client with keep-alive connections
+    after = []
+    for _ in range(args.turns):
+        start = time.perf_counter()
+        ask_ai_question(prompt, candidate_name="Bench", job_title="Developer", company_name="Bench Co")
+        after.append(time.perf_counter() - start)
+
+    before_mean = summarize("New client per turn", before)
+    after_mean = summarize("Shared pooled client", after)
+    print("-" * 60)
+    print(f"✅ Speedup: {before_mean / after_mean:.2f}x ({before_mean - after_mean:.2f} ms saved per turn)")
+    print("💡 Against the real endpoint the saving also includes the TLS handshake per turn.")
+
+    close_llm_clients()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
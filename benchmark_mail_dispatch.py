@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk interview email delivery: one SMTP connection per email vs the pooled outbox dispatcher.
+
+Starts a local SMTP stub that adds a fixed delay to every connection handshake and every
+message (like a remote relay with TLS), then sends N interview emails (default 500):
+  - the old way: one send_mail() call per candidate, each opening its own connection
+  - the outbox way: queue_emails() (one bulk insert) + dispatch_outbox(), which sends each
+    batch over a few reused connections in a bounded thread pool
+
+Usage:
+    USE_SQLITE=True python benchmark_mail_dispatch.py [--emails 500] [--connect-ms 150] [--message-ms 20]
+"""
+import argparse
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from jobapp.mail_dispatcher import dispatch_outbox, queue_emails
+from jobapp.models import OutboxEmail
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail from smtplib; counts connections and messages"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        stats = self.server.stats
+        with stats['lock']:
+            stats['connections'] += 1
+        time.sleep(self.server.connect_delay)
+        self.reply("220 stub ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.wfile.write(b"250-stub\r\n250 8BITMIME\r\n")
+            elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply("250 OK")
+            elif command == 'DATA':
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                time.sleep(self.server.message_delay)
+                with stats['lock']:
+                    stats['messages'] += 1
+                self.reply("250 OK queued")
+            elif command == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_stub(connect_delay, message_delay):
+    server = SMTPStubServer(('127.0.0.1', 0), SMTPStubHandler)
+    server.connect_delay = connect_delay
+    server.message_delay = message_delay
+    server.stats = {'connections': 0, 'messages': 0, 'lock': threading.Lock()}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset_stats(server):
+    with server.stats['lock']:
+        server.stats['connections'] = 0
+        server.stats['messages'] = 0
+
+
+def build_emails(count):
+    return [
+        {
+            'to_email': f"candidate{i}@example.com",
+            'subject': "🎯 Interview Scheduled - Backend Developer at Bench Co",
+            'body': f"Hello Candidate {i},\n\nYour interview link: http://localhost:8000/interview/ready/{i}/\n",
+            'html_body': f"<p>Hello Candidate {i}, <a href='http://localhost:8000/interview/ready/{i}/'>start</a></p>",
+            'dedupe_key': f"bench-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--emails', type=int, default=500)
+    parser.add_argument('--connect-ms', type=float, default=150, help='Stub delay per connection (handshake/TLS)')
+    parser.add_argument('--message-ms', type=float, default=20, help='Stub delay per accepted message')
+    parser.add_argument('--workers', type=int, default=4, help='Dispatcher sender threads')
+    parser.add_argument('--rate', type=float, default=0, help='Dispatcher rate limit per second (0 = unlimited)')
+    args = parser.parse_args()
+
+    print("🧪 Mail dispatch benchmark")
+    print("=" * 70)
+
+    logging.disable(logging.WARNING)
+    server = start_stub(args.connect_ms / 1000, args.message_ms / 1000)
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST, settings.EMAIL_PORT = server.server_address
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ''
+    settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+    print(f"SMTP stub on port {settings.EMAIL_PORT}: {args.connect_ms:.0f} ms per connection, "
+          f"{args.message_ms:.0f} ms per message")
+    print("-" * 70)
+
+    emails = build_emails(args.emails)
+
+    # Old path: every email opens (and closes) its own SMTP connection
+    reset_stats(server)
+    start = time.perf_counter()
+    for email in emails:
+        send_mail(email['subject'], email['body'], settings.DEFAULT_FROM_EMAIL, [email['to_email']],
+                  html_message=email['html_body'])
+    elapsed = time.perf_counter() - start
+    print(f"{'send_mail per email':<30} {elapsed:8.2f} s   "
+          f"{server.stats['connections']:4d} connections   {server.stats['messages']:4d} messages")
+
+    setup_test_environment()
+    # setup_test_environment swaps in the locmem backend - point it back at the stub
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    old_db_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        reset_stats(server)
+        start = time.perf_counter()
+        queue_emails(emails)
+        queued = time.perf_counter() - start
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        while True:
+            stats = dispatch_outbox(workers=args.workers, rate_per_second=args.rate)
+            if not any(stats.values()):
+                break
+            for key in totals:
+                totals[key] += stats[key]
+        elapsed = time.perf_counter() - start
+        print(f"{'outbox + pooled dispatcher':<30} {elapsed:8.2f} s   "
+              f"{server.stats['connections']:4d} connections   {server.stats['messages']:4d} messages")
+        print(f"  queue_emails (bulk insert): {queued * 1000:.1f} ms, "
+              f"sent {totals['sent']}, retried {totals['retried']}, failed {totals['failed']}, "
+              f"outbox sent rows {OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT).count()}")
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0)
+        server.shutdown()
+
+    print("-" * 70)
+    print("✅ Done")
+
+
+if __name__ == '__main__':
+    main()
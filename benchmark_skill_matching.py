@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark candidate-job matching at scale: scanning skill text vs the NumPy skill index.
+
+Builds a throwaway test database with N job seeker profiles (default 100,000) with
+a few skills each, written in the varied forms people use ("JS", "ReactJS", "k8s"),
+and a set of jobs, links them to canonical Skill rows, then times:
+  - ranking every profile for a job by scanning and splitting Profile.skills in Python
+  - best_candidates(job) on the skill index (index build timed separately)
+  - best_jobs(profile) for a profile
+
+Usage:
+    USE_SQLITE=True python benchmark_skill_matching.py [--profiles 100000] [--jobs 2000] [--samples 100]
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from jobapp.models import CustomUser, Job, Profile, Skill
+from jobapp.skill_matching import JOBS, PROFILES, best_candidates, best_jobs, rebuild_index
+from jobapp.skills import parse_skills
+
+# Written forms; several map to one canonical skill
+SKILL_FORMS = ['Python', 'python3', 'Django', 'DRF', 'JS', 'JavaScript', 'TypeScript', 'ts', 'React', 'ReactJS',
+               'Node', 'node.js', 'Postgres', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Docker', 'k8s',
+               'Kubernetes', 'AWS', 'GCP', 'Azure', 'Terraform', 'Go', 'golang', 'Rust', 'Java', 'Kotlin', 'Swift',
+               'C++', 'C#', '.NET', 'ML', 'PyTorch', 'TensorFlow', 'sklearn', 'Pandas', 'Spark', 'Kafka', 'GraphQL',
+               'REST', 'CI/CD', 'Git', 'Linux', 'Figma', 'UX', 'SQL', 'Excel', 'Tableau']
+
+
+def summarize(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(int(len(samples_ms) * 0.95) - 1, 0)]
+    print(f"{label:<42} mean {statistics.mean(samples_ms):8.2f} ms   "
+          f"p50 {statistics.median(samples_ms):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def skill_text(rng, low, high):
+    return ', '.join(rng.sample(SKILL_FORMS, rng.randint(low, high)))
+
+
+def link_all(model, text_field, owner_field):
+    """Bulk equivalent of sync_skills() for rows created with bulk_create (no signals)"""
+    parsed = {pk: parse_skills(text) for pk, text in model.objects.values_list('pk', text_field).iterator()}
+    names = {name for skill_names in parsed.values() for name in skill_names}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+    through = model.canonical_skills.through
+    through.objects.bulk_create([through(**{owner_field: pk, 'skill_id': skill_ids[name]})
+                                 for pk, skill_names in parsed.items() for name in skill_names], batch_size=10000)
+
+
+def build_dataset(profile_count, job_count):
+    rng = random.Random(7)
+    recruiter = CustomUser.objects.create_user('bench_recruiter', password='bench', is_recruiter=True)
+    CustomUser.objects.bulk_create([CustomUser(username=f'seeker{i}', password='!') for i in range(profile_count)],
+                                   batch_size=5000)
+    user_ids = CustomUser.objects.filter(username__startswith='seeker').values_list('id', flat=True)
+    Profile.objects.bulk_create([Profile(user_id=user_id, first_name='Seeker', skills=skill_text(rng, 3, 10))
+                                 for user_id in user_ids.iterator()], batch_size=5000)
+    Job.objects.bulk_create([Job(title=f'Job {i}', company='Bench Co', location='Remote', description='Benchmark job',
+                                 required_skills=skill_text(rng, 4, 8), posted_by=recruiter)
+                             for i in range(job_count)], batch_size=5000)
+    link_all(Profile, 'skills', 'profile_id')
+    link_all(Job, 'required_skills', 'job_id')
+
+
+def scan_candidates(job, limit=20):
+    """Ranking as keyword scanning would do it: split and compare every profile's skill text"""
+    wanted = set(parse_skills(job.required_skills))
+    scored = []
+    for profile_id, text in Profile.objects.filter(user__is_recruiter=False).values_list('id', 'skills').iterator():
+        shared = wanted.intersection(parse_skills(text))
+        if shared:
+            scored.append((len(shared) / len(wanted), profile_id))
+    scored.sort(reverse=True)
+    return scored[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=100)
+    args = parser.parse_args()
+
+    print("🧪 Skill matching benchmark")
+    print("=" * 72)
+
+    logging.disable(logging.WARNING)
+    setup_test_environment()
+    old_db_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        build_dataset(args.profiles, args.jobs)
+        links = Profile.canonical_skills.through.objects.count()
+        print(f"Dataset: {args.profiles} profiles ({links} skill links), {args.jobs} jobs, "
+              f"{Skill.objects.count()} canonical skills (built in {time.perf_counter() - start:.1f}s)")
+        print("-" * 72)
+
+        for kind in (PROFILES, JOBS):
+            t0 = time.perf_counter()
+            rebuild_index(kind)
+            print(f"Index build - {kind:<29} {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+        jobs = list(Job.objects.all())
+        profiles = list(Profile.objects.select_related('user')[:1000])
+
+        timings = []
+        for job in random.sample(jobs, min(3, len(jobs))):
+            t0 = time.perf_counter()
+            scan_candidates(job)
+            timings.append(time.perf_counter() - t0)
+        summarize("Candidates for a job - text scan", timings)
+
+        for label, run, owners in [("Candidates for a job - skill index", best_candidates, jobs),
+                                   ("Jobs for a profile - skill index", best_jobs, profiles)]:
+            timings = []
+            for _ in range(args.samples):
+                owner = random.choice(owners)
+                t0 = time.perf_counter()
+                run(owner)
+                timings.append(time.perf_counter() - t0)
+            summarize(label, timings)
+
+        job = jobs[0]
+        print("-" * 72)
+        print(f"Best matches for '{job.required_skills}':")
+        for match in best_candidates(job, limit=5):
+            print(f"  {match['percent']:>3}%  profile {match['profile'].id}: {', '.join(match['matched'])}")
+        print("✅ Done")
+    finally:
+        connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
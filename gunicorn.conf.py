@@ -1,5 +1,8 @@
 # Gunicorn configuration file
 import os
+import subprocess
+import sys
+from decouple import config
 
 # Server socket
 bind = "0.0.0.0:8000"
@@ -9,13 +12,36 @@ backlog = 2048
 workers = 2
 worker_class = "sync"
 worker_connections = 1000
-timeout = 60  # Increased from default 30 seconds
-keepalive = 2
+
+# SERVER_MODE=wsgi (default) serves job_platform.wsgi with sync/threaded workers.
+# SERVER_MODE=asgi serves job_platform.asgi with uvicorn workers: the async AI views wait on
+# NVIDIA/TTS on the event loop, but every sync view of a worker runs on one shared thread
+# (sync_to_async(thread_sensitive=True)), so keep it off while most views are sync - and
+# in particular with the single locmem worker below.
+server_mode = config('SERVER_MODE', default='wsgi')
+if server_mode == 'asgi':
+    wsgi_app = "job_platform.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "job_platform.wsgi:application"
 
 # Restart workers after this many requests, to help prevent memory leaks
 max_requests = 1000
 max_requests_jitter = 100
 
+# The in-process (locmem) interview state store is not shared between processes,
+# so without a Redis-compatible store all requests are served by one worker.
+# That worker holds every in-flight interview: it is not recycled after
+# max_requests (a restart or deploy still loses the state - use Redis in production)
+if not config('INTERVIEW_STATE_REDIS_URL', default='') and config('INTERVIEW_STATE_BACKEND', default='locmem') == 'locmem':
+    workers = 1
+    max_requests = 0
+    if server_mode != 'asgi':
+        worker_class = "gthread"
+        threads = 4
+timeout = 60  # Increased from default 30 seconds
+keepalive = 2
+
 # Logging
 accesslog = "-"
 errorlog = "-"
@@ -45,4 +71,36 @@ graceful_timeout = 30
 # Environment variables
 raw_env = [
     f"DJANGO_SETTINGS_MODULE=job_platform.settings",
-]
\ No newline at end of file
+]
+
+# Background task worker (python manage.py run_tasks) started next to the web workers.
+# Set RUN_TASK_WORKER=False when it runs as its own service.
+run_task_worker = config('RUN_TASK_WORKER', default=True, cast=bool)
+task_worker_process = None
+
+
+def when_ready(server):
+    global task_worker_process
+    if run_task_worker:
+        manage_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manage.py')
+        task_worker_process = subprocess.Popen([sys.executable, manage_py, 'run_tasks'])
+        server.log.info(f"Started task worker (pid {task_worker_process.pid})")
+
+
+def post_fork(server, worker):
+    # Start the face detection processes (cores shared between the web workers)
+    # before the first proctoring frame arrives
+    try:
+        from jobapp.utils.face_workers import get_face_worker_pool
+        get_face_worker_pool(web_workers=server.cfg.workers)
+    except Exception as e:
+        server.log.warning(f"Face detection workers not started: {e}")
+
+
+def on_exit(server):
+    if task_worker_process and task_worker_process.poll() is None:
+        task_worker_process.terminate()
+        try:
+            task_worker_process.wait(timeout=graceful_timeout)
+        except subprocess.TimeoutExpired:
+            task_worker_process.kill()
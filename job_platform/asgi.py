@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_platform.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from jobapp.proctoring import PROCTORING_WS_PATH, proctoring_app, reject_websocket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Django for HTTP; WebSocket connections go to the proctoring channel"""
+    if scope['type'] == 'websocket':
+        if scope['path'] == PROCTORING_WS_PATH:
+            return await proctoring_app(scope, receive, send)
+        return await reject_websocket(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -100,7 +100,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL='jobapp.CustomUser'
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'jobapp.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise that also runs in the async (ASGI) chain
     'jobapp.middleware.RequestLoggingMiddleware',  # Log slow requests
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -160,6 +160,9 @@ PRODUCTION_DOMAIN = config('PRODUCTION_DOMAIN', default='localhost:8000')
 if PRODUCTION_DOMAIN not in ALLOWED_HOSTS:
     ALLOWED_HOSTS.extend([PRODUCTION_DOMAIN, '.onrender.com'])
 
+        # wsgi: sync workers; asgi: gunicorn runs job_platform.asgi with uvicorn workers (gunicorn.conf.py)
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
         # Database configuration
 if config('USE_SQLITE', default=False, cast=bool):
     # Use SQLite for development
@@ -171,10 +174,13 @@ if config('USE_SQLITE', default=False, cast=bool):
     }
 elif config('DATABASE_URL', default=None) and dj_database_url:
      # Use DATABASE_URL (production)
+     # Under ASGI, queries also run in sync_to_async(thread_sensitive=False) executor threads, which
+     # Django's per-request connection cleanup never visits; persistent connections opened there
+     # would stay open, so Django recommends turning them off under ASGI
     DATABASES = {
         'default': dj_database_url.config(
             default=config('DATABASE_URL'),
-            conn_max_age=600,
+            conn_max_age=0 if SERVER_MODE == 'asgi' else 600,
             conn_health_checks=True,
         )
     }
@@ -279,6 +285,10 @@ if not DEBUG:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = '/opt/render/project/src/media/'
 
+        # Media serving (jobapp/media_serving.py) - '' streams from Django, 'nginx' sends X-Accel-Redirect, 'sendfile' sends X-Sendfile
+MEDIA_SENDFILE_BACKEND = config('MEDIA_SENDFILE_BACKEND', default='')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+
         # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
@@ -363,6 +373,56 @@ SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 SESSION_COOKIE_AGE = 7200  # 2 hours
 
+        # Interview conversation state (jobapp/interview_state.py)
+        # locmem keeps state in-process; set a Redis-compatible URL to share it across workers/nodes
+INTERVIEW_STATE_REDIS_URL = config('INTERVIEW_STATE_REDIS_URL', default='')
+INTERVIEW_STATE_BACKEND = config('INTERVIEW_STATE_BACKEND', default='redis' if INTERVIEW_STATE_REDIS_URL else 'locmem')
+INTERVIEW_STATE_MAX_ENTRIES = config('INTERVIEW_STATE_MAX_ENTRIES', default=1000, cast=int)
+INTERVIEW_STATE_TTL = config('INTERVIEW_STATE_TTL', default=SESSION_COOKIE_AGE, cast=int)
+
+        # Background task queue (jobapp/tasks.py) - worker: python manage.py run_tasks
+TASK_QUEUE_LEASE_SECONDS = config('TASK_QUEUE_LEASE_SECONDS', default=120, cast=int)
+TASK_QUEUE_RETRY_BASE_SECONDS = config('TASK_QUEUE_RETRY_BASE_SECONDS', default=10, cast=int)
+TASK_QUEUE_RETRY_MAX_SECONDS = config('TASK_QUEUE_RETRY_MAX_SECONDS', default=600, cast=int)
+
+        # Email outbox (jobapp/mail_dispatcher.py) - sent in batches by the run_tasks worker
+EMAIL_DISPATCH_WORKERS = config('EMAIL_DISPATCH_WORKERS', default=4, cast=int)
+EMAIL_DISPATCH_BATCH_SIZE = config('EMAIL_DISPATCH_BATCH_SIZE', default=200, cast=int)
+EMAIL_RATE_LIMIT_PER_SECOND = config('EMAIL_RATE_LIMIT_PER_SECOND', default=20, cast=float)
+
+        # TTS audio cache (jobapp/tts_cache.py) - least recently used clips are deleted above this size
+TTS_CACHE_MAX_BYTES = config('TTS_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+TTS_CACHE_INDEX_SAVE_SECONDS = config('TTS_CACHE_INDEX_SAVE_SECONDS', default=60, cast=int)
+
+        # Interview turn pipeline (jobapp/interview_pipeline.py) - TTS threads and how long an audio fetch waits
+INTERVIEW_PIPELINE_WORKERS = config('INTERVIEW_PIPELINE_WORKERS', default=8, cast=int)
+INTERVIEW_AUDIO_WAIT_SECONDS = config('INTERVIEW_AUDIO_WAIT_SECONDS', default=20, cast=int)
+
+        # Face detection (jobapp/utils/face_tracker.py) - trackers per worker, working resolution, full search every N frames
+FACE_TRACKER_POOL_SIZE = config('FACE_TRACKER_POOL_SIZE', default=4, cast=int)
+FACE_WORKING_WIDTH = config('FACE_WORKING_WIDTH', default=640, cast=int)
+FACE_FULL_DETECT_EVERY = config('FACE_FULL_DETECT_EVERY', default=5, cast=int)
+
+        # Face detection processes (jobapp/utils/face_workers.py) - 'auto' shares the cores between web workers, 0 detects in-process
+FACE_WORKER_PROCESSES = config('FACE_WORKER_PROCESSES', default='auto')
+FACE_WORKER_QUEUE = config('FACE_WORKER_QUEUE', default=16, cast=int)
+
+        # Proctoring WebSocket (jobapp/proctoring.py) - consecutive frames without a face before the no-face alert
+PROCTORING_NO_FACE_FRAMES = config('PROCTORING_NO_FACE_FRAMES', default=3, cast=int)
+        # Proctoring timeline (jobapp/proctoring_timeline.py) - write interval, and the frame gap that ends a segment
+PROCTORING_TIMELINE_FLUSH_SECONDS = config('PROCTORING_TIMELINE_FLUSH_SECONDS', default=10, cast=int)
+PROCTORING_GAP_SECONDS = config('PROCTORING_GAP_SECONDS', default=10, cast=int)
+
+        # Chunked interview recording uploads (jobapp/recording_upload.py) - largest accepted chunk
+RECORDING_CHUNK_MAX_BYTES = config('RECORDING_CHUNK_MAX_BYTES', default=32 * 1024 * 1024, cast=int)
+
+        # Candidate-job matching (jobapp/skill_matching.py) - seconds before a process reloads its skill index
+SKILL_MATCH_REFRESH_SECONDS = config('SKILL_MATCH_REFRESH_SECONDS', default=300, cast=int)
+
+        # Recruiter dashboard (jobapp/dashboard_stats.py) - seconds a recruiter's counters stay cached, rows per list page
+DASHBOARD_STATS_CACHE_SECONDS = config('DASHBOARD_STATS_CACHE_SECONDS', default=300, cast=int)
+DASHBOARD_PAGE_SIZE = config('DASHBOARD_PAGE_SIZE', default=20, cast=int)
+
         # File upload settings - Increase for better performance
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CustomUser , Profile, Job, Application , Interview , Candidate, InterviewRoom, RoomParticipant
+from .models import CustomUser , Profile, Job, Application , Interview , Candidate, InterviewRoom, RoomParticipant, InterviewTurn, OutboxEmail, ResumeText, ResumeFile, ProctoringSegment, RecordingUpload, Skill
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth import get_user_model
 
@@ -25,6 +25,13 @@ admin.site.register(Interview)
 admin.site.register(Candidate)
 admin.site.register(InterviewRoom)
 admin.site.register(RoomParticipant)
+admin.site.register(InterviewTurn)
+admin.site.register(OutboxEmail)
+admin.site.register(ResumeText)
+admin.site.register(ResumeFile)
+admin.site.register(ProctoringSegment)
+admin.site.register(RecordingUpload)
+admin.site.register(Skill)
 
 
 
@@ -1,7 +1,7 @@
 # DRF serializers
 
 from rest_framework import serializers
-from jobapp.models import CustomUser , Job , Application , Interview
+from jobapp.models import CustomUser , Job , Application , Interview, InterviewTurn
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -42,7 +42,16 @@ class ApplicationSerializer(serializers.ModelSerializer):
         
         
         
+class InterviewTurnSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InterviewTurn
+        fields = ['turn_index', 'speaker', 'text', 'question_number', 'time_remaining', 'created_at']
+
+
 class InterviewSerializer(serializers.ModelSerializer):
+    # The conversation; questions_asked / answers_given are only filled for interviews stored before InterviewTurn
+    turns = InterviewTurnSerializer(many=True, read_only=True)
+
     class Meta:
         model = Interview
         fields = '__all__'        
@@ -1,7 +1,7 @@
 # API URL routes
 
 from django.urls import path
-from .views import RegisterView , JobListCreate , jobdetail , ApplicationCreate , ApplicationList ,InterviewList , schedule_interview_api, face_detect_api
+from .views import RegisterView , JobListCreate , jobdetail , ApplicationCreate , ApplicationList ,InterviewList , schedule_interview_api, face_detect_api, face_detect_batch_api, job_matches_api, profile_job_matches_api
 from rest_framework_simplejwt.views import TokenRefreshView , TokenObtainPairView
 
 
@@ -14,6 +14,8 @@ urlpatterns = [
     # 💼 Jobs
     path('jobs/', JobListCreate.as_view(), name='job_list_create'),
     path('jobs/<int:pk>/', jobdetail.as_view(), name='api_job_detail'),
+    path('jobs/<int:job_id>/matches/', job_matches_api, name='api_job_matches'),
+    path('profile/job-matches/', profile_job_matches_api, name='api_profile_job_matches'),
     
      # 📄 Apply
     path('apply/', ApplicationCreate.as_view(), name='apply_job'),
@@ -25,5 +27,6 @@ urlpatterns = [
     
     # 👤 Face Detection
     path('face-detect/', face_detect_api, name='face_detect_api'),
+    path('face-detect/batch/', face_detect_batch_api, name='face_detect_batch_api'),
     
 ]
@@ -3,6 +3,7 @@
 from rest_framework import generics , permissions
 from jobapp.models import Job , Application , Interview , CustomUser
 from .serializers import RegisterSerializer , JobSerializer , ApplicationSerializer , InterviewSerializer
+from .pagination import JobCursorPagination
 from django.contrib.auth import get_user_model
 from rest_framework.permissions import AllowAny
 from datetime import datetime
@@ -11,7 +12,10 @@ from rest_framework.decorators import api_view, permission_classes
 
 from rest_framework import status
 from rest_framework.response import Response
-from jobapp.utils.face_tracker import FaceTracker
+from jobapp.utils.face_tracker import decode_frame_data
+from jobapp.proctoring_timeline import frame_times, record_results
+from jobapp.utils.face_workers import detect_faces_async, detect_faces_batch_async
+from jobapp.skill_matching import DEFAULT_MATCH_LIMIT, best_candidates, best_jobs
 import json
 
 User = get_user_model()
@@ -28,6 +32,7 @@ class JobListCreate(generics.ListCreateAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = JobCursorPagination  # newest first, ?cursor= from the next/previous links
     
     
 class jobdetail(generics.RetrieveUpdateDestroyAPIView):
@@ -60,7 +65,7 @@ class InterviewList(generics.ListAPIView):
     
     
     def get_queryset(self):
-        return Interview.objects.filter(candidate=self.request.user)    
+        return Interview.objects.filter(candidate=self.request.user).prefetch_related('turns')
     
     
     
@@ -82,27 +87,123 @@ def schedule_interview_api(request, job_id, applicant_id):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-from rest_framework.decorators import throttle_classes
-from rest_framework.throttling import BaseThrottle
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 
-class NoThrottle(BaseThrottle):
-    def allow_request(self, request, view):
-        return True
+FACE_DETECT_MAX_BATCH = 10
+FACE_DETECT_MAX_FRAME_BYTES = 2 * 1024 * 1024
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-@throttle_classes([NoThrottle])
-def face_detect_api(request):
+# The face detection endpoints are plain async Django views (DRF views are sync): a request waits
+# on its detection process without holding a worker thread. Like the AllowAny DRF views they
+# replace, they need no login and are exempt from CSRF.
+@csrf_exempt
+@require_http_methods(["POST"])
+async def face_detect_api(request):
+    """One frame: JSON (or form) 'frame' data URL, optional 'session' and 'interview' uuid"""
     try:
-        frame_data = request.data.get('frame')
+        if request.content_type == 'application/json':
+            data = json.loads(request.body or b'{}')
+        else:
+            data = request.POST
+        frame_data = data.get('frame')
         if not frame_data:
-            return Response({"error": "No frame data"}, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse({"error": "No frame data"}, status=400)
+        
+        try:
+            image_bytes = decode_frame_data(frame_data)
+        except ValueError as e:
+            return JsonResponse({'error': str(e), 'faces': [], 'count': 0, 'alert': False}, status=200)
+        
+        # Frames tagged with a session are tracked between requests (searched near the last faces);
+        # a frame still queued behind a detection process is dropped in favour of this one
+        result = await detect_faces_async(image_bytes, data.get('session'), droppable=True)
+        await sync_to_async(record_results, thread_sensitive=False)(data.get('interview'), data.get('session'), [result])
+        
+        return JsonResponse(result, status=200)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def face_detect_batch_api(request):
+    """
+    Several frames in one request: multipart 'frames' parts holding JPEG/PNG bytes, in capture order,
+    an optional 'session' id that keeps face tracking state between batches, and an optional
+    'interview' uuid whose proctoring timeline records the results - at each frame's
+    'captured_at' (one per frame, with 'sent_at'; client milliseconds) when given.
+    'final' marks the page's last frames and writes the timeline out.
+    """
+    try:
+        frames = request.FILES.getlist('frames')
+        if not frames:
+            return JsonResponse({"error": "No frames"}, status=400)
+        if len(frames) > FACE_DETECT_MAX_BATCH:
+            return JsonResponse({"error": f"At most {FACE_DETECT_MAX_BATCH} frames per batch"}, status=400)
+        if any(frame.size > FACE_DETECT_MAX_FRAME_BYTES for frame in frames):
+            return JsonResponse({"error": "Frame too large"}, status=400)
         
-        tracker = FaceTracker()
-        result = tracker.process_frame(frame_data)
+        session = request.POST.get('session')
+        results = await detect_faces_batch_async([frame.read() for frame in frames], session)
+        times = frame_times(request.POST.getlist('captured_at'), request.POST.get('sent_at'), len(results))
+        await sync_to_async(record_results, thread_sensitive=False)(
+            request.POST.get('interview'), session, results, times, final=bool(request.POST.get('final')))
         
-        return Response(result, status=status.HTTP_200_OK)
+        return JsonResponse({
+            'results': results,
+            'frames': len(results),
+            'max_count': max(result.get('count', 0) for result in results),
+            'alert': any(result.get('alert') for result in results),
+        }, status=200)
     except Exception as e:
-        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)    
-                        
- 
\ No newline at end of file
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+MAX_MATCH_LIMIT = 100
+
+
+def _match_limit(request):
+    try:
+        return min(max(int(request.query_params.get('limit', DEFAULT_MATCH_LIMIT)), 1), MAX_MATCH_LIMIT)
+    except ValueError:
+        return DEFAULT_MATCH_LIMIT
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_matches_api(request, job_id):
+    """Job seekers ranked by how well their skills cover the job's; for the recruiter who posted it"""
+    job = Job.objects.filter(id=job_id, posted_by=request.user).first()
+    if job is None:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    matches = [{
+        'profile_id': match['profile'].id,
+        'user_id': match['profile'].user_id,
+        'name': f"{match['profile'].first_name} {match['profile'].last_name}".strip() or match['profile'].user.username,
+        'email': match['profile'].email,
+        'score': match['score'],
+        'matched_skills': match['matched'],
+        'missing_skills': match['missing'],
+    } for match in best_candidates(job, limit=_match_limit(request))]
+    return Response({'job': job.id, 'matches': matches}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_job_matches_api(request):
+    """Open jobs ranked by how well the user's profile skills cover them, without the ones applied to"""
+    profile = getattr(request.user, 'profile', None)
+    if profile is None:
+        return Response({"error": "No profile"}, status=status.HTTP_404_NOT_FOUND)
+    matches = [{
+        'job_id': match['job'].id,
+        'title': match['job'].title,
+        'company': match['job'].company,
+        'location': match['job'].location,
+        'score': match['score'],
+        'matched_skills': match['matched'],
+        'missing_skills': match['missing'],
+    } for match in best_jobs(profile, limit=_match_limit(request))]
+    return Response({'matches': matches}, status=status.HTTP_200_OK)
@@ -0,0 +1,108 @@
+"""
+Recruiter dashboard counters
+
+recruiter_dashboard used to run a query per counter (jobs, applications,
+interviews, completed interviews, two recommendation counts, the average
+duration, candidates) and len() on every list, loading all of a recruiter's
+rows to count them. recruiter_stats() gets every counter in one statement:
+one conditional aggregation per table (Count(filter=Q(...)), grouped by the
+recruiter), each a derived table LEFT JOINed to a single row, so a
+recruiter with nothing in a table still gets zeros.
+
+The result is cached per recruiter for DASHBOARD_STATS_CACHE_SECONDS.
+signals.py drops a recruiter's entry when one of their jobs, applications,
+interviews or candidates is saved or deleted (in the cache of that process,
+or of every process when CACHES is shared, e.g. Redis).
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Avg, Count, Q
+
+from .models import Application, Candidate, Interview, Job
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_STATS_CACHE_SECONDS = getattr(settings, 'DASHBOARD_STATS_CACHE_SECONDS', 300)
+
+RECOMMENDED = ['highly_recommended', 'recommended']
+REJECTED = ['not_recommended', 'never_hire']
+# Interview fields the counters read; saves that touch none of them leave the cache alone
+INTERVIEW_STATS_FIELDS = {'status', 'recommendation', 'interview_duration_minutes', 'job', 'job_id'}
+
+
+def _cache_key(user_id):
+    return f'recruiter_dashboard_stats:{user_id}'
+
+
+def _counter_tables(user):
+    """(alias, queryset) pairs: one conditional aggregation per table, at most one row each"""
+    completed = Q(status='completed')
+    return [
+        ('jobs', Job.objects.filter(posted_by=user).values('posted_by').annotate(
+            jobs=Count('pk'),
+            active_jobs=Count('pk', filter=Q(status='active')),
+        )),
+        ('applications', Application.objects.filter(job__posted_by=user).values('job__posted_by').annotate(
+            applications=Count('pk'),
+        )),
+        ('interviews', Interview.objects.filter(job__posted_by=user).values('job__posted_by').annotate(
+            interviews=Count('pk'),
+            scheduled_interviews=Count('pk', filter=Q(status='scheduled')),
+            completed_interviews=Count('pk', filter=completed),
+            recommended=Count('pk', filter=completed & Q(recommendation__in=RECOMMENDED)),
+            rejected=Count('pk', filter=completed & Q(recommendation__in=REJECTED)),
+            avg_interview_duration=Avg('interview_duration_minutes', filter=completed),
+        )),
+        ('candidates', Candidate.objects.filter(added_by=user).values('added_by').annotate(
+            candidates=Count('pk'),
+        )),
+    ]
+
+
+def recruiter_stats_query(user):
+    """(connection, sql, params, counter names) of the single counters query"""
+    selects, joins, params = [], [], []
+    connection = None
+    for alias, queryset in _counter_tables(user):
+        queryset = queryset.order_by()
+        connection = connections[queryset.db]
+        sql, table_params = queryset.query.get_compiler(connection=connection).as_sql()
+        joins.append(f"LEFT JOIN ({sql}) AS {alias} ON 1 = 1")
+        params.extend(table_params)
+        selects.extend(f"{alias}.{name}" for name in queryset.query.annotations)
+    sql = f"SELECT {', '.join(selects)} FROM (SELECT 1 AS one) AS base {' '.join(joins)}"
+    return connection, sql, params, [select.split('.', 1)[1] for select in selects]
+
+
+def compute_recruiter_stats(user):
+    """Every dashboard counter of a recruiter, in one query"""
+    connection, sql, params, names = recruiter_stats_query(user)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    stats = dict(zip(names, row))
+    for name, value in stats.items():
+        if name != 'avg_interview_duration':
+            stats[name] = int(value or 0)
+    stats['avg_interview_duration'] = (int(stats['avg_interview_duration'])
+                                       if stats['avg_interview_duration'] else None)
+    return stats
+
+
+def recruiter_stats(user):
+    """compute_recruiter_stats(), cached per recruiter"""
+    key = _cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_recruiter_stats(user)
+        cache.set(key, stats, DASHBOARD_STATS_CACHE_SECONDS)
+    return stats
+
+
+def invalidate_recruiter_stats(user_id):
+    if user_id:
+        cache.delete(_cache_key(user_id))
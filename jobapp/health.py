@@ -53,6 +53,13 @@ def health_check(request):
         health_status['checks']['ai_api'] = 'error'
         health_status['status'] = 'degraded'
     
+    # TTS cache counters
+    try:
+        from .tts_cache import get_tts_cache
+        health_status['tts_cache'] = get_tts_cache().stats()
+    except Exception as e:
+        health_status['checks']['tts_cache'] = f'error: {str(e)}'
+    
     # Return appropriate status code
     status_code = 200
     if health_status['status'] == 'unhealthy':
@@ -0,0 +1,202 @@
+"""
+Catalog of the interviewer's fixed lines
+
+Greetings, ice-breakers, topic fallbacks and the closing message are
+templates, so their audio can be rendered ahead of time instead of on the
+request path. Each line is built from sentence-level segments:
+
+- segments without placeholders are rendered at deploy time
+  (`python manage.py warm_tts_cache`)
+- segments with {candidate_name}, {job_title} or {company_name} are rendered
+  when the candidate opens the interview (the prerender_interview_phrases
+  task), ice-breakers first, so interviews that never start cost nothing
+
+Both are pinned in the TTS cache so eviction cannot drop them: the fixed
+segments for good, an interview's segments until it is over.
+
+At interview time phrase_audio() splices the cached segment clips into one
+MP3 without calling the TTS API. Anything not in the cache (and everything
+the LLM writes) still goes through generate_tts.
+"""
+import hashlib
+import logging
+import string
+
+from .tts import find_cached_tts, generate_tts
+from .tts_cache import get_tts_cache
+
+logger = logging.getLogger(__name__)
+
+# Voice used for interview audio (matches the generate_tts calls in views.start_interview_by_uuid)
+INTERVIEW_VOICE = "female_interview"
+
+SEGMENTS = {
+    'greeting': "Hi there! I'm Sarah. Before we begin, could you please tell me your name?",
+
+    'time_up': "Thank you so much for your time today, {candidate_name}! We've covered a lot of ground in our conversation. I really enjoyed learning about your background, skills, and experiences. Your insights have been valuable, and we appreciate your interest in the {job_title} position at {company_name}. Our team will review everything we discussed and get back to you with next steps within 2-3 business days. Have a wonderful day!",
+
+    'last_question_1': "We're coming to the end of our time together, {candidate_name}. For my final question: Is there anything important about your skills, experience, or qualifications that we haven't discussed yet that you'd like me to know about?",
+    'last_question_2': "This will be our last question today, {candidate_name}. Before we wrap up: What makes you particularly excited about this {job_title} opportunity, and why do you think you'd be a great fit for our team at {company_name}?",
+    'last_question_3': "We have just a couple of minutes left, {candidate_name}. As a final question: If you were to start in this role next week, what would be your top priority in your first 30 days?",
+    'last_question_4': "For our final question today, {candidate_name}: What's one professional achievement you're most proud of, and what did you learn from that experience?",
+
+    'audio_check': "Yes, I can hear you perfectly, {candidate_name}! Your audio is crystal clear and you sound great. I'm Sarah, and I'm so excited to get to know you better today! Let's dive in - could you tell me about your background, your experience with {job_title} work, and what specifically drew you to apply for this position with {company_name}?",
+
+    # Acknowledgements that open a fallback question
+    'ack_nervous': "I completely understand, {candidate_name}. Interviews can feel nerve-wracking, but you're doing fantastic! Let's keep this conversational and relaxed. ",
+    'ack_passion': "I can really hear the passion in your voice, {candidate_name}! That enthusiasm is exactly what we love to see. ",
+    'ack_challenge': "That sounds like a great learning experience, {candidate_name}. I appreciate you sharing that challenge with me. ",
+    'ack_default': "Thank you for sharing that, {candidate_name}. That's really insightful! ",
+
+    # Ice-breakers (questions 1-3)
+    'icebreaker_1': "Nice to meet you! How are you feeling today?",
+    'icebreaker_2': "Great! Now that we're getting to know each other, are you ready to start our interview for the {job_title} position at {company_name}?",
+    'icebreaker_3': "Perfect! Let's begin. Could you tell me a bit about yourself and what drew you to apply for this {job_title} role?",
+
+    # Projects (question 4)
+    'projects_technologies': "Excellent technical foundation! Can you walk me through a specific project where you used these technologies? I'm particularly interested in any challenges you faced and how you overcame them.",
+    'projects_built': "That sounds like a fascinating project! What was the most challenging technical problem you encountered while building it, and how did you approach solving it?",
+    'projects_tools': "Great choice of technologies! Can you describe a specific project where you implemented these tools? What made you choose them for that particular solution?",
+    'projects_default': "I'd love to hear about a project you've worked on that you're particularly proud of. Can you walk me through the technical challenges and how you solved them?",
+
+    # Teamwork (questions 5-6)
+    'team_disagreement': "Collaboration is so crucial in development! Can you give me an example of a time when you had to work through a technical disagreement with a team member? How did you handle it?",
+    'team_debugging': "Great problem-solving approach! How do you typically approach debugging complex issues, especially when working with a team? Do you have a systematic process?",
+    'team_methodology': "Excellent experience with development methodologies! How do you handle changing requirements or tight deadlines while maintaining code quality?",
+    'team_default': "How do you approach working in team environments, especially when collaborating on complex technical projects? Can you share an example?",
+
+    # Motivation (question 7 onwards)
+    'motivation_goals': "I love hearing about career aspirations! What specifically excites you about this {job_title} role at {company_name}, and how does it align with your professional goals?",
+    'motivation_culture': "That's exactly the kind of thinking we value! Do you have any questions about the day-to-day responsibilities, our team dynamics, or the company culture?",
+    'motivation_trends': "Your interest in technology trends is great! How do you stay updated with the latest developments in {job_title}, and what emerging technologies are you most excited about?",
+    'motivation_default': "What draws you most to this {job_title} position at {company_name}? What aspects of the role or our company culture interest you the most?",
+
+    # Used when generating the follow-up question itself fails
+    'generic_followup': "Thank you for sharing that, {candidate_name}. That's really valuable insight! I'd love to learn more about your passion for {job_title} work. What aspects of technology and development motivate you most, and how do you see yourself contributing to our team?",
+    'generic_background': "Thank you for that response, {candidate_name}. Could you tell me more about your background and experience?",
+}
+
+LAST_QUESTIONS = ['last_question_1', 'last_question_2', 'last_question_3', 'last_question_4']
+
+
+def _placeholders(template):
+    return {name for _, name, _, _ in string.Formatter().parse(template) if name}
+
+
+class SpokenPhrase:
+    """An interviewer line made of catalog segments, with its placeholders filled in"""
+
+    def __init__(self, segment_ids, **params):
+        self.segment_ids = list(segment_ids)
+        self.segments = [SEGMENTS[segment_id].format(**params) for segment_id in self.segment_ids]
+
+    @property
+    def text(self):
+        return ''.join(self.segments)
+
+    def __add__(self, other):
+        combined = SpokenPhrase([])
+        combined.segment_ids = self.segment_ids + other.segment_ids
+        combined.segments = self.segments + other.segments
+        return combined
+
+
+def phrase(*segment_ids, **params):
+    return SpokenPhrase(segment_ids, **params)
+
+
+def fixed_segment_texts():
+    """Segments that read the same in every interview"""
+    return [template for template in SEGMENTS.values() if not _placeholders(template)]
+
+
+def interview_phrase_params(interview):
+    """Placeholder values as start_interview_by_uuid computes them"""
+    if interview.is_registered_candidate:
+        candidate_name = interview.candidate.get_full_name() or interview.candidate.username
+        job_title = interview.job.title or "Software Developer"
+    else:
+        candidate_name = interview.candidate_name or "the candidate"
+        job_title = interview.job.title if interview.job else "Software Developer"
+    company_name = interview.job.company if interview.job else "Our Company"
+    return {'candidate_name': candidate_name, 'job_title': job_title, 'company_name': company_name}
+
+
+def _render_order(segment_id):
+    # Ice-breakers are spoken within the first minute, the closing lines last
+    if segment_id.startswith('icebreaker_'):
+        return 0
+    if segment_id in LAST_QUESTIONS or segment_id == 'time_up':
+        return 2
+    return 1
+
+
+def interview_segment_texts(params):
+    """Segments that depend on the candidate, job or company, filled in for one interview, in speaking order"""
+    segment_ids = sorted((segment_id for segment_id, template in SEGMENTS.items() if _placeholders(template)),
+                         key=_render_order)
+    return [SEGMENTS[segment_id].format(**params) for segment_id in segment_ids]
+
+
+def prerender_segments(texts, voice=INTERVIEW_VOICE, pin_until=None):
+    """
+    Synthesize segments into the TTS cache and pin them, for good or until `pin_until`.
+    Returns the number that could not be rendered.
+    """
+    cache = get_tts_cache()
+    failed = 0
+    filenames = []
+    for text in texts:
+        audio_url = generate_tts(text.strip(), voice)
+        if audio_url:
+            filenames.append(cache.filename_from_url(audio_url))
+        else:
+            failed += 1
+            logger.warning(f"Could not pre-render interviewer phrase: {text[:50]}...")
+    cache.pin([filename for filename in filenames if filename], until=pin_until)
+    return failed
+
+
+def _strip_id3(data):
+    """Drop ID3v2/ID3v1 tags so MP3 clips can be joined frame to frame"""
+    if data[:3] == b'ID3' and len(data) > 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if len(data) > 128 and data[-128:-125] == b'TAG':
+        data = data[:-128]
+    return data
+
+
+def phrase_audio(spoken, voice=INTERVIEW_VOICE):
+    """
+    URL of pre-rendered audio for a catalog phrase, or None when a segment is not cached.
+    Never calls the TTS API.
+    """
+    urls = [find_cached_tts(segment.strip(), voice) for segment in spoken.segments]
+    if not urls or not all(urls):
+        return None
+    if len(urls) == 1:
+        return urls[0]
+
+    # Clips from different providers differ in sample rate and cannot be joined
+    cache = get_tts_cache()
+    filenames = [url.rsplit('/', 1)[-1] for url in urls]
+    if len({filename.split('_', 1)[0] for filename in filenames}) > 1:
+        return None
+
+    key = hashlib.sha256('\0'.join(filenames).encode()).hexdigest()
+    spliced = cache.filename('phrase', key, 'mp3')
+    url = cache.get(spliced)
+    if url:
+        return url
+
+    try:
+        parts = []
+        for filename in filenames:
+            with open(cache.path(filename), 'rb') as f:
+                parts.append(_strip_id3(f.read()))
+    except OSError as e:
+        logger.warning(f"Pre-rendered segment missing on disk: {e}")
+        return None
+    return cache.put(spliced, b''.join(parts))
@@ -0,0 +1,208 @@
+"""
+Overlapped interview turn pipeline
+
+Once the interviewer's reply text is known, its audio is synthesized in a
+small thread pool while the request thread writes the state store and the
+InterviewTurn rows. The interview view can then answer with the text
+straight away and let the page fetch the audio from interview_turn_audio,
+which waits on the synthesis started here.
+
+Every turn records how long each stage took (parse, llm, state_save,
+db_write, tts, response, audio_ready) in InterviewTurn.stage_timings.
+
+Pending audio is tracked per process. When the follow-up fetch lands on a
+different worker, the reply is rebuilt from the state store and synthesized
+there (by then it is usually a TTS cache hit).
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .interview_phrases import INTERVIEW_VOICE, phrase, phrase_audio
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_PIPELINE_WORKERS = getattr(settings, 'INTERVIEW_PIPELINE_WORKERS', 8)
+INTERVIEW_AUDIO_WAIT_SECONDS = getattr(settings, 'INTERVIEW_AUDIO_WAIT_SECONDS', 20)
+# Audio nobody fetched is forgotten after this long
+PENDING_AUDIO_TTL = 300
+
+
+class TurnTimer:
+    """Milliseconds spent in each stage of one interview turn"""
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.timings = {}
+
+    def lap(self, name):
+        """Record the time since the previous lap (or the start of the turn)"""
+        now = time.perf_counter()
+        self.timings[f'{name}_ms'] = int((now - self._last) * 1000)
+        self._last = now
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[f'{name}_ms'] = int((time.perf_counter() - start) * 1000)
+
+    def mark(self, name):
+        """Record the time from the start of the turn until now"""
+        self.timings[f'{name}_ms'] = int((time.perf_counter() - self.started) * 1000)
+
+
+class TurnRecord:
+    """
+    Stores the timings on the turn's interviewer row (turn_index None: log only).
+    The request thread writes the row and the TTS thread measures synthesis, in
+    either order - whichever finishes second saves.
+    """
+
+    def __init__(self, interview_id, turn_index, timer):
+        self.interview_id = interview_id
+        self.turn_index = turn_index
+        self.timer = timer
+        self._remaining = 2
+        self._lock = threading.Lock()
+
+    def arrive(self):
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last:
+            self._save()
+
+    def _save(self):
+        from .models import InterviewTurn
+
+        timings = dict(self.timer.timings)
+        log_timings(self.interview_id, timings)
+        if self.turn_index is None:
+            return
+        try:
+            InterviewTurn.objects.filter(interview_id=self.interview_id, turn_index=self.turn_index).update(
+                tts_latency_ms=timings.get('tts_ms'),
+                stage_timings=timings,
+            )
+        except Exception as e:
+            logger.error(f"Could not store turn timings for interview {self.interview_id}: {e}")
+
+
+def log_timings(interview_id, timings):
+    summary = ' '.join(f"{name[:-3]}={value}" for name, value in timings.items())
+    logger.info(f"⏱️ Turn timings (ms) for interview {interview_id}: {summary}")
+
+
+def synthesize_turn_audio(text, spoken=None, voice=INTERVIEW_VOICE):
+    """Audio URL and duration for an interviewer reply; catalog phrases use their pre-rendered clips"""
+    from .tts import estimate_audio_duration, generate_tts, get_tts_duration
+
+    audio_url = None
+    try:
+        audio_url = phrase_audio(spoken, voice) if spoken else None
+        if not audio_url:
+            audio_url = generate_tts(text, voice)
+        if audio_url == 'None':
+            audio_url = None
+    except Exception as e:
+        logger.error(f"TTS generation failed: {e}")
+        audio_url = None
+
+    duration = None
+    if audio_url:
+        # Exact length parsed from the clip when it was cached
+        duration = get_tts_duration(audio_url)
+    if not duration or duration <= 0:
+        duration = estimate_audio_duration(text) or max(3.0, len(text) * 0.05)
+    return {'audio': audio_url or '', 'audio_duration': duration, 'has_audio': bool(audio_url)}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = {}  # audio key -> (future, started at)
+_pending_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=INTERVIEW_PIPELINE_WORKERS,
+                                               thread_name_prefix='interview-tts')
+    return _executor
+
+
+def _run_turn_audio(text, spoken, timer, record):
+    try:
+        with timer.stage('tts'):
+            result = synthesize_turn_audio(text, spoken)
+        timer.mark('audio_ready')
+        return result
+    finally:
+        if record:
+            record.arrive()
+        # Pool threads outlive requests, so they must not keep a database connection open
+        connections.close_all()
+
+
+def start_turn_audio(audio_key, text, spoken=None, timer=None, record=None):
+    """Start synthesizing a reply in the pipeline pool; fetch the result with await_turn_audio(audio_key)"""
+    timer = timer or TurnTimer()
+    future = _get_executor().submit(_run_turn_audio, text, spoken, timer, record)
+    now = time.time()
+    with _pending_lock:
+        for key in [key for key, (_, started) in _pending.items() if now - started > PENDING_AUDIO_TTL]:
+            del _pending[key]
+        _pending[audio_key] = (future, now)
+    return future
+
+
+async def await_turn_audio(audio_key, timeout=INTERVIEW_AUDIO_WAIT_SECONDS):
+    """
+    Result of start_turn_audio once synthesis is done. None when this process has no such audio;
+    raises TimeoutError if it is still running after `timeout` seconds.
+    """
+    with _pending_lock:
+        pending = _pending.get(audio_key)
+    if pending is None:
+        return None
+    # shield: a timeout must not cancel synthesis another fetch may still wait for
+    result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(pending[0])), timeout)
+    with _pending_lock:
+        _pending.pop(audio_key, None)
+    return result
+
+
+def pending_audio_state(audio_key, text, spoken=None):
+    """What another worker needs to synthesize the reply if the audio fetch lands there (kept in the state store)"""
+    return {'key': audio_key, 'text': text, 'segments': spoken.segment_ids if spoken else []}
+
+
+async def resolve_turn_audio(audio_key, context, timeout=INTERVIEW_AUDIO_WAIT_SECONDS):
+    """
+    Audio for a deferred reply: from this process's pool, else synthesized from the state store.
+    None when the key is unknown; raises TimeoutError if synthesis is still running after `timeout`.
+    """
+    result = await await_turn_audio(audio_key, timeout)
+    if result is not None:
+        return result
+
+    pending = (context or {}).get('pending_audio') or {}
+    if pending.get('key') != audio_key:
+        return None
+    spoken = None
+    if pending.get('segments'):
+        spoken = phrase(*pending['segments'], candidate_name=context.get('candidate_name', ''),
+                        job_title=context.get('job_title', ''), company_name=context.get('company_name', ''))
+    return await sync_to_async(synthesize_turn_audio, thread_sensitive=False)(pending['text'], spoken)
@@ -0,0 +1,228 @@
+"""
+Interview conversation state store
+
+Keeps the live state of an AI interview (profile, counters, conversation turns)
+outside the Django session. Turns are append-only and every interview turn is
+persisted with a single write.
+
+Backends:
+- locmem: in-process LRU, for a single server process
+- redis:  any Redis-compatible server (Redis, Valkey, KeyDB), shared across
+          workers and nodes
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Written once when the interview starts, never rewritten per turn
+STATIC_FIELDS = (
+    'candidate_name',
+    'job_title',
+    'company_name',
+    'resume_text',
+    'job_description',
+    'job_location',
+    'is_registered_candidate',
+    'started_at',
+    'interview_duration_minutes',
+)
+
+HISTORY_FIELD = 'conversation_history'
+
+
+class LocMemStateBackend:
+    """In-process LRU store. Only correct when one process serves all requests."""
+
+    def __init__(self, max_entries=1000, ttl=7200):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires'] < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def load(self, key):
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                return None
+            return dict(entry['static']), dict(entry['meta']), list(entry['turns'])
+
+    def commit(self, key, meta, turns=(), static=None, max_turns=40, release=None):
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None or static is not None:
+                entry = {'static': dict(static or {}), 'meta': {}, 'turns': []}
+                self._entries[key] = entry
+            entry['meta'] = dict(meta)
+            if turns:
+                entry['turns'] = (entry['turns'] + list(turns))[-max_turns:]
+            entry['expires'] = time.time() + self.ttl
+            if release:
+                self._inflight.pop((key, release), None)
+
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.info(f"Evicted interview state {evicted_key} (LRU full)")
+
+    def claim(self, key, token, ttl):
+        now = time.time()
+        with self._lock:
+            expires = self._inflight.get((key, token))
+            if expires and expires > now:
+                return False
+            self._inflight[(key, token)] = now + ttl
+            # Drop stale claims so the dict does not grow without bound
+            if len(self._inflight) > self.max_entries:
+                self._inflight = {k: v for k, v in self._inflight.items() if v > now}
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class RedisStateBackend:
+    """Redis-compatible store: a hash for profile/counters and a capped list for turns."""
+
+    def __init__(self, url, ttl=7200, prefix='interview_state'):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package is required for the redis interview state backend")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _keys(self, key):
+        base = f"{self.prefix}:{key}"
+        return base, f"{base}:turns"
+
+    def load(self, key):
+        state_key, turns_key = self._keys(key)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(state_key)
+        pipe.lrange(turns_key, 0, -1)
+        fields, turns = pipe.execute()
+        if not fields:
+            return None
+        static = json.loads(fields.get(b'static', b'{}'))
+        meta = json.loads(fields.get(b'meta', b'{}'))
+        return static, meta, [json.loads(turn) for turn in turns]
+
+    def commit(self, key, meta, turns=(), static=None, max_turns=40, release=None):
+        state_key, turns_key = self._keys(key)
+        pipe = self.client.pipeline(transaction=True)
+        if static is not None:
+            pipe.delete(turns_key)
+            pipe.hset(state_key, 'static', json.dumps(static))
+        pipe.hset(state_key, 'meta', json.dumps(meta))
+        if turns:
+            pipe.rpush(turns_key, *[json.dumps(turn) for turn in turns])
+            pipe.ltrim(turns_key, -max_turns, -1)
+        pipe.expire(state_key, self.ttl)
+        pipe.expire(turns_key, self.ttl)
+        if release:
+            pipe.delete(f"{state_key}:inflight:{release}")
+        pipe.execute()
+
+    def claim(self, key, token, ttl):
+        state_key, _ = self._keys(key)
+        return bool(self.client.set(f"{state_key}:inflight:{token}", 1, nx=True, ex=ttl))
+
+    def delete(self, key):
+        state_key, turns_key = self._keys(key)
+        self.client.delete(state_key, turns_key)
+
+
+class InterviewStateStore:
+    """Reads and writes interview context dicts in the shape the interview view uses"""
+
+    def __init__(self, backend, max_turns=40):
+        self.backend = backend
+        self.max_turns = max_turns
+
+    def load(self, interview_uuid):
+        """Return the interview context dict, or None if the interview has no state yet"""
+        stored = self.backend.load(str(interview_uuid))
+        if stored is None:
+            return None
+        static, meta, turns = stored
+        context = {**static, **meta}
+        context[HISTORY_FIELD] = turns
+        return context
+
+    def create(self, interview_uuid, context):
+        """Store a fresh interview context (profile, counters and any initial turns)"""
+        static = {k: v for k, v in context.items() if k in STATIC_FIELDS}
+        self.backend.commit(
+            str(interview_uuid),
+            self._meta(context),
+            turns=context.get(HISTORY_FIELD, []),
+            static=static,
+            max_turns=self.max_turns,
+        )
+
+    def save_turn(self, interview_uuid, context, new_turns=(), release=None):
+        """Persist counters and append new turns in one write; optionally release an input claim"""
+        self.backend.commit(
+            str(interview_uuid),
+            self._meta(context),
+            turns=list(new_turns),
+            max_turns=self.max_turns,
+            release=release,
+        )
+
+    def claim_input(self, interview_uuid, input_hash, ttl=5):
+        """Mark an input as being processed; False if the same input is already in flight"""
+        return self.backend.claim(str(interview_uuid), input_hash, ttl)
+
+    def delete(self, interview_uuid):
+        self.backend.delete(str(interview_uuid))
+
+    @staticmethod
+    def _meta(context):
+        return {k: v for k, v in context.items() if k not in STATIC_FIELDS and k != HISTORY_FIELD}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_interview_state_store():
+    """Get the process-wide interview state store configured in settings"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend_name = getattr(settings, 'INTERVIEW_STATE_BACKEND', 'locmem')
+                ttl = getattr(settings, 'INTERVIEW_STATE_TTL', 7200)
+                if backend_name == 'redis':
+                    backend = RedisStateBackend(settings.INTERVIEW_STATE_REDIS_URL, ttl=ttl)
+                else:
+                    backend = LocMemStateBackend(
+                        max_entries=getattr(settings, 'INTERVIEW_STATE_MAX_ENTRIES', 1000),
+                        ttl=ttl,
+                    )
+                _store = InterviewStateStore(backend)
+                logger.info(f"✅ Interview state store ready ({backend_name})")
+    return _store
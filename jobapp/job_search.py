@@ -0,0 +1,206 @@
+"""
+Full-text job search
+
+job_list used to match the search box against the title only, with
+title__icontains (a sequential scan that never looks at the description,
+skills, company, location or tags). search_jobs() searches all of them
+through an index and orders the jobs by relevance. Fields are weighted:
+
+    A  title
+    B  required_skills and tag names
+    C  company and location
+    D  description
+
+PostgreSQL: jobapp_job.search_vector is a weighted tsvector with a GIN
+index, matched with websearch_to_tsquery (quoted phrases, "or", -word) and
+ranked with ts_rank. A pg_trgm GIN index on the title also lets a misspelt
+word match by word similarity ("pyhton developer"), ranked below the
+full-text matches.
+
+SQLite (development): the same four columns live in the FTS5 table
+jobapp_job_fts, keyed by job id and ranked with bm25 using the weights
+above. Every word is a prefix match; there is no typo tolerance. Without
+FTS5, or on another database, the search falls back to icontains on each
+field.
+
+The column and the FTS table are not model fields, so listing queries do
+not load them. index_jobs() rewrites the entries of the given jobs in one
+statement; signals.py calls it after a Job is saved or deleted or its tags
+change, and migration 0015 (or `python manage.py rebuild_job_search`) fills
+it for existing jobs.
+"""
+import logging
+import re
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'jobapp_job_fts'
+# bm25 weights of the FTS columns: title, skills and tags, company and location, description
+FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+MAX_QUERY_LENGTH = 200
+MAX_QUERY_TERMS = 12
+INDEX_BATCH_SIZE = 500
+
+FALLBACK_FIELDS = ('title', 'required_skills', 'company', 'location', 'description')
+
+_TAGS_SQL = """
+    SELECT item.object_id, {aggregate} AS names
+    FROM taggit_taggeditem AS item
+    JOIN taggit_tag AS tag ON tag.id = item.tag_id
+    JOIN django_content_type AS ct ON ct.id = item.content_type_id
+    WHERE ct.app_label = 'jobapp' AND ct.model = 'job'{where}
+    GROUP BY item.object_id
+"""
+
+_PG_INDEX_SQL = """
+    UPDATE jobapp_job AS job SET search_vector =
+        setweight(to_tsvector('{config}', coalesce(job.title, '')), 'A') ||
+        setweight(to_tsvector('{config}', coalesce(job.required_skills, '') || ' ' || coalesce(tags.names, '')), 'B') ||
+        setweight(to_tsvector('{config}', coalesce(job.company, '') || ' ' || coalesce(job.location, '')), 'C') ||
+        setweight(to_tsvector('{config}', coalesce(job.description, '')), 'D')
+    FROM jobapp_job AS source
+    LEFT JOIN ({tags}) AS tags ON tags.object_id = source.id
+    WHERE job.id = source.id{where}
+"""
+
+_FTS_INDEX_SQL = """
+    INSERT INTO jobapp_job_fts (rowid, title, skills, place, description)
+    SELECT job.id, job.title, coalesce(job.required_skills, '') || ' ' || coalesce(tags.names, ''),
+           coalesce(job.company, '') || ' ' || coalesce(job.location, ''), job.description
+    FROM jobapp_job AS job
+    LEFT JOIN ({tags}) AS tags ON tags.object_id = job.id
+    WHERE 1 = 1{where}
+"""
+
+_fts_ready = {}  # database alias -> whether jobapp_job_fts exists there
+
+
+def install_search_index(connection):
+    """Create the search column or FTS table and its indexes (migration 0015)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute("ALTER TABLE jobapp_job ADD COLUMN IF NOT EXISTS search_vector tsvector")
+            cursor.execute("CREATE INDEX IF NOT EXISTS job_search_vector_idx ON jobapp_job USING gin (search_vector)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS job_title_trgm_idx ON jobapp_job USING gin (title gin_trgm_ops)")
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                               f"USING fts5(title, skills, place, description, tokenize='porter unicode61')")
+            except DatabaseError as e:
+                logger.warning(f"SQLite has no FTS5, job search falls back to icontains: {e}")
+                return
+    _fts_ready.pop(connection.alias, None)
+    index_jobs(using=connection.alias)
+
+
+def remove_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS job_title_trgm_idx")
+            cursor.execute("DROP INDEX IF EXISTS job_search_vector_idx")
+            cursor.execute("ALTER TABLE jobapp_job DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _fts_ready.pop(connection.alias, None)
+
+
+def _fts_available(connection):
+    if connection.alias not in _fts_ready:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_ready[connection.alias] = cursor.fetchone() is not None
+    return _fts_ready[connection.alias]
+
+
+def index_jobs(job_ids=None, using=DEFAULT_DB_ALIAS):
+    """Rewrite the search entries of these jobs (of every job when job_ids is None)"""
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and not _fts_available(connection):
+        return
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    if job_ids is None:
+        batches = [None]
+    else:
+        job_ids = sorted({int(job_id) for job_id in job_ids if job_id is not None})
+        batches = [job_ids[i:i + INDEX_BATCH_SIZE] for i in range(0, len(job_ids), INDEX_BATCH_SIZE)]
+
+    with connection.cursor() as cursor:
+        for batch in batches:
+            placeholders = ', '.join(['%s'] * len(batch)) if batch else ''
+            if connection.vendor == 'postgresql':
+                tags = _TAGS_SQL.format(aggregate="string_agg(tag.name, ' ')",
+                                        where=f" AND item.object_id IN ({placeholders})" if batch else '')
+                sql = _PG_INDEX_SQL.format(config=SEARCH_CONFIG, tags=tags,
+                                           where=f" AND job.id IN ({placeholders})" if batch else '')
+                cursor.execute(sql, (batch * 2) if batch else [])
+            else:
+                if batch:
+                    cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch)
+                else:
+                    cursor.execute(f"DELETE FROM {FTS_TABLE}")
+                tags = _TAGS_SQL.format(aggregate="group_concat(tag.name, ' ')",
+                                        where=f" AND item.object_id IN ({placeholders})" if batch else '')
+                sql = _FTS_INDEX_SQL.format(tags=tags, where=f" AND job.id IN ({placeholders})" if batch else '')
+                cursor.execute(sql, (batch * 2) if batch else [])
+
+
+def schedule_index_jobs(job_ids, using=DEFAULT_DB_ALIAS):
+    """index_jobs() once the current transaction commits; a failure is logged, not raised"""
+    job_ids = list(job_ids)
+
+    def run():
+        try:
+            index_jobs(job_ids, using=using)
+        except DatabaseError as e:
+            logger.error(f"Could not update the search index of jobs {job_ids}: {e}")
+
+    transaction.on_commit(run, using=using)
+
+
+def _fts_match(query):
+    """FTS5 MATCH expression: every word of the query as a quoted prefix term"""
+    terms = re.findall(r'\w+', query.lower())[:MAX_QUERY_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_jobs(jobs, query):
+    """`jobs` narrowed to those matching the search text, most relevant first"""
+    query = ' '.join((query or '').split())[:MAX_QUERY_LENGTH]
+    if not query:
+        return jobs
+    connection = connections[jobs.db]
+
+    if connection.vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return (jobs
+                .filter(RawSQL(f'("jobapp_job"."search_vector" @@ {tsquery} OR "jobapp_job"."title" %%> %s)',
+                               [query, query], output_field=BooleanField()))
+                .annotate(rank=RawSQL(f'ts_rank("jobapp_job"."search_vector", {tsquery})',
+                                      [query], output_field=FloatField()),
+                          similarity=RawSQL('word_similarity(%s, "jobapp_job"."title")',
+                                            [query], output_field=FloatField()))
+                .order_by('-rank', '-similarity', '-date_posted'))
+
+    if connection.vendor == 'sqlite' and _fts_available(connection):
+        match = _fts_match(query)
+        if not match:
+            return jobs.none()
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        return (jobs
+                .filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+                .annotate(rank=RawSQL(f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                                      f'WHERE {FTS_TABLE} MATCH %s AND rowid = "jobapp_job"."id"',
+                                      [match], output_field=FloatField()))
+                .order_by('-rank', '-date_posted'))
+
+    condition = Q()
+    for field in FALLBACK_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return jobs.filter(condition)
@@ -0,0 +1,223 @@
+"""
+Pooled, batched mail dispatcher
+
+Emails are written to the OutboxEmail table first (queue_email / queue_emails), so
+nothing is lost when a gunicorn worker is recycled. dispatch_outbox() claims a
+batch, splits it across a bounded pool of sender threads, and each thread sends
+its share over one reused SMTP connection, under a shared rate limit.
+Transient SMTP/network errors are retried with backoff; permanent errors
+(5xx, refused recipients) are marked failed.
+"""
+import logging
+import smtplib
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DISPATCH_WORKERS = getattr(settings, 'EMAIL_DISPATCH_WORKERS', 4)
+EMAIL_DISPATCH_BATCH_SIZE = getattr(settings, 'EMAIL_DISPATCH_BATCH_SIZE', 200)
+EMAIL_RATE_LIMIT_PER_SECOND = getattr(settings, 'EMAIL_RATE_LIMIT_PER_SECOND', 20)
+EMAIL_SEND_LEASE_SECONDS = 300
+EMAIL_RETRY_BASE_SECONDS = 30
+EMAIL_RETRY_MAX_SECONDS = 1800
+
+
+class RateLimiter:
+    """Token bucket shared by all sender threads"""
+
+    def __init__(self, rate_per_second):
+        self.rate = rate_per_second
+        self.tokens = float(rate_per_second)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def queue_email(to_email, subject, body, html_body='', dedupe_key=None, from_email=None):
+    """Store one email in the outbox; with a dedupe key an existing email is returned instead"""
+    fields = {
+        'to_email': to_email,
+        'from_email': from_email or '',
+        'subject': subject[:255],
+        'body': body,
+        'html_body': html_body or '',
+    }
+    if dedupe_key:
+        email, created = OutboxEmail.objects.get_or_create(dedupe_key=dedupe_key, defaults=fields)
+        if not created:
+            logger.info(f"Email {dedupe_key} already in outbox ({email.status})")
+        return email
+    return OutboxEmail.objects.create(**fields)
+
+
+def queue_emails(emails):
+    """Store many emails with one bulk insert. Each item takes the queue_email keyword arguments."""
+    rows = [
+        OutboxEmail(
+            to_email=email['to_email'],
+            from_email=email.get('from_email') or '',
+            subject=email['subject'][:255],
+            body=email['body'],
+            html_body=email.get('html_body') or '',
+            dedupe_key=email.get('dedupe_key'),
+        )
+        for email in emails
+    ]
+    OutboxEmail.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    logger.info(f"📥 Queued {len(rows)} emails in outbox")
+    return len(rows)
+
+
+def claim_outbox(limit=EMAIL_DISPATCH_BATCH_SIZE, lease_seconds=EMAIL_SEND_LEASE_SECONDS):
+    """Lease up to `limit` emails that are due (or whose previous sender lease expired)"""
+    now = timezone.now()
+    due = (
+        Q(status=OutboxEmail.STATUS_QUEUED, next_attempt_at__lte=now) |
+        Q(status=OutboxEmail.STATUS_SENDING, locked_until__lt=now)
+    )
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        # The exact lease timestamp identifies this claim (rows another dispatcher took are not "due")
+        lease_until = now + timedelta(seconds=lease_seconds)
+        if ids:
+            OutboxEmail.objects.filter(due, id__in=ids).update(
+                status=OutboxEmail.STATUS_SENDING,
+                locked_until=lease_until,
+                attempts=F('attempts') + 1,
+            )
+    return list(OutboxEmail.objects.filter(id__in=ids, status=OutboxEmail.STATUS_SENDING, locked_until=lease_until))
+
+
+def is_transient_error(error):
+    """Network problems and 4xx replies are worth retrying; 5xx and refused recipients are not"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    # Every SMTPException is an OSError; the rest (SMTPNotSupportedError, ...) are permanent
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, (socket.timeout, OSError))
+
+
+def _build_message(row, connection):
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[row.to_email],
+        connection=connection,
+    )
+    if row.html_body:
+        message.attach_alternative(row.html_body, 'text/html')
+    return message
+
+
+def _open_connection():
+    # Opened explicitly: send_messages() closes connections it had to open itself
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    return connection
+
+
+def _send_chunk(rows, limiter):
+    """Send rows over one reused connection. No database access here; results go back to the caller."""
+    sent_ids, errors = [], []
+    connection = None
+    try:
+        for row in rows:
+            limiter.acquire()
+            try:
+                if connection is None:
+                    connection = _open_connection()
+                if connection.send_messages([_build_message(row, connection)]) != 1:
+                    raise smtplib.SMTPException("Message was not accepted")
+                sent_ids.append(row.id)
+            except Exception as e:
+                errors.append((row, e))
+                if is_transient_error(e):
+                    # The connection is likely broken - start a fresh one for the rest of the chunk
+                    if connection is not None:
+                        try:
+                            connection.close()
+                        except Exception:
+                            pass
+                    connection = None
+    finally:
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    return sent_ids, errors
+
+
+def dispatch_outbox(batch_size=EMAIL_DISPATCH_BATCH_SIZE, workers=EMAIL_DISPATCH_WORKERS,
+                    rate_per_second=EMAIL_RATE_LIMIT_PER_SECOND):
+    """Send one batch of due outbox emails. Returns counts of sent, retried and failed emails."""
+    rows = claim_outbox(limit=batch_size)
+    stats = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not rows:
+        return stats
+
+    limiter = RateLimiter(rate_per_second)
+    chunks = [rows[i::workers] for i in range(min(workers, len(rows)))]
+    with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix='mail-dispatch') as pool:
+        results = list(pool.map(lambda chunk: _send_chunk(chunk, limiter), chunks))
+
+    now = timezone.now()
+    sent_ids = [row_id for chunk_sent, _ in results for row_id in chunk_sent]
+    if sent_ids:
+        OutboxEmail.objects.filter(id__in=sent_ids).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=now, locked_until=None, last_error='')
+        stats['sent'] = len(sent_ids)
+
+    for _, chunk_errors in results:
+        for row, error in chunk_errors:
+            if is_transient_error(error) and row.attempts < row.max_attempts:
+                delay = min(EMAIL_RETRY_BASE_SECONDS * (2 ** (row.attempts - 1)), EMAIL_RETRY_MAX_SECONDS)
+                OutboxEmail.objects.filter(id=row.id).update(
+                    status=OutboxEmail.STATUS_QUEUED, locked_until=None, last_error=str(error),
+                    next_attempt_at=now + timedelta(seconds=delay))
+                stats['retried'] += 1
+                logger.warning(f"⚠️ Email to {row.to_email} failed (attempt {row.attempts}), retrying in {delay}s: {error}")
+            else:
+                OutboxEmail.objects.filter(id=row.id).update(
+                    status=OutboxEmail.STATUS_FAILED, locked_until=None, last_error=str(error))
+                stats['failed'] += 1
+                logger.error(f"❌ Email to {row.to_email} failed permanently: {error}")
+
+    logger.info(f"📧 Outbox batch: {stats['sent']} sent, {stats['retried']} retried, {stats['failed']} failed")
+    return stats
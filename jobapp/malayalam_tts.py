@@ -3,10 +3,10 @@ Malayalam IndicF5 TTS Service
 Integrates with http://34.232.76.115:8021/ for Malayalam text-to-speech
 """
 import requests
-import os
-import hashlib
 import logging
-from django.conf import settings
+
+from .tts_cache import async_cached_tts, cached_tts, tts_cache_key
+from .utils.async_clients import get_async_http_client, on_client_loop
 
 logger = logging.getLogger(__name__)
 
@@ -14,56 +14,82 @@ logger = logging.getLogger(__name__)
 MALAYALAM_TTS_API_URL = "http://34.232.76.115:8021"
 MALAYALAM_TTS_ENDPOINT = f"{MALAYALAM_TTS_API_URL}/v2/speech"
 
+MALAYALAM_TTS_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "audio/wav"
+}
+
+def _malayalam_payload(text):
+    return {
+        "text": text.strip(),
+        "voice_id": "malayalam_female",
+        "model_id": "indicf5",
+        "language": "ml"
+    }
+
+def _malayalam_cache_key(text, payload):
+    return tts_cache_key('malayalam', text, voice=payload['voice_id'], model=payload['model_id'], lang=payload['language'])
+
 def generate_malayalam_tts(text, voice_id="malayalam_female"):
     """Generate Malayalam TTS using IndicF5 v2 API"""
     try:
-        # Create filename for caching
-        text_hash = hashlib.md5(f"{text}_malayalam".encode()).hexdigest()[:10]
-        filename = f"malayalam_{text_hash}.wav"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
-        
-        # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
         # Prepare API request for IndicF5 v2
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "audio/wav"
-        }
+        payload = _malayalam_payload(text)
         
-        payload = {
-            "text": text.strip(),
-            "voice_id": "malayalam_female",
-            "model_id": "indicf5",
-            "language": "ml"
-        }
+        def synthesize():
+            logger.info(f"Requesting Malayalam TTS for: {text[:50]}...")
+            
+            response = requests.post(
+                MALAYALAM_TTS_ENDPOINT, 
+                json=payload, 
+                headers=MALAYALAM_TTS_HEADERS, 
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Malayalam TTS API error: {response.status_code} - {response.text}")
+                return None
+            return response.content
         
-        logger.info(f"Requesting Malayalam TTS for: {text[:50]}...")
+        audio_url = cached_tts('malayalam', 'wav', _malayalam_cache_key(text, payload), synthesize)
         
-        response = requests.post(
-            MALAYALAM_TTS_ENDPOINT, 
-            json=payload, 
-            headers=headers, 
-            timeout=30
-        )
+        if audio_url:
+            logger.info(f"Malayalam TTS ready: {audio_url}")
+        else:
+            logger.error("Malayalam TTS returned no usable audio")
+        return audio_url
         
-        if response.status_code == 200:
-            # Save audio file
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+    except Exception as e:
+        logger.error(f"Malayalam TTS generation failed: {e}")
+        return None
+
+async def async_generate_malayalam_tts(text, voice_id="malayalam_female"):
+    """generate_malayalam_tts for async views - the IndicF5 call does not hold a thread"""
+    try:
+        payload = _malayalam_payload(text)
+        
+        async def synthesize():
+            logger.info(f"Requesting Malayalam TTS for: {text[:50]}...")
             
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-                logger.info(f"Malayalam TTS generated successfully: {filename}")
-                return f"/media/tts/{filename}"
-            else:
-                logger.error("Generated Malayalam audio file is too small")
+            response = await on_client_loop(get_async_http_client().post(
+                MALAYALAM_TTS_ENDPOINT,
+                json=payload,
+                headers=MALAYALAM_TTS_HEADERS,
+                timeout=30
+            ))
+            
+            if response.status_code != 200:
+                logger.error(f"Malayalam TTS API error: {response.status_code} - {response.text}")
                 return None
+            return response.content
+        
+        audio_url = await async_cached_tts('malayalam', 'wav', _malayalam_cache_key(text, payload), synthesize)
+        
+        if audio_url:
+            logger.info(f"Malayalam TTS ready: {audio_url}")
         else:
-            logger.error(f"Malayalam TTS API error: {response.status_code} - {response.text}")
-            return None
+            logger.error("Malayalam TTS returned no usable audio")
+        return audio_url
         
     except Exception as e:
         logger.error(f"Malayalam TTS generation failed: {e}")
@@ -7,11 +7,14 @@ import logging
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .malayalam_tts import generate_malayalam_tts, estimate_malayalam_audio_duration
-from .utils.interview_ai_nvidia import ask_ai_question
+from .malayalam_tts import async_generate_malayalam_tts, generate_malayalam_tts, estimate_malayalam_audio_duration
+from .tts import get_tts_duration
+from .utils.interview_ai_nvidia import ask_ai_question, async_ask_ai_question
 
 logger = logging.getLogger(__name__)
 
+MALAYALAM_FALLBACK_RESPONSE = "ക്ഷമിക്കണം, എനിക്ക് ഇപ്പോൾ പ്രതികരിക്കാൻ കഴിയുന്നില്ല. ദയവായി വീണ്ടും ശ്രമിക്കുക."
+
 class MalayalamVoiceAgentSession:
     def __init__(self, session_id):
         self.session_id = session_id
@@ -25,6 +28,50 @@ class MalayalamVoiceAgentSession:
         welcome_message = "ഹായ്! എങ്ങനെയുണ്ട്? ഇന്ന് എന്താണ് പ്ലാൻ?"
         return self.generate_response(welcome_message, is_initial=True)
     
+    def _prompt(self, text):
+        # Build context from conversation history
+        context = "\n".join([
+            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+            for msg in self.conversation_history[-4:]  # Last 4 exchanges
+        ])
+        
+        # Enhanced prompt for Malayalam context
+        return f"""You are a helpful AI assistant that can communicate in Malayalam. 
+                The user is speaking in Malayalam or English. Please respond appropriately in the same language they use.
+                If they speak Malayalam, respond in Malayalam. If they speak English, respond in English.
+                
+                Previous conversation:
+                {context}
+                
+                User just said: {text}
+                
+                Please provide a helpful, natural response."""
+    
+    def _reply(self, ai_response, audio_url, llm_latency, tts_latency):
+        self.last_activity = time.time()
+        return {
+            "success": True,
+            "text": ai_response,
+            "audio_url": audio_url,
+            "audio_duration": get_tts_duration(audio_url) or estimate_malayalam_audio_duration(ai_response),
+            "session_active": self.is_active,
+            "tts_latency": tts_latency,
+            "llm_latency": llm_latency,
+            "model": "nvidia/llama-3.3-nemotron-70b-instruct",
+            "voice": "Malayalam IndicF5",
+            "language": "malayalam"
+        }
+    
+    def _error(self, e):
+        logger.error(f"Malayalam voice agent error: {e}")
+        return {
+            "success": False,
+            "error": f"Malayalam voice agent error: {str(e)}",
+            "session_active": self.is_active,
+            "model": "nvidia/llama-3.3-nemotron-70b-instruct",
+            "language": "malayalam"
+        }
+    
     def generate_response(self, text, is_initial=False):
         try:
             if not is_initial:
@@ -37,27 +84,9 @@ class MalayalamVoiceAgentSession:
                 ai_response = text
                 llm_latency = 0
             else:
-                # Build context from conversation history
-                context = "\n".join([
-                    f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
-                    for msg in self.conversation_history[-4:]  # Last 4 exchanges
-                ])
-                
-                # Enhanced prompt for Malayalam context
-                full_prompt = f"""You are a helpful AI assistant that can communicate in Malayalam. 
-                The user is speaking in Malayalam or English. Please respond appropriately in the same language they use.
-                If they speak Malayalam, respond in Malayalam. If they speak English, respond in English.
-                
-                Previous conversation:
-                {context}
-                
-                User just said: {text}
-                
-                Please provide a helpful, natural response."""
-                
                 try:
                     ai_response = ask_ai_question(
-                        full_prompt,
+                        self._prompt(text),
                         candidate_name="User",
                         job_title="General Position",
                         company_name="Our Company"
@@ -66,7 +95,7 @@ class MalayalamVoiceAgentSession:
                 except Exception as e:
                     logger.error(f"NVIDIA LLM Error: {e}")
                     # Fallback response in Malayalam
-                    ai_response = "ക്ഷമിക്കണം, എനിക്ക് ഇപ്പോൾ പ്രതികരിക്കാൻ കഴിയുന്നില്ല. ദയവായി വീണ്ടും ശ്രമിക്കുക."
+                    ai_response = MALAYALAM_FALLBACK_RESPONSE
                     llm_latency = int((time.time() - llm_start) * 1000)
             
             # Add AI response to history
@@ -76,32 +105,40 @@ class MalayalamVoiceAgentSession:
             tts_start = time.time()
             audio_url = generate_malayalam_tts(ai_response)
             tts_latency = int((time.time() - tts_start) * 1000)
-            audio_duration = estimate_malayalam_audio_duration(ai_response)
             
-            self.last_activity = time.time()
+            return self._reply(ai_response, audio_url, llm_latency, tts_latency)
+            
+        except Exception as e:
+            return self._error(e)
+    
+    async def agenerate_response(self, text):
+        """generate_response for the async chat view - LLM and TTS calls are awaited"""
+        try:
+            self.conversation_history.append({"role": "user", "content": text})
+            
+            llm_start = time.time()
+            try:
+                ai_response = await async_ask_ai_question(
+                    self._prompt(text),
+                    candidate_name="User",
+                    job_title="General Position",
+                    company_name="Our Company"
+                )
+            except Exception as e:
+                logger.error(f"NVIDIA LLM Error: {e}")
+                ai_response = MALAYALAM_FALLBACK_RESPONSE
+            llm_latency = int((time.time() - llm_start) * 1000)
+            
+            self.conversation_history.append({"role": "assistant", "content": ai_response})
+            
+            tts_start = time.time()
+            audio_url = await async_generate_malayalam_tts(ai_response)
+            tts_latency = int((time.time() - tts_start) * 1000)
             
-            return {
-                "success": True,
-                "text": ai_response,
-                "audio_url": audio_url,
-                "audio_duration": audio_duration,
-                "session_active": self.is_active,
-                "tts_latency": tts_latency,
-                "llm_latency": llm_latency,
-                "model": "nvidia/llama-3.3-nemotron-70b-instruct",
-                "voice": "Malayalam IndicF5",
-                "language": "malayalam"
-            }
+            return self._reply(ai_response, audio_url, llm_latency, tts_latency)
             
         except Exception as e:
-            logger.error(f"Malayalam voice agent error: {e}")
-            return {
-                "success": False,
-                "error": f"Malayalam voice agent error: {str(e)}",
-                "session_active": self.is_active,
-                "model": "nvidia/llama-3.3-nemotron-70b-instruct",
-                "language": "malayalam"
-            }
+            return self._error(e)
     
     def stop_session(self):
         self.is_active = False
@@ -134,7 +171,7 @@ def start_malayalam_voice_session(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def malayalam_voice_chat(request):
+async def malayalam_voice_chat(request):
     """Handle Malayalam voice input and generate response"""
     try:
         data = json.loads(request.body)
@@ -152,7 +189,7 @@ def malayalam_voice_chat(request):
             return JsonResponse({"success": False, "error": "Session not active", "language": "malayalam"})
         
         # Generate response
-        response = session.generate_response(user_text)
+        response = await session.agenerate_response(user_text)
         
         return JsonResponse(response)
         
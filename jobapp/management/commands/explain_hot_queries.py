@@ -0,0 +1,183 @@
+"""
+EXPLAIN the queries behind the busiest pages and flag full table scans.
+
+By default builds a throwaway test database (migrations applied, so the Meta
+indexes exist), fills it with a generated dataset big enough for the planner to
+prefer indexes (ANALYZEd), and prints each query's plan. A plan reading a whole
+table is flagged: "Seq Scan on <table>" on PostgreSQL, "SCAN <table>" without
+an index on SQLite. Other databases get the plans without flags.
+
+    python manage.py explain_hot_queries                 # generated dataset
+    python manage.py explain_hot_queries --current       # the configured database, read only
+    python manage.py explain_hot_queries --fail-on-scan  # exit non-zero when something is flagged (CI)
+"""
+import logging
+import random
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from jobapp.dashboard_stats import recruiter_stats_query
+from jobapp.models import (EMPLOYMENT_TYPE_CHOICES, Application, Candidate, CustomUser, Interview, InterviewRoom, Job,
+                           RoomParticipant)
+
+EMPLOYMENT_TYPES = [value for value, _ in EMPLOYMENT_TYPE_CHOICES]
+STATUSES = ['scheduled', 'completed', 'completed', 'cancelled', 'no_show']
+
+_POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+# "SCAN TABLE t" before SQLite 3.36, "SCAN t" since
+_SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\w+)\b(?! USING (?:COVERING )?INDEX)')
+
+
+def build_dataset(recruiters, jobs_per_recruiter, interviews, seed=42):
+    """Recruiters, job seekers, jobs, applications, interviews, candidates and rooms, in bulk (no signals)"""
+    rng = random.Random(seed)
+    now = timezone.now()
+    recruiter_rows = CustomUser.objects.bulk_create([
+        CustomUser(username=f'explain_recruiter{i}', is_recruiter=True) for i in range(recruiters)])
+    seekers = CustomUser.objects.bulk_create([
+        CustomUser(username=f'explain_seeker{i}', email=f'seeker{i}@example.com') for i in range(recruiters * 20)])
+    jobs = Job.objects.bulk_create([
+        Job(title=f'Job {i}', company='Explain Co', location='Remote', description='Generated job',
+            status='active' if i % 3 else 'closed', employment_type=rng.choice(EMPLOYMENT_TYPES),
+            posted_by=recruiter_rows[i % recruiters])
+        for i in range(recruiters * jobs_per_recruiter)], batch_size=2000)
+    Application.objects.bulk_create([
+        Application(applicant=rng.choice(seekers), job=rng.choice(jobs)) for _ in range(interviews // 2)],
+        batch_size=2000)
+    interview_rows = []
+    for i in range(interviews):
+        status = rng.choice(STATUSES)
+        interview_rows.append(Interview(
+            job=rng.choice(jobs),
+            candidate=rng.choice(seekers) if i % 4 == 0 else None,
+            candidate_email=f'candidate{i}@example.com',
+            interview_id=f'x{i:010d}',
+            link=f'/interview/ready/explain-{i}/',
+            status=status,
+            scheduled_at=now + timedelta(days=rng.randint(-30, 30)),
+            completed_at=now - timedelta(minutes=rng.randint(1, 50000)) if status == 'completed' else None,
+        ))
+    interview_rows = Interview.objects.bulk_create(interview_rows, batch_size=2000)
+    Candidate.objects.bulk_create([
+        Candidate(name=f'Candidate {i}', email=f'pool{i}@example.com', phone='555-0100',
+                  added_by=recruiter_rows[i % recruiters])
+        for i in range(interviews // 5)], batch_size=2000)
+    rooms = InterviewRoom.objects.bulk_create([
+        InterviewRoom(interview=interview, room_id=f'room{i}') for i, interview in enumerate(interview_rows[:2000])])
+    RoomParticipant.objects.bulk_create([
+        RoomParticipant(room=room, participant_type='observer', display_name=f'Observer {n}', is_connected=n == 0)
+        for room in rooms for n in range(3)], batch_size=2000)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def hot_queries():
+    """(label, sql, params) of the queries the busiest pages run, for the busiest recruiter and seeker"""
+    recruiter = (CustomUser.objects.filter(is_recruiter=True).annotate(jobs=Count('job'))
+                 .order_by('-jobs').first())
+    if recruiter is None:
+        raise CommandError('No recruiter in the database to explain the dashboard queries for')
+    seeker = (CustomUser.objects.filter(is_recruiter=False).annotate(interviews=Count('interview'))
+              .order_by('-interviews').first() or recruiter)
+    room_id = RoomParticipant.objects.values_list('room_id', flat=True).first() or 0
+    employment_type = EMPLOYMENT_TYPES[0]
+
+    querysets = [
+        ('job_list, newest first', Job.objects.order_by('-date_posted', '-id')[:6]),
+        ('job_list, status + job type filter',
+         Job.objects.filter(status='active', employment_type=employment_type).order_by('-date_posted')[:6]),
+        ('recruiter dashboard: jobs page',
+         Job.objects.filter(posted_by=recruiter).annotate(application_count=Count('application'))
+         .order_by('-date_posted', '-id')[:21]),
+        ('recruiter dashboard: applications page',
+         Application.objects.filter(job__posted_by=recruiter).order_by('-applied_at', '-id')[:21]),
+        ('recruiter dashboard: interviews page',
+         Interview.objects.filter(job__posted_by=recruiter).order_by('-id')[:21]),
+        ('recruiter dashboard: results page',
+         Interview.objects.filter(job__posted_by=recruiter, status='completed').order_by('-id')[:21]),
+        ('recruiter dashboard: recent interviews',
+         Interview.objects.filter(job__posted_by=recruiter).order_by('-created_at')[:5]),
+        ('recruiter dashboard: candidates page',
+         Candidate.objects.filter(added_by=recruiter).order_by('-added_at', '-id')[:21]),
+        ('jobseeker_dashboard: interviews', Interview.objects.filter(candidate=seeker).order_by('-created_at')),
+        ('jobseeker_dashboard: applications', Application.objects.filter(applicant=seeker)),
+        ('interview room: connected participants',
+         RoomParticipant.objects.filter(room_id=room_id, is_connected=True)),
+    ]
+    queries = [(label, *queryset.query.sql_with_params()) for label, queryset in querysets]
+    _, sql, params, _ = recruiter_stats_query(recruiter)
+    queries.insert(2, ('recruiter dashboard: counters', sql, params))
+    return queries
+
+
+def explain(sql, params):
+    """The plan of a query as text"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(row[-1] for row in rows)
+    return '\n'.join(' '.join(str(column) for column in row) for row in rows)
+
+
+def full_scans(plan):
+    """Tables a plan reads in full"""
+    if connection.vendor == 'postgresql':
+        scanned = _POSTGRES_SCAN.findall(plan)
+    elif connection.vendor == 'sqlite':
+        scanned = _SQLITE_SCAN.findall(plan)
+    else:
+        return []
+    tables = set(connection.introspection.table_names())
+    return sorted({table for table in scanned if table in tables})
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot view queries on a generated dataset and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--current', action='store_true',
+                            help='Explain against the configured database as it is instead of a generated one')
+        parser.add_argument('--recruiters', type=int, default=20)
+        parser.add_argument('--jobs-per-recruiter', type=int, default=50)
+        parser.add_argument('--interviews', type=int, default=20000)
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error when a plan reads a whole table')
+
+    def handle(self, *args, **options):
+        old_db_name = None
+        if not options['current']:
+            logging.disable(logging.WARNING)
+            setup_test_environment()
+            old_db_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            if old_db_name is not None:
+                build_dataset(options['recruiters'], options['jobs_per_recruiter'], options['interviews'])
+                self.stdout.write(f"Generated dataset: {options['recruiters']} recruiters, "
+                                  f"{options['recruiters'] * options['jobs_per_recruiter']} jobs, "
+                                  f"{options['interviews']} interviews on {connection.vendor}")
+            flagged = []
+            for label, sql, params in hot_queries():
+                plan = explain(sql, params)
+                scans = full_scans(plan)
+                if scans:
+                    flagged.append(label)
+                    self.stdout.write(self.style.WARNING(f"\n⚠️  {label}: full scan of {', '.join(scans)}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"\n✅ {label}"))
+                self.stdout.write(plan)
+        finally:
+            if old_db_name is not None:
+                connection.creation.destroy_test_db(old_db_name, verbosity=0)
+
+        self.stdout.write('')
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f"{len(flagged)} queries read whole tables: {', '.join(flagged)}")
+        self.stdout.write(f"{len(flagged)} queries with full table scans")
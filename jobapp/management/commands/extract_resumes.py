@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.models import Candidate, Profile
+from jobapp.resume_store import resume_text_for
+
+
+class Command(BaseCommand):
+    help = 'Extract and store the text of resumes uploaded before ResumeText existed (see jobapp/resume_store.py)'
+
+    def handle(self, *args, **options):
+        stored = missing = failed = 0
+
+        for model in (Profile, Candidate):
+            for owner in model.objects.exclude(resume='').exclude(resume__isnull=True).iterator():
+                try:
+                    if resume_text_for(owner) is None:
+                        missing += 1
+                        self.stdout.write(self.style.WARNING(f"Missing file: {owner.resume.name}"))
+                    else:
+                        stored += 1
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"Failed: {owner.resume.name}: {e}"))
+
+        self.stdout.write(self.style.SUCCESS(f"{stored} resumes stored, {missing} files missing, {failed} failed"))
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobapp.models import RecordingUpload
+from jobapp.recording_upload import RecordingUploadError, finalize_upload
+
+
+class Command(BaseCommand):
+    help = 'Finalize interview recording uploads that stopped receiving chunks (the page was closed before it finalized)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--idle-minutes', type=int, default=30,
+                            help='Only uploads without a chunk for this long (default 30)')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['idle_minutes'])
+        # An interview whose recording was saved by a later upload keeps that one
+        stale = (RecordingUpload.objects
+                 .filter(status=RecordingUpload.STATUS_UPLOADING, updated_at__lt=cutoff, received_bytes__gt=0)
+                 .exclude(interview__recording_uploads__status=RecordingUpload.STATUS_COMPLETE))
+        finalized = failed = 0
+        for upload_id in stale.values_list('upload_id', flat=True):
+            try:
+                upload = finalize_upload(upload_id)
+            except (RecordingUploadError, OSError) as e:
+                failed += 1
+                self.stderr.write(f"Upload {upload_id}: {e}")
+                continue
+            finalized += 1
+            self.stdout.write(f"Finalized {upload.recording_path} ({upload.received_bytes} bytes)")
+        self.stdout.write(f"Recording uploads: {finalized} finalized, {failed} failed")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from jobapp.job_search import index_jobs, install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text job search index (after bulk imports or raw SQL changes to jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--create', action='store_true',
+                            help='Also create the search column / FTS table and indexes if they are missing')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if options['create']:
+            install_search_index(connection)
+        else:
+            index_jobs(using=connection.alias)
+        self.stdout.write(f"Job search index rebuilt ({connection.vendor})")
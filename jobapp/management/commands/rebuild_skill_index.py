@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.models import Job, Profile
+from jobapp.skills import sync_skills
+
+
+class Command(BaseCommand):
+    help = 'Re-parse the skill lists of all jobs and profiles into canonical Skill links (after alias changes)'
+
+    def handle(self, *args, **options):
+        for model, text_field in ((Job, 'required_skills'), (Profile, 'skills')):
+            changed = total = 0
+            for instance in model.objects.only('id', text_field).iterator(chunk_size=1000):
+                total += 1
+                if sync_skills(instance, getattr(instance, text_field)):
+                    changed += 1
+            self.stdout.write(f"{model.__name__}: {changed} of {total} relinked")
@@ -0,0 +1,64 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from jobapp.models import Candidate, Profile, ResumeFile
+from jobapp.resume_store import RESUME_DIRS, file_sha256, find_resume_file, index_resume_file
+
+
+class Command(BaseCommand):
+    help = 'Sync the resume file index with the files in MEDIA_ROOT and report resumes whose file is missing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true',
+                            help='Point resumes with a missing file at the indexed file with the same content or name')
+
+    def handle(self, *args, **options):
+        known = {row.path: row for row in ResumeFile.objects.all()}
+        seen = set()
+        added = 0
+
+        for directory in RESUME_DIRS:
+            root = os.path.join(settings.MEDIA_ROOT, directory)
+            if not os.path.isdir(root):
+                continue
+            with os.scandir(root) as it:
+                for item in it:
+                    if item.name.startswith('.') or not item.is_file():
+                        continue
+                    path = f"{directory}/{item.name}"
+                    seen.add(path)
+                    size = item.stat().st_size
+                    row = known.get(path)
+                    if row and row.is_present and row.size == size and row.sha256:
+                        continue
+                    with open(item.path, 'rb') as f:
+                        index_resume_file(path, file_sha256(f), size)
+                    added += 1
+
+        gone = [path for path, row in known.items() if row.is_present and path not in seen]
+        ResumeFile.objects.filter(path__in=gone).update(is_present=False)
+        self.stdout.write(f"Resume index: {len(seen)} files, {added} added or updated, {len(gone)} marked missing")
+
+        missing = repaired = 0
+        for model in (Profile, Candidate):
+            for owner in model.objects.exclude(resume='').exclude(resume__isnull=True).iterator():
+                if default_storage.exists(owner.resume.name):
+                    continue
+                missing += 1
+                replacement = find_resume_file(owner.resume.name, owner.resume_sha256)
+                if replacement and options['repair']:
+                    sha256 = ResumeFile.objects.filter(path=replacement).values_list('sha256', flat=True).first()
+                    model.objects.filter(pk=owner.pk).update(resume=replacement, resume_sha256=sha256 or '')
+                    repaired += 1
+                    self.stdout.write(f"Repaired {model.__name__} {owner.pk}: {owner.resume.name} -> {replacement}")
+                else:
+                    found = f" (index has {replacement})" if replacement else ''
+                    self.stdout.write(self.style.WARNING(f"Missing file for {model.__name__} {owner.pk}: {owner.resume.name}{found}"))
+
+        if missing:
+            self.stdout.write(self.style.WARNING(f"{missing} resumes point at a missing file, {repaired} repaired"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All resume files present"))
@@ -0,0 +1,60 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobapp.mail_dispatcher import dispatch_outbox
+from jobapp.tasks import TASK_LEASE_SECONDS, claim_tasks, default_worker_id, run_task
+
+
+class Command(BaseCommand):
+    help = 'Run the background task worker (interview results, screenshots) and the email outbox dispatcher'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the runnable tasks once and exit')
+        parser.add_argument('--batch-size', type=int, default=5, help='Tasks claimed per poll')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--lease', type=int, default=TASK_LEASE_SECONDS, help='Lease length in seconds')
+        parser.add_argument('--no-outbox', action='store_true', help='Do not send queued outbox emails')
+
+    def handle(self, *args, **options):
+        worker_id = default_worker_id()
+        self.running = True
+
+        def stop(signum, frame):
+            self.stdout.write(f"Stopping task worker {worker_id} after the current task...")
+            self.running = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(self.style.SUCCESS(f"Task worker {worker_id} started"))
+        processed = 0
+
+        while self.running:
+            close_old_connections()
+            tasks = claim_tasks(worker_id, limit=options['batch_size'], lease_seconds=options['lease'])
+
+            for task in tasks:
+                ok = run_task(task, worker_id)
+                processed += 1
+                status = self.style.SUCCESS('done') if ok else self.style.WARNING('failed')
+                self.stdout.write(f"Task {task.task_name} #{task.id}: {status}")
+
+            emails = 0
+            if not options['no_outbox']:
+                stats = dispatch_outbox()
+                emails = sum(stats.values())
+                if emails:
+                    self.stdout.write(f"Emails: {stats['sent']} sent, {stats['retried']} retried, {stats['failed']} failed")
+
+            idle = not tasks and not emails
+            if options['once']:
+                if idle:
+                    break
+                continue
+            if idle:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(f"Task worker {worker_id} stopped ({processed} tasks processed)")
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobapp.interview_phrases import INTERVIEW_VOICE, fixed_segment_texts
+from jobapp.tts import generate_tts
+from jobapp.tts_cache import get_tts_cache
+
+
+class Command(BaseCommand):
+    help = 'Synthesize the fixed interviewer phrases (jobapp/interview_phrases.py) into the TTS cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--voice', default=INTERVIEW_VOICE, help='Voice passed to generate_tts')
+
+    def handle(self, *args, **options):
+        cache = get_tts_cache()
+        phrases = fixed_segment_texts()
+        failed = 0
+
+        for phrase in phrases:
+            start = time.time()
+            audio_url = generate_tts(phrase.strip(), options['voice'])
+            elapsed = int((time.time() - start) * 1000)
+            if audio_url:
+                # The fixed lines stay cached for good
+                cache.pin([cache.filename_from_url(audio_url)])
+                self.stdout.write(f"{elapsed:6d} ms  {audio_url}  {phrase[:50]}")
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"Failed: {phrase[:50]}"))
+
+        stats = cache.stats()
+        self.stdout.write(f"TTS cache: {stats['entries']} clips, {stats['bytes'] / 1024 / 1024:.1f} MB "
+                          f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB, {stats['hits']} hits, {stats['misses']} misses")
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} phrases could not be synthesized"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(phrases)} phrases cached"))
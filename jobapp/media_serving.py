@@ -0,0 +1,190 @@
+"""
+Media file responses with byte ranges, conditional requests and proxy offload
+
+serve_media used django.views.static.serve, which reads every file through
+Python and ignores Range, so seeking in an interview recording or a resume
+PDF downloaded the whole file. media_response() instead:
+
+- answers If-None-Match / If-Modified-Since with 304 and If-Match /
+  If-Unmodified-Since with 412, from an ETag built from the file's size and
+  mtime (one os.stat per request, no reads);
+- serves a single "Range: bytes=..." request as 206 Partial Content (416 when
+  it starts past the end), honouring If-Range; multi-range requests get the
+  whole file;
+- with MEDIA_SENDFILE_BACKEND='nginx' (X-Accel-Redirect to
+  MEDIA_ACCEL_REDIRECT_PREFIX + path) or 'sendfile' (X-Sendfile with the
+  absolute path) hands the body to the proxy, which also does the ranges;
+- otherwise streams whole files with FileResponse, which the WSGI server can
+  send with sendfile(), and ranges in FILE_BLOCK_SIZE pieces. Under ASGI,
+  Django would load a sync iterator into memory whole before sending it
+  (sync_to_async(list)), so there both are streamed from an async iterator
+  that reads one block at a time in a worker thread.
+
+PDFs are served inline as application/pdf, as before.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+MEDIA_SENDFILE_BACKEND = getattr(settings, 'MEDIA_SENDFILE_BACKEND', '')
+MEDIA_ACCEL_REDIRECT_PREFIX = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+FILE_BLOCK_SIZE = 64 * 1024
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    (first, last) byte positions, inclusive, of a single-range Range header; None when the
+    whole file should be sent (no header, multiple ranges or a malformed one, which RFC 9110 lets
+    a server ignore). Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    match = _RANGE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable()
+    last = int(last) if last else size - 1
+    return first, min(last, size - 1)
+
+
+def _if_range_matches(request, etag, last_modified):
+    """A Range is only honoured when If-Range (if sent) still names this version of the file"""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _read_range(path, first, length):
+    with open(path, 'rb') as f:
+        f.seek(first)
+        remaining = length
+        while remaining:
+            block = f.read(min(FILE_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+async def _aread_range(path, first, length):
+    """_read_range() for ASGI responses: each block is read in a worker thread"""
+    f = await sync_to_async(open, thread_sensitive=False)(path, 'rb')
+    try:
+        f.seek(first)
+        remaining = length
+        while remaining:
+            block = await sync_to_async(f.read, thread_sensitive=False)(min(FILE_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+    finally:
+        f.close()
+
+
+def media_response(request, path, document_root=None):
+    """Response for the file at `path` under `document_root` (MEDIA_ROOT by default); Http404 if there is none"""
+    document_root = document_root or settings.MEDIA_ROOT
+    try:
+        full_path = safe_join(document_root, path)
+        stat_result = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404(f"Media file not found: {path}")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404(f"Media file not found: {path}")
+
+    size = stat_result.st_size
+    last_modified = int(stat_result.st_mtime)
+    etag = f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        if not_modified.status_code == 304:
+            not_modified['ETag'] = etag
+            not_modified['Last-Modified'] = http_date(last_modified)
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    is_pdf = path.lower().endswith('.pdf')
+    if is_pdf:
+        content_type = 'application/pdf'
+
+    def headers(response):
+        response['Content-Type'] = content_type
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        if is_pdf:
+            response['Content-Disposition'] = f'inline; filename="{os.path.basename(path)}"'
+        return response
+
+    if MEDIA_SENDFILE_BACKEND == 'nginx':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = MEDIA_ACCEL_REDIRECT_PREFIX + quote(path.lstrip('/'))
+        return headers(response)
+    if MEDIA_SENDFILE_BACKEND == 'sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+        return headers(response)
+
+    byte_range = None
+    if request.headers.get('Range') and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except RangeNotSatisfiable:
+            response = headers(HttpResponse(status=416))
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if request.method == 'HEAD':
+        response = headers(HttpResponse())
+        response['Content-Length'] = str(size)
+        return response
+
+    is_asgi = isinstance(request, ASGIRequest)
+    if byte_range is None:
+        if is_asgi:
+            response = StreamingHttpResponse(_aread_range(full_path, 0, size))
+            response['Content-Length'] = str(size)
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        return headers(response)
+
+    first, last = byte_range
+    read_range = _aread_range if is_asgi else _read_range
+    response = StreamingHttpResponse(read_range(full_path, first, last - first + 1), status=206)
+    response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    response['Content-Length'] = str(last - first + 1)
+    return headers(response)
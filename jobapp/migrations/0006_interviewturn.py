@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-17 15:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0005_interviewroom_roomparticipant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('turn_index', models.PositiveIntegerField(help_text='Position of this message in the conversation')),
+                ('speaker', models.CharField(choices=[('interviewer', 'Interviewer'), ('candidate', 'Candidate')], max_length=20)),
+                ('text', models.TextField()),
+                ('question_number', models.IntegerField(default=0)),
+                ('time_remaining', models.IntegerField(blank=True, help_text='Seconds left in the interview', null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('llm_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('tts_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='jobapp.interview')),
+            ],
+            options={
+                'ordering': ['interview', 'turn_index'],
+                'indexes': [models.Index(fields=['interview', 'speaker', 'turn_index'], name='interview_turn_speaker_idx')],
+                'constraints': [models.UniqueConstraint(fields=('interview', 'turn_index'), name='unique_interview_turn_index')],
+            },
+        ),
+    ]
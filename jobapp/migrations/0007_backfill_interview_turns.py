@@ -0,0 +1,74 @@
+import json
+
+from django.db import migrations
+from django.utils.dateparse import parse_datetime
+
+
+def _load_list(value):
+    if not value:
+        return []
+    try:
+        data = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def backfill_interview_turns(apps, schema_editor):
+    """Copy questions_asked / answers_given JSON into InterviewTurn rows"""
+    Interview = apps.get_model('jobapp', 'Interview')
+    InterviewTurn = apps.get_model('jobapp', 'InterviewTurn')
+
+    interviews = (
+        Interview.objects
+        .exclude(questions_asked__isnull=True, answers_given__isnull=True)
+        .filter(turns__isnull=True)
+        .only('id', 'questions_asked', 'answers_given', 'completed_at', 'created_at')
+    )
+
+    batch = []
+    for interview in interviews.iterator(chunk_size=500):
+        fallback_time = interview.completed_at or interview.created_at
+        entries = []
+        for question in _load_list(interview.questions_asked):
+            if isinstance(question, dict):
+                entries.append(('interviewer', question.get('question', ''), question))
+        for answer in _load_list(interview.answers_given):
+            if isinstance(answer, dict):
+                entries.append(('candidate', answer.get('answer', ''), answer))
+
+        # Restore conversation order from the recorded timestamps (stable for ties)
+        entries.sort(key=lambda entry: entry[2].get('timestamp') or '')
+
+        for index, (speaker, text, data) in enumerate(entries):
+            created_at = parse_datetime(data.get('timestamp') or '') or fallback_time
+            batch.append(InterviewTurn(
+                interview_id=interview.id,
+                turn_index=index,
+                speaker=speaker,
+                text=text or '',
+                question_number=data.get('question_number') or 0,
+                **({'created_at': created_at} if created_at else {}),
+            ))
+
+        if len(batch) >= 1000:
+            InterviewTurn.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        InterviewTurn.objects.bulk_create(batch)
+
+
+def remove_interview_turns(apps, schema_editor):
+    apps.get_model('jobapp', 'InterviewTurn').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0006_interviewturn'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_interview_turns, remove_interview_turns),
+    ]
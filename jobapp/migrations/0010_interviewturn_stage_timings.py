@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0009_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewturn',
+            name='stage_timings',
+            field=models.JSONField(blank=True, default=dict, help_text='Milliseconds per stage of the turn (see jobapp/interview_pipeline.py)'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-17 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0010_interviewturn_stage_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField(blank=True)),
+                ('page_count', models.PositiveIntegerField(blank=True, help_text='PDF pages; empty for other formats', null=True)),
+                ('char_count', models.PositiveIntegerField(default=0)),
+                ('source_name', models.CharField(blank=True, help_text='Storage name of the file it was extracted from', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_sha256',
+            field=models.CharField(blank=True, help_text='Content hash of the resume (see ResumeText)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_sha256',
+            field=models.CharField(blank=True, help_text='Content hash of the resume (see ResumeText)', max_length=64),
+        ),
+    ]
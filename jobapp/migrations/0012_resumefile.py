@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-17 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0011_resumetext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Storage name under MEDIA_ROOT', max_length=255, unique=True)),
+                ('normalized_name', models.CharField(db_index=True, help_text="Lowercased file name without Django's random suffix", max_length=255)),
+                ('sha256', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('is_present', models.BooleanField(default=True, help_text='False once reconcile_resume_files no longer finds the file')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
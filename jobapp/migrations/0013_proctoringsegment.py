@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-17 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0012_resumefile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProctoringSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('no_face', 'No face'), ('one_face', 'One face'), ('multiple_faces', 'Multiple faces')], max_length=20)),
+                ('started_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField(help_text='Time of the frame that ended the segment, or of its last frame')),
+                ('frames', models.PositiveIntegerField(default=0)),
+                ('max_faces', models.PositiveSmallIntegerField(default=0)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proctoring_segments', to='jobapp.interview')),
+            ],
+            options={
+                'ordering': ['interview', 'started_at'],
+                'indexes': [models.Index(fields=['interview', 'started_at'], name='proctoring_segment_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-17 17:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0013_proctoringsegment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete')], default='uploading', max_length=20)),
+                ('content_type', models.CharField(default='video/webm', max_length=100)),
+                ('part_path', models.CharField(help_text='File under MEDIA_ROOT the chunks are appended to', max_length=255)),
+                ('received_bytes', models.PositiveBigIntegerField(default=0, help_text='Offset the next chunk must start at')),
+                ('chunk_count', models.PositiveIntegerField(default=0)),
+                ('recording_path', models.CharField(blank=True, help_text='Final file under MEDIA_ROOT once finalized', max_length=500)),
+                ('sha256', models.CharField(blank=True, help_text='Hash of the finalized file', max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_uploads', to='jobapp.interview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='recording_upload_status_idx')],
+            },
+        ),
+    ]
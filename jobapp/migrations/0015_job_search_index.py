@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 18:05
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    """search_vector column with GIN and trigram indexes on PostgreSQL, the FTS5 table on SQLite"""
+    from jobapp.job_search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    from jobapp.job_search import remove_search_index
+    remove_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0014_recordingupload'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
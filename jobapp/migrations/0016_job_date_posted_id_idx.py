@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0015_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['date_posted', 'id'], name='job_date_posted_id_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.3 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+def link_skills(apps, schema_editor):
+    """Parse the skill text of every job and profile into Skill links"""
+    from jobapp.skills import parse_skills
+
+    Skill = apps.get_model('jobapp', 'Skill')
+    Job = apps.get_model('jobapp', 'Job')
+    Profile = apps.get_model('jobapp', 'Profile')
+
+    for model, text_field, owner_field in ((Job, 'required_skills', 'job_id'), (Profile, 'skills', 'profile_id')):
+        through = model.canonical_skills.through
+        parsed = {pk: parse_skills(text) for pk, text in model.objects.values_list('pk', text_field).iterator()}
+        names = {name for skill_names in parsed.values() for name in skill_names}
+        Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+        skill_ids = dict(Skill.objects.values_list('name', 'id'))
+        links = [through(**{owner_field: pk, 'skill_id': skill_ids[name]})
+                 for pk, skill_names in parsed.items() for name in skill_names]
+        through.objects.bulk_create(links, batch_size=5000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0016_job_date_posted_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, editable=False, help_text='Parsed from required_skills (see jobapp/skills.py)', related_name='jobs', to='jobapp.skill'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, editable=False, help_text='Parsed from skills (see jobapp/skills.py)', related_name='profiles', to='jobapp.skill'),
+        ),
+        migrations.RunPython(link_skills, migrations.RunPython.noop),
+    ]
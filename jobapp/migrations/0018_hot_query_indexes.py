@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-17 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0017_skill_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'employment_type', 'date_posted'], name='job_status_type_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'applied_at'], name='application_job_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['job', 'status', 'completed_at'], name='interview_job_status_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['candidate', 'created_at'], name='interview_cand_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['added_by', 'added_at'], name='candidate_added_by_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roomparticipant',
+            index=models.Index(fields=['room', 'is_connected'], name='participant_room_conn_idx'),
+        ),
+    ]
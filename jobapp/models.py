@@ -32,7 +32,10 @@ class Profile(models.Model):
     location = models.CharField(max_length=100, blank=True)
     bio = models.TextField(max_length=500, blank=True, null=True)
     skills = models.CharField(max_length=300, blank=True, help_text="Separate skills with commas")
+    canonical_skills = models.ManyToManyField('Skill', blank=True, editable=False, related_name='profiles',
+                                              help_text="Parsed from skills (see jobapp/skills.py)")
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
+    resume_sha256 = models.CharField(max_length=64, blank=True, help_text="Content hash of the resume (see ResumeText)")
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
                
     def __str__(self):
@@ -95,6 +98,8 @@ class Job(models.Model):
     salary_min = models.IntegerField(help_text="Minimum salary in your currency", default=50000)
     salary_max = models.IntegerField(help_text="Maximum salary in your currency", default=80000)
     required_skills = models.TextField(max_length=500, help_text="Comma separated skills", default='Not specified')
+    canonical_skills = models.ManyToManyField('Skill', blank=True, editable=False, related_name='jobs',
+                                              help_text="Parsed from required_skills (see jobapp/skills.py)")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     
     # AI Interview Settings
@@ -134,6 +139,14 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the job list and API, newest first (pagination.py)
+            models.Index(fields=['date_posted', 'id'], name='job_date_posted_id_idx'),
+            # job_list's status and job type filters, newest first
+            models.Index(fields=['status', 'employment_type', 'date_posted'], name='job_status_type_posted_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -150,8 +163,13 @@ class Application(models.Model):
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
     applied_at = models.DateTimeField(auto_now_add=True)
-    
-    
+
+    class Meta:
+        indexes = [
+            # A recruiter's applications newest first (recruiter dashboard, by job)
+            models.Index(fields=['job', 'applied_at'], name='application_job_applied_idx'),
+        ]
+
     def __str__(self):
         return f"{self.applicant.username} - {self.job.title}"
     
@@ -350,10 +368,128 @@ class Interview(models.Model):
         else:
             return 'bg-primary'  # Blue for active
     
+    def get_conversation_pairs(self):
+        """Group interview turns into questions with the answers given to them"""
+        pairs = []
+        answers_by_number = {}
+        for turn in self.turns.all():
+            if turn.speaker == InterviewTurn.SPEAKER_INTERVIEWER:
+                pairs.append({'question': turn, 'answers': []})
+            else:
+                answers_by_number.setdefault(turn.question_number, []).append(turn)
+        for pair in pairs:
+            pair['answers'] = answers_by_number.get(pair['question'].question_number, [])
+        return pairs
+
+    class Meta:
+        indexes = [
+            # Recruiter dashboard counters and results list: a recruiter's interviews by job and status
+            models.Index(fields=['job', 'status', 'completed_at'], name='interview_job_status_done_idx'),
+            # A job seeker's interviews newest first (jobseeker_dashboard, the interviews API)
+            models.Index(fields=['candidate', 'created_at'], name='interview_cand_created_idx'),
+        ]
+
     def __str__(self):
         return f"Interview for {self.job.title} - {self.candidate_name}"
 
 
+class InterviewTurn(models.Model):
+    """One message of an AI interview, written as the interview happens"""
+    SPEAKER_INTERVIEWER = 'interviewer'
+    SPEAKER_CANDIDATE = 'candidate'
+    SPEAKER_CHOICES = [
+        (SPEAKER_INTERVIEWER, 'Interviewer'),
+        (SPEAKER_CANDIDATE, 'Candidate'),
+    ]
+    
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='turns')
+    turn_index = models.PositiveIntegerField(help_text="Position of this message in the conversation")
+    speaker = models.CharField(max_length=20, choices=SPEAKER_CHOICES)
+    text = models.TextField()
+    question_number = models.IntegerField(default=0)
+    time_remaining = models.IntegerField(blank=True, null=True, help_text="Seconds left in the interview")
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    # Latency metrics for interviewer turns
+    llm_latency_ms = models.IntegerField(blank=True, null=True)
+    tts_latency_ms = models.IntegerField(blank=True, null=True)
+    stage_timings = models.JSONField(default=dict, blank=True, help_text="Milliseconds per stage of the turn (see jobapp/interview_pipeline.py)")
+    
+    class Meta:
+        ordering = ['interview', 'turn_index']
+        constraints = [
+            models.UniqueConstraint(fields=['interview', 'turn_index'], name='unique_interview_turn_index'),
+        ]
+        indexes = [
+            models.Index(fields=['interview', 'speaker', 'turn_index'], name='interview_turn_speaker_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_speaker_display()} turn {self.turn_index} - {self.interview_id}"
+
+
+class RecordingUpload(models.Model):
+    """A resumable, chunked upload of an interview recording (see jobapp/recording_upload.py)"""
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='recording_uploads')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    content_type = models.CharField(max_length=100, default='video/webm')
+    part_path = models.CharField(max_length=255, help_text="File under MEDIA_ROOT the chunks are appended to")
+    received_bytes = models.PositiveBigIntegerField(default=0, help_text="Offset the next chunk must start at")
+    chunk_count = models.PositiveIntegerField(default=0)
+    recording_path = models.CharField(max_length=500, blank=True, help_text="Final file under MEDIA_ROOT once finalized")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Hash of the finalized file")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='recording_upload_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Recording upload {self.upload_id} ({self.status}, {self.received_bytes} bytes) - {self.interview_id}"
+
+
+class ProctoringSegment(models.Model):
+    """A stretch of proctoring frames with the same face state (see jobapp/proctoring_timeline.py)"""
+    STATE_NO_FACE = 'no_face'
+    STATE_ONE_FACE = 'one_face'
+    STATE_MULTIPLE_FACES = 'multiple_faces'
+    STATE_CHOICES = [
+        (STATE_NO_FACE, 'No face'),
+        (STATE_ONE_FACE, 'One face'),
+        (STATE_MULTIPLE_FACES, 'Multiple faces'),
+    ]
+    
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='proctoring_segments')
+    state = models.CharField(max_length=20, choices=STATE_CHOICES)
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(help_text="Time of the frame that ended the segment, or of its last frame")
+    frames = models.PositiveIntegerField(default=0)
+    max_faces = models.PositiveSmallIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['interview', 'started_at']
+        indexes = [
+            models.Index(fields=['interview', 'started_at'], name='proctoring_segment_time_idx'),
+        ]
+    
+    @property
+    def duration_seconds(self):
+        return (self.ended_at - self.started_at).total_seconds()
+    
+    def __str__(self):
+        return f"{self.get_state_display()} {self.started_at:%H:%M:%S}-{self.ended_at:%H:%M:%S} - {self.interview_id}"
+
+
     
 
 
@@ -362,11 +498,16 @@ class Candidate(models.Model):
     email = models.EmailField()
     phone = models.CharField(max_length=20)
     resume = models.FileField(upload_to='candidate_resumes/', blank=True, null=True)
+    resume_sha256 = models.CharField(max_length=64, blank=True, help_text="Content hash of the resume (see ResumeText)")
     added_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     added_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         unique_together = ['email', 'added_by']  # Prevent duplicate candidates per recruiter
+        indexes = [
+            # A recruiter's candidates newest first (dashboard list, schedule-interview modal)
+            models.Index(fields=['added_by', 'added_at'], name='candidate_added_by_at_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.email})"
@@ -441,6 +582,123 @@ class RoomParticipant(models.Model):
     audio_enabled = models.BooleanField(default=True)
     video_enabled = models.BooleanField(default=True)
     screen_sharing = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Connected participants of a room (joining, participant lists, capacity checks)
+            models.Index(fields=['room', 'is_connected'], name='participant_room_conn_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.display_name} in {self.room.room_id}"
+
+class BackgroundTask(models.Model):
+    """Durable job for the database-backed task queue (see jobapp/tasks.py)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    task_name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    idempotency_key = models.CharField(max_length=200, unique=True, blank=True, null=True,
+                                       help_text="Enqueuing the same key twice returns the existing task")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time (retry backoff)")
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(blank=True, null=True, help_text="Lease expiry; expired running tasks are reclaimed")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+
+class OutboxEmail(models.Model):
+    """Email waiting to be sent by the mail dispatcher (see jobapp/mail_dispatcher.py)"""
+    STATUS_QUEUED = 'queued'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    dedupe_key = models.CharField(max_length=200, unique=True, blank=True, null=True,
+                                  help_text="Queuing the same key twice keeps only the first email")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(blank=True, null=True, help_text="Lease expiry while a dispatcher is sending")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+
+class ResumeText(models.Model):
+    """Text extracted from a resume file, stored once per distinct file content (see jobapp/resume_store.py)"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True, help_text="PDF pages; empty for other formats")
+    char_count = models.PositiveIntegerField(default=0)
+    source_name = models.CharField(max_length=255, blank=True, help_text="Storage name of the file it was extracted from")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.source_name or self.sha256[:12]} ({self.char_count} chars)"
+
+
+class ResumeFile(models.Model):
+    """Stored resume file indexed by normalized name and content hash (see jobapp/resume_store.py)"""
+    path = models.CharField(max_length=255, unique=True, help_text="Storage name under MEDIA_ROOT")
+    normalized_name = models.CharField(max_length=255, db_index=True,
+                                       help_text="Lowercased file name without Django's random suffix")
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    is_present = models.BooleanField(default=True, help_text="False once reconcile_resume_files no longer finds the file")
+    created_at = models.DateTimeField(auto_now_add=True)
+    checked_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return self.path if self.is_present else f"{self.path} (missing)"
+
+
+class Skill(models.Model):
+    """Canonical skill name; Job and Profile skill lists link here (see jobapp/skills.py)"""
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.display_name} in {self.room.room_id}"
\ No newline at end of file
+        return self.name
@@ -0,0 +1,164 @@
+"""
+Pagination helpers
+
+Django's Paginator runs a COUNT(*) of the whole queryset and then a second
+query for the page. For a ranked full-text search both repeat the search.
+WindowCountPaginator fetches the page with a COUNT(*) OVER () column and
+takes the total from it, so a page is one query. Only a page past the end
+(or page 1 of an empty result) falls back to a separate count.
+
+OFFSET pagination also gets slower the deeper the page: the database reads
+and throws away every row before it. KeysetPaginator pages by the sort key
+instead. A page is "the next per_page rows after (date_posted, id) of the
+last row shown", one indexed range scan whatever the depth, and there is no
+count at all. Positions travel as opaque cursor tokens (?cursor=...); the
+job list and the jobs API (api/pagination.py) both use it.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Count, Q, Window
+
+TOTAL_ANNOTATION = 'paginator_total'
+
+
+class WindowCountPaginator(Paginator):
+    """Paginator whose count comes from the page query itself (orphans are not supported)"""
+
+    def page(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+
+        if 'count' not in self.__dict__ and hasattr(self.object_list, 'annotate') and not self.orphans:
+            bottom = (number - 1) * self.per_page
+            rows = list(self.object_list
+                        .annotate(**{TOTAL_ANNOTATION: Window(Count('pk'))})[bottom:bottom + self.per_page])
+            if rows:
+                self.count = getattr(rows[0], TOTAL_ANNOTATION)
+                return self._get_page(rows, number, self)
+            if number == 1:
+                self.count = 0
+        return super().page(number)
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(values, backward=False):
+    """Opaque token for a position: the sort key values of a row, and the direction to read in"""
+    payload = json.dumps({'k': values, 'b': 1 if backward else 0}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """(values, backward) of a cursor token; raises InvalidCursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        values, backward = payload['k'], bool(payload.get('b'))
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor(token)
+    if not isinstance(values, list):
+        raise InvalidCursor(token)
+    return values, backward
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, with the cursors of the pages around it"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination of a queryset ordered by `ordering`, whose last field must be unique
+    (the default, newest first, is ('-date_posted', '-id')). Needs an index on those fields.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-date_posted', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.keys = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        self.fields = [queryset.model._meta.get_field(name) for name, _ in self.keys]
+
+    def _order_by(self, backward):
+        # Reading backwards walks the same index in the opposite direction
+        return [('-' if descending != backward else '') + name for name, descending in self.keys]
+
+    def _after(self, values, backward):
+        """Rows that come after `values` in reading order: (a, b) < (x, y) spelled out for the ORM"""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self.keys, values):
+            lookup = 'lt' if descending != backward else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _cursor(self, row, backward):
+        return encode_cursor([field.value_to_string(row) for field in self.fields], backward)
+
+    def _values(self, token):
+        values, backward = decode_cursor(token)
+        if len(values) != len(self.fields):
+            raise InvalidCursor(token)
+        try:
+            return [field.to_python(value) for field, value in zip(self.fields, values)], backward
+        except ValidationError:
+            raise InvalidCursor(token)
+
+    def page(self, cursor=None):
+        """The page at `cursor` (the first page without one); raises InvalidCursor"""
+        values, backward = self._values(cursor) if cursor else (None, False)
+        queryset = self.queryset.order_by(*self._order_by(backward))
+        if values is not None:
+            queryset = queryset.filter(self._after(values, backward))
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backward:
+            if not rows:
+                return self.page()
+            rows.reverse()
+        has_next = True if backward else more
+        has_previous = more if backward else values is not None
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1], False) if rows and has_next else None,
+            previous_cursor=self._cursor(rows[0], True) if rows and has_previous else None,
+        )
+
+    def get_page(self, cursor=None):
+        """Like page(), but a malformed or stale cursor gives the first page"""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
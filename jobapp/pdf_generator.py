@@ -15,12 +15,19 @@ from datetime import datetime
 from PIL import Image as PILImage
 import io
 
+from .proctoring_timeline import timeline_summary
+
 def generate_interview_pdf(interview):
     """Generate a beautiful dashboard-style PDF report for interview results"""
     
     # Create PDF buffer
     buffer = io.BytesIO()
     
+    # Conversation turns - one query, shared by the statistics and conversation sections
+    turns = list(interview.turns.all())
+    questions = [turn.text for turn in turns if turn.speaker == 'interviewer']
+    answers = [turn.text for turn in turns if turn.speaker == 'candidate']
+    
     # Create PDF document
     doc = SimpleDocTemplate(
         buffer,
@@ -267,14 +274,9 @@ def generate_interview_pdf(interview):
             story.append(Spacer(1, 25))
     
     # Interview Statistics Cards
-    try:
-        questions = json.loads(interview.questions_asked) if interview.questions_asked else []
-        answers = json.loads(interview.answers_given) if interview.answers_given else []
-        total_q = len(questions)
-        total_a = len(answers)
-        response_rate = f"{(total_a/total_q*100):.0f}%" if total_q > 0 else "0%"
-    except:
-        total_q, total_a, response_rate = 0, 0, "0%"
+    total_q = len(questions)
+    total_a = len(answers)
+    response_rate = f"{(total_a/total_q*100):.0f}%" if total_q > 0 else "0%"
     
     stats_data = [
         ['Questions asked', 'Responses given', 'Response rate'],
@@ -301,6 +303,39 @@ def generate_interview_pdf(interview):
     story.append(stats_table)
     story.append(Spacer(1, 20))
     
+    # Proctoring summary from the face detection timeline
+    proctoring = timeline_summary(interview)
+    if proctoring:
+        proctoring_data = [
+            ['Monitored', 'Candidate alone', 'Multiple faces', 'No face'],
+            [f"{proctoring['monitored_seconds']:.0f}s",
+             f"{proctoring['one_face_seconds']:.0f}s",
+             f"{proctoring['multiple_faces_seconds']:.0f}s ({proctoring['multiple_faces_events']}x)",
+             f"{proctoring['no_face_seconds']:.0f}s ({proctoring['no_face_events']}x)"]
+        ]
+        
+        proctoring_table = Table(proctoring_data, colWidths=[1.725*inch] * 4)
+        proctoring_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
+            ('BACKGROUND', (0, 1), (-1, 1), colors.HexColor('#f9fafb')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, 1), colors.HexColor('#1f2937')),
+            ('TEXTCOLOR', (2, 1), (2, 1), colors.HexColor('#dc2626') if proctoring['multiple_faces_seconds'] else colors.HexColor('#1f2937')),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('FONTSIZE', (0, 1), (-1, 1), 12),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb')),
+        ]))
+        
+        story.append(Paragraph("Proctoring summary", header_style))
+        story.append(proctoring_table)
+        story.append(Spacer(1, 20))
+    
     # Add first screenshot to first page
     if interview.screenshots_data:
         try:
@@ -388,75 +423,68 @@ def generate_interview_pdf(interview):
         story.append(Spacer(1, 20))
     
     # Q&A Section with Bubble Style
-    if interview.questions_asked and interview.answers_given:
+    if questions and answers:
         story.append(PageBreak())
         story.append(Paragraph("Interview conversation", header_style))
         story.append(Spacer(1, 15))
         
-        try:
-            questions = json.loads(interview.questions_asked)
-            answers = json.loads(interview.answers_given)
+        for i, (q, a) in enumerate(zip(questions, answers), 1):
+            # Interviewer bubble (left aligned)
+            q_text = q or 'Question not recorded'
+            q_paragraph = Paragraph(f"Interviewer: {q_text}", ParagraphStyle(
+                'InterviewerBubble',
+                parent=content_style,
+                fontSize=10,
+                alignment=TA_LEFT,
+                textColor=colors.HexColor('#1e40af'),
+                leading=12,
+                leftIndent=10,
+                rightIndent=50
+            ))
+            
+            q_table = Table([[q_paragraph]], colWidths=[6*inch])
+            q_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#dbeafe')),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('TOPPADDING', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+                ('LEFTPADDING', (0, 0), (-1, -1), 15),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+                ('ROUNDEDCORNERS', [10, 10, 10, 10]),
+            ]))
+            
+            story.append(q_table)
+            story.append(Spacer(1, 8))
+            
+            # Candidate bubble (right aligned)
+            a_text = a or 'Answer not recorded'
+            a_paragraph = Paragraph(f"Candidate: {a_text}", ParagraphStyle(
+                'CandidateBubble',
+                parent=content_style,
+                fontSize=10,
+                alignment=TA_LEFT,
+                textColor=colors.HexColor('#065f46'),
+                leading=12,
+                leftIndent=50,
+                rightIndent=10
+            ))
+            
+            a_table = Table([['', a_paragraph]], colWidths=[1*inch, 5*inch])
+            a_table.setStyle(TableStyle([
+                ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#d1fae5')),
+                ('ALIGN', (1, 0), (1, 0), 'LEFT'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('TOPPADDING', (1, 0), (1, 0), 10),
+                ('BOTTOMPADDING', (1, 0), (1, 0), 10),
+                ('LEFTPADDING', (1, 0), (1, 0), 15),
+                ('RIGHTPADDING', (1, 0), (1, 0), 15),
+                ('ROUNDEDCORNERS', [10, 10, 10, 10]),
+            ]))
+            
+            story.append(a_table)
+            story.append(Spacer(1, 12))
             
-            for i, (q, a) in enumerate(zip(questions, answers), 1):
-                # Interviewer bubble (left aligned)
-                q_text = q.get('question', 'Question not recorded')
-                q_paragraph = Paragraph(f"Interviewer: {q_text}", ParagraphStyle(
-                    'InterviewerBubble',
-                    parent=content_style,
-                    fontSize=10,
-                    alignment=TA_LEFT,
-                    textColor=colors.HexColor('#1e40af'),
-                    leading=12,
-                    leftIndent=10,
-                    rightIndent=50
-                ))
-                
-                q_table = Table([[q_paragraph]], colWidths=[6*inch])
-                q_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#dbeafe')),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('TOPPADDING', (0, 0), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 15),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-                    ('ROUNDEDCORNERS', [10, 10, 10, 10]),
-                ]))
-                
-                story.append(q_table)
-                story.append(Spacer(1, 8))
-                
-                # Candidate bubble (right aligned)
-                a_text = a.get('answer', 'Answer not recorded')
-                a_paragraph = Paragraph(f"Candidate: {a_text}", ParagraphStyle(
-                    'CandidateBubble',
-                    parent=content_style,
-                    fontSize=10,
-                    alignment=TA_LEFT,
-                    textColor=colors.HexColor('#065f46'),
-                    leading=12,
-                    leftIndent=50,
-                    rightIndent=10
-                ))
-                
-                a_table = Table([['', a_paragraph]], colWidths=[1*inch, 5*inch])
-                a_table.setStyle(TableStyle([
-                    ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#d1fae5')),
-                    ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('TOPPADDING', (1, 0), (1, 0), 10),
-                    ('BOTTOMPADDING', (1, 0), (1, 0), 10),
-                    ('LEFTPADDING', (1, 0), (1, 0), 15),
-                    ('RIGHTPADDING', (1, 0), (1, 0), 15),
-                    ('ROUNDEDCORNERS', [10, 10, 10, 10]),
-                ]))
-                
-                story.append(a_table)
-                story.append(Spacer(1, 12))
-                
-        except (json.JSONDecodeError, TypeError):
-            error_paragraph = Paragraph("Conversation data could not be parsed.", content_style)
-            story.append(error_paragraph)
     
     # Screenshots Gallery
     if interview.screenshots_data:
@@ -0,0 +1,181 @@
+"""
+Proctoring WebSocket channel
+
+The interview page opens ws(s)://<host>/ws/proctoring/?session=<id>&interview=<uuid> and sends
+each webcam frame as one binary message holding the JPEG bytes, so there is
+no base64 data URL and no HTTP request per frame. For every frame the server
+replies with a JSON text message:
+
+    {"type": "detection", "seq": 12, "faces": [...], "count": 1, "alert": false,
+     "alerts": ["no_face"], "summary": {"frames": 12, "multiple_face_frames": 0, ...}}
+
+Alert state (multiple faces, no face) is aggregated per connection here, and
+every change is also pushed as {"type": "alert", "alert": "multiple_faces",
+"active": true, "count": 2}. A text message {"type": "ping"} is answered
+with {"type": "pong"}.
+
+With an interview uuid the results are also written to that interview's
+proctoring timeline (jobapp/proctoring_timeline.py).
+
+Frames are handled one at a time per connection; the page waits for a frame's
+result before sending the next one. Detection runs in the face detection
+worker processes (jobapp/utils/face_workers.py) while the event loop waits.
+
+This is a plain ASGI app; job_platform/asgi.py routes the WebSocket path to
+it. Under SERVER_MODE=wsgi there is no socket and the page keeps posting
+frames to /api/face-detect/batch/.
+"""
+import json
+import logging
+from contextlib import suppress
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http.request import validate_host
+
+from .proctoring_timeline import open_timeline
+from .utils.face_workers import detect_faces_async
+
+logger = logging.getLogger(__name__)
+
+PROCTORING_WS_PATH = '/ws/proctoring/'
+# The no-face alert is raised after this many frames in a row without a face
+PROCTORING_NO_FACE_FRAMES = getattr(settings, 'PROCTORING_NO_FACE_FRAMES', 3)
+PROCTORING_MAX_FRAME_BYTES = 2 * 1024 * 1024
+
+# WebSocket close codes
+CLOSE_FORBIDDEN = 4003
+CLOSE_MESSAGE_TOO_BIG = 1009
+
+
+class ProctoringAlerts:
+    """Alert state aggregated over the frames of one proctoring connection"""
+
+    def __init__(self, no_face_frames=PROCTORING_NO_FACE_FRAMES):
+        self.no_face_frames = max(1, no_face_frames)
+        self.frames = 0
+        self.multiple_face_frames = 0
+        self.no_face_total = 0
+        self.no_face_streak = 0
+        self.max_count = 0
+        self.active = set()
+
+    def update(self, result):
+        """Count a detection result; returns the alerts that started or cleared as (name, active) pairs"""
+        if result.get('error') or result.get('status') == 'dropped':
+            return []
+        count = result.get('count', 0)
+        self.frames += 1
+        self.max_count = max(self.max_count, count)
+        if count > 1:
+            self.multiple_face_frames += 1
+        if count == 0:
+            self.no_face_total += 1
+            self.no_face_streak += 1
+        else:
+            self.no_face_streak = 0
+
+        now_active = set()
+        if count > 1:
+            now_active.add('multiple_faces')
+        if self.no_face_streak >= self.no_face_frames:
+            now_active.add('no_face')
+
+        changes = [(name, True) for name in sorted(now_active - self.active)]
+        changes += [(name, False) for name in sorted(self.active - now_active)]
+        self.active = now_active
+        return changes
+
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'multiple_face_frames': self.multiple_face_frames,
+            'no_face_frames': self.no_face_total,
+            'max_count': self.max_count,
+        }
+
+
+def _origin_allowed(scope):
+    """Browsers always send Origin on a WebSocket handshake; it must be one of ALLOWED_HOSTS"""
+    headers = dict(scope.get('headers') or [])
+    origin = headers.get(b'origin')
+    if not origin:
+        return True
+    host = urlsplit(origin.decode('latin-1')).netloc
+    allowed = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed:
+        allowed = ['.localhost', '127.0.0.1', '[::1]']
+    return validate_host(host, allowed)
+
+
+async def proctoring_app(scope, receive, send):
+    """ASGI application for one proctoring WebSocket connection"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if not _origin_allowed(scope):
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    # Without a session id the connection itself is the tracked session
+    session = (query.get('session') or [''])[0] or uuid4().hex
+    timeline = await sync_to_async(open_timeline)((query.get('interview') or [''])[0])
+    await send({'type': 'websocket.accept'})
+
+    async def send_json(data):
+        await send({'type': 'websocket.send', 'text': json.dumps(data)})
+
+    alerts = ProctoringAlerts()
+    seq = 0
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+
+            frame = message.get('bytes')
+            if frame is None:
+                try:
+                    data = json.loads(message.get('text') or '{}')
+                except ValueError:
+                    data = {}
+                if data.get('type') == 'ping':
+                    await send_json({'type': 'pong'})
+                continue
+
+            if len(frame) > PROCTORING_MAX_FRAME_BYTES:
+                await send({'type': 'websocket.close', 'code': CLOSE_MESSAGE_TOO_BIG})
+                break
+
+            seq += 1
+            result = await detect_faces_async(frame, session, droppable=True)
+            if timeline is not None and timeline.add(result):
+                await sync_to_async(timeline.flush)()
+            for name, active in alerts.update(result):
+                await send_json({'type': 'alert', 'alert': name, 'active': active,
+                                 'count': result.get('count', 0)})
+            await send_json({
+                'type': 'detection',
+                'seq': seq,
+                **result,
+                'alerts': sorted(alerts.active),
+                'summary': alerts.summary(),
+            })
+    except Exception as e:
+        logger.error(f"Proctoring socket error: {e}")
+        with suppress(Exception):
+            await send({'type': 'websocket.close', 'code': 1011})
+    finally:
+        if timeline is not None:
+            await sync_to_async(timeline.close)()
+        logger.info(f"Proctoring socket closed after {alerts.frames} frames: {alerts.summary()}")
+
+
+async def reject_websocket(scope, receive, send):
+    """Refuse a WebSocket handshake on a path that has no socket"""
+    message = await receive()
+    if message['type'] == 'websocket.connect':
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
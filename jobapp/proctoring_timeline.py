@@ -0,0 +1,241 @@
+"""
+Proctoring timeline
+
+Face detection results are kept as run-length encoded ProctoringSegment rows:
+one row per stretch of frames with the same face state (no face, one face,
+multiple faces) holding its start and end time, frame count and the most
+faces seen. Individual frames are not stored.
+
+A segment runs until the frame that changes the state. When no frame arrives
+for PROCTORING_GAP_SECONDS (camera off, socket down) the segment ends at its
+last frame and the gap is left out of the timeline.
+
+A ProctoringTimeline buffers one interview's frames in memory and writes
+them every PROCTORING_TIMELINE_FLUSH_SECONDS. The database holds the only
+open segment: a flush locks the interview row, continues the interview's
+latest segment with the buffered frames, updates it and inserts the new
+segments in one bulk insert. So any number of buffers - the proctoring
+socket's (one per connection) and the HTTP face-detect endpoints' (one per
+interview and proctoring session in each process, get_timeline()) - build
+one timeline. A frame older than the latest stored one is placed at that
+time.
+
+Batched frames carry their capture times (frame_times()), so each frame is
+placed when it was seen rather than when its batch arrived. An interview's
+timelines are written out when it completes (close_timelines()) and when the
+page sends its last frames.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Interview, ProctoringSegment
+
+logger = logging.getLogger(__name__)
+
+PROCTORING_TIMELINE_FLUSH_SECONDS = getattr(settings, 'PROCTORING_TIMELINE_FLUSH_SECONDS', 10)
+PROCTORING_GAP_SECONDS = getattr(settings, 'PROCTORING_GAP_SECONDS', 10)
+# Timelines of the HTTP endpoints are written and forgotten after this long without a frame
+TIMELINE_IDLE_SECONDS = 120
+MAX_TIMELINES = 1000
+# Capture times further back than this are taken as this old (a stalled tab, a bad clock)
+MAX_FRAME_AGE_SECONDS = 60
+
+
+def face_state(count):
+    if count == 0:
+        return ProctoringSegment.STATE_NO_FACE
+    if count == 1:
+        return ProctoringSegment.STATE_ONE_FACE
+    return ProctoringSegment.STATE_MULTIPLE_FACES
+
+
+class ProctoringTimeline:
+    """Buffered face states of one interview's frames, merged into ProctoringSegment on flush"""
+
+    def __init__(self, interview_id):
+        self.interview_id = interview_id
+        self.last_flush = time.monotonic()
+        self._frames = []  # (time, face count) not written yet
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(self, result, at=None):
+        """Record one detection result; True when the timeline is due to be flushed"""
+        if result.get('error') or result.get('status') == 'dropped':
+            return False
+        with self._lock:
+            self._frames.append((at or timezone.now(), result.get('count', 0)))
+            return time.monotonic() - self.last_flush >= PROCTORING_TIMELINE_FLUSH_SECONDS
+
+    def flush(self):
+        """Continue the interview's stored timeline with the buffered frames"""
+        with self._flush_lock:
+            with self._lock:
+                frames, self._frames = self._frames, []
+                self.last_flush = time.monotonic()
+            if not frames:
+                return
+            try:
+                with transaction.atomic():
+                    # Serializes flushes of this interview across processes
+                    Interview.objects.select_for_update().filter(pk=self.interview_id).values_list('pk', flat=True).first()
+                    latest = (ProctoringSegment.objects.filter(interview_id=self.interview_id)
+                              .order_by('-started_at', '-id').first())
+                    changed, new = _extend(self.interview_id, latest, frames)
+                    if changed is not None:
+                        changed.save(update_fields=['ended_at', 'frames', 'max_faces'])
+                    ProctoringSegment.objects.bulk_create(new)
+            except Exception as e:
+                logger.error(f"Could not save proctoring timeline for interview {self.interview_id}: {e}")
+                with self._lock:
+                    self._frames[:0] = frames
+
+    def close(self):
+        """Write what is left; the open segment ends at its last frame"""
+        self.flush()
+
+
+def _extend(interview_id, latest, frames):
+    """
+    Apply frames to the latest stored segment (None when there is none yet): returns that
+    segment if it changed, and the new segments
+    """
+    current, last_frame_at = latest, latest.ended_at if latest is not None else None
+    changed, new = None, []
+    for at, count in sorted(frames, key=lambda frame: frame[0]):
+        state = face_state(count)
+        if last_frame_at is not None and at < last_frame_at:
+            at = last_frame_at
+        if current is not None:
+            if (at - last_frame_at).total_seconds() > PROCTORING_GAP_SECONDS:
+                # The segment already ends at its last frame
+                current = None
+            else:
+                current.ended_at = at
+                if current is latest:
+                    changed = latest
+                if current.state != state:
+                    current = None
+        if current is None:
+            current = ProctoringSegment(interview_id=interview_id, state=state, started_at=at, ended_at=at)
+            new.append(current)
+        current.frames += 1
+        current.max_faces = max(current.max_faces, count)
+        if current is latest:
+            changed = latest
+        last_frame_at = at
+    return changed, new
+
+
+def open_timeline(interview_uuid):
+    """Timeline for the interview with this uuid, or None when there is no such interview"""
+    if not interview_uuid:
+        return None
+    try:
+        interview_id = Interview.objects.filter(uuid=interview_uuid).values_list('id', flat=True).first()
+    except (ValidationError, ValueError):
+        return None
+    return ProctoringTimeline(interview_id) if interview_id else None
+
+
+_timelines = OrderedDict()  # (interview uuid, session) -> ProctoringTimeline, least recently used first
+_timelines_lock = threading.Lock()
+
+
+def get_timeline(interview_uuid, session):
+    """This process's timeline buffer of the HTTP endpoints for an interview's proctoring session"""
+    if not interview_uuid:
+        return None
+    key = (str(interview_uuid), str(session or '')[:100])
+    now = time.monotonic()
+    with _timelines_lock:
+        timeline = _timelines.pop(key, None)
+        if timeline is not None:
+            _timelines[key] = timeline
+        expired = []
+        while _timelines and (len(_timelines) > MAX_TIMELINES or
+                              now - next(iter(_timelines.values())).last_flush > TIMELINE_IDLE_SECONDS):
+            expired.append(_timelines.popitem(last=False)[1])
+    for old in expired:
+        old.close()
+    if timeline is None:
+        timeline = open_timeline(interview_uuid)
+        if timeline is not None:
+            with _timelines_lock:
+                timeline = _timelines.setdefault(key, timeline)
+    return timeline
+
+
+def close_timelines(interview_uuid):
+    """Write out and forget this process's timelines of an interview (it has ended)"""
+    if not interview_uuid:
+        return
+    interview_uuid = str(interview_uuid)
+    with _timelines_lock:
+        keys = [key for key in _timelines if key[0] == interview_uuid]
+        closing = [_timelines.pop(key) for key in keys]
+    for timeline in closing:
+        timeline.close()
+
+
+def frame_times(captured_at, sent_at, count):
+    """
+    Server times of a request's frames from the capture and send times the page reports
+    (milliseconds since the epoch, client clock). Only the age of each frame at send time
+    is used, so a skewed client clock does not shift the timeline. None when they are
+    missing or malformed.
+    """
+    if not captured_at or not sent_at or len(captured_at) != count:
+        return None
+    try:
+        sent_at = float(sent_at)
+        ages = [(sent_at - float(value)) / 1000 for value in captured_at]
+    except (TypeError, ValueError):
+        return None
+    received_at = timezone.now()
+    return [received_at - timedelta(seconds=min(max(age, 0), MAX_FRAME_AGE_SECONDS)) for age in ages]
+
+
+def record_results(interview_uuid, session, results, times=None, final=False):
+    """
+    Add the detection results of one request to the interview's timeline, at their
+    capture times when given; `final` writes the timeline out (the page is closing)
+    """
+    timeline = get_timeline(interview_uuid, session)
+    if timeline is None:
+        return
+    due = False
+    for result, at in zip(results, times or [None] * len(results)):
+        due = timeline.add(result, at) or due
+    if final:
+        close_timelines(interview_uuid)
+    elif due:
+        timeline.flush()
+
+
+def timeline_summary(interview):
+    """Seconds and number of segments per face state, or None when the interview has no timeline"""
+    segments = list(interview.proctoring_segments.values_list('state', 'started_at', 'ended_at'))
+    if not segments:
+        return None
+    seconds = {state: 0.0 for state, _ in ProctoringSegment.STATE_CHOICES}
+    events = {state: 0 for state, _ in ProctoringSegment.STATE_CHOICES}
+    for state, started_at, ended_at in segments:
+        seconds[state] += (ended_at - started_at).total_seconds()
+        events[state] += 1
+    return {
+        'monitored_seconds': sum(seconds.values()),
+        'one_face_seconds': seconds[ProctoringSegment.STATE_ONE_FACE],
+        'no_face_seconds': seconds[ProctoringSegment.STATE_NO_FACE],
+        'multiple_faces_seconds': seconds[ProctoringSegment.STATE_MULTIPLE_FACES],
+        'no_face_events': events[ProctoringSegment.STATE_NO_FACE],
+        'multiple_faces_events': events[ProctoringSegment.STATE_MULTIPLE_FACES],
+    }
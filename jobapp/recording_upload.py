@@ -0,0 +1,185 @@
+"""
+Chunked, resumable interview recording uploads
+
+The interview page sends MediaRecorder chunks while the interview runs
+instead of posting the whole recording at the end:
+
+    POST /interview/recording/uploads/                interview_uuid, content_type -> {"upload_id", "offset": 0}
+    PUT  /interview/recording/uploads/<id>/           chunk bytes, X-Upload-Offset: <offset>
+                                                      -> {"offset": <next offset>}, ETag: "<sha256 of the chunk>"
+    GET  /interview/recording/uploads/<id>/           -> {"offset", "status"}, where to resume
+    POST /interview/recording/uploads/<id>/finalize/  duration -> the recording is saved on the interview
+
+Chunks are appended to a .part file under media/interview_recordings/partial
+at the offset stored on the RecordingUpload row. A chunk for any other offset
+is refused with 409 and the current offset, so a client that lost a response
+resends from there; a chunk that breaks off midway is cut off again. An
+X-Chunk-SHA256 header is checked against the bytes received. Request bodies
+are copied to disk in CHUNK_READ_BYTES pieces, so memory use does not grow
+with the recording.
+
+Finalize moves the file into media/interview_recordings and records it on
+the Interview the same way save_interview_recording does. Uploads the
+browser never finalized are finalized by `python manage.py
+finalize_recording_uploads`.
+"""
+import hashlib
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import RecordingUpload
+from .resume_store import file_sha256
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = 'interview_recordings'
+PARTIAL_DIR = os.path.join(RECORDINGS_DIR, 'partial')
+RECORDING_CHUNK_MAX_BYTES = getattr(settings, 'RECORDING_CHUNK_MAX_BYTES', 32 * 1024 * 1024)
+CHUNK_READ_BYTES = 64 * 1024
+
+
+class RecordingUploadError(Exception):
+    """Refused upload request; status is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _media_path(relative_path):
+    return os.path.join(settings.MEDIA_ROOT, relative_path)
+
+
+def _extension(content_type):
+    return '.mp4' if 'mp4' in (content_type or '') else '.webm'
+
+
+def start_upload(interview, content_type=''):
+    """New upload for an interview recording, with an empty .part file"""
+    upload = RecordingUpload(interview=interview, content_type=(content_type or 'video/webm')[:100])
+    upload.part_path = os.path.join(PARTIAL_DIR, f"{upload.upload_id}.part")
+    os.makedirs(_media_path(PARTIAL_DIR), exist_ok=True)
+    open(_media_path(upload.part_path), 'wb').close()
+    upload.save()
+    logger.info(f"Recording upload {upload.upload_id} started for interview {interview.uuid}")
+    return upload
+
+
+def append_chunk(upload_id, offset, stream, length, chunk_sha256=''):
+    """
+    Append `length` bytes read from `stream` at `offset`; returns (upload, sha256 of the chunk).
+    Raises RecordingUploadError (409 with the current offset when `offset` is not where the file ends).
+    """
+    if length <= 0:
+        raise RecordingUploadError('Empty chunk')
+    if length > RECORDING_CHUNK_MAX_BYTES:
+        raise RecordingUploadError(f'Chunks are limited to {RECORDING_CHUNK_MAX_BYTES} bytes', status=413)
+
+    with transaction.atomic():
+        upload = RecordingUpload.objects.select_for_update().filter(upload_id=upload_id).first()
+        if upload is None:
+            raise RecordingUploadError('Upload not found', status=404)
+        if upload.status != RecordingUpload.STATUS_UPLOADING:
+            raise RecordingUploadError('Upload already finalized', status=409, offset=upload.received_bytes)
+        if offset != upload.received_bytes:
+            raise RecordingUploadError('Chunk does not start at the current offset', status=409,
+                                       offset=upload.received_bytes)
+
+        path = _media_path(upload.part_path)
+        with open(path, 'r+b' if os.path.exists(path) else 'w+b') as f:
+            # Anything past the recorded offset is left over from a chunk that broke off
+            f.seek(upload.received_bytes)
+            f.truncate()
+            try:
+                digest = _copy(stream, f, length)
+                if chunk_sha256 and chunk_sha256.lower() != digest:
+                    raise RecordingUploadError('Chunk checksum mismatch', status=422, offset=upload.received_bytes)
+            except Exception:
+                f.seek(upload.received_bytes)
+                f.truncate()
+                raise
+
+        upload.received_bytes += length
+        upload.chunk_count += 1
+        upload.save(update_fields=['received_bytes', 'chunk_count', 'updated_at'])
+    return upload, digest
+
+
+def _copy(stream, f, length):
+    """Copy exactly `length` bytes from the request stream to `f`; returns their SHA-256"""
+    digest = hashlib.sha256()
+    remaining = length
+    while remaining:
+        piece = stream.read(min(CHUNK_READ_BYTES, remaining))
+        if not piece:
+            raise RecordingUploadError('Chunk ended before Content-Length bytes')
+        f.write(piece)
+        digest.update(piece)
+        remaining -= len(piece)
+    return digest.hexdigest()
+
+
+def finalize_upload(upload_id, duration=0):
+    """Move the assembled recording into place and record it on the interview (repeat calls are no-ops)"""
+    with transaction.atomic():
+        upload = (RecordingUpload.objects.select_for_update().select_related('interview')
+                  .filter(upload_id=upload_id).first())
+        if upload is None:
+            raise RecordingUploadError('Upload not found', status=404)
+        if upload.status == RecordingUpload.STATUS_COMPLETE:
+            return upload
+        if not upload.received_bytes:
+            raise RecordingUploadError('Nothing has been uploaded')
+
+        interview = upload.interview
+        part = _media_path(upload.part_path)
+        with open(part, 'r+b') as f:
+            # Drop the tail of a chunk whose request died before it was cut off
+            f.truncate(upload.received_bytes)
+            upload.sha256 = file_sha256(f)
+
+        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"interview_{interview.uuid}_{timestamp}{_extension(upload.content_type)}"
+        upload.recording_path = os.path.join(RECORDINGS_DIR, filename)
+        upload.status = RecordingUpload.STATUS_COMPLETE
+        upload.save(update_fields=['sha256', 'recording_path', 'status', 'updated_at'])
+        attach_recording(interview, upload.recording_path, filename, upload.received_bytes, duration)
+        # Last, so a failure above leaves the upload resumable
+        os.replace(part, _media_path(upload.recording_path))
+
+    logger.info(f"Recording upload {upload.upload_id} finalized: {upload.recording_path} "
+                f"({upload.received_bytes} bytes in {upload.chunk_count} chunks)")
+    return upload
+
+
+def attach_recording(interview, relative_path, filename, file_size, duration):
+    """Record a saved recording file on the interview"""
+    try:
+        duration = float(duration or 0)
+    except (TypeError, ValueError):
+        duration = 0.0
+    recording_info = {
+        'recording_path': relative_path,
+        'duration': duration,
+        'file_size': file_size,
+        'recorded_at': timezone.now().isoformat(),
+        'filename': filename
+    }
+
+    interview.recording_data = json.dumps(recording_info)
+    interview.recording_path = relative_path
+    interview.recording_duration = duration
+    interview.is_recorded = True
+
+    # Also update transcript with recording info
+    current_transcript = interview.transcript or ''
+    interview.transcript = current_transcript + f"\n\nRecording saved: {json.dumps(recording_info)}"
+
+    interview.save()
+    return recording_info
@@ -0,0 +1,140 @@
+"""
+Extracted resume text, stored once per file content
+
+When a Profile or Candidate gets a new resume file, its SHA-256 is taken
+from the upload (resume_sha256) and the extract_resume_text task fills the
+ResumeText row for that hash. The interview view then reads the text with
+one indexed lookup instead of opening and parsing the file on every request.
+Identical files uploaded for several candidates share one row.
+
+Resumes uploaded before this existed (or whose task has not run yet) are
+extracted inline once, and the row is stored for the next request;
+`python manage.py extract_resumes` backfills them ahead of time.
+
+Every stored resume file is also listed in ResumeFile by its normalized
+name and content hash. When a Profile or Candidate points at a file that
+is gone, the same resume is found there with an indexed query instead of
+a directory scan. Uploads add their row; `python manage.py
+reconcile_resume_files` picks up files copied in by hand and reports (or
+repairs) resumes whose file is missing.
+"""
+import hashlib
+import logging
+import os
+import re
+
+from django.core.files.storage import default_storage
+from django.db.models import Q
+
+from .models import ResumeFile, ResumeText
+from .utils.resume_reader import extract_resume
+
+# Directories (under MEDIA_ROOT) the resume upload fields write to
+RESUME_DIRS = ('resumes', 'candidate_resumes')
+
+# Storage adds "_<7 random characters>" before the extension when a name is taken
+_STORAGE_SUFFIX = re.compile(r'_[A-Za-z0-9]{7}$')
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(file_obj):
+    """SHA-256 of a file or upload, read in chunks; the position is reset afterwards"""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(1024 * 1024), b''):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def lookup_resume_text(sha256):
+    """Stored text for a content hash, or None"""
+    if not sha256:
+        return None
+    return ResumeText.objects.filter(sha256=sha256).values_list('text', flat=True).first()
+
+
+def store_resume_text(sha256, file_obj, name=None):
+    """Extract a resume and store it under its hash (existing rows are kept); returns the ResumeText"""
+    existing = ResumeText.objects.filter(sha256=sha256).first()
+    if existing:
+        return existing
+    file_obj.seek(0)
+    text, page_count = extract_resume(file_obj)
+    row, _ = ResumeText.objects.get_or_create(sha256=sha256, defaults={
+        'text': text,
+        'page_count': page_count,
+        'char_count': len(text),
+        'source_name': (name or file_obj.name or '')[-255:],
+    })
+    return row
+
+
+def normalize_resume_name(name):
+    """'candidate_resumes/Asha_Bose_G5KYK8S.PDF' -> 'asha_bose.pdf'"""
+    stem, ext = os.path.splitext(os.path.basename(name or ''))
+    return f"{_STORAGE_SUFFIX.sub('', stem)}{ext}".lower()[:255]
+
+
+def index_resume_file(path, sha256='', size=0):
+    """Add or refresh the ResumeFile row for a stored file"""
+    row, _ = ResumeFile.objects.update_or_create(path=path, defaults={
+        'normalized_name': normalize_resume_name(path),
+        'sha256': sha256,
+        'size': size,
+        'is_present': True,
+    })
+    return row
+
+
+def find_resume_file(name, sha256=''):
+    """
+    Storage name of a present file with the same content (preferred) or the same normalized
+    name as `name`, or None. Index rows whose file has since disappeared are marked missing.
+    """
+    match = Q(normalized_name=normalize_resume_name(name))
+    if sha256:
+        match |= Q(sha256=sha256)
+    rows = ResumeFile.objects.filter(match, is_present=True).exclude(path=name)
+    for row in sorted(rows[:10], key=lambda row: not (sha256 and row.sha256 == sha256)):
+        if default_storage.exists(row.path):
+            return row.path
+        ResumeFile.objects.filter(pk=row.pk).update(is_present=False)
+    return None
+
+
+def resolve_resume_path(owner):
+    """Storage name of the owner's resume file: its own when present, else the indexed replacement"""
+    resume = owner.resume
+    if not resume:
+        return None
+    if default_storage.exists(resume.name):
+        return resume.name
+    path = find_resume_file(resume.name, owner.resume_sha256)
+    if path:
+        logger.info(f"Found replacement resume file {path} for missing {resume.name}")
+    return path
+
+
+def resume_text_for(owner):
+    """
+    Text of a Profile's or Candidate's resume. Normally one lookup by resume_sha256;
+    otherwise the file is read once, hashed and stored. None when no file is found.
+    """
+    text = lookup_resume_text(owner.resume_sha256)
+    if text is not None:
+        return text
+
+    path = resolve_resume_path(owner)
+    if not path:
+        return None
+    with default_storage.open(path, 'rb') as file_obj:
+        sha256 = file_sha256(file_obj)
+        row = store_resume_text(sha256, file_obj, path)
+        index_resume_file(path, sha256, file_obj.size)
+    if owner.resume_sha256 != sha256:
+        type(owner).objects.filter(pk=owner.pk, resume=owner.resume.name).update(resume_sha256=sha256)
+        owner.resume_sha256 = sha256
+    logger.info(f"📄 Extracted resume {path} inline ({row.char_count} chars)")
+    return row.text
@@ -1,9 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import Application, Interview, Profile
+from .models import Application, Candidate, Interview, Job, Profile
 
 # AUTOMATIC EMAIL SENDING WITH GMAIL SMTP
 # Using threading and timeouts to prevent worker crashes
@@ -25,6 +25,110 @@ def create_profile(sender, instance, created, **kwargs):
         )
        
        
+# Resume uploads: hash and index the new file, extract its text in the background (see resume_store.py)
+
+@receiver(pre_save, sender=Profile)
+@receiver(pre_save, sender=Candidate)
+def hash_uploaded_resume(sender, instance, **kwargs):
+    resume = instance.resume
+    if not resume:
+        instance.resume_sha256 = ''
+    elif not resume._committed:
+        # A new upload, not yet written to storage
+        from .resume_store import file_sha256
+        instance.resume_sha256 = file_sha256(resume)
+        instance._resume_uploaded = True
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Candidate)
+def queue_resume_text(sender, instance, **kwargs):
+    if getattr(instance, '_resume_uploaded', False):
+        instance._resume_uploaded = False
+        try:
+            from .resume_store import index_resume_file
+            from .tasks import enqueue_resume_text
+            index_resume_file(instance.resume.name, instance.resume_sha256, instance.resume.size)
+            enqueue_resume_text(instance)
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"❌ Could not queue resume text extraction for {instance}: {str(e)}")
+
+
+# Job search: keep the full-text index of a job in step with its fields and tags (see job_search.py)
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def reindex_job(sender, instance, **kwargs):
+    from .job_search import schedule_index_jobs
+    schedule_index_jobs([instance.pk])
+
+
+@receiver(m2m_changed, sender=Job.tags.through)
+def reindex_job_tags(sender, instance, action, **kwargs):
+    if isinstance(instance, Job) and action in ('post_add', 'post_remove', 'post_clear'):
+        from .job_search import schedule_index_jobs
+        schedule_index_jobs([instance.pk])
+
+
+# Skills: link the skill text of a job or profile to canonical Skill rows (see skills.py, skill_matching.py)
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Profile)
+def link_canonical_skills(sender, instance, update_fields=None, **kwargs):
+    from .skill_matching import JOBS, PROFILES, note_owner_saved
+    text_field = 'required_skills' if sender is Job else 'skills'
+    changed = False
+    if update_fields is None or text_field in update_fields:
+        try:
+            from .skills import sync_skills
+            changed = sync_skills(instance, getattr(instance, text_field))
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"❌ Could not link skills of {instance}: {str(e)}")
+    # A job's status decides whether it is matched at all
+    if sender is Job:
+        note_owner_saved(JOBS, instance.pk, changed,
+                         lambda: instance.status == 'active' and instance.canonical_skills.exists())
+    else:
+        note_owner_saved(PROFILES, instance.pk, changed,
+                         lambda: not instance.user.is_recruiter and instance.canonical_skills.exists())
+
+
+# Recruiter dashboard counters: drop the recruiter's cached stats when their data changes (see dashboard_stats.py)
+
+def _drop_dashboard_stats(recruiter_id):
+    from django.db import transaction
+    from .dashboard_stats import invalidate_recruiter_stats
+    transaction.on_commit(lambda: invalidate_recruiter_stats(recruiter_id))
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_dashboard_stats(sender, instance, **kwargs):
+    _drop_dashboard_stats(instance.posted_by_id)
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def candidate_dashboard_stats(sender, instance, **kwargs):
+    _drop_dashboard_stats(instance.added_by_id)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Application)
+@receiver(post_delete, sender=Interview)
+def job_activity_dashboard_stats(sender, instance, update_fields=None, **kwargs):
+    from .dashboard_stats import INTERVIEW_STATS_FIELDS
+    if sender is Interview and update_fields is not None and not INTERVIEW_STATS_FIELDS.intersection(update_fields):
+        return
+    recruiter_id = Job.objects.filter(pk=instance.job_id).values_list('posted_by_id', flat=True).first()
+    _drop_dashboard_stats(recruiter_id)
+
+
 # 2. Application Submitted Email - TEMPORARILY DISABLED
 
 # @receiver(post_save, sender = Application)
@@ -73,16 +177,17 @@ def send_interview_email(sender, instance, created, **kwargs):
     """Send interview email when interview is created"""
     if created:
         try:
-            from .email_utils import send_interview_email_async
+            from .email_utils import send_interview_link_email
             import logging
             logger = logging.getLogger(__name__)
             
             logger.info(f"📧 Sending interview email for {instance.candidate_email}")
             
-            # Send email asynchronously to avoid blocking
-            send_interview_email_async(instance)
+            # Queue the email in the outbox (committed together with the interview)
+            result = send_interview_link_email(instance)
             
-            logger.info(f"✅ Interview email process initiated for {instance.candidate_email}")
+            if result['success']:
+                logger.info(f"✅ Interview email queued for {instance.candidate_email}")
             
         except Exception as e:
             import logging
@@ -0,0 +1,251 @@
+"""
+Candidate-job matching on canonical skills
+
+Ranks every job seeker's profile for a job (best_candidates) or every open
+job for a profile (best_jobs) by the skills they share, using the Skill
+links kept by skills.py.
+
+Each direction is a SkillIndex: an inverted index loaded from the link table
+into NumPy arrays, one sorted run of owner rows per skill. Scoring a query
+concatenates the runs of its skills and sums per-owner weights with one
+np.bincount over all owners, then takes the top rows with np.argpartition,
+so a query costs O(rows holding the skills) and no per-owner Python loop.
+It takes milliseconds at 100k profiles.
+
+A skill's weight is its inverse document frequency: a rare skill counts more
+than one everybody lists. The score is the weighted share of the query's
+skills the owner has, from 0 to 1, so a profile holding every required skill
+scores 1 however many other skills it lists.
+
+Indexes are built per process on first use and rebuilt when older than
+SKILL_MATCH_REFRESH_SECONDS, or on the next query after a save changed
+what an index holds: an owner's skills, or whether a job is listed at all
+(note_owner_saved() - most job saves change neither). Only the first build
+makes a query wait; later rebuilds run in a background thread while queries
+keep using the previous index. Other processes see a change within the
+refresh period.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+
+from .models import Job, Profile
+
+logger = logging.getLogger(__name__)
+
+SKILL_MATCH_REFRESH_SECONDS = getattr(settings, 'SKILL_MATCH_REFRESH_SECONDS', 300)
+DEFAULT_MATCH_LIMIT = 20
+
+
+class SkillIndex:
+    """Owners (profiles or jobs) by skill, as NumPy arrays"""
+
+    def __init__(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        self.owner_ids, rows = np.unique(pairs[:, 0], return_inverse=True)
+        # By skill, then by owner row: each skill's run of rows is sorted
+        order = np.lexsort((rows, pairs[:, 1]))
+        self.skill_ids, self._starts, self._counts = np.unique(
+            pairs[order, 1], return_index=True, return_counts=True)
+        self._rows = rows[order].astype(np.int32)
+        owners = len(self.owner_ids)
+        self.idf = np.log((1.0 + owners) / (1.0 + self._counts)) + 1.0
+        # Weight of a skill nobody in the index has; it still counts against coverage
+        self.unknown_idf = np.log(1.0 + owners) + 1.0
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.owner_ids)
+
+    def __contains__(self, owner_id):
+        return _contains(self.owner_ids, owner_id)
+
+    def _positions(self, skill_ids):
+        skill_ids = np.unique(np.asarray(list(skill_ids), dtype=np.int64))
+        positions = np.searchsorted(self.skill_ids, skill_ids)
+        positions[positions == len(self.skill_ids)] = 0
+        known = (self.skill_ids[positions] == skill_ids) if len(self.skill_ids) else np.zeros(len(skill_ids), bool)
+        return skill_ids, positions[known], int((~known).sum())
+
+    def _rows_of(self, position):
+        start = self._starts[position]
+        return self._rows[start:start + self._counts[position]]
+
+    def rank(self, skill_ids, limit=DEFAULT_MATCH_LIMIT, exclude_ids=()):
+        """
+        [(owner_id, score, [matched skill ids])] for the owners sharing at least one skill,
+        best first (ties: more matched skills, then lower id)
+        """
+        skill_ids, positions, unknown = self._positions(skill_ids)
+        if not len(positions) or not len(self):
+            return []
+        total = self.idf[positions].sum() + unknown * self.unknown_idf
+
+        runs = [self._rows_of(position) for position in positions]
+        rows = np.concatenate(runs)
+        weights = np.repeat(self.idf[positions], [len(run) for run in runs])
+        scores = np.bincount(rows, weights=weights, minlength=len(self)) / total
+        matched = np.bincount(rows, minlength=len(self))
+        exclude_ids = np.asarray(list(exclude_ids), dtype=np.int64)
+        if len(exclude_ids):
+            at = np.searchsorted(self.owner_ids, exclude_ids)
+            at = at[at < len(self)]
+            scores[at[np.isin(self.owner_ids[at], exclude_ids)]] = 0
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # lexsort sorts by the last key first
+        candidates = candidates[np.lexsort((candidates, -matched[candidates], -scores[candidates]))]
+
+        results = []
+        for row in candidates:
+            owned = [int(skill_ids[i]) for i, run in enumerate(runs) if _contains(run, row)]
+            results.append((int(self.owner_ids[row]), float(scores[row]), owned))
+        return results
+
+
+def _contains(sorted_rows, row):
+    i = np.searchsorted(sorted_rows, row)
+    return i < len(sorted_rows) and sorted_rows[i] == row
+
+
+PROFILES = 'profiles'
+JOBS = 'jobs'
+
+_indexes = {}  # PROFILES / JOBS -> SkillIndex
+_stale = set()
+_rebuilding = set()
+_indexes_lock = threading.Lock()
+_first_build_lock = threading.Lock()
+
+
+def _load_index(kind):
+    if kind == PROFILES:
+        # Job seekers only; recruiters have profiles too
+        links = (Profile.canonical_skills.through.objects
+                 .filter(profile__user__is_recruiter=False)
+                 .values_list('profile_id', 'skill_id'))
+    else:
+        links = (Job.canonical_skills.through.objects
+                 .filter(job__status='active')
+                 .values_list('job_id', 'skill_id'))
+    return SkillIndex(list(links.iterator(chunk_size=10000)))
+
+
+def _build(kind):
+    start = time.monotonic()
+    index = _load_index(kind)
+    logger.info(f"Skill index of {kind} built: {len(index)} {kind}, {len(index.skill_ids)} skills "
+                f"in {time.monotonic() - start:.2f}s")
+    return index
+
+
+def _rebuild(kind):
+    try:
+        index = _build(kind)
+        with _indexes_lock:
+            _indexes[kind] = index
+    except Exception as e:
+        logger.error(f"Could not rebuild the skill index of {kind}: {e}")
+        with _indexes_lock:
+            _stale.add(kind)
+    finally:
+        with _indexes_lock:
+            _rebuilding.discard(kind)
+        # The thread ends here; its database connection must not stay open
+        connections.close_all()
+
+
+def get_index(kind):
+    """
+    The SkillIndex of profiles or of open jobs. A stale or expired index is still returned
+    while a background thread builds its replacement.
+    """
+    with _indexes_lock:
+        index = _indexes.get(kind)
+        if index is not None:
+            if ((kind in _stale or time.monotonic() - index.built_at > SKILL_MATCH_REFRESH_SECONDS)
+                    and kind not in _rebuilding):
+                # Changes made while it loads mark the index stale again
+                _stale.discard(kind)
+                _rebuilding.add(kind)
+                threading.Thread(target=_rebuild, args=(kind,), name=f'skill-index-{kind}', daemon=True).start()
+            return index
+
+    with _first_build_lock:
+        return _indexes.get(kind) or rebuild_index(kind)
+
+
+def rebuild_index(kind):
+    """Build an index now and use it from here on"""
+    index = _build(kind)
+    with _indexes_lock:
+        _stale.discard(kind)
+        _indexes[kind] = index
+    return index
+
+
+def invalidate_index(kind):
+    """Rebuild an index on its next use (skills of a profile or a job changed in this process)"""
+    with _indexes_lock:
+        _stale.add(kind)
+
+
+def note_owner_saved(kind, owner_id, skills_changed, listed):
+    """
+    A profile or job was saved: rebuild its index when its skills changed, or when it is in the
+    index but should not be (a closed job) or the other way round. `listed` is a callable
+    answering whether it belongs in the index now; it is only called when the index is built.
+    """
+    with _indexes_lock:
+        index = _indexes.get(kind)
+    if index is None:
+        return
+    if skills_changed or (owner_id in index) != listed():
+        invalidate_index(kind)
+
+
+def _matches(skills, ranked, owners, key):
+    matches = []
+    for owner_id, score, owned in ranked:
+        owner = owners.get(owner_id)
+        if owner is None:
+            continue
+        owned = set(owned)
+        matches.append({
+            key: owner,
+            'score': round(score, 3),
+            'percent': round(score * 100),
+            'matched': [name for skill_id, name in skills.items() if skill_id in owned],
+            'missing': [name for skill_id, name in skills.items() if skill_id not in owned],
+        })
+    return matches
+
+
+def best_candidates(job, limit=DEFAULT_MATCH_LIMIT):
+    """
+    Job seekers' profiles ranked for a job:
+    [{'profile', 'score' (0-1), 'percent', 'matched': [skill names], 'missing': [skill names]}]
+    """
+    skills = dict(job.canonical_skills.order_by('name').values_list('id', 'name'))
+    if not skills:
+        return []
+    ranked = get_index(PROFILES).rank(skills, limit)
+    profiles = Profile.objects.select_related('user').in_bulk([owner_id for owner_id, _, _ in ranked])
+    return _matches(skills, ranked, profiles, 'profile')
+
+
+def best_jobs(profile, limit=DEFAULT_MATCH_LIMIT):
+    """Open jobs ranked for a profile, without those its user applied to; like best_candidates with 'job'"""
+    skills = dict(profile.canonical_skills.order_by('name').values_list('id', 'name'))
+    if not skills:
+        return []
+    applied = profile.user.application_set.values_list('job_id', flat=True)
+    ranked = get_index(JOBS).rank(skills, limit, exclude_ids=list(applied))
+    jobs = Job.objects.in_bulk([owner_id for owner_id, _, _ in ranked])
+    return _matches(skills, ranked, jobs, 'job')
@@ -0,0 +1,136 @@
+"""
+Canonical skills
+
+Profile.skills and Job.required_skills are free text ("JS, ReactJS,
+node.js"). parse_skills() turns them into canonical names: split on commas,
+semicolons, slashes, pipes and new lines, lowercased, whitespace collapsed,
+surrounding punctuation dropped and aliases resolved through SKILL_ALIASES
+("js" -> "javascript", "k8s" -> "kubernetes"). Each name is one Skill row.
+
+Job.canonical_skills and Profile.canonical_skills link the records to their
+Skill rows. The link tables are the inverted index (skill -> jobs, skill ->
+profiles) that skill_matching.py loads to rank candidates for a job and
+jobs for a candidate. signals.py calls sync_skills() when a Job or Profile
+is saved; `python manage.py rebuild_skill_index` re-parses every record
+(after SKILL_ALIASES changes, for example).
+
+The text fields are left as they are: forms, the interview prompts and the
+templates keep using them.
+"""
+import re
+
+from .models import Skill
+
+MAX_SKILL_LENGTH = 100
+MAX_SKILLS = 50
+
+# Written form -> canonical name. Keys are already lowercased and whitespace-collapsed.
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'es6': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'python 3': 'python',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'angular.js': 'angular',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'expressjs': 'express',
+    'express.js': 'express',
+    'nextjs': 'next.js',
+    'golang': 'go',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'mssql': 'sql server',
+    'ms sql': 'sql server',
+    'k8s': 'kubernetes',
+    'gcp': 'google cloud',
+    'google cloud platform': 'google cloud',
+    'amazon web services': 'aws',
+    'ms azure': 'azure',
+    'microsoft azure': 'azure',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'cv': 'computer vision',
+    'drf': 'django rest framework',
+    'django rest': 'django rest framework',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'cicd': 'ci/cd',
+    'html5': 'html',
+    'css3': 'css',
+    'rest': 'rest api',
+    'restful': 'rest api',
+    'restful api': 'rest api',
+    'rest apis': 'rest api',
+    'ux': 'ux design',
+    'ui': 'ui design',
+}
+
+# Placeholders that are not skills (Job.required_skills defaults to "Not specified")
+IGNORED_SKILLS = {'not specified', 'none', 'n/a', 'na', 'other', 'others', 'etc'}
+
+# "ci/cd" and "tcp/ip" are skills, not two; other slashes separate skills
+_KEEP_SLASH = {'ci/cd', 'tcp/ip', 'pl/sql', 'a/b testing'}
+_SEPARATORS = re.compile(r'[,;|\n\r\t•]+')
+_STRIP = ' :-_*"\'()[]'
+
+
+def canonical_skill(text):
+    """Canonical name of one written skill, or '' when it is not one"""
+    # A leading dot is kept (".net"), a trailing one ends a sentence
+    name = ' '.join((text or '').lower().split()).strip(_STRIP).rstrip('.')
+    if not name or len(name) > MAX_SKILL_LENGTH:
+        return ''
+    name = SKILL_ALIASES.get(name, name)
+    return '' if name in IGNORED_SKILLS else name
+
+
+def parse_skills(text):
+    """Canonical names in a free-text skill list, in order, without duplicates"""
+    names = []
+    for part in _SEPARATORS.split(text or ''):
+        lowered = ' '.join(part.lower().split())
+        pieces = [lowered] if lowered in _KEEP_SLASH or '/' not in lowered else lowered.split('/')
+        for piece in pieces:
+            name = canonical_skill(piece)
+            if name and name not in names:
+                names.append(name)
+    return names[:MAX_SKILLS]
+
+
+def get_skills(names):
+    """Skill rows for canonical names, creating the missing ones"""
+    if not names:
+        return []
+    existing = {skill.name: skill for skill in Skill.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in existing]
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        existing.update((skill.name, skill) for skill in Skill.objects.filter(name__in=missing))
+    return [existing[name] for name in names if name in existing]
+
+
+def sync_skills(instance, text):
+    """Point a Job's or Profile's canonical_skills at the skills in `text`; True when they changed"""
+    wanted = {skill.id for skill in get_skills(parse_skills(text))}
+    current = set(instance.canonical_skills.values_list('id', flat=True))
+    if wanted == current:
+        return False
+    instance.canonical_skills.set(wanted)
+    return True
@@ -3,16 +3,20 @@ Streaming Voice Agent for Real-time Audio Processing
 """
 import json
 import asyncio
+import logging
 import time
-from django.http import StreamingHttpResponse, JsonResponse
+from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .utils.interview_ai_nvidia import ask_ai_question
-from .tts import generate_tts
+from .utils.async_clients import event_stream_response
+from .utils.interview_ai_nvidia import async_stream_ai_question, SentenceChunker
+from .tts import async_generate_tts, get_tts_duration
+
+logger = logging.getLogger(__name__)
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def streaming_voice_chat(request):
+async def streaming_voice_chat(request):
     """Streaming voice chat with real-time responses"""
     try:
         data = json.loads(request.body)
@@ -22,54 +26,111 @@ def streaming_voice_chat(request):
         if not message:
             return JsonResponse({'success': False, 'error': 'No message provided'})
         
-        def generate_streaming_response():
+        async def generate_streaming_response():
             # Start timing
             start_time = time.time()
             
             # Send initial response
-            yield f"data: {json.dumps({'type': 'start', 'message': 'Processing...'})}\n\n"
+            yield {'type': 'start', 'message': 'Processing...'}
             
-            # Generate AI response
+            # Stream AI tokens; each finished sentence goes to TTS while later tokens arrive
             llm_start = time.time()
-            ai_response = ask_ai_question(
-                message,
-                candidate_name="User",
-                job_title="Voice Chat",
-                company_name="Streaming Lab"
-            )
-            llm_latency = int((time.time() - llm_start) * 1000)
+            chunker = SentenceChunker()
+            pending_audio = []  # (index, sentence, submitted_at, task) in speaking order
+            first_audio_latency = None
             
-            # Send AI response
-            yield f"data: {json.dumps({'type': 'text', 'content': ai_response, 'llm_latency': llm_latency})}\n\n"
+            async def drain_audio(block=False):
+                nonlocal first_audio_latency
+                events = []
+                while pending_audio and (block or pending_audio[0][3].done()):
+                    index, sentence, submitted_at, task = pending_audio.pop(0)
+                    try:
+                        audio_url = await task
+                    except Exception as tts_error:
+                        logger.error(f"Sentence TTS failed: {tts_error}")
+                        audio_url = None
+                    now = time.time()
+                    if first_audio_latency is None and audio_url:
+                        first_audio_latency = int((now - start_time) * 1000)
+                    events.append({
+                        'type': 'audio',
+                        'index': index,
+                        'text': sentence,
+                        'url': audio_url,
+                        'audio_duration': get_tts_duration(audio_url),
+                        'tts_latency': int((now - submitted_at) * 1000),
+                        'time_to_first_audio': first_audio_latency,
+                        'total_latency': int((now - start_time) * 1000)
+                    })
+                return events
             
-            # Generate TTS
-            tts_start = time.time()
-            audio_url = generate_tts(ai_response)
-            tts_latency = int((time.time() - tts_start) * 1000)
+            sentence_count = 0
             
-            # Send audio response
-            total_latency = int((time.time() - start_time) * 1000)
-            yield f"data: {json.dumps({'type': 'audio', 'url': audio_url, 'tts_latency': tts_latency, 'total_latency': total_latency})}\n\n"
+            def queue_sentences(sentences):
+                """Start TTS for the accepted sentences; returns their text_delta events"""
+                nonlocal sentence_count
+                events = []
+                for sentence in sentences:
+                    pending_audio.append((sentence_count, sentence, time.time(), asyncio.create_task(async_generate_tts(sentence))))
+                    # Only text that will be spoken: the deltas add up to the final 'text' event
+                    events.append({'type': 'text_delta', 'content': (' ' if sentence_count else '') + sentence})
+                    sentence_count += 1
+                return events
+            
+            try:
+                token_stream = async_stream_ai_question(
+                    message,
+                    candidate_name="User",
+                    job_title="Voice Chat",
+                    company_name="Streaming Lab"
+                )
+                first_token_latency = None
+                async for delta in token_stream:
+                    if first_token_latency is None:
+                        first_token_latency = int((time.time() - llm_start) * 1000)
+                    
+                    for event in queue_sentences(chunker.feed(delta)):
+                        yield event
+                    
+                    for event in await drain_audio():
+                        yield event
+                    
+                    if chunker.done:
+                        # clean_text keeps two sentences - stop generating
+                        await token_stream.aclose()
+                        break
+                
+                for event in queue_sentences(chunker.flush()):
+                    yield event
+            except Exception as e:
+                logger.error(f"Streaming LLM error: {e}")
+                for _, _, _, task in pending_audio:
+                    task.cancel()
+                yield {'type': 'error', 'error': str(e)}
+                return
+            
+            llm_latency = int((time.time() - llm_start) * 1000)
+            ai_response = chunker.text
+            
+            # Send full AI response (same shape as before)
+            yield {'type': 'text', 'content': ai_response, 'llm_latency': llm_latency, 'first_token_latency': first_token_latency}
+            
+            # Send remaining per-sentence audio in order
+            for event in await drain_audio(block=True):
+                yield event
             
             # Send completion
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
-        
-        response = StreamingHttpResponse(
-            generate_streaming_response(),
-            content_type='text/event-stream'
-        )
-        response['Cache-Control'] = 'no-cache'
-        response['Connection'] = 'keep-alive'
-        response['Access-Control-Allow-Origin'] = '*'
+            total_latency = int((time.time() - start_time) * 1000)
+            yield {'type': 'complete', 'llm_latency': llm_latency, 'time_to_first_audio': first_audio_latency, 'total_latency': total_latency}
         
-        return response
+        return event_stream_response(request, generate_streaming_response())
         
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
 @csrf_exempt  
 @require_http_methods(["POST"])
-def streaming_tts_only(request):
+async def streaming_tts_only(request):
     """Streaming TTS generation only"""
     try:
         data = json.loads(request.body)
@@ -79,26 +140,18 @@ def streaming_tts_only(request):
         if not text:
             return JsonResponse({'success': False, 'error': 'No text provided'})
         
-        def generate_tts_stream():
+        async def generate_tts_stream():
             start_time = time.time()
             
-            yield f"data: {json.dumps({'type': 'start', 'message': 'Generating audio...'})}\n\n"
+            yield {'type': 'start', 'message': 'Generating audio...'}
             
-            audio_url = generate_tts(text)
+            audio_url = await async_generate_tts(text)
             latency = int((time.time() - start_time) * 1000)
             
-            yield f"data: {json.dumps({'type': 'audio', 'url': audio_url, 'latency': latency})}\n\n"
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
-        
-        response = StreamingHttpResponse(
-            generate_tts_stream(),
-            content_type='text/event-stream'
-        )
-        response['Cache-Control'] = 'no-cache'
-        response['Connection'] = 'keep-alive'
-        response['Access-Control-Allow-Origin'] = '*'
+            yield {'type': 'audio', 'url': audio_url, 'audio_duration': get_tts_duration(audio_url), 'latency': latency}
+            yield {'type': 'complete'}
         
-        return response
+        return event_stream_response(request, generate_tts_stream())
         
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
\ No newline at end of file
+        return JsonResponse({'success': False, 'error': str(e)})
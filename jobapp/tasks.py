@@ -0,0 +1,243 @@
+"""
+Database-backed background task queue
+
+Tasks are rows in BackgroundTask. Web requests enqueue them; the worker
+(`python manage.py run_tasks`) claims them with a time-limited lease, runs the
+registered handler and retries failures with exponential backoff. A task whose
+worker dies is picked up again once its lease expires.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundTask, Interview
+
+logger = logging.getLogger(__name__)
+
+TASK_LEASE_SECONDS = getattr(settings, 'TASK_QUEUE_LEASE_SECONDS', 120)
+TASK_RETRY_BASE_SECONDS = getattr(settings, 'TASK_QUEUE_RETRY_BASE_SECONDS', 10)
+TASK_RETRY_MAX_SECONDS = getattr(settings, 'TASK_QUEUE_RETRY_MAX_SECONDS', 600)
+# Pre-rendered interview phrases stay pinned this long past the interview's duration
+PHRASE_PIN_GRACE_SECONDS = getattr(settings, 'INTERVIEW_PHRASE_PIN_GRACE_SECONDS', 2 * 60 * 60)
+
+TASK_REGISTRY = {}
+
+
+def register_task(name):
+    """Register a function as the handler for a task name"""
+    def decorator(func):
+        TASK_REGISTRY[name] = func
+        return func
+    return decorator
+
+
+def enqueue_task(task_name, payload=None, idempotency_key=None, max_attempts=5, delay_seconds=0, rerun_finished=False):
+    """
+    Queue a task; with an idempotency key an existing task is returned instead of a duplicate
+    (or, with rerun_finished, queued again when it is done or failed)
+    """
+    if task_name not in TASK_REGISTRY:
+        raise ValueError(f"Unknown task: {task_name}")
+
+    fields = {
+        'task_name': task_name,
+        'payload': payload or {},
+        'max_attempts': max_attempts,
+        'run_after': timezone.now() + timedelta(seconds=delay_seconds),
+    }
+    if idempotency_key:
+        task, created = BackgroundTask.objects.get_or_create(idempotency_key=idempotency_key, defaults=fields)
+        if not created:
+            if rerun_finished and task.status in (BackgroundTask.STATUS_DONE, BackgroundTask.STATUS_FAILED):
+                return requeue_task(task)
+            logger.info(f"Task {idempotency_key} already queued ({task.status})")
+            return task
+    else:
+        task = BackgroundTask.objects.create(**fields)
+
+    logger.info(f"📥 Queued task {task_name} #{task.id}")
+    return task
+
+
+def requeue_task(task):
+    """Run a done or failed task again, with a fresh attempt budget"""
+    now = timezone.now()
+    BackgroundTask.objects.filter(
+        id=task.id, status__in=[BackgroundTask.STATUS_DONE, BackgroundTask.STATUS_FAILED]
+    ).update(status=BackgroundTask.STATUS_PENDING, attempts=0, run_after=now, locked_by='',
+             locked_until=None, completed_at=None, updated_at=now)
+    task.refresh_from_db()
+    logger.info(f"🔁 Requeued task {task.task_name} #{task.id} ({task.status})")
+    return task
+
+
+def get_task(idempotency_key):
+    """Look up a task by its idempotency key"""
+    return BackgroundTask.objects.filter(idempotency_key=idempotency_key).first()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_tasks(worker_id, limit=5, lease_seconds=TASK_LEASE_SECONDS):
+    """Lease up to `limit` runnable tasks (pending and due, or running with an expired lease)"""
+    now = timezone.now()
+    runnable = (
+        Q(status=BackgroundTask.STATUS_PENDING, run_after__lte=now) |
+        Q(status=BackgroundTask.STATUS_RUNNING, locked_until__lt=now)
+    )
+    claimed_ids = []
+    with transaction.atomic():
+        candidate_ids = list(
+            BackgroundTask.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by('run_after')
+            .values_list('id', flat=True)[:limit]
+        )
+        for task_id in candidate_ids:
+            # Conditional update keeps the claim safe on databases without SKIP LOCKED
+            updated = BackgroundTask.objects.filter(runnable, id=task_id).update(
+                status=BackgroundTask.STATUS_RUNNING,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=lease_seconds),
+                attempts=F('attempts') + 1,
+                updated_at=now,
+            )
+            if updated:
+                claimed_ids.append(task_id)
+    return list(BackgroundTask.objects.filter(id__in=claimed_ids).order_by('run_after'))
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... capped"""
+    return min(TASK_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), TASK_RETRY_MAX_SECONDS)
+
+
+def run_task(task, worker_id):
+    """Run one claimed task and record the outcome. Returns True on success."""
+    handler = TASK_REGISTRY.get(task.task_name)
+    owned = BackgroundTask.objects.filter(id=task.id, locked_by=worker_id)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for task {task.task_name}")
+        if task.attempts > task.max_attempts:
+            raise RuntimeError("Lease expired too many times")
+        handler(**task.payload)
+    except Exception as e:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            owned.update(status=BackgroundTask.STATUS_FAILED, last_error=error,
+                         locked_until=None, completed_at=now, updated_at=now)
+            logger.error(f"❌ Task {task.task_name} #{task.id} failed permanently: {e}")
+        else:
+            delay = retry_delay(task.attempts)
+            owned.update(status=BackgroundTask.STATUS_PENDING, last_error=error, locked_until=None,
+                         run_after=now + timedelta(seconds=delay), updated_at=now)
+            logger.warning(f"⚠️ Task {task.task_name} #{task.id} failed (attempt {task.attempts}), retrying in {delay}s: {e}")
+        return False
+
+    now = timezone.now()
+    owned.update(status=BackgroundTask.STATUS_DONE, last_error='', locked_until=None,
+                 completed_at=now, updated_at=now)
+    logger.info(f"✅ Task {task.task_name} #{task.id} done")
+    return True
+
+
+# Task handlers
+
+def interview_results_key(interview_uuid):
+    return f"interview-results:{interview_uuid}"
+
+
+@register_task('generate_interview_results')
+def generate_interview_results_task(interview_uuid):
+    from .views import generate_interview_results
+
+    interview = Interview.objects.select_related('job').filter(uuid=interview_uuid).first()
+    if interview is None:
+        logger.warning(f"Interview {interview_uuid} no longer exists, skipping results")
+        return
+    if interview.has_results:
+        logger.info(f"Results already generated for {interview_uuid}, skipping")
+        return
+
+    conversation_history = [
+        {
+            'speaker': turn.speaker,
+            'message': turn.text,
+            'question_number': turn.question_number,
+            'timestamp': turn.created_at.isoformat(),
+            'time_remaining': turn.time_remaining,
+        }
+        for turn in interview.turns.all()
+    ]
+    if not generate_interview_results(interview, conversation_history):
+        raise RuntimeError(f"Results generation failed for interview {interview_uuid}")
+
+
+@register_task('save_interview_screenshots')
+def save_interview_screenshots_task(interview_uuid, screenshots):
+    from .views import save_interview_screenshots
+
+    interview = Interview.objects.filter(uuid=interview_uuid).first()
+    if interview is None:
+        return
+    if not save_interview_screenshots(interview, screenshots):
+        raise RuntimeError(f"Could not save screenshots for interview {interview_uuid}")
+
+
+@register_task('prerender_interview_phrases')
+def prerender_interview_phrases_task(interview_uuid):
+    from .interview_phrases import interview_phrase_params, interview_segment_texts, prerender_segments
+
+    interview = Interview.objects.select_related('job', 'candidate').filter(uuid=interview_uuid).first()
+    if interview is None:
+        return
+    # Pinned until the interview can no longer be running
+    pin_until = time.time() + (interview.interview_duration_minutes or 15) * 60 + PHRASE_PIN_GRACE_SECONDS
+    failed = prerender_segments(interview_segment_texts(interview_phrase_params(interview)), pin_until=pin_until)
+    if failed:
+        raise RuntimeError(f"{failed} interviewer phrases could not be pre-rendered for {interview_uuid}")
+
+
+def enqueue_interview_results(interview, rerun_finished=False):
+    return enqueue_task('generate_interview_results', {'interview_uuid': str(interview.uuid)},
+                        idempotency_key=interview_results_key(interview.uuid), rerun_finished=rerun_finished)
+
+
+def enqueue_interview_phrases(interview):
+    # Name/job/company lines are rendered once the candidate opens the interview,
+    # while they check their camera and microphone
+    return enqueue_task('prerender_interview_phrases', {'interview_uuid': str(interview.uuid)},
+                        idempotency_key=f"interview-phrases:{interview.uuid}", max_attempts=3)
+
+
+@register_task('extract_resume_text')
+def extract_resume_text_task(sha256, model, pk):
+    from django.apps import apps
+    from .resume_store import store_resume_text
+
+    owner = apps.get_model('jobapp', model).objects.filter(pk=pk).first()
+    if owner is None or not owner.resume or owner.resume_sha256 != sha256:
+        logger.info(f"Resume {sha256[:12]} of {model} {pk} was replaced or removed, skipping")
+        return
+    with owner.resume.open('rb') as file_obj:
+        row = store_resume_text(sha256, file_obj)
+    logger.info(f"📄 Resume text stored for {model} {pk}: {row.char_count} chars, {row.page_count or '?'} pages")
+
+
+def enqueue_resume_text(owner):
+    # One task per distinct file content; owners uploading the same file share the extracted text
+    return enqueue_task('extract_resume_text',
+                        {'sha256': owner.resume_sha256, 'model': owner._meta.model_name, 'pk': owner.pk},
+                        idempotency_key=f"resume-text:{owner.resume_sha256}", max_attempts=3)
@@ -1,3 +1,714 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import smtplib
+import socket
+import tempfile
+import threading
+import time
+import wave
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .job_search import search_jobs
+from .mail_dispatcher import is_transient_error
+from .dashboard_stats import compute_recruiter_stats, recruiter_stats
+from .interview_pipeline import (TurnRecord, TurnTimer, await_turn_audio, pending_audio_state, resolve_turn_audio,
+                                 start_turn_audio, synthesize_turn_audio)
+from .interview_state import InterviewStateStore, LocMemStateBackend
+from .media_serving import RangeNotSatisfiable, parse_range
+from .models import BackgroundTask, Candidate, CustomUser, Interview, InterviewTurn, Job, ProctoringSegment, RecordingUpload
+from .pagination import InvalidCursor, KeysetPaginator, WindowCountPaginator, decode_cursor, encode_cursor
+from .proctoring_timeline import PROCTORING_GAP_SECONDS, ProctoringTimeline, frame_times, timeline_summary
+from .recording_upload import RecordingUploadError, append_chunk, start_upload
+from .skills import canonical_skill, parse_skills
+from .tts_cache import INDEX_FILENAME, TTSCache
+from .utils.audio_duration import audio_duration
+from .tasks import TASK_REGISTRY, claim_tasks, enqueue_task, requeue_task, run_task
+from .views import generate_interview_results, save_interview_turns
+
+
+def make_recruiter(username='recruiter'):
+    return CustomUser.objects.create_user(username, password='test', is_recruiter=True)
+
+
+def make_job(recruiter, title='Job', **fields):
+    fields = {'company': 'Test Co', 'location': 'Remote', 'description': 'A job', **fields}
+    return Job.objects.create(title=title, posted_by=recruiter, **fields)
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_recruiter()
+        job = make_job(self.recruiter)
+        make_job(self.recruiter, status='closed')
+        Interview.objects.create(job=job, status='completed', recommendation='recommended', interview_duration_minutes=10)
+        Interview.objects.create(job=job, status='completed', recommendation='never_hire', interview_duration_minutes=20)
+        self.scheduled = Interview.objects.create(job=job)
+        Candidate.objects.create(name='Ann', email='ann@example.com', phone='1', added_by=self.recruiter)
+        # Another recruiter's rows are not counted
+        other = make_recruiter('other')
+        Interview.objects.create(job=make_job(other), status='completed')
+
+    def test_every_counter_in_one_query(self):
+        with self.assertNumQueries(1):
+            stats = compute_recruiter_stats(self.recruiter)
+        self.assertEqual(stats, {
+            'jobs': 2, 'active_jobs': 1, 'applications': 0,
+            'interviews': 3, 'scheduled_interviews': 1, 'completed_interviews': 2,
+            'recommended': 1, 'rejected': 1, 'avg_interview_duration': 15,
+            'candidates': 1,
+        })
+
+    def test_recruiter_without_rows_gets_zeros(self):
+        stats = compute_recruiter_stats(make_recruiter('new'))
+        self.assertEqual(stats['jobs'], 0)
+        self.assertEqual(stats['interviews'], 0)
+        self.assertIsNone(stats['avg_interview_duration'])
+
+    def test_cache_is_dropped_when_counted_fields_change(self):
+        self.assertEqual(recruiter_stats(self.recruiter)['completed_interviews'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Saves that touch no counted field keep the cached counters
+            self.scheduled.save(update_fields=['transcript'])
+        with self.assertNumQueries(0):
+            recruiter_stats(self.recruiter)
+        self.scheduled.status = 'completed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scheduled.save(update_fields=['status'])
+        self.assertEqual(recruiter_stats(self.recruiter)['completed_interviews'], 3)
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = make_recruiter()
+        cls.jobs = [make_job(recruiter, f'Job {i}') for i in range(7)]
+        # Three jobs share a timestamp, so their order rests on the id tie-breaker
+        posted = timezone.now() - timedelta(days=1)
+        for i, job in enumerate(cls.jobs):
+            job.date_posted = posted if 2 <= i <= 4 else posted + timedelta(minutes=i)
+            Job.objects.filter(pk=job.pk).update(date_posted=job.date_posted)
+        cls.expected = [job.pk for job in sorted(cls.jobs, key=lambda job: (job.date_posted, job.pk), reverse=True)]
+
+    def paginator(self):
+        return KeysetPaginator(Job.objects.all(), per_page=3)
+
+    def test_forward_pages_cover_every_row_once(self):
+        paginator = self.paginator()
+        seen, page = [], paginator.page()
+        self.assertFalse(page.has_previous())
+        while True:
+            seen.extend(job.pk for job in page)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_cursor_returns_previous_page(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        self.assertEqual([job.pk for job in second], self.expected[3:6])
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([job.pk for job in back], self.expected[:3])
+        self.assertFalse(back.has_previous())
+        self.assertEqual(back.next_cursor, first.next_cursor)
+
+    def test_ties_on_date_posted_are_split_by_id(self):
+        paginator = KeysetPaginator(Job.objects.all(), per_page=1)
+        seen, cursor = [], None
+        for _ in self.expected:
+            page = paginator.page(cursor)
+            seen.extend(job.pk for job in page)
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.expected)
+        self.assertIsNone(cursor)
+
+    def test_cursor_round_trip(self):
+        token = encode_cursor(['2026-01-01T00:00:00+00:00', '5'], backward=True)
+        self.assertEqual(decode_cursor(token), (['2026-01-01T00:00:00+00:00', '5'], True))
+
+    def test_tampered_cursor_is_rejected(self):
+        paginator = self.paginator()
+        for token in ['not-a-cursor', encode_cursor(['x']), encode_cursor(['not a date', '1']), 'e30']:
+            with self.assertRaises(InvalidCursor):
+                paginator.page(token)
+        self.assertEqual([job.pk for job in paginator.get_page('not-a-cursor')], self.expected[:3])
+
+
+class WindowCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = make_recruiter()
+        for i in range(5):
+            make_job(recruiter, f'Job {i}')
+
+    def test_count_comes_from_the_page_query(self):
+        paginator = WindowCountPaginator(Job.objects.order_by('id'), per_page=2)
+        with self.assertNumQueries(1):
+            page = paginator.page(2)
+            self.assertEqual(paginator.count, 5)
+        self.assertEqual(len(page), 2)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_empty_result(self):
+        paginator = WindowCountPaginator(Job.objects.none(), per_page=2)
+        page = paginator.page(1)
+        self.assertEqual(paginator.count, 0)
+        self.assertEqual(len(page), 0)
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        recruiter = make_recruiter()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.title_match = make_job(recruiter, 'Python Developer')
+            self.description_match = make_job(recruiter, 'Backend Engineer', description='Services in Python and Go')
+            self.other = make_job(recruiter, 'Graphic Designer', location='Berlin')
+
+    def search(self, query):
+        return [job.pk for job in search_jobs(Job.objects.all(), query)]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.search('python'), [self.title_match.pk, self.description_match.pk])
+
+    def test_words_match_as_prefixes_across_fields(self):
+        self.assertEqual(self.search('pyth'), [self.title_match.pk, self.description_match.pk])
+        self.assertEqual(self.search('designer berlin'), [self.other.pk])
+
+    def test_index_follows_edits_tags_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.title = 'Rust Developer'
+            self.other.save()
+            self.description_match.tags.add('kubernetes')
+        self.assertEqual(self.search('rust'), [self.other.pk])
+        self.assertEqual(self.search('designer'), [])
+        self.assertEqual(self.search('kubernetes'), [self.description_match.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.title_match.delete()
+        self.assertEqual(self.search('python'), [self.description_match.pk])
+
+    def test_blank_and_punctuation_queries(self):
+        self.assertEqual(len(self.search('  ')), 3)
+        self.assertEqual(self.search('"*)'), [])
+
+
+class SkillParsingTests(TestCase):
+    def test_aliases_separators_and_duplicates(self):
+        self.assertEqual(parse_skills("JS, ReactJS; node.js | K8s\nPython 3 / Django, javascript"),
+                         ['javascript', 'react', 'node.js', 'kubernetes', 'python', 'django'])
+
+    def test_slashes_kept_inside_known_skills(self):
+        self.assertEqual(parse_skills("CI/CD, TCP/IP"), ['ci/cd', 'tcp/ip'])
+
+    def test_placeholders_and_punctuation(self):
+        self.assertEqual(parse_skills("Not specified"), [])
+        self.assertEqual(canonical_skill("  .NET  "), '.net')
+        self.assertEqual(canonical_skill("(Docker)"), 'docker')
+        self.assertEqual(canonical_skill("Docker."), 'docker')
+        self.assertEqual(canonical_skill(''), '')
+
+
+class ParseRangeTests(TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+        self.assertEqual(parse_range('bytes=500-5000', 1000), (500, 999))
+
+    def test_whole_file(self):
+        for header in [None, '', 'bytes=0-9,20-29', 'bytes=-', 'items=0-9', 'bytes=9-0']:
+            self.assertIsNone(parse_range(header, 1000), header)
+
+    def test_not_satisfiable(self):
+        for header, size in [('bytes=1000-', 1000), ('bytes=-0', 1000), ('bytes=-10', 0)]:
+            with self.assertRaises(RangeNotSatisfiable):
+                parse_range(header, size)
+
+
+class ProctoringTimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.interview = Interview.objects.create(job=make_job(make_recruiter()), candidate_email='a@example.com')
+
+    def segments(self):
+        return list(ProctoringSegment.objects.filter(interview=self.interview).order_by('started_at')
+                    .values_list('state', 'frames', 'max_faces'))
+
+    def test_runs_of_the_same_state_are_one_segment(self):
+        timeline = ProctoringTimeline(self.interview.id)
+        start = timezone.now()
+        for second, count in enumerate([1, 1, 1, 0, 0, 2, 1]):
+            timeline.add({'count': count}, at=start + timedelta(seconds=second))
+        timeline.close()
+        self.assertEqual(self.segments(), [
+            (ProctoringSegment.STATE_ONE_FACE, 3, 1),
+            (ProctoringSegment.STATE_NO_FACE, 2, 0),
+            (ProctoringSegment.STATE_MULTIPLE_FACES, 1, 2),
+            (ProctoringSegment.STATE_ONE_FACE, 1, 1),
+        ])
+
+    def test_gap_ends_the_segment_at_its_last_frame(self):
+        timeline = ProctoringTimeline(self.interview.id)
+        start = timezone.now()
+        timeline.add({'count': 1}, at=start)
+        timeline.add({'count': 1}, at=start + timedelta(seconds=1))
+        timeline.add({'count': 1}, at=start + timedelta(seconds=PROCTORING_GAP_SECONDS + 5))
+        timeline.close()
+        first = ProctoringSegment.objects.filter(interview=self.interview).order_by('started_at').first()
+        self.assertEqual(first.ended_at, start + timedelta(seconds=1))
+        self.assertEqual(len(self.segments()), 2)
+
+    def test_errors_and_dropped_frames_are_ignored(self):
+        timeline = ProctoringTimeline(self.interview.id)
+        self.assertFalse(timeline.add({'error': 'bad frame'}))
+        self.assertFalse(timeline.add({'status': 'dropped'}))
+        timeline.close()
+        self.assertEqual(self.segments(), [])
+
+    def test_later_flushes_update_the_open_segment(self):
+        timeline = ProctoringTimeline(self.interview.id)
+        start = timezone.now()
+        timeline.add({'count': 1}, at=start)
+        timeline.flush()
+        timeline.add({'count': 1}, at=start + timedelta(seconds=1))
+        timeline.flush()
+        self.assertEqual(self.segments(), [(ProctoringSegment.STATE_ONE_FACE, 2, 1)])
+
+    def test_buffers_in_several_processes_build_one_timeline(self):
+        # Two workers receive alternate batches of the same page
+        first, second = ProctoringTimeline(self.interview.id), ProctoringTimeline(self.interview.id)
+        start = timezone.now()
+        for second_offset, (timeline, count) in enumerate([(first, 1), (first, 1), (second, 1), (second, 0),
+                                                           (first, 0), (second, 1)]):
+            timeline.add({'count': count}, at=start + timedelta(seconds=second_offset))
+            timeline.flush()
+        self.assertEqual(self.segments(), [
+            (ProctoringSegment.STATE_ONE_FACE, 3, 1),
+            (ProctoringSegment.STATE_NO_FACE, 2, 0),
+            (ProctoringSegment.STATE_ONE_FACE, 1, 1),
+        ])
+        summary = timeline_summary(self.interview)
+        self.assertEqual(summary['monitored_seconds'], 5.0)
+        self.assertEqual(summary['no_face_events'], 1)
+
+    def test_frame_times_use_the_age_at_send_time(self):
+        times = frame_times(['1000', '2000', '3000'], '5000', 3)
+        self.assertEqual([(times[-1] - at).total_seconds() for at in times], [2.0, 1.0, 0.0])
+        self.assertIsNone(frame_times(['1000'], '5000', 2))
+        self.assertIsNone(frame_times(['soon'], '5000', 1))
+
+
+class RecordingUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        interview = Interview.objects.create(job=make_job(make_recruiter()), candidate_email='a@example.com')
+        self.upload = start_upload(interview, 'video/webm')
+
+    def part_bytes(self):
+        with open(os.path.join(self.media_root, self.upload.part_path), 'rb') as f:
+            return f.read()
+
+    def test_chunks_append_at_the_recorded_offset(self):
+        upload, digest = append_chunk(self.upload.upload_id, 0, io.BytesIO(b'abc'), 3)
+        self.assertEqual(digest, hashlib.sha256(b'abc').hexdigest())
+        upload, _ = append_chunk(self.upload.upload_id, 3, io.BytesIO(b'defg'), 4)
+        self.assertEqual((upload.received_bytes, upload.chunk_count), (7, 2))
+        self.assertEqual(self.part_bytes(), b'abcdefg')
+
+    def test_wrong_offset_is_refused_with_the_current_one(self):
+        append_chunk(self.upload.upload_id, 0, io.BytesIO(b'abc'), 3)
+        with self.assertRaises(RecordingUploadError) as raised:
+            append_chunk(self.upload.upload_id, 0, io.BytesIO(b'abc'), 3)
+        self.assertEqual((raised.exception.status, raised.exception.offset), (409, 3))
+
+    def test_broken_chunk_is_cut_off(self):
+        append_chunk(self.upload.upload_id, 0, io.BytesIO(b'abc'), 3)
+        with self.assertRaises(RecordingUploadError):
+            append_chunk(self.upload.upload_id, 3, io.BytesIO(b'de'), 5)
+        with self.assertRaises(RecordingUploadError) as raised:
+            append_chunk(self.upload.upload_id, 3, io.BytesIO(b'de'), 2, chunk_sha256='0' * 64)
+        self.assertEqual(raised.exception.status, 422)
+        self.assertEqual(self.part_bytes(), b'abc')
+        self.assertEqual(RecordingUpload.objects.get(pk=self.upload.pk).received_bytes, 3)
+
+
+class InterviewPipelineTests(TestCase):
+    audio = {'audio': '/media/tts/reply.mp3', 'audio_duration': 2.0, 'has_audio': True}
+
+    def setUp(self):
+        synthesize = mock.patch('jobapp.interview_pipeline.synthesize_turn_audio', return_value=self.audio)
+        self.synthesize = synthesize.start()
+        self.addCleanup(synthesize.stop)
+
+    async def test_audio_is_fetched_once(self):
+        start_turn_audio('key-1', 'Tell me about yourself.')
+        self.assertEqual(await await_turn_audio('key-1'), self.audio)
+        self.assertIsNone(await await_turn_audio('key-1'))
+        self.assertIsNone(await await_turn_audio('unknown'))
+
+    async def test_timeout_does_not_cancel_synthesis(self):
+        release = threading.Event()
+        self.synthesize.side_effect = lambda *args: release.wait(5) and self.audio
+        start_turn_audio('key-2', 'Tell me about yourself.')
+        with self.assertRaises(asyncio.TimeoutError):
+            await await_turn_audio('key-2', timeout=0.05)
+        release.set()
+        self.assertEqual(await await_turn_audio('key-2'), self.audio)
+
+    async def test_other_worker_synthesizes_from_the_state_store(self):
+        context = {'pending_audio': pending_audio_state('key-3', 'Tell me about yourself.')}
+        self.assertEqual(await resolve_turn_audio('key-3', context), self.audio)
+        self.synthesize.assert_called_once_with('Tell me about yourself.', None)
+        self.assertIsNone(await resolve_turn_audio('other-key', context))
+
+    def test_failed_tts_falls_back_to_an_estimate(self):
+        # synthesize_turn_audio was imported before setUp patched the module, so this is the real one
+        with mock.patch('jobapp.tts.generate_tts', side_effect=RuntimeError('TTS down')):
+            result = synthesize_turn_audio('Tell me about a project you are proud of.')
+        self.assertFalse(result['has_audio'])
+        self.assertGreater(result['audio_duration'], 0)
+
+    def test_timings_are_saved_when_both_sides_arrive(self):
+        interview = Interview.objects.create(job=make_job(make_recruiter()))
+        save_interview_turns(interview, [{'speaker': 'interviewer', 'message': 'Q1'}])
+        timer = TurnTimer()
+        timer.lap('llm')
+        timer.timings['tts_ms'] = 120
+        record = TurnRecord(interview.id, 0, timer)
+        record.arrive()
+        self.assertEqual(interview.turns.get().stage_timings, {})
+        record.arrive()
+        turn = interview.turns.get()
+        self.assertEqual((turn.tts_latency_ms, set(turn.stage_timings)), (120, {'llm_ms', 'tts_ms'}))
+
+
+def mp3_frames(count, xing=False):
+    """MPEG-1 Layer III frames, 128 kbps, 44.1 kHz, stereo: 1152 samples in 417 bytes each"""
+    frames = []
+    for i in range(count):
+        frame = bytearray(b'\xff\xfb\x90\x00' + bytes(413))
+        if xing and i == 0:
+            frame[36:40] = b'Xing'
+        frames.append(bytes(frame))
+    return b''.join(frames)
+
+
+def wav_bytes(seconds, rate=8000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(bytes(2 * int(seconds * rate)))
+    return buffer.getvalue()
+
+
+class AudioDurationTests(TestCase):
+    def test_mp3_duration_counts_every_frame(self):
+        self.assertAlmostEqual(audio_duration(mp3_frames(100)), 100 * 1152 / 44100)
+
+    def test_mp3_skips_id3_tag_and_info_frame(self):
+        id3 = b'ID3\x03\x00\x00\x00\x00\x00\x0a' + bytes(10)
+        self.assertAlmostEqual(audio_duration(id3 + mp3_frames(11, xing=True)), 10 * 1152 / 44100)
+
+    def test_spliced_mp3_clips_add_up(self):
+        self.assertAlmostEqual(audio_duration(mp3_frames(40) + mp3_frames(60)), 100 * 1152 / 44100)
+
+    def test_wav_duration_from_data_chunk(self):
+        self.assertAlmostEqual(audio_duration(wav_bytes(2.5)), 2.5)
+
+    def test_streamed_wav_without_a_data_size(self):
+        data = bytearray(wav_bytes(1.0))
+        data_chunk = data.index(b'data')
+        data[data_chunk + 4:data_chunk + 8] = b'\xff\xff\xff\xff'
+        self.assertAlmostEqual(audio_duration(bytes(data)), 1.0)
+
+    def test_unrecognised_data_has_no_duration(self):
+        self.assertIsNone(audio_duration(b'not audio' * 200))
+        self.assertIsNone(audio_duration(b'RIFF\x00\x00'))
+
+
+class TTSCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.cache = self.make_cache()
+        self.clock = 1000.0
+        clock = mock.patch('jobapp.tts_cache.time.time', side_effect=self.tick)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def tick(self):
+        self.clock += 1
+        return self.clock
+
+    def make_cache(self):
+        # Room for two 2000-byte clips
+        return TTSCache(self.directory, '/media/tts/', max_bytes=5000)
+
+    def put(self, name, cache=None):
+        return (cache or self.cache).put(name, b'x' * 2000)
+
+    def cached(self):
+        return sorted(name for name in os.listdir(self.directory) if not name.startswith('.'))
+
+    def test_least_recently_used_clip_is_evicted(self):
+        self.put('a.mp3')
+        self.put('b.mp3')
+        self.assertEqual(self.cache.get('a.mp3'), '/media/tts/a.mp3')
+        self.put('c.mp3')
+        self.assertEqual(self.cached(), ['a.mp3', 'c.mp3'])
+        self.assertIsNone(self.cache.get('b.mp3'))
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_pinned_clips_are_not_evicted(self):
+        self.put('a.mp3')
+        self.assertEqual(self.cache.pin(['a.mp3', 'missing.mp3']), 1)
+        self.put('b.mp3')
+        self.put('c.mp3')
+        self.assertEqual(self.cached(), ['a.mp3', 'c.mp3'])
+
+    def test_expired_pin_is_evictable(self):
+        self.put('a.mp3')
+        self.cache.pin(['a.mp3'], until=self.clock + 1)
+        self.put('b.mp3')
+        self.put('c.mp3')
+        self.assertEqual(self.cached(), ['b.mp3', 'c.mp3'])
+
+    def test_pins_are_shared_through_the_saved_index(self):
+        self.put('a.mp3')
+        self.cache.pin(['a.mp3'])
+        other = self.make_cache()
+        self.put('b.mp3', other)
+        self.put('c.mp3', other)
+        self.assertEqual(self.cached(), ['a.mp3', 'c.mp3'])
+
+    def test_store_under_budget_does_not_rescan_or_save(self):
+        self.put('a.mp3')
+        index_mtime = os.stat(os.path.join(self.directory, INDEX_FILENAME)).st_mtime_ns
+        with mock.patch.object(self.cache, '_scan') as scan, mock.patch.object(self.cache, '_save_index') as save:
+            self.put('b.mp3')
+            self.cache.get('b.mp3')
+        scan.assert_not_called()
+        save.assert_not_called()
+        self.assertEqual(os.stat(os.path.join(self.directory, INDEX_FILENAME)).st_mtime_ns, index_mtime)
+
+
+class TransientErrorTests(TestCase):
+    def test_transient(self):
+        for error in [smtplib.SMTPServerDisconnected('gone'), smtplib.SMTPResponseException(421, b'busy'),
+                      socket.timeout(), ConnectionRefusedError()]:
+            self.assertTrue(is_transient_error(error), error)
+
+    def test_permanent(self):
+        for error in [smtplib.SMTPResponseException(550, b'no such user'),
+                      smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'no')}),
+                      smtplib.SMTPNotSupportedError(), ValueError('bad address')]:
+            self.assertFalse(is_transient_error(error), error)
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        registry = mock.patch.dict(TASK_REGISTRY, {'test_task': self.handler})
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def handler(self, fail=False):
+        self.calls.append(fail)
+        if fail:
+            raise RuntimeError('task failed')
+
+    def test_idempotency_key_returns_the_existing_task(self):
+        task = enqueue_task('test_task', idempotency_key='key')
+        self.assertEqual(enqueue_task('test_task', idempotency_key='key').pk, task.pk)
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+
+    def test_claimed_task_is_leased_once(self):
+        task = enqueue_task('test_task')
+        claimed = claim_tasks('worker-1')
+        self.assertEqual([t.pk for t in claimed], [task.pk])
+        self.assertEqual((claimed[0].status, claimed[0].locked_by, claimed[0].attempts),
+                         (BackgroundTask.STATUS_RUNNING, 'worker-1', 1))
+        self.assertEqual(claim_tasks('worker-2'), [])
+        self.assertTrue(run_task(claimed[0], 'worker-1'))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_DONE)
+
+    def test_expired_lease_is_reclaimed(self):
+        task = enqueue_task('test_task')
+        claim_tasks('worker-1')
+        BackgroundTask.objects.filter(pk=task.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_tasks('worker-2')
+        self.assertEqual([(t.pk, t.locked_by, t.attempts) for t in reclaimed], [(task.pk, 'worker-2', 2)])
+        # The first worker's late outcome is not recorded
+        self.assertTrue(run_task(task, 'worker-1'))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_RUNNING)
+
+    def test_failures_retry_then_fail(self):
+        task = enqueue_task('test_task', {'fail': True}, max_attempts=2)
+        self.assertFalse(run_task(claim_tasks('worker')[0], 'worker'))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_PENDING)
+        self.assertGreater(task.run_after, timezone.now())
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        self.assertFalse(run_task(claim_tasks('worker')[0], 'worker'))
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_FAILED)
+        self.assertIn('task failed', task.last_error)
+
+    def test_requeue_finished_task(self):
+        task = enqueue_task('test_task', {'fail': True}, idempotency_key='key', max_attempts=1)
+        run_task(claim_tasks('worker')[0], 'worker')
+        task.refresh_from_db()
+        self.assertEqual(task.status, BackgroundTask.STATUS_FAILED)
+
+        task = enqueue_task('test_task', idempotency_key='key', rerun_finished=True)
+        self.assertEqual((task.status, task.attempts), (BackgroundTask.STATUS_PENDING, 0))
+        self.assertEqual([t.pk for t in claim_tasks('worker')], [task.pk])
+
+    def test_requeue_leaves_pending_and_running_tasks_alone(self):
+        task = enqueue_task('test_task')
+        claim_tasks('worker')
+        task = requeue_task(task)
+        self.assertEqual((task.status, task.attempts), (BackgroundTask.STATUS_RUNNING, 1))
+
+
+    def test_results_error_is_raised_without_a_placeholder(self):
+        interview = Interview.objects.create(job=make_job(make_recruiter()), status='completed',
+                                             completed_at=timezone.now())
+        history = [{'speaker': 'candidate', 'message': 'An answer', 'question_number': 1}]
+        with mock.patch('jobapp.views.save_interview_turns', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                generate_interview_results(interview, history)
+        interview.refresh_from_db()
+        # Nothing was saved, so the results task keeps retrying and the page shows its state
+        self.assertFalse(interview.has_results)
+
+class InterviewTurnTests(TestCase):
+    def setUp(self):
+        self.interview = Interview.objects.create(job=make_job(make_recruiter()), candidate_email='a@example.com')
+
+    def turn(self, speaker, message, question_number):
+        return {'speaker': speaker, 'message': message, 'question_number': question_number}
+
+    def test_indexes_continue_across_saves(self):
+        save_interview_turns(self.interview, [self.turn('interviewer', 'Q1', 1), self.turn('candidate', 'A1', 1)])
+        save_interview_turns(self.interview, [self.turn('interviewer', 'Q2', 2)])
+        turns = list(self.interview.turns.values_list('turn_index', 'text'))
+        self.assertEqual(turns, [(0, 'Q1'), (1, 'A1'), (2, 'Q2')])
+
+    def test_index_conflict_is_retried(self):
+        save_interview_turns(self.interview, [self.turn('interviewer', 'Q1', 1)])
+        # The first attempt sees a stale maximum, as a concurrent writer would
+        real_aggregate = type(self.interview.turns).aggregate
+        calls = []
+
+        def stale_aggregate(manager, *args, **kwargs):
+            calls.append(1)
+            return {'last': None} if len(calls) == 1 else real_aggregate(manager, *args, **kwargs)
+
+        with mock.patch.object(type(self.interview.turns), 'aggregate', stale_aggregate):
+            saved = save_interview_turns(self.interview, [self.turn('candidate', 'A1', 1)])
+        self.assertEqual([turn.turn_index for turn in saved], [1])
+        self.assertEqual(len(calls), 2)
+
+    def test_conversation_pairs_match_answers_by_question_number(self):
+        save_interview_turns(self.interview, [
+            self.turn('interviewer', 'Q1', 1),
+            self.turn('interviewer', 'Q2', 2),
+            self.turn('candidate', 'A2', 2),
+            self.turn('candidate', 'A2 again', 2),
+        ])
+        pairs = [(pair['question'].text, [answer.text for answer in pair['answers']])
+                 for pair in self.interview.get_conversation_pairs()]
+        self.assertEqual(pairs, [('Q1', []), ('Q2', ['A2', 'A2 again'])])
+
+    def test_backfill_orders_json_history_by_timestamp(self):
+        self.interview.questions_asked = json.dumps([
+            {'question': 'Q1', 'question_number': 1, 'timestamp': '2026-01-01T10:00:00+00:00'},
+            {'question': 'Q2', 'question_number': 2, 'timestamp': '2026-01-01T10:02:00+00:00'},
+        ])
+        self.interview.answers_given = json.dumps([
+            {'answer': 'A1', 'question_number': 1, 'timestamp': '2026-01-01T10:01:00+00:00'},
+            'not a dict',
+        ])
+        self.interview.save()
+        migration = importlib.import_module('jobapp.migrations.0007_backfill_interview_turns')
+        migration.backfill_interview_turns(apps, None)
+        turns = list(self.interview.turns.values_list('turn_index', 'speaker', 'text', 'question_number'))
+        self.assertEqual(turns, [
+            (0, 'interviewer', 'Q1', 1),
+            (1, 'candidate', 'A1', 1),
+            (2, 'interviewer', 'Q2', 2),
+        ])
+        # Interviews that already have turns are left alone
+        migration.backfill_interview_turns(apps, None)
+        self.assertEqual(self.interview.turns.count(), 3)
+
+
+class InterviewStateStoreTests(TestCase):
+    def setUp(self):
+        self.store = InterviewStateStore(LocMemStateBackend(max_entries=2), max_turns=3)
+
+    def turn(self, message):
+        return {'speaker': 'candidate', 'message': message}
+
+    def test_turns_are_appended_and_capped(self):
+        self.store.create('a', {'candidate_name': 'Ann', 'question_count': 0,
+                                'conversation_history': [self.turn('hello')]})
+        context = self.store.load('a')
+        context['question_count'] = 1
+        self.store.save_turn('a', context, [self.turn('one'), self.turn('two')])
+        self.store.save_turn('a', {**context, 'question_count': 2}, [self.turn('three')])
+
+        context = self.store.load('a')
+        self.assertEqual(context['candidate_name'], 'Ann')
+        self.assertEqual(context['question_count'], 2)
+        self.assertEqual([turn['message'] for turn in context['conversation_history']], ['one', 'two', 'three'])
+
+    def test_static_fields_are_not_rewritten_per_turn(self):
+        self.store.create('a', {'candidate_name': 'Ann', 'question_count': 0})
+        self.store.save_turn('a', {'candidate_name': 'Changed', 'question_count': 1})
+        self.assertEqual(self.store.load('a')['candidate_name'], 'Ann')
+
+    def test_input_claim_blocks_duplicates_until_released(self):
+        self.store.create('a', {'question_count': 0})
+        self.assertTrue(self.store.claim_input('a', 'hash'))
+        self.assertFalse(self.store.claim_input('a', 'hash'))
+        self.assertTrue(self.store.claim_input('a', 'other'))
+        self.store.save_turn('a', {'question_count': 1}, release='hash')
+        self.assertTrue(self.store.claim_input('a', 'hash'))
+
+    def test_least_recently_used_interview_is_evicted(self):
+        for key in ('a', 'b'):
+            self.store.create(key, {'question_count': 0})
+        self.store.load('a')
+        self.store.create('c', {'question_count': 0})
+        self.assertIsNone(self.store.load('b'))
+        self.assertIsNotNone(self.store.load('a'))
+
+    def test_state_expires_after_ttl(self):
+        self.store.create('a', {'question_count': 0})
+        with mock.patch('jobapp.interview_state.time.time', return_value=time.time() + 7201):
+            self.assertIsNone(self.store.load('a'))
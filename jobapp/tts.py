@@ -3,11 +3,16 @@ TTS.PY - Configured for Daisy Studious voice using new TTS API
 """
 import requests
 import os
+from io import BytesIO
 from gtts import gTTS
+from asgiref.sync import sync_to_async
 from django.conf import settings
-import hashlib
 import logging
 
+from .tts_cache import async_cached_tts, cached_tts, get_tts_cache, tts_cache_key
+from .utils.async_clients import get_async_http_client, on_client_loop
+from .utils.audio_duration import audio_file_duration
+
 logger = logging.getLogger(__name__)
 
 # New TTS API Configuration
@@ -22,47 +27,54 @@ if NEW_TTS_API_KEY:
 # Use only TTS API voices
 DEFAULT_VOICE_ID = NEW_TTS_VOICE_ID or "Ana Florence"
 
+def _tts_api_request(text, voice):
+    """URL, JSON payload and headers for a TTS API call"""
+    url = f"{NEW_TTS_API_URL.rstrip('/')}/v1/text-to-speech"
+    headers = {
+        "Accept": "audio/mpeg",
+        "Content-Type": "application/json",
+        "xi-api-key": NEW_TTS_API_KEY
+    }
+    
+    payload = {
+        "text": text.strip(),
+        "voice_id": voice,
+        "model_id": NEW_TTS_MODEL_ID or "coqui"
+    }
+    return url, payload, headers
+
+def _request_tts_api(text, voice):
+    """Call the TTS API and return the MP3 bytes"""
+    url, payload, headers = _tts_api_request(text, voice)
+    response = requests.post(url, json=payload, headers=headers, timeout=15)
+    
+    if response.status_code == 200:
+        return response.content
+    
+    raise Exception(f"TTS API failed: {response.status_code}")
+
+async def _async_request_tts_api(text, voice):
+    """_request_tts_api over the shared async HTTP client"""
+    url, payload, headers = _tts_api_request(text, voice)
+    response = await on_client_loop(get_async_http_client().post(url, json=payload, headers=headers, timeout=15))
+    
+    if response.status_code == 200:
+        return response.content
+    
+    raise Exception(f"TTS API failed: {response.status_code}")
+
 def generate_tts_api_only(text, voice="Ana Florence"):
     """Generate TTS using only the main TTS API"""
     try:
         if not NEW_TTS_API_KEY or not NEW_TTS_API_URL:
             raise Exception("TTS API not configured")
         
-        # Create filename for caching
-        text_hash = hashlib.md5(f"{text}_{voice}".encode()).hexdigest()[:10]
-        filename = f"tts_api_{text_hash}.mp3"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
-        
-        # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
-        # API request
-        url = f"{NEW_TTS_API_URL.rstrip('/')}/v1/text-to-speech"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": NEW_TTS_API_KEY
-        }
-        
-        payload = {
-            "text": text.strip(),
-            "voice_id": voice,
-            "model_id": NEW_TTS_MODEL_ID or "coqui"
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-                return f"/media/tts/{filename}"
+        key = tts_cache_key('tts_api', text, voice=voice, model=NEW_TTS_MODEL_ID or "coqui")
+        audio_url = cached_tts('tts_api', 'mp3', key, lambda: _request_tts_api(text, voice))
+        if audio_url:
+            return audio_url
         
-        raise Exception(f"TTS API failed: {response.status_code}")
+        raise Exception("TTS API returned no usable audio")
         
     except Exception as e:
         logger.error(f"TTS API failed: {e}")
@@ -74,39 +86,10 @@ def generate_elevenlabs_tts(text, voice="female_interview"):
         if not NEW_TTS_API_KEY or not NEW_TTS_API_URL:
             return generate_google_tts(text)
         
-        # Create filename for caching
-        text_hash = hashlib.md5(f"{text}_daisy".encode()).hexdigest()[:10]
-        filename = f"daisy_{text_hash}.mp3"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
-        
-        # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
-        # API request
-        url = f"{NEW_TTS_API_URL.rstrip('/')}/v1/text-to-speech"
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": NEW_TTS_API_KEY
-        }
-        
-        payload = {
-            "text": text.strip(),
-            "voice_id": DEFAULT_VOICE_ID,
-            "model_id": NEW_TTS_MODEL_ID or "coqui"
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-                return f"/media/tts/{filename}"
+        key = tts_cache_key('daisy', text, voice=DEFAULT_VOICE_ID, model=NEW_TTS_MODEL_ID or "coqui")
+        audio_url = cached_tts('daisy', 'mp3', key, lambda: _request_tts_api(text, DEFAULT_VOICE_ID))
+        if audio_url:
+            return audio_url
         
         # If failed, fall back to Google TTS
         return generate_google_tts(text)
@@ -118,24 +101,13 @@ def generate_elevenlabs_tts(text, voice="female_interview"):
 def generate_google_tts(text, lang='en'):
     """Generate TTS using Google Text-to-Speech as fallback"""
     try:
-        text_hash = hashlib.md5(f"{text}_google".encode()).hexdigest()[:10]
-        filename = f"google_{text_hash}.mp3"
-        tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-        os.makedirs(tts_dir, exist_ok=True)
-        filepath = os.path.join(tts_dir, filename)
+        def synthesize():
+            buffer = BytesIO()
+            gTTS(text=text, lang=lang, slow=False).write_to_fp(buffer)
+            return buffer.getvalue()
         
-        # Check cache first
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
-        # Generate with Google TTS
-        tts = gTTS(text=text, lang=lang, slow=False)
-        tts.save(filepath)
-        
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 1000:
-            return f"/media/tts/{filename}"
-        
-        return None
+        key = tts_cache_key('google', text, lang=lang)
+        return cached_tts('google', 'mp3', key, synthesize)
         
     except Exception as e:
         logger.error(f"Google TTS failed: {e}")
@@ -149,6 +121,37 @@ def generate_tts(text, voice="Ana Florence"):
         logger.warning(f"TTS API failed ({e}), falling back to Google TTS")
         return generate_google_tts(text)
 
+async def async_generate_tts(text, voice="Ana Florence"):
+    """generate_tts for async views - the TTS API call does not hold a thread"""
+    try:
+        if not NEW_TTS_API_KEY or not NEW_TTS_API_URL:
+            raise Exception("TTS API not configured")
+        
+        key = tts_cache_key('tts_api', text, voice=voice, model=NEW_TTS_MODEL_ID or "coqui")
+        audio_url = await async_cached_tts('tts_api', 'mp3', key, lambda: _async_request_tts_api(text, voice))
+        if audio_url:
+            return audio_url
+        
+        raise Exception("TTS API returned no usable audio")
+        
+    except Exception as e:
+        # gTTS has no async API
+        logger.warning(f"TTS API failed ({e}), falling back to Google TTS")
+        return await sync_to_async(generate_google_tts, thread_sensitive=False)(text)
+
+def find_cached_tts(text, voice="Ana Florence"):
+    """Cached clip generate_tts would return for this text, without synthesizing anything"""
+    cache = get_tts_cache()
+    candidates = [
+        ('tts_api', tts_cache_key('tts_api', text, voice=voice, model=NEW_TTS_MODEL_ID or "coqui")),
+        ('google', tts_cache_key('google', text, lang='en')),
+    ]
+    for prefix, key in candidates:
+        audio_url = cache.get(cache.filename(prefix, key, 'mp3'))
+        if audio_url:
+            return audio_url
+    return None
+
 def generate_gtts_fallback(text):
     """Fallback function for Google TTS"""
     return generate_google_tts(text)
@@ -168,17 +171,22 @@ def estimate_audio_duration(text):
 def get_audio_duration(file_path):
     """Get actual audio duration from file"""
     try:
-        import os
         if not os.path.exists(file_path):
             return None
-        
-        # For now, return None to fall back to estimation
-        # You could add audio library here if needed
-        return None
+        return audio_file_duration(file_path)
     except Exception as e:
         logger.error(f"Error getting audio duration: {e}")
         return None
 
+def get_tts_duration(audio_url):
+    """Duration of a clip returned by the TTS functions, from the cache index"""
+    if not audio_url:
+        return None
+    cache = get_tts_cache()
+    if not audio_url.startswith(cache.url_prefix):
+        return None
+    return cache.duration(audio_url[len(cache.url_prefix):])
+
 def check_tts_api_status():
     """Check if TTS API is working"""
     if not NEW_TTS_API_KEY:
@@ -0,0 +1,409 @@
+"""
+Content-addressed cache for synthesized speech (media/tts/)
+
+Every TTS provider stores its clips here under a full SHA-256 of
+provider, voice, model, language and text. The index of cached files lives
+in memory (loaded once per process from media/tts/.index.json plus a
+directory scan), so a hit costs a dict lookup and one stat. When the cache
+grows past TTS_CACHE_MAX_BYTES the least recently used clips are deleted.
+The exact playback length of each clip is parsed once, when it is stored,
+and kept in the index.
+
+Several processes share the directory (web workers, the run_tasks worker
+that pre-renders phrases). Each keeps its own index; the directory is the
+shared truth. A hit whose file is gone (evicted by another process) is a
+miss, and a clip written by another process is found on the next miss.
+A store only updates the in-memory index. When a process's total goes
+over budget it takes an exclusive lock on the directory, rescans it,
+merges its access times with the saved index, evicts and rewrites the
+saved index - so one process evicts at a time, from the LRU order of all
+of them. Otherwise the index is merged into the saved file every
+TTS_CACHE_INDEX_SAVE_SECONDS and on every pin, so a restart keeps it.
+
+Pre-rendered interviewer phrases are pinned: eviction skips them, for good
+(the fixed lines warm_tts_cache renders) or until a given time (the lines
+rendered for one interview, until it is over). Pins are kept in the index.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .utils.audio_duration import audio_duration, audio_file_duration
+
+logger = logging.getLogger(__name__)
+
+TTS_CACHE_MAX_BYTES = getattr(settings, 'TTS_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+# Eviction frees space down to this fraction of the budget so it does not run on every store
+TTS_CACHE_LOW_WATER = 0.9
+# How often access times are merged into the saved index when nothing is evicted or pinned
+TTS_CACHE_INDEX_SAVE_SECONDS = getattr(settings, 'TTS_CACHE_INDEX_SAVE_SECONDS', 60)
+MIN_AUDIO_BYTES = 1000
+INDEX_FILENAME = '.index.json'
+LOCK_FILENAME = '.lock'
+
+
+def tts_cache_key(provider, text, voice='', model='', lang=''):
+    """Full-length cache key for one synthesized clip"""
+    material = '\0'.join([provider, voice or '', model or '', lang or '', text.strip()])
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    """LRU index over the audio files in one directory"""
+
+    def __init__(self, directory, url_prefix, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.directory = str(directory)
+        self.url_prefix = url_prefix.rstrip('/') + '/'
+        self.max_bytes = max_bytes
+        # filename -> {'size', 'accessed', 'duration', 'pinned', 'pinned_until'}, least recently used first
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._directory_mutex = threading.Lock()
+        self._loaded = False
+        self._saved_at = 0
+
+    def filename(self, prefix, key, ext):
+        return f"{prefix}_{key}.{ext}"
+
+    def url(self, filename):
+        return f"{self.url_prefix}{filename}"
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def filename_from_url(self, url):
+        """Cache filename behind a URL this cache returned, or None for any other URL"""
+        if url and url.startswith(self.url_prefix):
+            return url[len(self.url_prefix):]
+        return None
+
+    @contextmanager
+    def _directory_lock(self):
+        """Exclusive lock on the cache directory, across threads and processes"""
+        with self._directory_mutex:
+            fd = os.open(self.path(LOCK_FILENAME), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)  # releases the flock
+
+    def _read_saved_index(self):
+        try:
+            with open(self.path(INDEX_FILENAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _scan(self):
+        """
+        Entries of the clips actually in the directory, least recently used first.
+        Access times are the latest known to this process or the saved index.
+        """
+        saved = self._read_saved_index()
+        with self._lock:
+            known = {filename: dict(entry) for filename, entry in self.entries.items()}
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.startswith('.') or not item.is_file():
+                    continue
+                stat = item.stat()
+                if stat.st_size <= MIN_AUDIO_BYTES:
+                    continue
+                entry = _merge_entries(known.get(item.name), saved.get(item.name))
+                entry['size'] = stat.st_size
+                entry['accessed'] = entry.get('accessed') or stat.st_mtime
+                entries.append((item.name, entry))
+        entries.sort(key=lambda item: item[1]['accessed'])
+        return entries
+
+    def load(self):
+        """Build the index from the saved index file and one scan of the directory"""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = self._scan()
+        with self._lock:
+            self.entries = OrderedDict(entries)
+            self.total_bytes = sum(entry['size'] for _, entry in entries)
+            self._loaded = True
+        logger.info(f"🗂️ TTS cache loaded: {len(entries)} clips, {self.total_bytes / 1024 / 1024:.1f} MB")
+        self._sync()
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+
+    def get(self, filename):
+        """URL of a cached clip, or None"""
+        self._ensure_loaded()
+        with self._lock:
+            indexed = filename in self.entries
+        if indexed:
+            if os.path.exists(self.path(filename)):
+                with self._lock:
+                    entry = self.entries.get(filename)
+                    if entry is not None:
+                        entry['accessed'] = time.time()
+                        self.entries.move_to_end(filename)
+                    self.hits += 1
+                self._index_changed()
+                return self.url(filename)
+            # Evicted by another process
+            with self._lock:
+                entry = self.entries.pop(filename, None)
+                if entry is not None:
+                    self.total_bytes -= entry['size']
+                self.misses += 1
+            return None
+
+        # Another process may have stored it since the index was loaded
+        try:
+            size = os.path.getsize(self.path(filename))
+        except OSError:
+            size = 0
+        with self._lock:
+            if size > MIN_AUDIO_BYTES:
+                if filename not in self.entries:
+                    self.entries[filename] = {'size': size, 'accessed': time.time()}
+                    self.total_bytes += size
+                self.hits += 1
+                return self.url(filename)
+            self.misses += 1
+        return None
+
+    def put(self, filename, data):
+        """Store a clip and return its URL; clips too small to be real audio are rejected"""
+        if not data or len(data) <= MIN_AUDIO_BYTES:
+            return None
+        self._ensure_loaded()
+
+        # Write to a temp file and rename so readers never see a partial clip
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(filename))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            previous = self.entries.pop(filename, None)
+            if previous:
+                self.total_bytes -= previous['size']
+            self.entries[filename] = {'size': len(data), 'accessed': time.time(), 'duration': audio_duration(data)}
+            self.total_bytes += len(data)
+            over_budget = self.max_bytes and self.total_bytes > self.max_bytes
+
+        if over_budget:
+            self._sync()
+        else:
+            self._index_changed()
+        return self.url(filename)
+
+    def pin(self, filenames, until=None):
+        """
+        Keep cached clips out of eviction: for good, or until the `until` timestamp.
+        Returns the number of clips pinned (clips not in the cache are skipped).
+        """
+        self._ensure_loaded()
+        pinned = 0
+        with self._lock:
+            for filename in filenames:
+                entry = self.entries.get(filename)
+                if entry is None:
+                    continue
+                if until is None:
+                    entry['pinned'] = True
+                else:
+                    entry['pinned_until'] = max(entry.get('pinned_until') or 0, until)
+                pinned += 1
+        if pinned:
+            # Saved right away: other processes must see the pins before they evict
+            self._save_merged_index()
+        return pinned
+
+    def duration(self, filename):
+        """Playback length of a cached clip in seconds, or None"""
+        self._ensure_loaded()
+        with self._lock:
+            entry = self.entries.get(filename)
+            if entry is None:
+                return None
+            if entry.get('duration') is not None:
+                return entry['duration']
+
+        # Clips adopted from disk are parsed on first use
+        try:
+            duration = audio_file_duration(self.path(filename))
+        except OSError:
+            return None
+        with self._lock:
+            entry['duration'] = duration
+        return duration
+
+    def _index_changed(self):
+        """Note new access times; merged into the saved index at most every TTS_CACHE_INDEX_SAVE_SECONDS"""
+        if time.time() - self._saved_at >= TTS_CACHE_INDEX_SAVE_SECONDS:
+            self._save_merged_index()
+
+    def _save_merged_index(self):
+        """Merge this process's entries into the saved index without rescanning the directory"""
+        with self._directory_lock():
+            saved = self._read_saved_index()
+            with self._lock:
+                merged = {filename: _merge_entries(self.entries.get(filename), saved.get(filename))
+                          for filename in set(saved) | set(self.entries)}
+            self._save_index(sorted(merged.items(), key=lambda item: item[1].get('accessed') or 0))
+
+    def _sync(self):
+        """
+        Reconcile with the directory and the other processes: rescan, evict least recently
+        used clips while over budget, save the merged index and adopt it. Runs on load and
+        when this process's total goes over budget.
+        """
+        with self._directory_lock():
+            entries = self._scan()
+            total_bytes = sum(entry['size'] for _, entry in entries)
+            victims = []
+            if self.max_bytes and total_bytes > self.max_bytes:
+                target = self.max_bytes * TTS_CACHE_LOW_WATER
+                now = time.time()
+                kept = []
+                for filename, entry in entries:
+                    if total_bytes > target and not _is_pinned(entry, now):
+                        total_bytes -= entry['size']
+                        victims.append((filename, entry['size']))
+                    else:
+                        kept.append((filename, entry))
+                entries = kept
+                if total_bytes > self.max_bytes:
+                    logger.warning(f"TTS cache over budget with pinned clips: {total_bytes / 1024 / 1024:.1f} MB")
+                for filename, _ in victims:
+                    try:
+                        os.remove(self.path(filename))
+                    except OSError:
+                        pass
+            self._save_index(entries)
+
+        with self._lock:
+            # Keep access times and pins recorded here while the directory was scanned
+            for filename, entry in entries:
+                current = self.entries.get(filename)
+                if current is not None:
+                    entry['accessed'] = max(entry['accessed'], current['accessed'])
+                    if current.get('pinned'):
+                        entry['pinned'] = True
+                    if (current.get('pinned_until') or 0) > (entry.get('pinned_until') or 0):
+                        entry['pinned_until'] = current['pinned_until']
+            entries.sort(key=lambda item: item[1]['accessed'])
+            self.entries = OrderedDict(entries)
+            self.total_bytes = total_bytes
+            self.evictions += len(victims)
+            self.evicted_bytes += sum(size for _, size in victims)
+        if victims:
+            logger.info(f"🧹 TTS cache evicted {len(victims)} clips ({total_bytes / 1024 / 1024:.1f} MB left)")
+
+    def _save_index(self, entries):
+        """Write the index file; called with the directory lock held"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp_')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(entries), f)
+            os.replace(tmp_path, self.path(INDEX_FILENAME))
+            self._saved_at = time.time()
+        except OSError as e:
+            logger.warning(f"Could not save TTS cache index: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+            }
+
+
+def _merge_entries(ours, theirs):
+    """One clip's entry from this process and from the saved index: latest access, every pin"""
+    ours, theirs = ours or {}, theirs or {}
+    entry = {**theirs, **ours}
+    entry['accessed'] = max(ours.get('accessed', 0), theirs.get('accessed', 0))
+    if entry.get('duration') is None:
+        entry['duration'] = theirs.get('duration')
+    if theirs.get('pinned'):
+        entry['pinned'] = True
+    pinned_until = max(ours.get('pinned_until') or 0, theirs.get('pinned_until') or 0)
+    if pinned_until:
+        entry['pinned_until'] = pinned_until
+    return entry
+
+
+def _is_pinned(entry, now):
+    return bool(entry.get('pinned')) or (entry.get('pinned_until') or 0) > now
+
+
+_tts_cache = None
+_tts_cache_lock = threading.Lock()
+
+
+def cached_tts(prefix, ext, key, synthesize):
+    """Return the cached clip for `key`, or call synthesize() for the audio bytes and store them"""
+    cache = get_tts_cache()
+    filename = cache.filename(prefix, key, ext)
+    url = cache.get(filename)
+    if url:
+        return url
+    return cache.put(filename, synthesize())
+
+
+async def async_cached_tts(prefix, ext, key, synthesize):
+    """cached_tts for async views: synthesize is awaited, the index and file work runs in a thread"""
+    cache = get_tts_cache()
+    filename = cache.filename(prefix, key, ext)
+    url = await sync_to_async(cache.get, thread_sensitive=False)(filename)
+    if url:
+        return url
+    data = await synthesize()
+    return await sync_to_async(cache.put, thread_sensitive=False)(filename, data)
+
+
+def get_tts_cache():
+    """Process-wide cache for media/tts/"""
+    global _tts_cache
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSCache(os.path.join(settings.MEDIA_ROOT, 'tts'), f"{settings.MEDIA_URL}tts/")
+    return _tts_cache
@@ -4,14 +4,16 @@ TTS Testing Views - Separate module for TTS testing functionality
 import json
 import requests
 import time
-import os
-import hashlib
 import secrets
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
+
+from .tts_cache import get_tts_cache, tts_cache_key
+from .utils.async_clients import get_async_http_client, on_client_loop
 # Only use http://34.232.76.115 API
 
 def tts_test_view(request):
@@ -180,21 +182,16 @@ def generate_tts_speech(request):
         response = requests.post(api_url, json=payload, headers=headers, timeout=15)
         
         if response.status_code == 200:
-            # Save audio file
-            text_hash = hashlib.md5(f"{text}_{model}_{voice}".encode()).hexdigest()[:10]
-            filename = f"tts_test_{text_hash}.mp3"
-            tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-            os.makedirs(tts_dir, exist_ok=True)
-            filepath = os.path.join(tts_dir, filename)
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # Save audio file (always synthesized - this endpoint measures API latency)
+            cache = get_tts_cache()
+            filename = cache.filename('tts_test', tts_cache_key('tts_test', text, voice=voice, model=model), 'mp3')
+            audio_url = cache.put(filename, response.content)
             
             latency = int((time.time() - start_time) * 1000)
             
             return JsonResponse({
                 'success': True,
-                'audio_url': f'/media/tts/{filename}',
+                'audio_url': audio_url,
                 'latency': latency,
                 'model': model,
                 'voice': voice
@@ -210,7 +207,7 @@ def generate_tts_speech(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def tts_chat_agent(request):
+async def tts_chat_agent(request):
     """Chat with AI agent and generate TTS responses"""
     try:
         data = json.loads(request.body)
@@ -223,14 +220,14 @@ def tts_chat_agent(request):
             return JsonResponse({'success': False, 'error': 'No message provided'})
         
         # Generate AI response using real NVIDIA LLM
-        from .utils.interview_ai_nvidia import ask_ai_question
+        from .utils.interview_ai_nvidia import async_ask_ai_question
         
         llm_start = time.time()
         
         # Use NVIDIA LLM - no fallbacks allowed
         conversation_context = f"You are a helpful AI voice assistant. The user just said: '{message}'. Respond naturally and conversationally. Keep responses brief (1-2 sentences) and engaging. Be helpful and friendly."
         
-        ai_response = ask_ai_question(
+        ai_response = await async_ask_ai_question(
             conversation_context,
             candidate_name="User",
             job_title="Voice Conversation",
@@ -271,22 +268,15 @@ def tts_chat_agent(request):
                 
                 print(f"TTS Request: {model_id} + {voice_id} + {ai_response[:50]}...")
                 
-                response = requests.post(api_url, json=payload, headers=headers, timeout=20)
+                response = await on_client_loop(get_async_http_client().post(api_url, json=payload, headers=headers, timeout=20))
                 tts_latency = int((time.time() - tts_start) * 1000)
                 
                 print(f"TTS Response: {response.status_code}")
                 
                 if response.status_code == 200:
-                    text_hash = hashlib.md5(f"{ai_response}_{model_id}_{voice_id}".encode()).hexdigest()[:8]
-                    filename = f"agent_{text_hash}.mp3"
-                    tts_dir = os.path.join(settings.MEDIA_ROOT, 'tts')
-                    os.makedirs(tts_dir, exist_ok=True)
-                    filepath = os.path.join(tts_dir, filename)
-                    
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    
-                    audio_url = f'/media/tts/{filename}'
+                    cache = get_tts_cache()
+                    filename = cache.filename('agent', tts_cache_key('agent', ai_response, voice=voice_id, model=model_id), 'mp3')
+                    audio_url = await sync_to_async(cache.put, thread_sensitive=False)(filename, response.content)
                     print(f"TTS Success: {audio_url}")
                 else:
                     print(f"TTS Failed: {response.text}")
@@ -32,6 +32,7 @@ urlpatterns = [
      # 🧑‍💼 Dashboards
     path('dashboard/seeker/', views.jobseeker_dashboard, name='jobseeker_dashboard'),
     path('dashboard/recruiter/', views.recruiter_dashboard, name='recruiter_dashboard'),
+    path('dashboard/recruiter/candidates/', views.recruiter_candidate_options, name='recruiter_candidate_options'),
     # 📅 Interview scheduling - existing (for registered candidates)
     path('schedule-interview/<int:job_id>/<int:applicant_id>/', views.schedule_interview, name='schedule_interview'),
     # Interview scheduling - simplified for added candidates
@@ -45,6 +46,7 @@ urlpatterns = [
     path('interview/ready/<uuid:interview_uuid>/', views.interview_ready, name='interview_ready'),
      # 🗣️ Interview Start + AI Response
     path('interview/start/<uuid:interview_uuid>/', views.start_interview_by_uuid, name='start_interview'),
+    path('interview/start/<uuid:interview_uuid>/audio/<slug:audio_key>/', views.interview_turn_audio, name='interview_turn_audio'),
     # path('debug/media/', views.test_media_debug, name='test_debug_media'),
    
     
@@ -75,6 +77,9 @@ urlpatterns = [
     
     # Recording and TTS endpoints
     path('save-interview-recording/', views.save_interview_recording, name='save_interview_recording'),
+    path('interview/recording/uploads/', views.start_recording_upload, name='start_recording_upload'),
+    path('interview/recording/uploads/<uuid:upload_id>/', views.recording_upload_chunk, name='recording_upload_chunk'),
+    path('interview/recording/uploads/<uuid:upload_id>/finalize/', views.finalize_recording_upload, name='finalize_recording_upload'),
     
     path('generate-audio/', views.generate_audio, name='generate_audio'),
     path('get-csrf-token/', views.get_csrf_token, name='get_csrf_token'),
@@ -94,6 +99,7 @@ urlpatterns = [
     
     # Interview results view
     path('interview-results/<uuid:interview_uuid>/', views.interview_results, name='interview_results'),
+    path('interview-results/<uuid:interview_uuid>/status/', views.interview_results_status, name='interview_results_status'),
     path('interview-results/<uuid:interview_uuid>/download-pdf/', views.download_interview_pdf, name='download_interview_pdf'),
     
   
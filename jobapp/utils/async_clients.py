@@ -0,0 +1,145 @@
+"""
+Shared async HTTP clients and event streams for the async views
+
+httpx.AsyncClient connections belong to the event loop that opened them, so
+clients are kept per event loop. Under uvicorn (SERVER_MODE=asgi) that is the
+worker's long-lived loop, so every request shares one keep-alive pool. Under
+WSGI each async view call runs in a fresh, short-lived loop; the clients live
+on one background loop per process instead, and the views await their calls
+there through on_client_loop / iterate_on_client_loop.
+"""
+import asyncio
+import json
+import os
+import threading
+import weakref
+
+import httpx
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+UPSTREAM_POOL_SIZE = 100
+UPSTREAM_KEEPALIVE_EXPIRY = 60.0
+
+_loop_clients = weakref.WeakKeyDictionary()  # event loop -> {name: client}
+_loop_clients_lock = threading.Lock()
+_background_loop = None
+_END = object()
+
+
+def _reset_after_fork():
+    # The background loop's thread does not survive a fork
+    global _background_loop, _loop_clients
+    _background_loop = None
+    _loop_clients = weakref.WeakKeyDictionary()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def client_loop():
+    """
+    Event loop that owns the pooled clients: the running loop under uvicorn,
+    otherwise a background loop started on first use and kept for the life of the process
+    """
+    global _background_loop
+    if getattr(settings, 'SERVER_MODE', 'wsgi') == 'asgi':
+        return asyncio.get_running_loop()
+    with _loop_clients_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='async-clients', daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+async def on_client_loop(coro):
+    """Await a coroutine that uses pooled clients on the loop that owns them"""
+    loop = client_loop()
+    if loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def _next_item(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+async def iterate_on_client_loop(aiterable):
+    """Iterate an async iterable that reads from a pooled client (e.g. a response stream)"""
+    iterator = aiterable.__aiter__()
+    while True:
+        item = await on_client_loop(_next_item(iterator))
+        if item is _END:
+            return
+        yield item
+
+
+def loop_client(name, factory):
+    """Client built by factory() for client_loop(), created on first use"""
+    loop = client_loop()
+    with _loop_clients_lock:
+        clients = _loop_clients.setdefault(loop, {})
+        client = clients.get(name)
+        if client is None:
+            client = clients[name] = factory()
+    return client
+
+
+async def close_loop_clients():
+    """Close the clients of the running loop; call before a loop that owns clients ends"""
+    with _loop_clients_lock:
+        clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        # httpx.AsyncClient.aclose / AsyncOpenAI.close
+        close = getattr(client, 'aclose', None) or client.close
+        await close()
+
+
+def get_async_http_client():
+    """Pooled httpx.AsyncClient for the upstream TTS APIs - await its requests through on_client_loop"""
+    return loop_client('http', lambda: httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_POOL_SIZE,
+            max_keepalive_connections=UPSTREAM_POOL_SIZE,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    ))
+
+
+def _iterate_in_loop(agen):
+    """Drive an async generator from sync code (a WSGI server iterating a response body)"""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.run_until_complete(close_loop_clients())
+        loop.close()
+
+
+def event_stream_response(request, events):
+    """Server-sent events response for an async generator of event dicts"""
+    async def encode():
+        async for event in events:
+            yield f"data: {json.dumps(event)}\n\n"
+
+    body = encode()
+    if not isinstance(request, ASGIRequest):
+        # Django would buffer an async body under WSGI; step through it instead so events still stream
+        body = _iterate_in_loop(body)
+
+    response = StreamingHttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
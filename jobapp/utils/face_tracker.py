@@ -3,11 +3,81 @@ import numpy as np
 from typing import List, Dict
 import base64
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
-class FaceTracker:
+# Trackers per process; a cascade cannot be shared by threads detecting at the same time
+FACE_TRACKER_POOL_SIZE = getattr(settings, 'FACE_TRACKER_POOL_SIZE', 4)
+# Frames wider than this are downscaled before detection (0 keeps the full resolution)
+FACE_WORKING_WIDTH = getattr(settings, 'FACE_WORKING_WIDTH', 640)
+# A tracked session searches only around its previous faces, and the whole frame every N frames
+FACE_FULL_DETECT_EVERY = getattr(settings, 'FACE_FULL_DETECT_EVERY', 5)
+
+# Realistic face and eye sizes at laptop distance, in frame pixels
+MIN_FACE_SIZE = 80
+MAX_FACE_SIZE = 500
+MIN_EYE_SIZE = 5
+MAX_EYE_SIZE = 60
+# The tracking search region extends this fraction of a face's size on every side
+TRACK_MARGIN = 0.5
+TRACK_STATE_TTL = 600
+MAX_TRACK_STATES = 5000
+
+
+class FaceTrackState:
+    """Faces found in a session's previous frame: (eye count, (x, y, w, h)) in working-resolution pixels"""
+    
     def __init__(self):
+        self.reset()
+    
+    def reset(self, shape=None):
+        self.shape = shape
+        self.faces = []
+        self.frames_since_full = 0
+        self.seen = time.time()
+
+
+_track_states = OrderedDict()  # session key -> FaceTrackState, least recently used first
+_track_states_lock = threading.Lock()
+
+
+def get_track_state(session_key):
+    """Tracking state for a proctoring session, or None without a key (every frame is searched in full)"""
+    if not session_key:
+        return None
+    session_key = str(session_key)[:100]
+    now = time.time()
+    with _track_states_lock:
+        state = _track_states.pop(session_key, None) or FaceTrackState()
+        _track_states[session_key] = state
+        while _track_states and (len(_track_states) > MAX_TRACK_STATES or
+                                 now - next(iter(_track_states.values())).seen > TRACK_STATE_TTL):
+            _track_states.popitem(last=False)
+    return state
+
+
+def decode_frame_data(frame_data: str) -> bytes:
+    """Image bytes from a base64 'data:image/...' URL; ValueError carries the error reported to the client"""
+    if not frame_data or 'data:image' not in frame_data:
+        raise ValueError('Invalid frame format')
+    try:
+        return base64.b64decode(frame_data.split(',')[1])
+    except Exception as decode_error:
+        logger.error(f"Image decode error: {decode_error}")
+        raise ValueError('Image decode failed')
+
+
+class FaceTracker:
+    def __init__(self, working_width=FACE_WORKING_WIDTH, full_detect_every=FACE_FULL_DETECT_EVERY):
+        self.working_width = working_width
+        self.full_detect_every = full_detect_every
         try:
             face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
             eye_cascade_path = cv2.data.haarcascades + 'haarcascade_eye.xml'
@@ -26,86 +96,57 @@ class FaceTracker:
             self.face_cascade = None
             self.eye_cascade = None
         
-    def process_frame(self, frame_data: str) -> Dict:
+    def process_frame(self, frame_data: str, state: FaceTrackState = None) -> Dict:
         """Process base64 frame and return face detection results"""
         try:
             if self.face_cascade is None:
                 return {'error': 'Face detector not initialized', 'faces': [], 'count': 0, 'alert': False}
             
-            if not frame_data or 'data:image' not in frame_data:
-                return {'error': 'Invalid frame format', 'faces': [], 'count': 0, 'alert': False}
+            try:
+                image_bytes = decode_frame_data(frame_data)
+            except ValueError as decode_error:
+                return {'error': str(decode_error), 'faces': [], 'count': 0, 'alert': False}
+            
+            return self.process_image(image_bytes, state)
+            
+        except Exception as e:
+            logger.error(f"Face detection error: {e}")
+            return {'error': str(e), 'faces': [], 'count': 0, 'alert': False}
+    
+    def process_image(self, image_bytes: bytes, state: FaceTrackState = None) -> Dict:
+        """Process encoded image bytes (JPEG/PNG) and return face detection results"""
+        try:
+            if self.face_cascade is None:
+                return {'error': 'Face detector not initialized', 'faces': [], 'count': 0, 'alert': False}
             
             try:
-                image_data = frame_data.split(',')[1]
-                image_bytes = base64.b64decode(image_data)
                 nparr = np.frombuffer(image_bytes, np.uint8)
-                frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+                gray = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
             except Exception as decode_error:
                 logger.error(f"Image decode error: {decode_error}")
                 return {'error': 'Image decode failed', 'faces': [], 'count': 0, 'alert': False}
             
-            if frame is None or frame.size == 0:
+            if gray is None or gray.size == 0:
                 return {'error': 'Invalid image data', 'faces': [], 'count': 0, 'alert': False}
             
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces with realistic distance constraints
-            faces_detected = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor=1.15,
-                minNeighbors=8,
-                minSize=(80, 80),   # Minimum realistic face size for laptop
-                maxSize=(500, 500), # Maximum realistic face size for laptop
-                flags=cv2.CASCADE_SCALE_IMAGE
-            )
-            
-            # Validate faces by checking for eyes
-            valid_faces = []
-            for (x, y, w, h) in faces_detected:
-                # Extract face region
-                face_roi = gray[y:y+h, x:x+w]
-                
-                # Detect eyes in face region (more lenient)
-                eyes = self.eye_cascade.detectMultiScale(
-                    face_roi,
-                    scaleFactor=1.05,
-                    minNeighbors=3,
-                    minSize=(5, 5),
-                    maxSize=(60, 60)
-                )
-                
-                # Accept faces with eyes OR reasonable face characteristics
-                has_eyes = len(eyes) >= 1
-                reasonable_size = 80 <= w <= 500 and 80 <= h <= 500
-                good_aspect_ratio = 0.7 <= w/h <= 1.4
-                
-                if has_eyes or (reasonable_size and good_aspect_ratio):
-                    valid_faces.append((x, y, w, h))
-            
-            # Keep max 2 faces, prefer those with eyes
-            if len(valid_faces) > 2:
-                # Sort by eye detection first, then by size
-                scored_faces = []
-                for face in valid_faces:
-                    x, y, w, h = face
-                    face_roi = gray[y:y+h, x:x+w]
-                    eyes = self.eye_cascade.detectMultiScale(face_roi, scaleFactor=1.05, minNeighbors=3)
-                    score = len(eyes) * 1000 + (w * h)  # Prioritize faces with eyes
-                    scored_faces.append((score, face))
-                
-                scored_faces.sort(reverse=True)
-                faces_detected = [face for score, face in scored_faces[:2]]
-            else:
-                faces_detected = valid_faces
+            # Detect on a downscaled copy; boxes are scaled back to frame pixels
+            scale = 1.0
+            height, width = gray.shape[:2]
+            if self.working_width and width > self.working_width:
+                scale = self.working_width / width
+                gray = cv2.resize(gray, (self.working_width, max(1, round(height * scale))),
+                                  interpolation=cv2.INTER_AREA)
+            
+            faces_detected = self._detect(gray, scale, state)
             
             faces = []
             for i, (x, y, w, h) in enumerate(faces_detected):
                 faces.append({
                     'id': i,
-                    'x': int(x),
-                    'y': int(y),
-                    'width': int(w),
-                    'height': int(h),
+                    'x': int(round(x / scale)),
+                    'y': int(round(y / scale)),
+                    'width': int(round(w / scale)),
+                    'height': int(round(h / scale)),
                     'confidence': 0.85
                 })
             
@@ -120,4 +161,129 @@ class FaceTracker:
             
         except Exception as e:
             logger.error(f"Face detection error: {e}")
-            return {'error': str(e), 'faces': [], 'count': 0, 'alert': False}
\ No newline at end of file
+            return {'error': str(e), 'faces': [], 'count': 0, 'alert': False}
+    
+    def _detect(self, gray, scale, state):
+        """Up to two faces; with tracking state, searched around the previous faces when possible"""
+        if state is not None and state.shape != gray.shape:
+            state.reset(gray.shape)
+        
+        faces = None
+        if state is not None and state.faces and state.frames_since_full + 1 < self.full_detect_every:
+            faces = self._find_faces(gray, scale, self._search_region(gray.shape, state.faces), known=state.faces)
+            if faces:
+                state.frames_since_full += 1
+        if not faces:
+            # Periodic full search, or the tracked faces were lost
+            faces = self._find_faces(gray, scale)
+            if state is not None:
+                state.frames_since_full = 0
+        
+        if state is not None:
+            state.faces = faces
+            state.seen = time.time()
+        return [face for _, face in faces]
+    
+    def _search_region(self, shape, faces):
+        """(x0, y0, x1, y1) around the given faces, widened by TRACK_MARGIN"""
+        height, width = shape[:2]
+        boxes = [face for _, face in faces]
+        x0 = min(x - w * TRACK_MARGIN for x, y, w, h in boxes)
+        y0 = min(y - h * TRACK_MARGIN for x, y, w, h in boxes)
+        x1 = max(x + w * (1 + TRACK_MARGIN) for x, y, w, h in boxes)
+        y1 = max(y + h * (1 + TRACK_MARGIN) for x, y, w, h in boxes)
+        return max(0, int(x0)), max(0, int(y0)), min(width, int(x1)), min(height, int(y1))
+    
+    def _find_faces(self, gray, scale, region=None, known=()):
+        """
+        Up to two faces in `region` of the working image (default: all of it) as (eye count, (x, y, w, h)).
+        A face overlapping one of the `known` faces from the previous frame keeps its eye count.
+        """
+        x0, y0, x1, y1 = region or (0, 0, gray.shape[1], gray.shape[0])
+        search = gray[y0:y1, x0:x1]
+        min_face = max(1, round(MIN_FACE_SIZE * scale))
+        max_face = round(MAX_FACE_SIZE * scale)
+        
+        # Detect faces with realistic distance constraints
+        faces_detected = self.face_cascade.detectMultiScale(
+            search,
+            scaleFactor=1.15,
+            minNeighbors=8,
+            minSize=(min_face, min_face),
+            maxSize=(max_face, max_face),
+            flags=cv2.CASCADE_SCALE_IMAGE
+        )
+        
+        # Validate faces by checking for eyes; the eye counts are kept for ranking below
+        min_eye = max(1, round(MIN_EYE_SIZE * scale))
+        max_eye = round(MAX_EYE_SIZE * scale)
+        valid_faces = []
+        for (x, y, w, h) in faces_detected:
+            box = (int(x) + x0, int(y) + y0, int(w), int(h))
+            eye_count = next((eyes for eyes, face in known if _overlap(box, face) >= 0.5), None)
+            if eye_count is None:
+                # Detect eyes in face region (more lenient)
+                eye_count = len(self.eye_cascade.detectMultiScale(
+                    search[y:y+h, x:x+w],
+                    scaleFactor=1.05,
+                    minNeighbors=3,
+                    minSize=(min_eye, min_eye),
+                    maxSize=(max_eye, max_eye)
+                ))
+            
+            # Accept faces with eyes OR reasonable face characteristics (sizes in frame pixels)
+            has_eyes = eye_count >= 1
+            reasonable_size = MIN_FACE_SIZE <= w / scale <= MAX_FACE_SIZE and MIN_FACE_SIZE <= h / scale <= MAX_FACE_SIZE
+            good_aspect_ratio = 0.7 <= w/h <= 1.4
+            
+            if has_eyes or (reasonable_size and good_aspect_ratio):
+                valid_faces.append((eye_count, box))
+        
+        # Keep max 2 faces, prefer those with eyes, then the largest
+        if len(valid_faces) > 2:
+            valid_faces.sort(key=lambda item: item[0] * 1000 + item[1][2] * item[1][3] / scale ** 2, reverse=True)
+            valid_faces = valid_faces[:2]
+        return valid_faces
+
+
+def _overlap(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union else 0.0
+
+
+class FaceTrackerPool:
+    """FaceTracker instances loaded once and lent to one request thread at a time"""
+    
+    def __init__(self, size=FACE_TRACKER_POOL_SIZE):
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(FaceTracker())
+        logger.info(f"Face tracker pool ready ({self.size} trackers)")
+    
+    @contextmanager
+    def tracker(self):
+        """Borrow a tracker, waiting while all of them are busy"""
+        tracker = self._idle.get()
+        try:
+            yield tracker
+        finally:
+            self._idle.put(tracker)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_face_tracker_pool():
+    """Process-wide tracker pool, built on first use (gunicorn workers build it at startup)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FaceTrackerPool()
+    return _pool
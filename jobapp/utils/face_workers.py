@@ -0,0 +1,324 @@
+"""
+Face detection worker processes
+
+Cascade detection is CPU-bound, so each web worker hands frames to a small
+pool of detection processes (FACE_WORKER_PROCESSES, by default the cores
+divided between the gunicorn workers) instead of running OpenCV itself.
+
+Frames travel through shared memory: every detection process owns a
+multiprocessing.shared_memory block of SLOTS_PER_WORKER slots. The web
+process copies a frame into a free slot and sends only (job id, slot,
+length, session) down the pipe; the result dict comes back the same way.
+
+A proctoring session always goes to the same process, which keeps that
+session's face tracking state. Frames that wait for a free slot are queued
+in the web process. A droppable frame (the single-frame endpoint and the
+proctoring socket) replaces a queued frame of the same session, whose caller
+gets a 'dropped' result; when a process falls FACE_WORKER_QUEUE frames behind,
+its oldest droppable frame is dropped. Batch frames are never dropped.
+
+FACE_WORKER_PROCESSES=0 keeps detection in the web process (FaceTrackerPool).
+"""
+import asyncio
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing import shared_memory
+
+from django.conf import settings
+
+from .face_tracker import (FACE_FULL_DETECT_EVERY, FACE_WORKING_WIDTH, FaceTracker,
+                           get_face_tracker_pool, get_track_state)
+
+logger = logging.getLogger(__name__)
+
+# 'auto': the cores divided between the web workers; 0: detect in the web process
+FACE_WORKER_PROCESSES = getattr(settings, 'FACE_WORKER_PROCESSES', 'auto')
+# Frames waiting per detection process before stale ones are dropped
+FACE_WORKER_QUEUE = getattr(settings, 'FACE_WORKER_QUEUE', 16)
+FACE_WORKER_TIMEOUT = 10
+SLOT_BYTES = 2 * 1024 * 1024
+# One frame being detected and one ready behind it; the rest wait in the web process
+SLOTS_PER_WORKER = 2
+
+_mp = multiprocessing.get_context('spawn')
+
+
+def _error(message):
+    return {'error': message, 'faces': [], 'count': 0, 'alert': False}
+
+
+def dropped_result():
+    """Result for a frame that a newer frame of the same session replaced before detection"""
+    return {'faces': [], 'count': 0, 'alert': False, 'status': 'dropped'}
+
+
+def _resolve(future, result):
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass  # the caller gave up (cancelled) already
+
+
+def _worker_main(conn, shm_name, working_width, full_detect_every):
+    """Detection process: reads frames from its shared memory slots until the pipe closes"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    tracker = FaceTracker(working_width, full_detect_every)
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+            job_id, slot, length, session = job
+            start = slot * SLOT_BYTES
+            frame = bytes(shm.buf[start:start + length])
+            try:
+                result = tracker.process_image(frame, get_track_state(session))
+            except Exception as e:
+                result = _error(str(e))
+            conn.send((job_id, result))
+    finally:
+        shm.close()
+
+
+class _Job:
+    __slots__ = ('session', 'frame', 'future', 'droppable')
+
+    def __init__(self, session, frame, future, droppable):
+        self.session = session
+        self.frame = frame
+        self.future = future
+        self.droppable = droppable
+
+
+class _Worker:
+    """One detection process with its shared memory slots and the frames waiting for them"""
+
+    def __init__(self, index):
+        self.index = index
+        self.shm = shared_memory.SharedMemory(create=True, size=SLOT_BYTES * SLOTS_PER_WORKER)
+        self.lock = threading.Lock()
+        self.job_ids = itertools.count()
+        self.free_slots = list(range(SLOTS_PER_WORKER))
+        self.in_flight = {}  # job id -> (slot, future)
+        self.waiting = deque()
+        self.closed = False
+        self._start()
+
+    def _start(self):
+        parent_conn, child_conn = _mp.Pipe()
+        self.process = _mp.Process(
+            target=_worker_main,
+            args=(child_conn, self.shm.name, FACE_WORKING_WIDTH, FACE_FULL_DETECT_EVERY),
+            name=f'face-worker-{self.index}',
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        threading.Thread(target=self._read_results, args=(parent_conn,),
+                         name=f'face-worker-{self.index}-results', daemon=True).start()
+
+    def submit(self, session, frame, droppable):
+        future = Future()
+        resolved = []
+        with self.lock:
+            queued = None
+            if droppable and session:
+                queued = next((job for job in self.waiting if job.droppable and job.session == session), None)
+            if queued is not None:
+                # A newer frame of this session: the queued one is stale
+                resolved.append((queued.future, dropped_result()))
+                queued.frame, queued.future = frame, future
+            elif len(self.waiting) >= FACE_WORKER_QUEUE and not any(job.droppable for job in self.waiting):
+                resolved.append((future, _error('Face detection busy')))
+            else:
+                if len(self.waiting) >= FACE_WORKER_QUEUE:
+                    stale = next(job for job in self.waiting if job.droppable)
+                    self.waiting.remove(stale)
+                    resolved.append((stale.future, dropped_result()))
+                self.waiting.append(_Job(session, frame, future, droppable))
+                self._dispatch()
+        for waiting_future, result in resolved:
+            _resolve(waiting_future, result)
+        return future
+
+    def _dispatch(self):
+        """Copy waiting frames into free slots and hand them to the process (lock held)"""
+        while self.free_slots and self.waiting:
+            job = self.waiting.popleft()
+            slot = self.free_slots.pop()
+            start = slot * SLOT_BYTES
+            self.shm.buf[start:start + len(job.frame)] = job.frame
+            job_id = next(self.job_ids)
+            self.in_flight[job_id] = (slot, job.future)
+            try:
+                self.conn.send((job_id, slot, len(job.frame), job.session))
+            except (OSError, ValueError):
+                # The process is gone; _read_results fails the job and restarts it
+                break
+
+    def _read_results(self, conn):
+        while True:
+            try:
+                job_id, result = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self.lock:
+                slot, future = self.in_flight.pop(job_id)
+                self.free_slots.append(slot)
+                self._dispatch()
+            _resolve(future, result)
+
+        with self.lock:
+            if self.closed:
+                return
+            logger.error(f"Face worker {self.index} exited ({self.process.exitcode}), restarting")
+            failed = [future for _, future in self.in_flight.values()]
+            self.in_flight = {}
+            self.free_slots = list(range(SLOTS_PER_WORKER))
+            conn.close()
+            self._start()
+            self._dispatch()
+        for future in failed:
+            _resolve(future, _error('Face detection worker restarted'))
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            waiting = [job.future for job in self.waiting] + [future for _, future in self.in_flight.values()]
+            self.waiting.clear()
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.shm.close()
+        self.shm.unlink()
+        for future in waiting:
+            _resolve(future, _error('Face detection stopped'))
+
+
+class FaceWorkerPool:
+    """Detection processes; each proctoring session is served by one of them"""
+
+    def __init__(self, processes):
+        self.size = max(1, processes)
+        self.workers = [_Worker(index) for index in range(self.size)]
+        self._round_robin = itertools.count()
+        logger.info(f"Face worker pool ready ({self.size} processes)")
+
+    def _worker_for(self, session):
+        if session:
+            return self.workers[zlib.crc32(session.encode()) % self.size]
+        return self.workers[next(self._round_robin) % self.size]
+
+    def submit(self, image_bytes, session=None, droppable=False):
+        """Future for the detection result of one encoded frame (JPEG/PNG bytes)"""
+        session = str(session)[:100] if session else None
+        if len(image_bytes) > SLOT_BYTES:
+            future = Future()
+            future.set_result(_error('Frame too large'))
+            return future
+        return self._worker_for(session).submit(session, bytes(image_bytes), droppable)
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _process_count(web_workers):
+    value = str(FACE_WORKER_PROCESSES).strip().lower()
+    if value == 'auto':
+        return max(1, (os.cpu_count() or 1) // max(1, web_workers))
+    return max(0, int(value))
+
+
+def get_face_worker_pool(web_workers=1):
+    """
+    Process-wide detection pool, started on first use (gunicorn workers start it at boot and pass
+    their own count, so the cores are shared between them). None when FACE_WORKER_PROCESSES=0.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                processes = _process_count(web_workers)
+                _pool = FaceWorkerPool(processes) if processes else False
+                if _pool:
+                    atexit.register(_pool.close)
+    return _pool or None
+
+
+def _detect_in_process(image_bytes, session):
+    with get_face_tracker_pool().tracker() as tracker:
+        return tracker.process_image(image_bytes, get_track_state(session))
+
+
+def detect_faces(image_bytes, session=None, droppable=False):
+    """Face detection result for one encoded frame, waiting for a detection process"""
+    pool = get_face_worker_pool()
+    if pool is None:
+        return _detect_in_process(image_bytes, session)
+    try:
+        return pool.submit(image_bytes, session, droppable).result(FACE_WORKER_TIMEOUT)
+    except TimeoutError:
+        return _error('Face detection timed out')
+
+
+def detect_faces_batch(frames, session=None):
+    """Results for several frames of one session, in order; none of them is dropped"""
+    pool = get_face_worker_pool()
+    if pool is None:
+        return [_detect_in_process(frame, session) for frame in frames]
+    futures = [pool.submit(frame, session) for frame in frames]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(FACE_WORKER_TIMEOUT))
+        except TimeoutError:
+            results.append(_error('Face detection timed out'))
+    return results
+
+
+async def detect_faces_async(image_bytes, session=None, droppable=False):
+    """detect_faces() for async code: waits on the detection process without holding a thread"""
+    pool = get_face_worker_pool()
+    if pool is None:
+        return await asyncio.to_thread(_detect_in_process, image_bytes, session)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(pool.submit(image_bytes, session, droppable)),
+                                      FACE_WORKER_TIMEOUT)
+    except asyncio.TimeoutError:
+        return _error('Face detection timed out')
+
+
+async def detect_faces_batch_async(frames, session=None):
+    """detect_faces_batch() for async code: all frames are queued in order, then awaited"""
+    pool = get_face_worker_pool()
+    if pool is None:
+        return await asyncio.to_thread(lambda: [_detect_in_process(frame, session) for frame in frames])
+    futures = [asyncio.wrap_future(pool.submit(frame, session)) for frame in frames]
+    results = []
+    for future in futures:
+        try:
+            results.append(await asyncio.wait_for(future, FACE_WORKER_TIMEOUT))
+        except asyncio.TimeoutError:
+            results.append(_error('Face detection timed out'))
+    return results
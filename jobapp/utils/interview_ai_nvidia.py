@@ -1,12 +1,128 @@
 import os
-from openai import OpenAI
+import re
+import threading
+import httpx
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, OpenAI
 from decouple import config
 import logging
 
+from .async_clients import iterate_on_client_loop, loop_client, on_client_loop
+
 logger = logging.getLogger(__name__)
 
-def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None):
-    """Ask AI question using NVIDIA Llama-3.3-Nemotron-Super-49B-v1 model"""
+# NVIDIA client pool configuration
+NVIDIA_BASE_URL = config('NVIDIA_BASE_URL', default='https://integrate.api.nvidia.com/v1')
+NVIDIA_LLM_POOL_SIZE = config('NVIDIA_LLM_POOL_SIZE', default=20, cast=int)
+NVIDIA_LLM_TIMEOUT = config('NVIDIA_LLM_TIMEOUT', default=10.0, cast=float)
+# The OpenAI client's own default (2) unless overridden
+NVIDIA_LLM_MAX_RETRIES = config('NVIDIA_LLM_MAX_RETRIES', default=DEFAULT_MAX_RETRIES, cast=int)
+NVIDIA_LLM_KEEPALIVE_EXPIRY = config('NVIDIA_LLM_KEEPALIVE_EXPIRY', default=60.0, cast=float)
+NVIDIA_LLM_HTTP2 = config('NVIDIA_LLM_HTTP2', default=True, cast=bool)
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Process-wide client registry, keyed by (base_url, api_key)
+_clients = {}
+_clients_lock = threading.Lock()
+_clients_pid = os.getpid()
+
+
+def _reset_clients():
+    """Drop inherited clients in a forked child (sockets must not be shared across processes)"""
+    global _clients, _clients_lock, _clients_pid
+    _clients = {}
+    _clients_lock = threading.Lock()
+    _clients_pid = os.getpid()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients)
+
+
+def get_llm_client(api_key, base_url=None):
+    """Return the shared, connection-pooled OpenAI client for the NVIDIA endpoint"""
+    base_url = base_url or NVIDIA_BASE_URL
+    key = (base_url, api_key)
+
+    # Fallback for forks that bypass os.fork (register_at_fork not triggered)
+    if _clients_pid != os.getpid():
+        _reset_clients()
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            use_http2 = NVIDIA_LLM_HTTP2 and HTTP2_AVAILABLE
+            http_client = httpx.Client(
+                http2=use_http2,
+                limits=httpx.Limits(
+                    max_connections=NVIDIA_LLM_POOL_SIZE,
+                    max_keepalive_connections=NVIDIA_LLM_POOL_SIZE,
+                    keepalive_expiry=NVIDIA_LLM_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(NVIDIA_LLM_TIMEOUT, connect=5.0),
+            )
+            client = OpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                timeout=NVIDIA_LLM_TIMEOUT,
+                max_retries=NVIDIA_LLM_MAX_RETRIES,
+                http_client=http_client,
+            )
+            _clients[key] = client
+            logger.info(f"Created shared NVIDIA client (pool size {NVIDIA_LLM_POOL_SIZE}, http2={use_http2}, pid {os.getpid()})")
+    return client
+
+
+def get_async_llm_client(api_key, base_url=None):
+    """AsyncOpenAI client for client_loop() (one keep-alive pool per worker) - await its calls through on_client_loop"""
+    base_url = base_url or NVIDIA_BASE_URL
+
+    def build():
+        http_client = httpx.AsyncClient(
+            http2=NVIDIA_LLM_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=NVIDIA_LLM_POOL_SIZE,
+                max_keepalive_connections=NVIDIA_LLM_POOL_SIZE,
+                keepalive_expiry=NVIDIA_LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(NVIDIA_LLM_TIMEOUT, connect=5.0),
+        )
+        return AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=NVIDIA_LLM_TIMEOUT,
+            max_retries=NVIDIA_LLM_MAX_RETRIES,
+            http_client=http_client,
+        )
+
+    return loop_client(('nvidia', base_url, api_key), build)
+
+
+def close_llm_clients():
+    """Close all pooled clients (used on shutdown and by benchmarks)"""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing NVIDIA client: {e}")
+        _clients.clear()
+
+
+NVIDIA_MODEL = "nvidia/llama-3.3-nemotron-super-49b-v1"
+STOP_SEQUENCES = ["\n\n", "Candidate:", "You:", "Interviewer:", "Response as", "Here's my", "As Sarah", "Sarah responds", "*", "(", "Warm"]
+
+
+def _get_api_key():
+    """Read and validate the NVIDIA API key"""
     try:
         api_key = config('NVIDIA_API_KEY')
     except:
@@ -16,15 +132,11 @@ def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=No
     if not api_key:
         logger.error("NVIDIA_API_KEY is empty")
         raise ValueError("NVIDIA_API_KEY cannot be empty")
-        
-    candidate_name = candidate_name or "the candidate"
-    job_title = job_title or "Software Developer" 
-    company_name = company_name or "Our Company"
-        
-    if not prompt or not prompt.strip():
-        logger.error("Empty prompt provided to AI function")
-        return f"Hey {candidate_name}! Great to meet you. What brings you here today?"
-            
+    return api_key
+
+
+def _build_messages(prompt, candidate_name):
+    """System + user messages shared by the blocking and streaming calls"""
     # Optimized system prompt for NVIDIA Llama-3.3-Nemotron
     system_prompt = f"""
 You're having a casual, friendly conversation with {candidate_name}. You're genuinely curious about them as a person.
@@ -55,34 +167,50 @@ AVOID:
 
 Just be yourself and have a genuine conversation.
 """
+    return [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def _completion_kwargs(prompt, candidate_name, timeout, stream):
+    """Chat completion parameters shared by the blocking, streaming and async calls"""
+    return dict(
+        model=NVIDIA_MODEL,
+        messages=_build_messages(prompt, candidate_name),
+        temperature=0.8,
+        max_tokens=80,
+        stream=stream,
+        timeout=timeout or NVIDIA_LLM_TIMEOUT,
+        stop=STOP_SEQUENCES
+    )
+
+
+def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None):
+    """Ask AI question using NVIDIA Llama-3.3-Nemotron-Super-49B-v1 model"""
+    api_key = _get_api_key()
+        
+    candidate_name = candidate_name or "the candidate"
+    job_title = job_title or "Software Developer" 
+    company_name = company_name or "Our Company"
+        
+    if not prompt or not prompt.strip():
+        logger.error("Empty prompt provided to AI function")
+        return f"Hey {candidate_name}! Great to meet you. What brings you here today?"
                 
     try:
-        # Initialize NVIDIA client
-        client = OpenAI(
-            base_url="https://integrate.api.nvidia.com/v1",
-            api_key=api_key,
-            timeout=timeout or 10.0
-        )
+        # Reuse the shared NVIDIA client (keep-alive connection pool)
+        client = get_llm_client(api_key)
         
         logger.info(f"Making NVIDIA Llama-3.3-Nemotron API call")
         
-        completion = client.chat.completions.create(
-            model="nvidia/llama-3.3-nemotron-super-49b-v1",
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.8,
-            max_tokens=80,
-            stream=False,
-            stop=["\n\n", "Candidate:", "You:", "Interviewer:", "Response as", "Here's my", "As Sarah", "Sarah responds", "*", "(", "Warm"]
-        )
+        completion = client.chat.completions.create(**_completion_kwargs(prompt, candidate_name, timeout, stream=False))
         
         raw_response = completion.choices[0].message.content
         cleaned_response = clean_text(raw_response)
@@ -94,10 +222,75 @@ Just be yourself and have a genuine conversation.
         logger.error(f"NVIDIA API Error: {type(e).__name__}: {str(e)}")
         raise RuntimeError(f"Failed to get response from NVIDIA Llama-3.3-Nemotron model: {str(e)}")
 
-def clean_text(text):
-    """Clean AI response and keep it short and direct"""
-    import re
+
+async def async_ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None):
+    """ask_ai_question for async views - waiting on NVIDIA does not hold a thread"""
+    api_key = _get_api_key()
+    
+    candidate_name = candidate_name or "the candidate"
+    
+    if not prompt or not prompt.strip():
+        logger.error("Empty prompt provided to AI function")
+        return f"Hey {candidate_name}! Great to meet you. What brings you here today?"
+    
+    try:
+        client = get_async_llm_client(api_key)
+        
+        logger.info(f"Making async NVIDIA Llama-3.3-Nemotron API call")
+        
+        completion = await on_client_loop(client.chat.completions.create(**_completion_kwargs(prompt, candidate_name, timeout, stream=False)))
+        
+        cleaned_response = clean_text(completion.choices[0].message.content)
+        
+        logger.info(f"NVIDIA Llama-3.3-Nemotron response successful, length: {len(cleaned_response)}")
+        return cleaned_response
+        
+    except Exception as e:
+        logger.error(f"NVIDIA API Error: {type(e).__name__}: {str(e)}")
+        raise RuntimeError(f"Failed to get response from NVIDIA Llama-3.3-Nemotron model: {str(e)}")
+
+
+async def async_stream_ai_question(prompt, candidate_name=None, job_title=None, company_name=None, timeout=None):
+    """Streaming variant of async_ask_ai_question - yields raw token deltas as they arrive.
+
+    Pair with SentenceChunker to clean the output incrementally.
+    """
+    api_key = _get_api_key()
+    
+    candidate_name = candidate_name or "the candidate"
+    
+    if not prompt or not prompt.strip():
+        logger.error("Empty prompt provided to AI function")
+        yield f"Hey {candidate_name}! Great to meet you. What brings you here today?"
+        return
+    
+    try:
+        client = get_async_llm_client(api_key)
+        
+        logger.info(f"Making async streaming NVIDIA Llama-3.3-Nemotron API call")
+        
+        stream = await on_client_loop(client.chat.completions.create(**_completion_kwargs(prompt, candidate_name, timeout, stream=True)))
+    except Exception as e:
+        logger.error(f"NVIDIA API Error: {type(e).__name__}: {str(e)}")
+        raise RuntimeError(f"Failed to get response from NVIDIA Llama-3.3-Nemotron model: {str(e)}")
     
+    try:
+        async for chunk in iterate_on_client_loop(stream):
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    except Exception as e:
+        logger.error(f"NVIDIA stream error: {type(e).__name__}: {str(e)}")
+        raise RuntimeError(f"NVIDIA Llama-3.3-Nemotron stream interrupted: {str(e)}")
+    finally:
+        # Release the pooled connection even if the consumer stops early
+        await on_client_loop(stream.close())
+
+
+def _strip_meta(text):
+    """Remove stage directions, speaker labels and formatting (clean_text without the final punctuation)"""
     # Remove ALL meta-language and stage directions
     text = re.sub(r'^(Response as Sarah|Sarah\'s response|As Sarah|Here\'s my response|Sarah responds|Warm Smile|\*.*?\*)[:.]?\s*', '', text, flags=re.IGNORECASE)
     text = re.sub(r'\*.*?\*', '', text)  # Remove any *actions*
@@ -112,6 +305,12 @@ def clean_text(text):
     text = re.sub(r'\s+', ' ', text).strip()
     text = re.sub(r'^\d+\.\s*', '', text)
     text = re.sub(r'^[-•]\s*', '', text)
+    return text
+
+
+def clean_text(text):
+    """Clean AI response and keep it short and direct"""
+    text = _strip_meta(text)
     
     # Keep responses SHORT - max 2 sentences
     sentences = text.split('. ')
@@ -124,3 +323,72 @@ def clean_text(text):
         
     return text
 
+
+def _hide_unclosed(text):
+    """Cut an unterminated *action* or (aside) - it may still be closed by later tokens"""
+    if text.count('*') % 2:
+        text = text[:text.rfind('*')]
+    open_paren = text.rfind('(')
+    if open_paren > text.rfind(')'):
+        text = text[:open_paren]
+    return text
+
+
+# Sentence end: terminal punctuation followed by whitespace (waits for the next
+# token so "3.5" or "Node.js" are not split)
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+
+class SentenceChunker:
+    """Incrementally cut a token stream into cleaned sentences for TTS.
+
+    feed() returns the sentences completed by the new delta; flush() returns
+    whatever is left when the stream ends. Like clean_text, output stops after
+    max_sentences so the caller can close the stream early.
+    """
+
+    def __init__(self, max_sentences=2):
+        self.max_sentences = max_sentences
+        self.sentences = []
+        self._pending = ''
+
+    @property
+    def done(self):
+        return len(self.sentences) >= self.max_sentences
+
+    def feed(self, delta):
+        self._pending += delta
+        completed = []
+        
+        search_from = 0
+        while not self.done:
+            match = _SENTENCE_END.search(self._pending, search_from)
+            if not match:
+                break
+            candidate = self._pending[:match.end()]
+            # Don't split inside an open *action* or (aside)
+            if _hide_unclosed(candidate) != candidate:
+                search_from = match.end()
+                continue
+            self._pending = self._pending[match.end():]
+            search_from = 0
+            sentence = clean_text(candidate)
+            if sentence and sentence not in ('.', '!', '?'):
+                self.sentences.append(sentence)
+                completed.append(sentence)
+        return completed
+
+    def flush(self):
+        if self.done or not self._pending.strip():
+            return []
+        sentence = clean_text(self._pending)
+        self._pending = ''
+        if sentence and sentence not in ('.', '!', '?'):
+            self.sentences.append(sentence)
+            return [sentence]
+        return []
+
+    @property
+    def text(self):
+        """Full cleaned response (equivalent of ask_ai_question's return value)"""
+        return ' '.join(self.sentences)
@@ -2,22 +2,24 @@ import os
 import fitz  # PyMuPDF
 import docx
 
-def extract_resume_text(resume_file):
+def extract_resume(resume_file):
+    """(text, page_count) for a resume; page_count is only known for PDFs"""
     ext = os.path.splitext(resume_file.name)[1].lower()
 
     if ext == '.txt':
-        return resume_file.read().decode('utf-8', errors='ignore')
+        return resume_file.read().decode('utf-8', errors='ignore'), None
 
     elif ext == '.docx':
         doc = docx.Document(resume_file)
-        return '\n'.join([para.text for para in doc.paragraphs])
+        return '\n'.join([para.text for para in doc.paragraphs]), None
 
     elif ext == '.pdf':
-        text = ''
         with fitz.open(stream=resume_file.read(), filetype="pdf") as pdf:
-            for page in pdf:
-                text += page.get_text()
-        return text
+            return ''.join(page.get_text() for page in pdf), pdf.page_count
 
     else:
-        return "Unsupported file format."
+        return "Unsupported file format.", None
+
+
+def extract_resume_text(resume_file):
+    return extract_resume(resume_file)[0]
@@ -1,13 +1,13 @@
 from django.shortcuts import render,redirect, get_object_or_404 , HttpResponse
 from django.contrib.auth import login, authenticate, logout
 from .forms import UserRegistrationForm, LoginForm , ProfileForm, JobForm, ApplicationForm, ScheduleInterviewForm , AddCandidateForm, ScheduleInterviewWithCandidateForm
-from .models import CustomUser , Profile, Job, Application , Interview, Candidate
+from .models import CustomUser , Profile, Job, Application , Interview, Candidate, InterviewTurn, RecordingUpload
 from django.contrib.auth.decorators import login_required , user_passes_test 
 from django.views.decorators.http import require_http_methods
 from django.http import HttpResponseForbidden , JsonResponse, Http404, FileResponse
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.middleware.csrf import CsrfViewMiddleware
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.db import models
 from django.core.paginator import Paginator
 from django.contrib.auth import get_user_model
@@ -16,18 +16,23 @@ from datetime import datetime
 from django.contrib.auth import get_backends
 from django.urls import reverse
 import os
+import time
 import uuid
 import base64
 import tempfile
 from gtts import gTTS
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib import messages
 from django.http import JsonResponse
-from jobapp.tts import generate_tts, generate_google_tts
+from jobapp.tts import async_generate_tts, generate_tts, generate_google_tts
 import json
 from django.conf import settings
 import logging
 from .health import health_check, readiness_check
+from .interview_state import get_interview_state_store
+from .tasks import (enqueue_task, enqueue_interview_phrases, enqueue_interview_results, get_task,
+                    interview_results_key)
 
 
 
@@ -47,14 +52,27 @@ from django.http import JsonResponse
 from django.db import connection
 
 from django.core.exceptions import FieldError
-from django.views.static import serve
 
 from django.core.mail import send_mail
 from .email_utils import send_interview_link_email, test_email_configuration, get_email_settings_info
+from .mail_dispatcher import queue_email
+from .interview_phrases import LAST_QUESTIONS, phrase, phrase_audio
+from .resume_store import resume_text_for
+from .media_serving import media_response
+from .proctoring_timeline import close_timelines, timeline_summary
+from .job_search import search_jobs
+from .pagination import KeysetPaginator, WindowCountPaginator
+from .dashboard_stats import recruiter_stats
+from .skill_matching import best_candidates
+from .recording_upload import (RECORDING_CHUNK_MAX_BYTES, RecordingUploadError, append_chunk, attach_recording,
+                               finalize_upload, start_upload)
+from .interview_pipeline import (TurnRecord, TurnTimer, await_turn_audio, pending_audio_state, resolve_turn_audio,
+                                 start_turn_audio)
+from asgiref.sync import sync_to_async
 from django.core.mail import send_mail
 
 
-from django.db import connection, transaction
+from django.db import IntegrityError, connection, transaction
 from django.core.management import call_command
 import json
 
@@ -110,52 +128,15 @@ HR Team
         else:
             return False
         
-        # Send the email
-        try:
-            # Check if we're using console backend
-            from django.conf import settings
-            is_console_backend = 'console' in settings.EMAIL_BACKEND.lower()
-            
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [interview.candidate_email],
-                fail_silently=False  # Show email errors for debugging
-            )
-            
-            if is_console_backend:
-                logger.info(f"📧 Status email logged to console for {interview.candidate_email} (interview {interview.uuid}) - Type: {status_type}")
-                logger.info(f"""
-                ==========================================
-                📧 EMAIL CONTENT (CONSOLE OUTPUT):
-                ==========================================
-                To: {interview.candidate_email}
-                Subject: {subject}
-                
-                {message}
-                ==========================================
-                💡 NOTE: Email was sent to console. To send real emails, configure SMTP settings.
-                """)
-            else:
-                logger.info(f"✅ Status email sent successfully to {interview.candidate_email} for interview {interview.uuid} - Type: {status_type}")
-            
-            return True
-            
-        except Exception as email_error:
-            logger.error(f"❌ Email sending failed for {interview.candidate_email}: {email_error}")
-            # Log the email content for manual sending if needed
-            logger.info(f"""
-            ==========================================
-            📧 EMAIL CONTENT (FAILED TO SEND):
-            ==========================================
-            To: {interview.candidate_email}
-            Subject: {subject}
-            
-            {message}
-            ==========================================
-            """)
-            return False
+        # Queue the email in the outbox; the dispatcher sends it with the next batch
+        queue_email(
+            interview.candidate_email,
+            subject,
+            message,
+            dedupe_key=f"interview-status:{interview.uuid}:{status_type}",
+        )
+        logger.info(f"📥 Status email queued for {interview.candidate_email} (interview {interview.uuid}) - Type: {status_type}")
+        return True
         
     except Exception as e:
         logger.error(f"Failed to send status email for interview {interview.uuid}: {e}")
@@ -164,13 +145,15 @@ HR Team
 
 #for Ai interview
 try:
-    from .utils.interview_ai_nvidia import ask_ai_question 
+    from .utils.interview_ai_nvidia import ask_ai_question, async_ask_ai_question
     from jobapp.utils.resume_reader import extract_resume_text
     from .asr import transcribe_audio
 except ImportError as e:
     print(f"Import error: {e}")
     def ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None , timeout=None):
         return "AI service is currently unavailable. Please try again later."
+    async def async_ask_ai_question(prompt, candidate_name=None, job_title=None, company_name=None , timeout=None):
+        return ask_ai_question(prompt)
     def extract_resume_text(resume_file):
         return "Resume processing is currently unavailable."
     def transcribe_audio(audio_file):
@@ -360,8 +343,6 @@ def post_job(request):
 
 # Job List view
 def job_list(request):
-    from django.core.paginator import Paginator
-    
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
     job_type_filter = request.GET.get('job_type', '')
@@ -369,9 +350,9 @@ def job_list(request):
     # Start with all jobs
     jobs = Job.objects.all().order_by('-date_posted')
     
-    # Apply search filter
+    # Apply search filter (ranked full-text search, see job_search.py)
     if search_query:
-        jobs = jobs.filter(title__icontains=search_query)
+        jobs = search_jobs(jobs, search_query)
     
     # Apply status filter
     if status_filter:
@@ -384,16 +365,22 @@ def job_list(request):
     if job_type_filter:
         jobs = jobs.filter(employment_type=job_type_filter)
     
-    # Pagination - 5 jobs per page
-    paginator = Paginator(jobs, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    no_results = not jobs.exists()
+    # Pagination - 5 jobs per page. Searches are in relevance order and numbered (the total
+    # comes with the page rows); the plain list pages by cursor on (date_posted, id), so a
+    # deep page costs the same as the first
+    if search_query:
+        paginator = WindowCountPaginator(jobs, 5)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        no_results = paginator.count == 0
+    else:
+        page_obj = KeysetPaginator(jobs, 5).get_page(request.GET.get('cursor'))
+        no_results = not page_obj.object_list and not page_obj.has_previous()
 
     return render(request, 'jobapp/job_list.html', {
         'jobs': page_obj,
         'page_obj': page_obj,
+        'cursor_pagination': not search_query,
         'search_query': search_query,
         'no_results': no_results
     })
@@ -413,7 +400,9 @@ def job_detail(request, job_id):
     context = {
         'job': job,
         'is_recruiter': is_recruiter,
-        'is_job_owner': is_job_owner
+        'is_job_owner': is_job_owner,
+        # Job seekers whose skills best cover the job's (see skill_matching.py)
+        'best_matches': best_candidates(job, limit=10) if is_job_owner else [],
     }
     return render(request, 'jobapp/job_detail.html', context)
 
@@ -614,14 +603,9 @@ Best regards,
 HR Team
 {interview.job.company}"""
                 
-                send_mail(
-                    email_subject,
-                    email_body,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [interview.candidate_email],
-                    fail_silently=False  # Show email errors for debugging
-                )
-                messages.success(request, f'Interview scheduled successfully! Email sent to {interview.candidate_email} with interview link.')
+                queue_email(interview.candidate_email, email_subject, email_body,
+                            dedupe_key=f"interview-scheduled:{interview.uuid}")
+                messages.success(request, f'Interview scheduled successfully! Email queued for {interview.candidate_email} with interview link.')
             except Exception as e:
                 logger.warning(f'Email sending failed for interview {interview.uuid}: {str(e)}')
                 messages.warning(request, f'Interview scheduled successfully! Email could not be sent, but the candidate can see the interview link on their dashboard.')
@@ -802,16 +786,11 @@ Best regards,
 {request.user.get_full_name() or request.user.username}
 {interview.job.company}"""
                     
-                    send_mail(
-                        email_subject,
-                        email_body,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [interview.candidate_email],
-                        fail_silently=False
-                    )
+                    queue_email(interview.candidate_email, email_subject, email_body,
+                                dedupe_key=f"interview-scheduled:{interview.uuid}")
                     
-                    messages.success(request, f'Interview scheduled successfully! Email sent to {interview.candidate_email}.')
-                    logger.info(f"Email sent successfully to {interview.candidate_email}")
+                    messages.success(request, f'Interview scheduled successfully! Email queued for {interview.candidate_email}.')
+                    logger.info(f"Email queued for {interview.candidate_email}")
                     
                 except Exception as e:
                     logger.warning(f'Email sending failed: {str(e)}')
@@ -880,7 +859,8 @@ def interview_ready(request, interview_uuid):
                 f'</div>'
             )
         
-        # Interview is accessible - show normal ready page
+        # Interview is accessible - render its name/job/company lines while the candidate gets ready
+        enqueue_interview_phrases(interview)
         return render(request, 'jobapp/interview_ready.html', {
             'interview': interview,
         })
@@ -900,7 +880,35 @@ def interview_ready(request, interview_uuid):
             
 #interview function
 @csrf_exempt
-def start_interview_by_uuid(request, interview_uuid):
+async def start_interview_by_uuid(request, interview_uuid):
+    """
+    Runs _interview_flow in a worker thread. Where the flow waits on the LLM or TTS it yields
+    the coroutine instead, and it is awaited here - so hundreds of interviews waiting on
+    upstream APIs do not hold hundreds of threads.
+    """
+    flow = _interview_flow(request, interview_uuid)
+    resume = sync_to_async(_resume_flow)
+    awaitable, response = await resume(flow)
+    while awaitable is not None:
+        try:
+            value, error = await awaitable, None
+        except Exception as e:
+            value, error = None, e
+        awaitable, response = await resume(flow, value, error)
+    return response
+
+
+def _resume_flow(flow, value=None, error=None):
+    """Run the flow up to its next upstream wait: (coroutine to await, None) or (None, response)"""
+    try:
+        awaitable = flow.throw(error) if error else flow.send(value)
+    except StopIteration as stop:
+        return None, stop.value
+    return awaitable, None
+
+
+def _interview_flow(request, interview_uuid):
+    """Interview page (GET) and interviewer replies (POST); a generator driven by start_interview_by_uuid"""
     try:
         # Get the interview record
         interview = get_object_or_404(Interview, uuid=interview_uuid)
@@ -930,17 +938,13 @@ def start_interview_by_uuid(request, interview_uuid):
             job_title = interview.job.title or "Software Developer"
             
             profile = getattr(interview.candidate, 'profile', None)
-            resume_file = profile.resume if profile and profile.resume else None
             resume_text = ""
             
-            if resume_file:
+            if profile and profile.resume:
                 try:
-                    # Check if file actually exists before trying to open it
-                    if hasattr(resume_file, 'path') and os.path.exists(resume_file.path):
-                        # Open the file properly before passing to extract_resume_text
-                        with resume_file.open('rb') as file_obj:
-                            resume_text = extract_resume_text(file_obj)
-                    else:
+                    # Text extracted at upload time (one lookup by content hash)
+                    resume_text = resume_text_for(profile)
+                    if resume_text is None:
                         # File is missing - continue without resume
                         resume_text = f"Resume file is not available for {candidate_name}."
                         logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
@@ -955,6 +959,7 @@ def start_interview_by_uuid(request, interview_uuid):
             job_title = interview.job.title if interview.job else "Software Developer"
             
             # Try to find the candidate resume from the Candidate model
+            candidate_obj = None
             candidate_resume = None
             try:
                 # Find the candidate by email and recruiter
@@ -972,44 +977,15 @@ def start_interview_by_uuid(request, interview_uuid):
             
             if candidate_resume:
                 try:
-                    # Check if file actually exists before trying to open it
-                    if hasattr(candidate_resume, 'path') and os.path.exists(candidate_resume.path):
-                        # Open the file properly before passing to extract_resume_text
-                        with candidate_resume.open('rb') as resume_file:
-                            resume_text = extract_resume_text(resume_file)
-                        logger.info(f"Successfully extracted resume text for {candidate_name}")
+                    # Text extracted at upload time (one lookup by content hash); a missing
+                    # file is replaced through the resume file index (see resume_store.py)
+                    resume_text = resume_text_for(candidate_obj)
+                    if resume_text is not None:
+                        logger.info(f"Loaded resume text for {candidate_name}")
                     else:
-                        # Try to find similar file in candidate_resumes folder
-                        resume_found = False
-                        try:
-                            candidate_resumes_dir = os.path.join(settings.MEDIA_ROOT, 'candidate_resumes')
-                            if os.path.exists(candidate_resumes_dir):
-                                # Get base filename without Django's random suffix
-                                original_name = candidate_resume.name
-                                base_name = original_name.split('/')[-1]  # Get filename only
-                                name_without_suffix = base_name.split('_')[:-1]  # Remove last part (random suffix)
-                                if name_without_suffix:
-                                    search_pattern = '_'.join(name_without_suffix)
-                                    
-                                    # Look for files that start with the base name
-                                    for filename in os.listdir(candidate_resumes_dir):
-                                        if filename.startswith(search_pattern) and filename.endswith('.pdf'):
-                                            found_file_path = os.path.join(candidate_resumes_dir, filename)
-                                            logger.info(f"Found similar resume file: {filename} for {candidate_name}")
-                                            
-                                            # Try to extract from found file
-                                            with open(found_file_path, 'rb') as resume_file:
-                                                resume_text = extract_resume_text(resume_file)
-                                            logger.info(f"Successfully extracted resume text from {filename} for {candidate_name}")
-                                            resume_found = True
-                                            break
-                        except Exception as search_error:
-                            logger.warning(f"Error searching for similar resume file: {search_error}")
-                        
-                        if not resume_found:
-                            # File is missing - continue without resume
-                            resume_text = f"Resume file is not available for {candidate_name}."
-                            logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
+                        # File is missing - continue without resume
+                        resume_text = f"Resume file is not available for {candidate_name}."
+                        logger.info(f"Resume file missing for {candidate_name}, continuing interview without resume")
                 except Exception as e:
                     resume_text = f"Resume could not be processed for {candidate_name}."
                     logger.warning(f"Resume extraction error for unregistered candidate in interview {interview_uuid}: {e}")
@@ -1032,19 +1008,20 @@ def start_interview_by_uuid(request, interview_uuid):
                 status=400
             )
         
-        # Use unique session key per interview
-        session_key = f'interview_context_{interview_uuid}'
+        # Interview state lives in the interview state store, not the DB-backed session
+        state_store = get_interview_state_store()
+        context = state_store.load(interview_uuid)
         
-        # CRITICAL FIX: Only initialize session if it doesn't exist (don't reset on every request)
-        if session_key not in request.session:
-            logger.info(f"Creating new session context for interview {interview_uuid}")
+        # CRITICAL FIX: Only initialize state if it doesn't exist (don't reset on every request)
+        if context is None:
+            logger.info(f"Creating new interview state for interview {interview_uuid}")
             # Set the actual start time in the database when interview begins
             if not interview.started_at:
                 interview.started_at = timezone.now()
                 interview.save(update_fields=['started_at'])
                 logger.info(f"Interview {interview_uuid} started at {interview.started_at}")
             
-            request.session[session_key] = {
+            context = {
                 'candidate_name': candidate_name,
                 'job_title': job_title,
                 'company_name': company_name,
@@ -1056,14 +1033,18 @@ def start_interview_by_uuid(request, interview_uuid):
                 'conversation_history': [],
                 'started_at': timezone.now().isoformat(),
                 'interview_completed': False,
-                'interview_duration_minutes': interview.interview_duration_minutes or 15  # Use actual duration or default to 15
+                'interview_duration_minutes': interview.interview_duration_minutes or 15,  # Use actual duration or default to 15
             }
-            request.session.modified = True
+            state_store.create(interview_uuid, context)
+            # No-op when the ready page already queued it
+            enqueue_interview_phrases(interview)
         else:
-            logger.info(f"Using existing session context for interview {interview_uuid}")
+            logger.info(f"Using existing interview state for interview {interview_uuid}")
         
         # HANDLE POST REQUEST - Process candidate responses
         if request.method == "POST":
+            timer = TurnTimer()
+            defer_audio = False
             try:
                 user_text = ""
                 time_remaining = 900
@@ -1085,6 +1066,7 @@ def start_interview_by_uuid(request, interview_uuid):
                             time_remaining = int(request.POST.get("time_remaining", 900))
                         except (ValueError, TypeError):
                             time_remaining = 900
+                        defer_audio = request.POST.get("defer_audio") == "1"
                     else:
                         logger.error(f"❌ Whisper transcription failed: {transcription_result['error']}")
                         return JsonResponse({
@@ -1101,22 +1083,29 @@ def start_interview_by_uuid(request, interview_uuid):
                     data = json.loads(request.body)
                     user_text = data.get("text") or data.get("message")
                     time_remaining = int(data.get("time_remaining", 900))
+                    defer_audio = bool(data.get("defer_audio"))
                 else:
                     user_text = request.POST.get("text", "")
                     try:
                         time_remaining = int(request.POST.get("time_remaining", 900))
                     except (ValueError, TypeError):
                         time_remaining = 900
+                    defer_audio = request.POST.get("defer_audio") == "1"
                 
                 # Handle screenshots if provided
                 screenshots_data = request.POST.get('screenshots')
                 if screenshots_data:
                     try:
                         screenshots = json.loads(screenshots_data)
-                        save_interview_screenshots(interview, screenshots)
-                        logger.info(f"Saved {len(screenshots)} screenshots for interview {interview_uuid}")
+                        # Decoding and writing the images happens in the task worker
+                        enqueue_task(
+                            'save_interview_screenshots',
+                            {'interview_uuid': str(interview_uuid), 'screenshots': screenshots},
+                            idempotency_key=f"interview-screenshots:{interview_uuid}:{hashlib.md5(screenshots_data.encode()).hexdigest()}"
+                        )
+                        logger.info(f"Queued {len(screenshots)} screenshots for interview {interview_uuid}")
                     except Exception as e:
-                        logger.error(f"Failed to save screenshots: {e}")
+                        logger.error(f"Failed to queue screenshots: {e}")
                         
             except Exception as e:
                 logger.error(f"Error parsing request data: {e}")
@@ -1137,9 +1126,8 @@ def start_interview_by_uuid(request, interview_uuid):
     
             logger.info(f"User input for interview {interview_uuid}: {user_text[:100]}... (Time remaining: {time_remaining}s)")
     
-            # Get current context
-            context = request.session.get(session_key, {})
-            logger.info(f"Retrieved session context: {context.keys() if context else 'None'}")
+            # Current context was loaded from the state store above
+            logger.info(f"Retrieved interview state: {context.keys() if context else 'None'}")
             logger.info(f"Current question count in context: {context.get('question_count', 'Not found')}")
             logger.info(f"Interview completed flag: {context.get('interview_completed', 'Not found')}")
             
@@ -1156,15 +1144,10 @@ def start_interview_by_uuid(request, interview_uuid):
                 })
     
             # Prevent duplicate processing - but be more lenient
-            last_processed = context.get('last_processed_input', '')
             current_input_hash = hashlib.md5(user_text.encode()).hexdigest()
             
-            # Only block if it's EXACTLY the same AND was processed within last 5 seconds
-            last_processed_time = context.get('last_processed_time', 0)
-            current_time = timezone.now().timestamp()
-            time_since_last = current_time - last_processed_time
-            
-            if last_processed == current_input_hash and time_since_last < 5:
+            # Only block if it's EXACTLY the same AND is still being processed (claim expires after 5 seconds)
+            if not state_store.claim_input(interview_uuid, current_input_hash, ttl=5):
                 logger.warning(f"Duplicate request detected for interview {interview_uuid} (within 5s), ignoring")
                 return JsonResponse({
                     'error': 'Duplicate request detected',
@@ -1174,19 +1157,13 @@ def start_interview_by_uuid(request, interview_uuid):
                     'success': False
                 })
     
-            context['last_processed_input'] = current_input_hash
-            context['last_processed_time'] = current_time
-            
             logger.info(f"Processing new response (hash: {current_input_hash[:8]}...)")
     
             # Get current question count and increment
             current_count = context.get('question_count', 0)
             question_count = current_count + 1
     
-            # Save incremented count back to session IMMEDIATELY
             context['question_count'] = question_count
-            request.session[session_key] = context
-            request.session.modified = True
     
             logger.info(f"Question count incremented from {current_count} to {question_count} for interview {interview_uuid}")
     
@@ -1216,6 +1193,7 @@ def start_interview_by_uuid(request, interview_uuid):
             
             # Build conversation history
             conversation_history = context.get('conversation_history', [])
+            stored_turn_count = len(conversation_history)
             
             # Only add to conversation history if it's not a simple audio test
             if not is_simple_audio_issue:
@@ -1234,12 +1212,19 @@ def start_interview_by_uuid(request, interview_uuid):
             
             logger.info(f"Content analysis - Audio issue: {is_simple_audio_issue}, User text: '{user_text_lower}'")
             
+            timer.lap('parse')
+            
             # Generate AI response - WRAP IN TRY-CATCH
+            llm_latency_ms = None
+            # Fixed interviewer lines come from the phrase catalog so their audio can be pre-rendered
+            ai_phrase = None
+            phrase_params = {'candidate_name': candidate_name, 'job_title': job_title, 'company_name': company_name}
             logger.info(f"About to generate AI response - Audio issue: {is_simple_audio_issue}, Time up: {is_time_up}, Last question: {is_last_question}")
             try:
                 if is_time_up:
                     # Time is up - end the interview
-                    ai_response = f"Thank you so much for your time today, {candidate_name}! We've covered a lot of ground in our conversation. I really enjoyed learning about your background, skills, and experiences. Your insights have been valuable, and we appreciate your interest in the {job_title} position at {company_name}. Our team will review everything we discussed and get back to you with next steps within 2-3 business days. Have a wonderful day!"
+                    ai_phrase = phrase('time_up', **phrase_params)
+                    ai_response = ai_phrase.text
                     
                     context['interview_completed'] = True
                     # Mark interview as completed in database
@@ -1251,32 +1236,17 @@ def start_interview_by_uuid(request, interview_uuid):
                     interview.save()
                     logger.info(f"Interview time completed for {interview_uuid}")
                     
-                    # Generate interview results immediately
-                    try:
-                        generate_interview_results(interview, conversation_history)
-                        logger.info(f"Interview results generated for {interview_uuid}")
-                    except Exception as e:
-                        logger.error(f"Failed to generate interview results: {e}")
-                    
                 elif is_last_question:
                     # 2 minutes or less - notify this is the last question
-                    follow_up_questions = [
-                        f"We're coming to the end of our time together, {candidate_name}. For my final question: Is there anything important about your skills, experience, or qualifications that we haven't discussed yet that you'd like me to know about?",
-                        
-                        f"This will be our last question today, {candidate_name}. Before we wrap up: What makes you particularly excited about this {job_title} opportunity, and why do you think you'd be a great fit for our team at {company_name}?",
-                        
-                        f"We have just a couple of minutes left, {candidate_name}. As a final question: If you were to start in this role next week, what would be your top priority in your first 30 days?",
-                        
-                        f"For our final question today, {candidate_name}: What's one professional achievement you're most proud of, and what did you learn from that experience?",
-                    ]
-                    
                     import random
-                    ai_response = random.choice(follow_up_questions)
+                    ai_phrase = phrase(random.choice(LAST_QUESTIONS), **phrase_params)
+                    ai_response = ai_phrase.text
                     logger.info(f"Last question triggered for interview {interview_uuid} with {time_remaining}s remaining")
                     
                 elif is_simple_audio_issue:
                     # Audio test response - DON'T increment question count for audio tests
-                    ai_response = f"Yes, I can hear you perfectly, {candidate_name}! Your audio is crystal clear and you sound great. I'm Sarah, and I'm so excited to get to know you better today! Let's dive in - could you tell me about your background, your experience with {job_title} work, and what specifically drew you to apply for this position with {company_name}?"
+                    ai_phrase = phrase('audio_check', **phrase_params)
+                    ai_response = ai_phrase.text
                     
                     # CRITICAL FIX: Reset question count for audio issues to prevent premature completion
                     context['question_count'] = 0  # Reset to 0 for audio tests
@@ -1330,13 +1300,15 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
                         
                         # Use AI to generate contextual response
                         try:
-                            ai_response = ask_ai_question(
+                            llm_start = time.time()
+                            ai_response = yield async_ask_ai_question(
                                 conversation_context,
                                 candidate_name=candidate_name,
                                 job_title=job_title,
                                 company_name=company_name,
                                 timeout=15
                             )
+                            llm_latency_ms = int((time.time() - llm_start) * 1000)
                             
                             # Clean and validate the AI response
                             if ai_response:
@@ -1370,68 +1342,74 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
                             
                             # Analyze candidate's response for emotional tone and content
                             if any(word in response_lower for word in ['nervous', 'anxious', 'worried', 'scared']):
-                                ai_response = f"I completely understand, {candidate_name}. Interviews can feel nerve-wracking, but you're doing fantastic! Let's keep this conversational and relaxed. "
+                                ack = 'ack_nervous'
                             elif any(word in response_lower for word in ['excited', 'passionate', 'love', 'enjoy', 'enthusiastic']):
-                                ai_response = f"I can really hear the passion in your voice, {candidate_name}! That enthusiasm is exactly what we love to see. "
+                                ack = 'ack_passion'
                             elif any(word in response_lower for word in ['challenge', 'difficult', 'problem', 'struggle']):
-                                ai_response = f"That sounds like a great learning experience, {candidate_name}. I appreciate you sharing that challenge with me. "
+                                ack = 'ack_challenge'
                             else:
-                                ai_response = f"Thank you for sharing that, {candidate_name}. That's really insightful! "
+                                ack = 'ack_default'
                             
                             # Add contextual follow-up based on question progression and content
                             if question_count <= 3:
                                 # ICE-BREAKING QUESTIONS (First 3 questions to make candidate comfortable)
                                 if question_count == 1:
-                                    ai_response += f"Nice to meet you! How are you feeling today?"
+                                    follow_up = 'icebreaker_1'
                                 elif question_count == 2:
-                                    ai_response += f"Great! Now that we're getting to know each other, are you ready to start our interview for the {job_title} position at {company_name}?"
+                                    follow_up = 'icebreaker_2'
                                 else:  # question_count == 3
-                                    ai_response += f"Perfect! Let's begin. Could you tell me a bit about yourself and what drew you to apply for this {job_title} role?"
+                                    follow_up = 'icebreaker_3'
                             
                             elif question_count <= 4:
                                 if any(word in response_lower for word in ['python', 'javascript', 'java', 'react', 'django', 'node', 'html', 'css', 'sql']):
-                                    ai_response += "Excellent technical foundation! Can you walk me through a specific project where you used these technologies? I'm particularly interested in any challenges you faced and how you overcame them."
+                                    follow_up = 'projects_technologies'
                                 elif any(word in response_lower for word in ['project', 'built', 'created', 'developed', 'application', 'website']):
-                                    ai_response += "That sounds like a fascinating project! What was the most challenging technical problem you encountered while building it, and how did you approach solving it?"
+                                    follow_up = 'projects_built'
                                 elif any(word in response_lower for word in ['framework', 'library', 'tool', 'database']):
-                                    ai_response += "Great choice of technologies! Can you describe a specific project where you implemented these tools? What made you choose them for that particular solution?"
+                                    follow_up = 'projects_tools'
                                 else:
-                                    ai_response += "I'd love to hear about a project you've worked on that you're particularly proud of. Can you walk me through the technical challenges and how you solved them?"
+                                    follow_up = 'projects_default'
                             #Techniacal questions
                             elif question_count <= 6:
                                 if any(word in response_lower for word in ['team', 'collaborate', 'group', 'together', 'pair']):
-                                    ai_response += "Collaboration is so crucial in development! Can you give me an example of a time when you had to work through a technical disagreement with a team member? How did you handle it?"
+                                    follow_up = 'team_disagreement'
                                 elif any(word in response_lower for word in ['problem', 'challenge', 'difficult', 'bug', 'issue', 'debug']):
-                                    ai_response += "Great problem-solving approach! How do you typically approach debugging complex issues, especially when working with a team? Do you have a systematic process?"
+                                    follow_up = 'team_debugging'
                                 elif any(word in response_lower for word in ['agile', 'scrum', 'methodology', 'process']):
-                                    ai_response += "Excellent experience with development methodologies! How do you handle changing requirements or tight deadlines while maintaining code quality?"
+                                    follow_up = 'team_methodology'
                                 else:
-                                    ai_response += "How do you approach working in team environments, especially when collaborating on complex technical projects? Can you share an example?"
+                                    follow_up = 'team_default'
                             #Advanced
                             else:
                                 if any(word in response_lower for word in ['goal', 'future', 'career', 'grow', 'learn', 'aspiration']):
-                                    ai_response += f"I love hearing about career aspirations! What specifically excites you about this {job_title} role at {company_name}, and how does it align with your professional goals?"
+                                    follow_up = 'motivation_goals'
                                 elif any(word in response_lower for word in ['company', 'role', 'position', 'opportunity', 'culture']):
-                                    ai_response += "That's exactly the kind of thinking we value! Do you have any questions about the day-to-day responsibilities, our team dynamics, or the company culture?"
+                                    follow_up = 'motivation_culture'
                                 elif any(word in response_lower for word in ['technology', 'innovation', 'cutting-edge', 'latest']):
-                                    ai_response += f"Your interest in technology trends is great! How do you stay updated with the latest developments in {job_title}, and what emerging technologies are you most excited about?"
+                                    follow_up = 'motivation_trends'
                                 else:
-                                    ai_response += f"What draws you most to this {job_title} position at {company_name}? What aspects of the role or our company culture interest you the most?"
+                                    follow_up = 'motivation_default'
+                            
+                            ai_phrase = phrase(ack, follow_up, **phrase_params)
+                            ai_response = ai_phrase.text
                         
                     except Exception as qgen_error:
                         logger.error(f"Error generating conversational response: {qgen_error}")
                         # Enhanced fallback that's more engaging and job-focused
-                        ai_response = f"Thank you for sharing that, {candidate_name}. That's really valuable insight! I'd love to learn more about your passion for {job_title} work. What aspects of technology and development motivate you most, and how do you see yourself contributing to our team?"
+                        ai_phrase = phrase('generic_followup', **phrase_params)
+                        ai_response = ai_phrase.text
             
             except Exception as response_gen_error:
                 logger.error(f"CRITICAL: Error generating AI response: {response_gen_error}")
                 import traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
-                ai_response = f"Thank you for that response, {candidate_name}. Could you tell me more about your background and experience?"
+                ai_phrase = phrase('generic_background', **phrase_params)
+                ai_response = ai_phrase.text
                 # Mark as completion error to prevent interview from ending
                 context['interview_completed'] = False
             
             logger.info(f"AI response generated successfully ({len(ai_response)} chars)")
+            timer.lap('llm')
 
     
             # Add AI response to history (skip for audio tests)
@@ -1441,140 +1419,124 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
                     'message': ai_response,
                     'question_number': question_count,
                     'timestamp': timezone.now().isoformat(),
-                    'time_remaining': time_remaining
+                    'time_remaining': time_remaining,
+                    'llm_latency_ms': llm_latency_ms
                 })
             else:
                 logger.info(f"Skipping AI response history for audio test response")
     
+            # Only the turns added during this request are appended to the store
+            new_turns = conversation_history[stored_turn_count:]
+            
             # Keep conversation history manageable
             if len(conversation_history) > 40:
                 conversation_history = conversation_history[-40:]
                 
             context['conversation_history'] = conversation_history
             
-            # Generate interview results if completed (but not already generated)
-            if context.get('interview_completed', False) and not interview.has_results:
-                try:
-                    generate_interview_results(interview, conversation_history)
-                    logger.info(f"Interview results generation completed for {interview_uuid}")
-                except Exception as e:
-                    logger.error(f"Failed to generate interview results for {interview_uuid}: {e}")
-            
             # CRITICAL FIX: Don't complete interview unless time is actually up or we have substantial conversation
-            elif question_count >= 15 and time_remaining > 60:  # Only complete if we have many questions AND time is running out
+            if not context.get('interview_completed', False) and question_count >= 15 and time_remaining > 60:  # Only complete if we have many questions AND time is running out
                 logger.info(f"Interview has {question_count} questions but {time_remaining}s remaining - continuing interview")
                 # Don't complete yet, let time run out naturally
             
-            # Save updated context
-            request.session[session_key] = context
-            request.session.modified = True
-        
-            # Generate TTS audio for the response
-            audio_path = None
-            audio_duration = None
-            try:
-                logger.info(f"Starting TTS generation for interview {interview_uuid}")
-                
-                from jobapp.tts import generate_tts, estimate_audio_duration, get_audio_duration
+            # Synthesize the reply's audio in the pipeline pool while the turn is stored
+            audio_key = uuid.uuid4().hex
+            context['pending_audio'] = pending_audio_state(audio_key, ai_response, ai_phrase)
+            # Audio-check replies are not stored as turns; their timings are only logged.
+            # The row's turn_index is known once save_interview_turns has allocated it.
+            turn_record = TurnRecord(interview.id, None, timer)
+            start_turn_audio(audio_key, ai_response, ai_phrase, timer, turn_record)
+            
+            # Save updated context - one write per turn, which also releases the duplicate-input claim
+            with timer.stage('state_save'):
+                state_store.save_turn(interview_uuid, context, new_turns, release=current_input_hash)
+            
+            with timer.stage('db_write'):
+                # Append this exchange to the InterviewTurn table
+                if new_turns:
+                    saved_turns = save_interview_turns(interview, new_turns)
+                    if saved_turns:
+                        turn_record.turn_index = saved_turns[-1].turn_index
                 
-                # Always try Daisy TTS first
-                audio_path = generate_tts(ai_response, "female_interview")
+                if context.get('interview_completed', False):
+                    # Write out the face timeline before the results read it
+                    close_timelines(interview_uuid)
                 
-                if audio_path and audio_path != 'None':
+                # Results are generated by the task worker once the final turns are stored
+                if context.get('interview_completed', False) and not interview.has_results:
                     try:
-                        full_audio_path = os.path.join(settings.BASE_DIR, audio_path.lstrip('/'))
-                        if os.path.exists(full_audio_path):
-                            actual_duration = get_audio_duration(full_audio_path)
-                            
-                            if actual_duration and actual_duration > 0:
-                                audio_duration = actual_duration
-                                logger.info(f"Using actual audio duration: {audio_duration:.2f} seconds")
-                            else:
-                                audio_duration = estimate_audio_duration(ai_response)
-                                logger.info(f"Using estimated audio duration: {audio_duration:.2f} seconds")
-                        else:
-                            logger.warning(f"Audio file not found: {full_audio_path}")
-                            audio_path = None
-                            audio_duration = estimate_audio_duration(ai_response)
-                    except Exception as duration_error:
-                        logger.error(f"Error getting audio duration: {duration_error}")
-                        audio_duration = estimate_audio_duration(ai_response)
-                else:
-                    logger.info("No audio path returned from TTS generation")
-                    audio_path = None
-                    audio_duration = estimate_audio_duration(ai_response)
-                    
-            except Exception as e:
-                logger.error(f"TTS generation failed for interview {interview_uuid}: {e}")
-                audio_path = None
-                try:
-                    from jobapp.tts import estimate_audio_duration
-                    audio_duration = estimate_audio_duration(ai_response)
-                except:
-                    audio_duration = max(6.0, len(ai_response) * 0.05)
-    
-            # Ensure we have a valid duration
-            if not audio_duration or audio_duration <= 0:
-                audio_duration = max(3.0, len(ai_response) * 0.05)
-    
+                        enqueue_interview_results(interview)
+                        logger.info(f"Interview results generation queued for {interview_uuid}")
+                    except Exception as e:
+                        logger.error(f"Failed to queue interview results for {interview_uuid}: {e}")
+            
             # Return response data
             response_data = {
                 'response': ai_response,
-                'audio': audio_path if audio_path else '',
-                'audio_duration': audio_duration,
                 'success': True,
                 'question_count': question_count,
                 'is_final': context.get('interview_completed', False),
-                'has_audio': bool(audio_path),
                 'interview_completed': context.get('interview_completed', False),
                 'time_remaining': time_remaining
             }
+            
+            if defer_audio:
+                # The page shows the text now and fetches the audio from interview_turn_audio
+                from jobapp.tts import estimate_audio_duration
+                response_data.update({
+                    'audio': '',
+                    'audio_duration': estimate_audio_duration(ai_response),
+                    'has_audio': False,
+                    'audio_pending': True,
+                    'audio_url': reverse('interview_turn_audio', args=[interview_uuid, audio_key]),
+                })
+            else:
+                try:
+                    audio = yield await_turn_audio(audio_key)
+                except TimeoutError:
+                    logger.error(f"TTS generation timed out for interview {interview_uuid}")
+                    audio = None
+                if not audio:
+                    from jobapp.tts import estimate_audio_duration
+                    audio = {'audio': '', 'audio_duration': estimate_audio_duration(ai_response), 'has_audio': False}
+                response_data.update(audio)
+            
+            timer.mark('response')
+            turn_record.arrive()
     
             logger.info(f"Sending response for interview {interview_uuid}: question_count={question_count}, time_remaining={time_remaining}s, is_final={response_data['is_final']}")
             logger.info(f"Response data keys: {list(response_data.keys())}")
             logger.info(f"AI response length: {len(ai_response)} characters")
     
-            # Save updated context to session
-            request.session[session_key] = context
-            request.session.modified = True
-            
             # Update interview start time if not already set
             if not interview.started_at:
                 interview.started_at = timezone.now()
                 interview.save(update_fields=['started_at'])
                 logger.info(f"Interview {interview_uuid} start time updated to {interview.started_at}")
             
-            # Clear duplicate prevention after a delay
-            if 'last_processed_input' in context:
-                context['last_processed_input'] = ''
-                request.session[session_key] = context
-                request.session.modified = True
-            
             logger.info(f"About to return JsonResponse for interview {interview_uuid}")
             return JsonResponse(response_data)
         
         # HANDLE GET REQUEST - Show interview UI with first question
-        ai_question = f"Hi there! I'm Sarah. Before we begin, could you please tell me your name?"
+        greeting = phrase('greeting')
+        ai_question = greeting.text
         
         logger.info(f"Generated AI initial question for interview {interview_uuid}")
         
-        # Add initial question to context conversation history
-        context = request.session.get(session_key, {})
-        conversation_history = context.get('conversation_history', [])
-        conversation_history.append({
+        # Add initial question to the stored conversation history
+        greeting_turn = {
             'speaker': 'interviewer',
             'message': ai_question,
             'question_number': 0,
             'timestamp': timezone.now().isoformat(),
             'response_type': 'initial_greeting',
             'response_length': len(ai_question)
-        })
+        }
         
-        context['conversation_history'] = conversation_history
         context['interview_started_at'] = timezone.now().isoformat()
         context['interviewer_name'] = 'Sarah'
-        request.session[session_key] = context
-        request.session.modified = True
+        state_store.save_turn(interview_uuid, context, [greeting_turn])
+        save_interview_turns(interview, [greeting_turn])
         
         # Generate initial TTS
         audio_path = None
@@ -1582,29 +1544,19 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
         try:
             logger.info(f"Starting initial TTS generation for interview {interview_uuid}")
             
-            from jobapp.tts import generate_tts, estimate_audio_duration, get_audio_duration
+            from jobapp.tts import generate_tts, estimate_audio_duration, get_tts_duration
             
-            audio_path = generate_tts(ai_question, "female_interview")
+            audio_path = phrase_audio(greeting) or (yield async_generate_tts(ai_question, "female_interview"))
             
             if audio_path and audio_path != 'None':
-                try:
-                    full_audio_path = os.path.join(settings.BASE_DIR, audio_path.lstrip('/'))
-                    if os.path.exists(full_audio_path):
-                        actual_duration = get_audio_duration(full_audio_path)
-                        
-                        if actual_duration and actual_duration > 0:
-                            audio_duration = actual_duration
-                            logger.info(f"Initial question - using actual audio duration: {audio_duration:.2f} seconds")
-                        else:
-                            audio_duration = estimate_audio_duration(ai_question)
-                            logger.info(f"Initial question - using estimated audio duration: {audio_duration:.2f} seconds")
-                    else:
-                        logger.warning(f"Initial audio file not found: {full_audio_path}")
-                        audio_path = None
-                        audio_duration = estimate_audio_duration(ai_question)
-                except Exception as duration_error:
-                    logger.error(f"Error getting initial audio duration: {duration_error}")
+                actual_duration = get_tts_duration(audio_path)
+                
+                if actual_duration and actual_duration > 0:
+                    audio_duration = actual_duration
+                    logger.info(f"Initial question - using actual audio duration: {audio_duration:.2f} seconds")
+                else:
                     audio_duration = estimate_audio_duration(ai_question)
+                    logger.info(f"Initial question - using estimated audio duration: {audio_duration:.2f} seconds")
             else:
                 logger.info("No initial audio path returned from TTS generation")
                 audio_path = None
@@ -1634,6 +1586,8 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
             'has_audio': bool(audio_path),
             'csrf_token': get_token(request),
             'is_registered_candidate': interview.is_registered_candidate,
+            # The proctoring WebSocket is only routed under ASGI (jobapp/proctoring.py)
+            'proctoring_socket': settings.SERVER_MODE == 'asgi',
         }
         
         logger.info(f"Template context for interview {interview_uuid} - has_audio: {context_data['has_audio']}, duration: {audio_duration:.2f}s")
@@ -1683,6 +1637,28 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
             )
 
 
+async def interview_turn_audio(request, interview_uuid, audio_key):
+    """Audio for an interviewer reply sent with defer_audio - returns once synthesis has finished"""
+    try:
+        interview = await Interview.objects.aget(uuid=interview_uuid)
+        context = await sync_to_async(get_interview_state_store().load)(interview.uuid)
+        audio = await resolve_turn_audio(audio_key, context)
+        if audio is None:
+            return JsonResponse({'success': False, 'error': 'Unknown audio'}, status=404)
+        return JsonResponse({'success': True, **audio})
+    
+    except Interview.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Interview not found'}, status=404)
+    
+    except TimeoutError:
+        logger.error(f"Audio {audio_key} for interview {interview_uuid} is still being synthesized")
+        return JsonResponse({'success': False, 'error': 'Audio not ready'}, status=504)
+    
+    except Exception as e:
+        logger.error(f"Error fetching turn audio for interview {interview_uuid}: {e}")
+        return JsonResponse({'success': False, 'error': 'Audio unavailable'}, status=500)
+
+
             
 
 
@@ -1739,32 +1715,14 @@ As Sarah, respond to what they just shared. Acknowledge their answer, show genui
 
 def serve_media(request, path):
     """
-    Serve media files in production with better error handling
+    Serve media files in production with byte ranges, conditional requests and
+    X-Accel-Redirect / X-Sendfile offload (see jobapp/media_serving.py)
     """
     try:
-        # Try to serve the file
-        media_root = settings.MEDIA_ROOT
-        full_path = os.path.join(media_root, path)
-        
-        logger.info(f"Attempting to serve media file: {path}")
-        logger.info(f"Full path: {full_path}")
-        logger.info(f"File exists: {os.path.exists(full_path)}")
-        
-        if not os.path.exists(full_path):
-            logger.error(f"Media file not found: {full_path}")
-            raise Http404(f"Media file not found: {path}")
-        
-        # Get file info
-        file_size = os.path.getsize(full_path)
-        logger.info(f"File size: {file_size} bytes")
-        
-        # For PDF files, ensure proper content type
-        response = serve(request, path, document_root=media_root)
-        if path.lower().endswith('.pdf'):
-            response['Content-Type'] = 'application/pdf'
-            response['Content-Disposition'] = f'inline; filename="{os.path.basename(path)}"'
-            
-        return response
+        return media_response(request, path)
+    except Http404:
+        logger.warning(f"Media file not found: {path}")
+        raise
     except Exception as e:
         logger.error(f"Error serving media file {path}: {e}")
         raise Http404(f"Media file not found: {path}")
@@ -1883,28 +1841,7 @@ def save_interview_recording(request):
             
             # Update interview record with recording info
             relative_path = os.path.join('interview_recordings', filename)
-            
-            # Add recording info to interview (you might want to create a separate Recording model)
-            # For now, we'll store it in the transcript field or create a new field
-            recording_info = {
-                'recording_path': relative_path,
-                'duration': float(duration),
-                'file_size': recording_file.size,
-                'recorded_at': timezone.now().isoformat(),
-                'filename': filename
-            }
-            
-            # Store recording info in interview record
-            interview.recording_data = json.dumps(recording_info)
-            interview.recording_path = relative_path
-            interview.recording_duration = float(duration)
-            interview.is_recorded = True
-            
-            # Also update transcript with recording info
-            current_transcript = interview.transcript or ''
-            interview.transcript = current_transcript + f"\n\nRecording saved: {json.dumps(recording_info)}"
-            
-            interview.save()
+            attach_recording(interview, relative_path, filename, recording_file.size, duration)
             
             logger.info(f"Recording saved successfully: {file_path}")
             
@@ -1928,6 +1865,89 @@ def save_interview_recording(request):
     return JsonResponse({'error': 'Only POST method allowed'}, status=405)
 
 
+# Chunked recording uploads (see jobapp/recording_upload.py)
+def _recording_upload_error(error):
+    data = {'success': False, 'error': str(error)}
+    if error.offset is not None:
+        data['offset'] = error.offset
+    return JsonResponse(data, status=error.status)
+
+
+@csrf_exempt
+def start_recording_upload(request):
+    """Open a resumable upload that the interview page appends MediaRecorder chunks to"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method allowed'}, status=405)
+    
+    interview_uuid = request.POST.get('interview_uuid')
+    if not interview_uuid:
+        return JsonResponse({'error': 'No interview UUID provided'}, status=400)
+    try:
+        interview = Interview.objects.get(uuid=interview_uuid)
+    except (Interview.DoesNotExist, ValidationError):
+        return JsonResponse({'error': 'Interview not found'}, status=404)
+    
+    upload = start_upload(interview, request.POST.get('content_type', ''))
+    return JsonResponse({
+        'success': True,
+        'upload_id': str(upload.upload_id),
+        'offset': 0,
+        'max_chunk_bytes': RECORDING_CHUNK_MAX_BYTES,
+    }, status=201)
+
+
+@csrf_exempt
+def recording_upload_chunk(request, upload_id):
+    """PUT appends one chunk at X-Upload-Offset; GET returns the offset to resume from"""
+    if request.method == 'GET':
+        upload = RecordingUpload.objects.filter(upload_id=upload_id).first()
+        if upload is None:
+            return JsonResponse({'error': 'Upload not found'}, status=404)
+        return JsonResponse({'offset': upload.received_bytes, 'status': upload.status, 'chunks': upload.chunk_count})
+    
+    if request.method != 'PUT':
+        return JsonResponse({'error': 'Only GET and PUT methods allowed'}, status=405)
+    
+    try:
+        offset = int(request.headers.get('X-Upload-Offset', ''))
+        length = int(request.META.get('CONTENT_LENGTH') or '')
+    except ValueError:
+        return JsonResponse({'error': 'X-Upload-Offset and Content-Length headers are required'}, status=411)
+    
+    try:
+        upload, chunk_sha256 = append_chunk(upload_id, offset, request, length,
+                                            request.headers.get('X-Chunk-SHA256', ''))
+    except RecordingUploadError as e:
+        return _recording_upload_error(e)
+    
+    response = JsonResponse({'success': True, 'offset': upload.received_bytes, 'chunks': upload.chunk_count})
+    response['ETag'] = f'"{chunk_sha256}"'
+    return response
+
+
+@csrf_exempt
+def finalize_recording_upload(request, upload_id):
+    """Assemble the uploaded chunks into the interview's recording"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method allowed'}, status=405)
+    
+    try:
+        upload = finalize_upload(upload_id, request.POST.get('duration', 0))
+    except RecordingUploadError as e:
+        return _recording_upload_error(e)
+    
+    response = JsonResponse({
+        'success': True,
+        'message': 'Recording saved successfully',
+        'file_size': upload.received_bytes,
+        'chunks': upload.chunk_count,
+        'path': upload.recording_path,
+        'sha256': upload.sha256,
+    })
+    response['ETag'] = f'"{upload.sha256}"'
+    return response
+
+
 
 
 @login_required
@@ -2060,141 +2080,95 @@ def add_candidate_dashboard(request):
     return redirect('recruiter_dashboard')
 
 
+DASHBOARD_SECTIONS = {
+    'applications_section', 'post_job_section', 'create_job_section', 'all_candidates_section',
+    'scheduled_interviews_section', 'edit_jobs_section', 'add_candidate_section', 'interview_results_section',
+}
+
+
 @login_required
 @user_passes_test(lambda u: u.is_recruiter)
 def recruiter_dashboard(request):
-    """Updated recruiter dashboard with proper candidate handling"""
-    # Initialize all variables as empty
-    applications = []
-    jobs = []
-    scheduled_interviews = []
-    all_candidates = []
-    
-    try:
-        # Get jobs posted by this recruiter
-        jobs = Job.objects.filter(posted_by=request.user).order_by('-date_posted')
-        logger.info(f"Successfully loaded {len(jobs)} jobs for recruiter {request.user.username}")
-    except Exception as e:
-        logger.error(f"Job query failed for recruiter {request.user.username}: {e}")
-        jobs = []
-    
-    # Try to get applications for recruiter's jobs
-    try:
-        applications = Application.objects.filter(
-            job__posted_by=request.user
-        ).select_related('job', 'applicant').order_by('-applied_at')
-        logger.info(f"Successfully loaded {len(applications)} applications for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Application query failed for recruiter {request.user.username}: {e}")
-        applications = []
-    
-    # Try to get interviews for recruiter's jobs
-    try:
-        scheduled_interviews = Interview.objects.filter(
-            job__posted_by=request.user
-        ).select_related('job', 'candidate').order_by('-scheduled_at')
-        logger.info(f"Successfully loaded {len(scheduled_interviews)} interviews for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Interview query failed for recruiter {request.user.username}: {e}")
-        scheduled_interviews = []
-    
-    # Get completed interviews with results for the results section
-    try:
-        completed_interviews = Interview.objects.filter(
-            job__posted_by=request.user,
-            status='completed'
-        ).select_related('job', 'candidate').order_by('-completed_at')
-        logger.info(f"Successfully loaded {len(completed_interviews)} completed interviews for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Completed interview query failed for recruiter {request.user.username}: {e}")
-        completed_interviews = []
-    
-    # Get recent interviews (last 10) for activity feed
-    try:
-        recent_interviews = Interview.objects.filter(
-            job__posted_by=request.user
-        ).select_related('job', 'candidate').order_by('-created_at')[:10]
-    except Exception as e:
-        logger.warning(f"Recent interviews query failed: {e}")
-        recent_interviews = []
-    
-    # Calculate recommendation statistics
-    try:
-        recommended_count = Interview.objects.filter(
-            job__posted_by=request.user,
-            status='completed',
-            recommendation__in=['highly_recommended', 'recommended']
-        ).count()
-        
-        rejected_count = Interview.objects.filter(
-            job__posted_by=request.user,
-            status='completed',
-            recommendation__in=['not_recommended', 'never_hire']
-        ).count()
-    except Exception as e:
-        logger.warning(f"Recommendation stats query failed: {e}")
-        recommended_count = 0
-        rejected_count = 0
-    
-    # Calculate average interview duration
-    try:
-        from django.db.models import Avg
-        avg_duration = Interview.objects.filter(
-            job__posted_by=request.user,
-            status='completed',
-            interview_duration_minutes__isnull=False
-        ).aggregate(avg_duration=Avg('interview_duration_minutes'))['avg_duration']
-        avg_interview_duration = int(avg_duration) if avg_duration else 15
-    except Exception as e:
-        logger.warning(f"Average duration calculation failed: {e}")
-        avg_interview_duration = 15
-    
-    # Get all candidates added by this recruiter
-    try:
-        all_candidates = Candidate.objects.filter(
-            added_by=request.user
-        ).order_by('-added_at')
-        logger.info(f"Successfully loaded {len(all_candidates)} candidates for recruiter {request.user.username}")
-    except Exception as e:
-        logger.warning(f"Candidate query failed for recruiter {request.user.username}: {e}")
-        all_candidates = []
-    
-    # Get user's jobs for the modal dropdown
-    try:
-        user_jobs = Job.objects.filter(posted_by=request.user).values('id', 'title', 'company', 'status')
-        user_jobs_list = list(user_jobs)
-        logger.info(f"Successfully loaded {len(user_jobs_list)} jobs for modal dropdown")
-    except Exception as e:
-        logger.warning(f"Could not fetch user jobs for modal: {e}")
-        user_jobs_list = []
-    
-    # Prepare context
+    """
+    Recruiter dashboard. The counters come from one cached query (dashboard_stats.py); each list
+    is a page of DASHBOARD_PAGE_SIZE rows with its own cursor (?applications_cursor=, ...), and
+    ?section= reopens the section a pager link came from.
+    """
+    page_size = getattr(settings, 'DASHBOARD_PAGE_SIZE', 20)
+    stats = recruiter_stats(request.user)
+
+    def page(queryset, param, ordering):
+        return KeysetPaginator(queryset, page_size, ordering).get_page(request.GET.get(param))
+
+    # Counted in the same query as the rows, not once per job in the template
+    jobs = page(Job.objects.filter(posted_by=request.user).annotate(application_count=Count('application')),
+                'jobs_cursor', ('-date_posted', '-id'))
+    applications = page(Application.objects.filter(job__posted_by=request.user).select_related('job', 'applicant'),
+                        'applications_cursor', ('-applied_at', '-id'))
+    # scheduled_at and completed_at can be null, so interviews page newest-created first by id
+    scheduled_interviews = page(Interview.objects.filter(job__posted_by=request.user).select_related('job', 'candidate'),
+                                'interviews_cursor', ('-id',))
+    completed_interviews = page(Interview.objects.filter(job__posted_by=request.user, status='completed')
+                                .select_related('job', 'candidate').prefetch_related('turns'),
+                                'results_cursor', ('-id',))
+    all_candidates = page(Candidate.objects.filter(added_by=request.user).select_related('added_by'),
+                          'candidates_cursor', ('-added_at', '-id'))
+    recent_interviews = Interview.objects.filter(
+        job__posted_by=request.user
+    ).select_related('job', 'candidate').order_by('-created_at')[:5]
+
+    # Jobs for the schedule-interview modal; its candidates load from recruiter_candidate_options
+    user_jobs = list(Job.objects.filter(posted_by=request.user).order_by('-date_posted').values('id', 'title', 'company'))
+
+    active_section = request.GET.get('section')
     context = {
+        'stats': stats,
         'applications': applications,
         'scheduled_interviews': scheduled_interviews,
         'completed_interviews': completed_interviews,
         'all_candidates': all_candidates,
         'jobs': jobs,
-        'user_jobs': user_jobs_list,
+        'user_jobs': user_jobs,
         'user': request.user,
         'recent_interviews': recent_interviews,
-        'recommended_count': recommended_count,
-        'rejected_count': rejected_count,
-        'avg_interview_duration': avg_interview_duration,
+        'recommended_count': stats['recommended'],
+        'rejected_count': stats['rejected'],
+        'avg_interview_duration': stats['avg_interview_duration'] or 15,
+        'active_section': active_section if active_section in DASHBOARD_SECTIONS else 'applications_section',
         'debug_info': {
-            'jobs_count': len(jobs),
-            'applications_count': len(applications),
-            'interviews_count': len(scheduled_interviews),
-            'completed_interviews_count': len(completed_interviews),
-            'candidates_count': len(all_candidates)
+            'jobs_count': stats['jobs'],
+            'applications_count': stats['applications'],
+            'interviews_count': stats['interviews'],
+            'completed_interviews_count': stats['completed_interviews'],
+            'candidates_count': stats['candidates'],
         }
     }
-    
-    logger.info(f"Recruiter dashboard loaded for {request.user.username}: {len(jobs)} jobs, {len(applications)} applications, {len(all_candidates)} candidates")
-    
+
+    logger.info(f"Recruiter dashboard loaded for {request.user.username}: {stats['jobs']} jobs, "
+                f"{stats['applications']} applications, {stats['candidates']} candidates")
+
     return render(request, 'jobapp/recruiter_dashboard.html', context)
 
 
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def recruiter_candidate_options(request):
+    """
+    The recruiter's candidates for the schedule-interview modal, a page at a time:
+    {"results": [{"id", "name", "email"}], "next": cursor or null}, searchable with ?q=
+    """
+    candidates = Candidate.objects.filter(added_by=request.user)
+    query = request.GET.get('q', '').strip()
+    if query:
+        candidates = candidates.filter(Q(name__icontains=query) | Q(email__icontains=query))
+    page_obj = KeysetPaginator(candidates.only('id', 'name', 'email', 'added_at'), 50,
+                               ('-added_at', '-id')).get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [{'id': c.id, 'name': c.name, 'email': c.email} for c in page_obj],
+        'next': page_obj.next_cursor,
+    })
+
+
 
         
 
@@ -2384,6 +2358,43 @@ def save_interview_screenshots(interview, screenshots):
         logger.error(f"Error saving screenshots: {e}")
         return False
 
+def save_interview_turns(interview, turns, attempts=3):
+    """
+    Append conversation turns to the InterviewTurn table in a single insert; returns the saved rows.
+    Indexes continue from the highest stored one, allocated under a lock on the interview row, so
+    concurrent requests of one interview don't collide (a conflict that still slips through,
+    e.g. on SQLite where there is no row lock, is retried).
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic():
+                Interview.objects.select_for_update().filter(pk=interview.pk).values_list('pk', flat=True).first()
+                last_index = interview.turns.aggregate(last=models.Max('turn_index'))['last']
+                start_index = 0 if last_index is None else last_index + 1
+                return InterviewTurn.objects.bulk_create([
+                    InterviewTurn(
+                        interview=interview,
+                        turn_index=start_index + offset,
+                        speaker=turn['speaker'],
+                        text=turn['message'],
+                        question_number=turn.get('question_number', 0),
+                        time_remaining=turn.get('time_remaining'),
+                        created_at=parse_datetime(turn.get('timestamp') or '') or timezone.now(),
+                        llm_latency_ms=turn.get('llm_latency_ms'),
+                        tts_latency_ms=turn.get('tts_latency_ms'),
+                    )
+                    for offset, turn in enumerate(turns)
+                ])
+        except IntegrityError as e:
+            if attempt == attempts:
+                logger.error(f"Error saving interview turns for {interview.uuid} after {attempts} attempts: {e}")
+                return []
+            logger.warning(f"Turn index conflict for interview {interview.uuid}, retrying: {e}")
+        except Exception as e:
+            logger.error(f"Error saving interview turns for {interview.uuid}: {e}")
+            return []
+    return []
+
 def generate_interview_results(interview, conversation_history):
     """Generate and save interview results from live conversation - FIXED VERSION"""
     try:
@@ -2419,12 +2430,14 @@ def generate_interview_results(interview, conversation_history):
         
         logger.info(f"📝 Extracted {len(questions_asked)} questions and {len(answers_given)} answers")
         
+        # Turns are normally written as the interview happens; backfill if none were recorded
+        if conversation_history and not interview.turns.exists():
+            save_interview_turns(interview, conversation_history)
+        
         # CRITICAL FIX: Handle edge case where no responses were recorded
         if len(candidate_responses) == 0:
             logger.warning(f"⚠️ No candidate responses found for interview {interview.uuid}")
             # Still save partial results
-            interview.questions_asked = json.dumps(questions_asked)
-            interview.answers_given = json.dumps([])
             interview.overall_score = 1.0
             interview.technical_score = 1.0
             interview.communication_score = 1.0
@@ -2627,8 +2640,6 @@ The interview participation was insufficient. Professional interviews require ac
         # CRITICAL FIX: Save to database with explicit field assignment
         #Save Everything to Database
         try:
-            interview.questions_asked = json.dumps(questions_asked)
-            interview.answers_given = json.dumps(answers_given)
             interview.overall_score = round(overall_score, 1)
             interview.technical_score = round(technical_score, 1)
             interview.communication_score = round(communication_score, 1)
@@ -2648,7 +2659,7 @@ The interview participation was insufficient. Professional interviews require ac
             
             # CRITICAL: Force save to database
             interview.save(update_fields=[
-                'questions_asked', 'answers_given', 'overall_score', 
+                'overall_score', 
                 'technical_score', 'communication_score', 'problem_solving_score',
                 'ai_feedback', 'recommendation', 'status', 'completed_at',
                 'results_generated_at', 'transcript', 'started_at'
@@ -2670,9 +2681,9 @@ The interview participation was insufficient. Professional interviews require ac
                 # Email Confirmation code
                 try:
                     send_interview_status_email(interview, 'completed')
-                    logger.info(f"✅ Completion email sent for interview {interview.uuid}")
+                    logger.info(f"✅ Completion email queued for interview {interview.uuid}")
                 except Exception as email_error:
-                    logger.error(f"❌ Failed to send completion email: {email_error}")
+                    logger.error(f"❌ Failed to queue completion email: {email_error}")
                 
                 return True
             else:
@@ -2686,21 +2697,10 @@ The interview participation was insufficient. Professional interviews require ac
             return False
         
     except Exception as e:
+        # No placeholder result: the task queue retries the error and records it if it persists,
+        # and the results page shows that state instead of a fake score
         logger.error(f"❌ CRITICAL ERROR generating interview results for {interview.uuid}: {e}")
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
-        
-        # Try to save error state
-        try:
-            interview.status = 'completed'
-            interview.completed_at = timezone.now()
-            interview.ai_feedback = f"Error generating results: {str(e)}"
-            interview.overall_score = 1.0
-            interview.save()
-        except:
-            pass
-            
-        return False
+        raise
     
     
 #interview results view 
@@ -2726,51 +2726,39 @@ def interview_results(request, interview_uuid):
             return redirect('recruiter_dashboard')
         
         
-        # Check if results exist
-        if not interview.has_results:
+        # Check if results exist (or are still being generated by the task worker)
+        results_task = get_task(interview_results_key(interview_uuid))
+        generating = results_task is not None and results_task.status in ('pending', 'running')
+        if not interview.has_results or generating:
             logger.warning(f"⚠️ No results available for interview {interview_uuid}")
             logger.info(f"Debug info - Status: {interview.status}, Completed: {interview.completed_at}")
-            logger.info(f"Debug info - Questions: {bool(interview.questions_asked)}, Answers: {bool(interview.answers_given)}")
+            logger.info(f"Debug info - Turns recorded: {interview.turns.exists()}")
             
-            # Try to regenerate results if interview is completed but has no results
+            # Generate results if interview is completed but has no results; a task that failed,
+            # or finished without leaving results, runs again
             if interview.status == 'completed' and interview.completed_at:
-                logger.info(f"🔄 Attempting to regenerate results...")
-                messages.info(request, 'Results are being generated for this interview. Please refresh in a moment.')
-            else:
-                messages.warning(request, 'This interview is not yet completed or has no results.')
+                if not generating:
+                    logger.info(f"🔄 Queueing results generation...")
+                    results_task = enqueue_interview_results(interview, rerun_finished=True)
+                return render(request, 'jobapp/interview_results_generating.html', {
+                    'interview': interview,
+                    'task': results_task,
+                })
             
+            messages.warning(request, 'This interview is not yet completed or has no results.')
             return redirect('recruiter_dashboard')
         
-        # Parse the questions and answers from JSON
-        questions_asked = []
-        answers_given = []
-        
-        try:
-            if interview.questions_asked:
-                questions_asked = json.loads(interview.questions_asked)
-                logger.info(f"✅ Parsed {len(questions_asked)} questions")
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"❌ Could not parse questions_asked: {e}")
-        
-        try:
-            if interview.answers_given:
-                answers_given = json.loads(interview.answers_given)
-                logger.info(f"✅ Parsed {len(answers_given)} answers")
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.error(f"❌ Could not parse answers_given: {e}")
-        
-        # Combine questions and answers for display 
+        # Pair each question with the answers recorded against its question number
         qa_pairs = []
-        for i in range(max(len(questions_asked), len(answers_given))):
-            question = questions_asked[i] if i < len(questions_asked) else None
-            answer = answers_given[i] if i < len(answers_given) else None
-            
+        for i, pair in enumerate(interview.get_conversation_pairs()):
+            question = pair['question']
+            answers = pair['answers']
             qa_pairs.append({
                 'question_number': i + 1,
-                'question': question['question'] if question else 'Question not recorded',
-                'answer': answer['answer'] if answer else 'Answer not recorded',
-                'question_timestamp': question.get('timestamp') if question else None,
-                'answer_timestamp': answer.get('timestamp') if answer else None
+                'question': question.text,
+                'answer': ' '.join(answer.text for answer in answers) if answers else 'Answer not recorded',
+                'question_timestamp': question.created_at.isoformat(),
+                'answer_timestamp': answers[0].created_at.isoformat() if answers else None
             })
         
         logger.info(f"✅ Created {len(qa_pairs)} Q&A pairs for display")
@@ -2824,6 +2812,9 @@ def interview_results(request, interview_uuid):
             except (json.JSONDecodeError, TypeError) as e:
                 logger.error(f"Could not parse screenshots_data: {e}")
         
+        # Face detection timeline, summarized per face state
+        proctoring = timeline_summary(interview)
+        
         # Prepare Data for Template - Packages all data into a dictionary called context
         #-Sends data to HTML template (interview_results.html)
         #-Template uses this data to create the beautiful results page
@@ -2834,6 +2825,7 @@ def interview_results(request, interview_uuid):
             'total_questions': len(questions_asked),
             'total_answers': len(answers_given),
             'screenshots': screenshots,
+            'proctoring': proctoring,
         }
         
         logger.info(f"✅ Rendering results page with {len(qa_pairs)} Q&A pairs")
@@ -2847,6 +2839,23 @@ def interview_results(request, interview_uuid):
         return redirect('recruiter_dashboard')    
 
 
+@login_required
+@user_passes_test(lambda u: u.is_recruiter)
+def interview_results_status(request, interview_uuid):
+    """Polled by the results page while results are being generated"""
+    interview = get_object_or_404(Interview.objects.select_related('job'), uuid=interview_uuid)
+    if interview.job.posted_by != request.user:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    
+    results_task = get_task(interview_results_key(interview_uuid))
+    task_finished = results_task is None or results_task.status in ('done', 'failed')
+    return JsonResponse({
+        'ready': interview.has_results and task_finished,
+        'status': results_task.status if results_task else None,
+        'attempts': results_task.attempts if results_task else 0,
+    })
+
+
 # EMAIL MANAGEMENT VIEWS
 
 @login_required
@@ -2863,11 +2872,11 @@ def send_interview_email_manual(request, interview_uuid):
                 'message': 'You do not have permission to send this interview email.'
             }, status=403)
         
-        # Send the email
-        result = send_interview_link_email(interview)
+        # Queue a fresh copy of the email
+        result = send_interview_link_email(interview, resend=True)
         
         if result['success']:
-            messages.success(request, f'Interview email sent successfully to {interview.candidate_email}!')
+            messages.success(request, f'Interview email queued for {interview.candidate_email}!')
         else:
             messages.warning(request, f'Email could not be sent, but interview link is available: {result["interview_url"]}')
         
@@ -10,8 +10,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
-from .tts import generate_tts, estimate_audio_duration
-from .utils.interview_ai_nvidia import ask_ai_question
+from .tts import async_generate_tts, generate_tts, estimate_audio_duration, get_tts_duration
+from .utils.interview_ai_nvidia import ask_ai_question, async_ask_ai_question
 import time
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,37 @@ class VoiceAgentSession:
         welcome_message = "Hey there! Good to see you. What's on your mind today?"
         return self.generate_response(welcome_message, is_initial=True)
     
+    def _prompt(self, text):
+        # Build context from conversation history
+        context = "\n".join([
+            f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+            for msg in self.conversation_history[-4:]  # Last 4 exchanges
+        ])
+        return f"Previous conversation:\n{context}\n\nCandidate just said: {text}"
+    
+    def _reply(self, ai_response, audio_url, llm_latency, tts_latency, voice):
+        self.last_activity = time.time()
+        return {
+            "success": True,
+            "text": ai_response,
+            "audio_url": audio_url,
+            "audio_duration": get_tts_duration(audio_url) or estimate_audio_duration(ai_response),
+            "session_active": self.is_active,
+            "tts_latency": tts_latency,
+            "llm_latency": llm_latency,
+            "model": "nvidia/llama-3.3-nemotron-70b-instruct",
+            "voice": voice or "Ana Florence"
+        }
+    
+    def _error(self, e):
+        logger.error(f"Voice agent error: {e}")
+        return {
+            "success": False,
+            "error": f"NVIDIA Llama-3.3-Nemotron model error: {str(e)}",
+            "session_active": self.is_active,
+            "model": "nvidia/llama-3.3-nemotron-70b-instruct"
+        }
+    
     def generate_response(self, text, is_initial=False, voice=None):
         try:
             if not is_initial:
@@ -41,16 +72,9 @@ class VoiceAgentSession:
                 ai_response = text
                 llm_latency = 0
             else:
-                # Build context from conversation history
-                context = "\n".join([
-                    f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
-                    for msg in self.conversation_history[-4:]  # Last 4 exchanges
-                ])
-                
-                full_prompt = f"Previous conversation:\n{context}\n\nCandidate just said: {text}"
                 try:
                     ai_response = ask_ai_question(
-                        full_prompt,
+                        self._prompt(text),
                         candidate_name="User",
                         job_title="General Position",
                         company_name="Our Company"
@@ -65,40 +89,42 @@ class VoiceAgentSession:
             
             # Generate audio with timing using selected voice
             tts_start = time.time()
-            if voice:
-                # Temporarily override voice for this response
-                from . import tts
-                original_voice = tts.DAISY_VOICE_ID
-                tts.DAISY_VOICE_ID = voice
-                audio_url = generate_tts(ai_response)
-                tts.DAISY_VOICE_ID = original_voice
-            else:
-                audio_url = generate_tts(ai_response)
+            audio_url = generate_tts(ai_response, voice) if voice else generate_tts(ai_response)
             tts_latency = int((time.time() - tts_start) * 1000)
-            audio_duration = estimate_audio_duration(ai_response)
             
-            self.last_activity = time.time()
+            return self._reply(ai_response, audio_url, llm_latency, tts_latency, voice)
+            
+        except Exception as e:
+            return self._error(e)
+    
+    async def agenerate_response(self, text, voice=None):
+        """generate_response for the async chat view - LLM and TTS calls are awaited"""
+        try:
+            self.conversation_history.append({"role": "user", "content": text})
+            
+            llm_start = time.time()
+            try:
+                ai_response = await async_ask_ai_question(
+                    self._prompt(text),
+                    candidate_name="User",
+                    job_title="General Position",
+                    company_name="Our Company"
+                )
+                llm_latency = int((time.time() - llm_start) * 1000)
+            except Exception as e:
+                logger.error(f"NVIDIA LLM Error: {e}")
+                raise e
+            
+            self.conversation_history.append({"role": "assistant", "content": ai_response})
+            
+            tts_start = time.time()
+            audio_url = await async_generate_tts(ai_response, voice) if voice else await async_generate_tts(ai_response)
+            tts_latency = int((time.time() - tts_start) * 1000)
             
-            return {
-                "success": True,
-                "text": ai_response,
-                "audio_url": audio_url,
-                "audio_duration": audio_duration,
-                "session_active": self.is_active,
-                "tts_latency": tts_latency,
-                "llm_latency": llm_latency,
-                "model": "nvidia/llama-3.3-nemotron-70b-instruct",
-                "voice": voice or "Ana Florence"
-            }
+            return self._reply(ai_response, audio_url, llm_latency, tts_latency, voice)
             
         except Exception as e:
-            logger.error(f"Voice agent error: {e}")
-            return {
-                "success": False,
-                "error": f"NVIDIA Llama-3.3-Nemotron model error: {str(e)}",
-                "session_active": self.is_active,
-                "model": "nvidia/llama-3.3-nemotron-70b-instruct"
-            }
+            return self._error(e)
     
     def stop_session(self):
         self.is_active = False
@@ -131,7 +157,7 @@ def start_voice_session(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def voice_chat(request):
+async def voice_chat(request):
     """Handle voice input and generate response"""
     try:
         data = json.loads(request.body)
@@ -150,7 +176,7 @@ def voice_chat(request):
             return JsonResponse({"success": False, "error": "Session not active"})
         
         # Generate response with selected voice
-        response = session.generate_response(user_text, voice=selected_voice)
+        response = await session.agenerate_response(user_text, voice=selected_voice)
         
         return JsonResponse(response)
         
@@ -2,12 +2,14 @@
 URL patterns for Voice Agent system
 """
 from django.urls import path
-from . import voice_agent, voice_views
+from . import voice_agent, voice_views, streaming_voice
 
 urlpatterns = [
     path('', voice_views.voice_agent_demo, name='voice_agent_main'),  # Main voice agent page
     path('start/', voice_agent.start_voice_session, name='voice_start'),
     path('chat/', voice_agent.voice_chat, name='voice_chat'),
+    path('stream/', streaming_voice.streaming_voice_chat, name='voice_stream'),
+    path('stream-tts/', streaming_voice.streaming_tts_only, name='voice_stream_tts'),
     path('stop/', voice_agent.stop_voice_session, name='voice_stop'),
     path('status/', voice_agent.voice_agent_status, name='voice_status'),
     path('demo/', voice_views.voice_agent_demo, name='voice_demo'),
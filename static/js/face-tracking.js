@@ -6,7 +6,23 @@ class FaceTracker {
         this.isTracking = false;
         this.alertShown = false;
         this.lastDetectionTime = 0;
-        this.detectionInterval = 2000; // Check every 2 seconds
+        this.detectionInterval = 1000; // Capture a frame every second
+        this.batchSize = 3; // Frames sent per request to /api/face-detect/batch/
+        this.pendingFrames = []; // { blob, capturedAt } - capture times place each frame on the timeline
+        // Lets the server track faces between batches instead of searching every frame in full
+        // Detection results are recorded on this interview's proctoring timeline
+        this.interviewUuid = (typeof TEMPLATE_DATA !== 'undefined' && TEMPLATE_DATA.interviewUuid) || '';
+        this.sessionId = (window.crypto && crypto.randomUUID) ? crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+        // Frames go over the proctoring WebSocket as binary JPEG; the batch endpoint is the fallback.
+        // The socket only exists when the server runs under ASGI
+        this.socketEnabled = typeof TEMPLATE_DATA !== 'undefined' && TEMPLATE_DATA.proctoringSocket === true;
+        this.socket = null;
+        this.socketReady = false;
+        this.awaitingResult = false;
+        this.socketRetryDelay = 1000; // Doubled after every failed attempt
+        this.socketMaxRetryDelay = 30000;
+        this.socketMaxAttempts = 6;
+        this.socketAttempts = 0;
         this.statusIndicator = document.getElementById('faceStatus');
         
         // Create overlay canvas
@@ -60,7 +76,66 @@ class FaceTracker {
         this.isTracking = true;
         console.log('🎯 Face tracking started');
         this.updateStatus('STARTING...', false);
+        this.connectSocket();
         this.detectFaces();
+        // Send the frames still waiting for a batch and let the server write the timeline out
+        window.addEventListener('pagehide', () => this.sendFinalFrames());
+    }
+    
+    connectSocket() {
+        if (!this.socketEnabled || !window.WebSocket) return;
+        this.socketAttempts++;
+        const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        const params = new URLSearchParams({ session: this.sessionId, interview: this.interviewUuid });
+        const socket = new WebSocket(`${scheme}://${window.location.host}/ws/proctoring/?${params}`);
+        socket.binaryType = 'arraybuffer';
+        this.socket = socket;
+        
+        socket.onopen = () => {
+            console.log('🔌 Proctoring socket connected');
+            this.socketReady = true;
+            this.awaitingResult = false;
+            this.socketAttempts = 0;
+        };
+        socket.onmessage = (event) => this.handleSocketMessage(JSON.parse(event.data));
+        socket.onclose = () => {
+            // Fall back to batched HTTP frames until the socket is back
+            this.socketReady = false;
+            this.awaitingResult = false;
+            this.socket = null;
+            if (this.socketAttempts >= this.socketMaxAttempts) {
+                console.warn('🔌 Proctoring socket unavailable, sending frames over HTTP');
+                return;
+            }
+            const delay = Math.min(this.socketRetryDelay * 2 ** (this.socketAttempts - 1), this.socketMaxRetryDelay);
+            setTimeout(() => this.connectSocket(), delay);
+        };
+    }
+    
+    handleSocketMessage(message) {
+        if (message.type === 'alert') {
+            if (message.alert === 'multiple_faces' && message.active) {
+                console.log('🚨 Multiple people detected!');
+                if (window.captureScreenshot) {
+                    window.captureScreenshot('second_person_detected');
+                }
+                this.showAlert(`Alert: ${message.count} people detected!`);
+            } else if (message.alert === 'no_face' && message.active) {
+                this.showAlert('Alert: no face detected!');
+            }
+            return;
+        }
+        if (message.type !== 'detection') return;
+        
+        this.awaitingResult = false;
+        if (message.status === 'dropped') return; // The server fell behind and skipped this frame
+        if (message.error) {
+            console.error('🚨 Face detection error:', message.error);
+            this.updateStatus('ERROR', false);
+            return;
+        }
+        this.updateStatus(`${message.count} faces`, true);
+        this.drawFaces(message.faces || []);
     }
     
     updateStatus(message, isActive) {
@@ -100,54 +175,25 @@ class FaceTracker {
                 this.setupCanvas();
             }
             
-            // Capture frame
-            this.ctx.drawImage(this.video, 0, 0, this.canvas.width, this.canvas.height);
-            const frameData = this.canvas.toDataURL('image/jpeg', 0.7);
-            
-            // Get CSRF token
-            const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || 
-                             document.querySelector('input[name=csrfmiddlewaretoken]')?.value || 
-                             (typeof TEMPLATE_DATA !== 'undefined' ? TEMPLATE_DATA.csrfToken : '') ||
-                             document.querySelector('meta[name=csrf-token]')?.getAttribute('content') || '';
-            
-            if (!csrfToken) {
-                console.warn('⚠️ No CSRF token found');
+            // A new frame goes over the socket only once the previous one has its result
+            if (this.socketReady && this.awaitingResult) {
+                setTimeout(() => this.detectFaces(), this.detectionInterval);
+                return;
             }
             
-            const response = await fetch('/api/face-detect/', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': csrfToken
-                },
-                body: JSON.stringify({ frame: frameData })
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            // Capture frame as JPEG bytes; sent over the socket, or in batches over HTTP
+            const capturedAt = Date.now();
+            this.ctx.drawImage(this.video, 0, 0, this.canvas.width, this.canvas.height);
+            const frame = await new Promise(resolve => this.canvas.toBlob(resolve, 'image/jpeg', 0.7));
+            if (frame && this.socketReady) {
+                this.pendingFrames = [];
+                this.awaitingResult = true;
+                this.socket.send(await frame.arrayBuffer());
+            } else if (frame) {
+                this.pendingFrames.push({ blob: frame, capturedAt });
             }
-            
-            const result = await response.json();
-            
-            if (result.error) {
-                console.error('🚨 Face detection error:', result.error);
-                this.updateStatus('ERROR', false);
-            } else {
-                console.log(`👤 Detected ${result.count} faces`);
-                this.updateStatus(`${result.count} faces`, true);
-                this.drawFaces(result.faces || []);
-                
-                // Capture screenshot when second person detected
-                if (result.count > 1 && window.captureScreenshot) {
-                    window.captureScreenshot('second_person_detected');
-                }
-                
-                if (result.alert && !this.alertShown) {
-                    console.log('🚨 Multiple people detected!');
-                    this.showAlert(`Alert: ${result.count} people detected!`);
-                    this.alertShown = true;
-                    setTimeout(() => { this.alertShown = false; }, 5000);
-                }
+            if (this.pendingFrames.length >= this.batchSize) {
+                await this.sendFrames(this.pendingFrames.splice(0));
             }
             
         } catch (error) {
@@ -159,6 +205,78 @@ class FaceTracker {
         setTimeout(() => this.detectFaces(), this.detectionInterval);
     }
     
+    batchForm(frames, final = false) {
+        const formData = new FormData();
+        formData.append('session', this.sessionId);
+        formData.append('interview', this.interviewUuid);
+        frames.forEach((frame, index) => {
+            formData.append('frames', frame.blob, `frame_${index}.jpg`);
+            formData.append('captured_at', frame.capturedAt);
+        });
+        // The server only uses each frame's age at send time, so the client clock may be off
+        formData.append('sent_at', Date.now());
+        if (final) {
+            formData.append('final', '1');
+        }
+        return formData;
+    }
+    
+    sendFinalFrames() {
+        const frames = this.pendingFrames.splice(0);
+        if (!frames.length || !this.interviewUuid || !navigator.sendBeacon) return;
+        navigator.sendBeacon('/api/face-detect/batch/', this.batchForm(frames, true));
+    }
+    
+    async sendFrames(frames) {
+        // Get CSRF token
+        const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value || 
+                         document.querySelector('input[name=csrfmiddlewaretoken]')?.value || 
+                         (typeof TEMPLATE_DATA !== 'undefined' ? TEMPLATE_DATA.csrfToken : '') ||
+                         document.querySelector('meta[name=csrf-token]')?.getAttribute('content') || '';
+        
+        if (!csrfToken) {
+            console.warn('⚠️ No CSRF token found');
+        }
+        
+        const response = await fetch('/api/face-detect/batch/', {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': csrfToken
+            },
+            body: this.batchForm(frames)
+        });
+        
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        
+        const batch = await response.json();
+        // The overlay shows the most recent frame; alerts consider every frame in the batch
+        const result = batch.error ? batch : batch.results[batch.results.length - 1];
+        
+        if (result.error) {
+            console.error('🚨 Face detection error:', result.error);
+            this.updateStatus('ERROR', false);
+            return;
+        }
+        
+        console.log(`👤 Detected ${result.count} faces (max ${batch.max_count} in ${batch.frames} frames)`);
+        this.updateStatus(`${result.count} faces`, true);
+        this.drawFaces(result.faces || []);
+        
+        // Capture screenshot when second person detected
+        if (batch.max_count > 1 && window.captureScreenshot) {
+            window.captureScreenshot('second_person_detected');
+        }
+        
+        if (batch.alert && !this.alertShown) {
+            console.log('🚨 Multiple people detected!');
+            this.showAlert(`Alert: ${batch.max_count} people detected!`);
+            this.alertShown = true;
+            setTimeout(() => { this.alertShown = false; }, 5000);
+        }
+    }
+    
     drawFaces(faces) {
         if (!faces || !Array.isArray(faces)) {
             console.warn('⚠️ Invalid faces data:', faces);
@@ -7,6 +7,8 @@ window.recordedChunks = [];
 window.isRecording = false;
 window.isCameraOn = true;
 window.userStream = null;
+window.recordingUpload = null; // ChunkedRecordingUpload (recording-upload.js) when loaded
+window.recordingStartTime = null;
 
 // Override initializeCamera function
 window.initializeCamera = async function() {
@@ -48,7 +50,12 @@ function setupRecording() {
         
         window.mediaRecorder.ondataavailable = (event) => {
             if (event.data.size > 0) {
-                window.recordedChunks.push(event.data);
+                // Chunks go to the server as they are recorded; without an upload they are kept for the end
+                if (window.recordingUpload) {
+                    window.recordingUpload.push(event.data);
+                } else {
+                    window.recordedChunks.push(event.data);
+                }
             }
         };
         
@@ -72,6 +79,15 @@ function setupRecording() {
 function startRecording() {
     if (window.mediaRecorder && !window.isRecording) {
         window.recordedChunks = [];
+        if (window.ChunkedRecordingUpload) {
+            window.recordingUpload = new ChunkedRecordingUpload(getInterviewUuid(), 'video/webm');
+            window.recordingUpload.ready.catch(error => {
+                console.warn('⚠️ Chunked upload unavailable, keeping the recording in memory:', error);
+                window.recordedChunks = window.recordingUpload.pending.concat(window.recordedChunks);
+                window.recordingUpload = null;
+            });
+        }
+        window.recordingStartTime = Date.now();
         window.mediaRecorder.start(1000);
         window.isRecording = true;
         
@@ -99,20 +115,36 @@ function stopRecording() {
     }
 }
 
+function getInterviewUuid() {
+    const pathParts = window.location.pathname.split('/');
+    return pathParts[pathParts.length - 2];
+}
+
 // Save recording
 async function saveRecording() {
+    const duration = window.recordingStartTime ? (Date.now() - window.recordingStartTime) / 1000 : 300;
+    
+    if (window.recordingUpload) {
+        // The chunks are already on the server; assemble them
+        try {
+            await window.recordingUpload.finish(duration);
+            console.log('✅ Recording saved');
+        } catch (error) {
+            console.error('❌ Error saving recording:', error);
+        }
+        return;
+    }
+    
     if (window.recordedChunks.length === 0) return;
     
     try {
         const blob = new Blob(window.recordedChunks, { type: 'video/webm' });
         const formData = new FormData();
-        
-        const pathParts = window.location.pathname.split('/');
-        const uuid = pathParts[pathParts.length - 2];
+        const uuid = getInterviewUuid();
         
         formData.append('recording', blob, `interview-${uuid}.webm`);
         formData.append('interview_uuid', uuid);
-        formData.append('duration', '300');
+        formData.append('duration', String(duration));
         
         const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
         
@@ -0,0 +1,102 @@
+// Chunked, resumable upload of the interview recording.
+// MediaRecorder chunks are sent to /interview/recording/uploads/ while the interview runs,
+// so a failed request only resends one chunk instead of losing the whole recording.
+class ChunkedRecordingUpload {
+    constructor(interviewUuid, contentType) {
+        this.interviewUuid = interviewUuid;
+        this.contentType = contentType || 'video/webm';
+        this.uploadId = null;
+        this.offset = 0;
+        this.pending = [];      // Blobs recorded but not yet acknowledged by the server
+        this.sending = null;    // Promise of the send loop while it runs
+        this.maxRetries = 5;
+        this.ready = this.open();
+    }
+
+    async open() {
+        const formData = new FormData();
+        formData.append('interview_uuid', this.interviewUuid);
+        formData.append('content_type', this.contentType);
+        const response = await fetch('/interview/recording/uploads/', { method: 'POST', body: formData });
+        if (!response.ok) {
+            throw new Error(`Recording upload not started: HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        this.uploadId = data.upload_id;
+        this.offset = data.offset;
+        console.log('📤 Recording upload started:', this.uploadId);
+    }
+
+    // Queue a MediaRecorder chunk; chunks are sent one at a time, in order
+    push(blob) {
+        if (!blob || blob.size === 0) return;
+        this.pending.push(blob);
+        if (!this.sending) {
+            this.sending = this.sendPending()
+                .catch(error => console.error('❌ Recording upload stalled:', error))
+                .finally(() => { this.sending = null; });
+        }
+    }
+
+    async sendPending() {
+        await this.ready;
+        while (this.pending.length) {
+            await this.sendChunk(this.pending[0]);
+            this.pending.shift();
+        }
+    }
+
+    async sendChunk(blob) {
+        const url = `/interview/recording/uploads/${this.uploadId}/`;
+        const body = await blob.arrayBuffer();
+        const headers = { 'Content-Type': 'application/octet-stream' };
+        if (window.crypto && crypto.subtle) {
+            const digest = await crypto.subtle.digest('SHA-256', body);
+            headers['X-Chunk-SHA256'] = Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+        }
+
+        for (let attempt = 0; attempt <= this.maxRetries; attempt++) {
+            try {
+                headers['X-Upload-Offset'] = String(this.offset);
+                const response = await fetch(url, { method: 'PUT', headers, body });
+                const data = await response.json();
+                if (response.ok) {
+                    this.offset = data.offset;
+                    return;
+                }
+                if (response.status === 409 && data.offset !== undefined) {
+                    // The server already has part of what we sent (a lost response); continue from its offset
+                    if (data.offset >= this.offset + body.byteLength) {
+                        this.offset = data.offset;
+                        return;
+                    }
+                    this.offset = data.offset;
+                }
+            } catch (error) {
+                console.warn('⚠️ Recording chunk upload failed, retrying:', error);
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+        }
+        throw new Error('Recording chunk could not be uploaded');
+    }
+
+    // Wait for the queued chunks, then assemble the recording on the server
+    async finish(durationSeconds) {
+        if (this.sending) {
+            await this.sending;
+        }
+        await this.sendPending(); // Chunks left over from a stalled send
+        const formData = new FormData();
+        formData.append('duration', String(durationSeconds || 0));
+        const response = await fetch(`/interview/recording/uploads/${this.uploadId}/finalize/`, {
+            method: 'POST',
+            body: formData
+        });
+        if (!response.ok) {
+            throw new Error(`Recording not finalized: HTTP ${response.status}`);
+        }
+        return response.json();
+    }
+}
+
+window.ChunkedRecordingUpload = ChunkedRecordingUpload;